@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark da listagem de chamados do admin (GET /api/admin/chamados).
+
+Compara o carregamento antigo (obter_todos traz todos os chamados com o
+autor e as não lidas de todas as interações, filtra em Python e pagina com
+paginar) com chamado_repo.obter_pagina_admin, que filtra, ordena e pagina
+no banco pelos índices idx_chamado_status_prioridade_data e
+idx_chamado_prioridade_data e conta as não lidas só da página.
+
+Cenários: sem filtro, status, status + prioridade, prioridade, busca
+textual no título e nas mensagens (índices FTS5 chamado_busca e
+chamado_interacao_busca, ordenada por relevância) e uma página profunda sem
+filtro. O carregamento antigo só é medido até --max-antigo chamados (ele
+materializa a tabela inteira a cada chamada). Nas buscas os resultados não
+são comparados: o antigo procurava substrings só no título e no autor, em
+ordem de prioridade.
+
+Uso:
+    python benchmarks/bench_admin_chamados.py
+    python benchmarks/bench_admin_chamados.py --chamados 10000 100000 1000000 --repeticoes 5 --max-antigo 100000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from repo import chamado_interacao_repo, chamado_repo, usuario_repo  # noqa: E402
+from sql import indices_sql  # noqa: E402
+from util import db_util  # noqa: E402
+from util.paginacao_util import paginar  # noqa: E402
+
+POR_PAGINA = 10
+ADMIN_ID = 1
+STATUS = ["Aberto", "Em Análise", "Resolvido", "Fechado"]
+PRIORIDADES = ["Baixa", "Média", "Alta", "Urgente"]
+
+CENARIOS = [
+    ("sem filtro", {}),
+    ("status", {"status": "Aberto"}),
+    ("status+prioridade", {"status": "Em Análise", "prioridade": "Urgente"}),
+    ("prioridade", {"prioridade": "Baixa"}),
+    ("busca título", {"termo": "pedido 4242"}),
+    ("busca mensagem", {"termo": "nota erro 31337"}),
+    ("busca + status", {"termo": "pedido 4242", "status": "Aberto"}),
+    ("página 500", {"pagina": 500}),
+]
+
+
+def _popular_banco(caminho: str, chamados: int) -> None:
+    """Cria `chamados` chamados de chamados/10 usuários, com uma interação cada."""
+    db_util.DATABASE_PATH = caminho
+    usuario_repo.criar_tabela()
+    chamado_repo.criar_tabela()
+    chamado_interacao_repo.criar_tabela()
+
+    usuarios = max(1, chamados // 10)
+    aleatorio = random.Random(42)
+    base = datetime(2025, 1, 1)
+    with sqlite3.connect(caminho) as conn:
+        conn.executemany(
+            "INSERT INTO usuario (id, nome, email, senha, perfil) VALUES (?, ?, ?, 'x', ?)",
+            (
+                (i, f"Usuario {i}", f"usuario{i}@example.com", "Administrador" if i == ADMIN_ID else "Cliente")
+                for i in range(1, usuarios + 2)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO chamado (id, titulo, status, prioridade, usuario_id, data_abertura) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    i,
+                    f"Chamado {i} sobre pedido {aleatorio.randrange(100000)}",
+                    aleatorio.choice(STATUS),
+                    aleatorio.choice(PRIORIDADES),
+                    aleatorio.randrange(2, usuarios + 2),
+                    (base + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+                )
+                for i in range(1, chamados + 1)
+            ),
+        )
+        # Uma mensagem do autor por chamado, metade ainda não lida pelo admin;
+        # os triggers indexam títulos e mensagens durante a carga
+        conn.executemany(
+            "INSERT INTO chamado_interacao (chamado_id, usuario_id, mensagem, tipo, data_leitura) "
+            "SELECT id, usuario_id, 'Erro ' || (id * 7919 % 100000) || ' ao emitir a nota fiscal do pedido', "
+            "'Abertura', ? FROM chamado WHERE id % 2 = ?",
+            ((None, 0), ("2025-01-01 00:00:00", 1)),
+        )
+        conn.execute(indices_sql.CRIAR_INDICE_CHAMADO_USUARIO)
+        conn.execute(indices_sql.CRIAR_INDICE_CHAMADO_STATUS_PRIORIDADE_DATA)
+        conn.execute(indices_sql.CRIAR_INDICE_CHAMADO_PRIORIDADE_DATA)
+        conn.execute(indices_sql.CRIAR_INDICE_INTERACAO_CHAMADO)
+
+
+def _listar_antigo(pagina: int = 1, termo=None, status=None, prioridade=None):
+    """Reproduz a listagem anterior (tudo do banco, filtros e paginação em Python)."""
+    chamados = chamado_repo.obter_todos(ADMIN_ID)
+    if termo:
+        termo = termo.strip().lower()
+        chamados = [
+            c
+            for c in chamados
+            if termo in c.titulo.lower()
+            or (c.usuario_nome and termo in c.usuario_nome.lower())
+            or (c.usuario_email and termo in c.usuario_email.lower())
+        ]
+    if status:
+        chamados = [c for c in chamados if c.status.value == status]
+    if prioridade:
+        chamados = [c for c in chamados if c.prioridade.value == prioridade]
+    return paginar(chamados, pagina, POR_PAGINA)
+
+
+def _listar_novo(pagina: int = 1, **filtros):
+    return chamado_repo.obter_pagina_admin(ADMIN_ID, pagina=pagina, por_pagina=POR_PAGINA, **filtros)
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    """Tempo médio (ms) de `repeticoes` execuções."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chamados", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--max-antigo", type=int, default=100_000, help="maior volume medido no modo antigo")
+    args = parser.parse_args()
+
+    print(f"Página: {POR_PAGINA} chamados")
+    for chamados in args.chamados:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            inicio = time.perf_counter()
+            _popular_banco(os.path.join(temp_dir, "bench.db"), chamados)
+            print(f"{chamados} chamados (banco criado em {time.perf_counter() - inicio:.1f} s)")
+
+            for rotulo, filtros in CENARIOS:
+                paginacao = _listar_novo(**filtros)
+                novo = _medir(lambda: _listar_novo(**filtros), args.repeticoes)
+                if chamados <= args.max_antigo:
+                    esperado = _listar_antigo(**filtros)
+                    if "termo" not in filtros:
+                        assert [c.id for c in paginacao.items] == [c.id for c in esperado.items], rotulo
+                        assert paginacao.total == esperado.total, rotulo
+                    antigo = _medir(lambda: _listar_antigo(**filtros), args.repeticoes)
+                    comparacao = f"antigo {antigo:9.1f} ms | ganho {antigo / novo:7.1f}x"
+                else:
+                    comparacao = "antigo         - (acima de --max-antigo)"
+                print(
+                    f"  {rotulo:<18} total {paginacao.total:>8} | "
+                    f"SQL {novo:8.2f} ms | {comparacao}"
+                )
+            db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos backends de broadcast do chat (util/chat_broadcast.py).
+
+Simula dois workers no mesmo banco: o worker A publica N mensagens em uma
+sala e o worker B tem o destinatário conectado. Para cada backend mede o
+throughput (eventos entregues por segundo ao destinatário) e a latência
+publicação -> entrega (p50/p99).
+
+  - memoria: entrega direta no processo (referência; não atravessa workers)
+  - sqlite:  log chat_evento + polling no worker B
+
+Uso:
+    python benchmarks/bench_broadcast_chat.py
+    python benchmarks/bench_broadcast_chat.py --eventos 20000 --concorrencia 16 --intervalo-ms 10 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from repo import chat_evento_repo  # noqa: E402
+from util import db_util  # noqa: E402
+from util.chat_broadcast import BackendMemoria, BackendSQLite  # noqa: E402
+from util.chat_manager import GerenciadorChat  # noqa: E402
+from util.db_async import encerrar_executor  # noqa: E402
+
+
+def _percentil(amostras: list[float], p: int) -> float:
+    """Percentil p (1-99) das amostras."""
+    if len(amostras) < 2:
+        return amostras[0] if amostras else 0.0
+    return statistics.quantiles(amostras, n=100, method="inclusive")[p - 1]
+
+
+async def _rodar(worker_a: GerenciadorChat, worker_b: GerenciadorChat, eventos: int, concorrencia: int) -> dict:
+    fila = await worker_b.conectar(2)
+    await worker_b.iniciar()
+    latencias: list[float] = []
+
+    async def consumidor():
+        for _ in range(eventos):
+            evento = await fila.get()
+            latencias.append(time.perf_counter() - evento["enviado_em"])
+
+    async def publicador(inicio: int):
+        # Cada corrotina equivale a uma requisição POST /api/chat/mensagens
+        for i in range(inicio, eventos, concorrencia):
+            await worker_a.broadcast_para_sala(
+                "1_2", {"tipo": "nova_mensagem", "seq": i, "enviado_em": time.perf_counter()}
+            )
+            # Devolve o event loop entre requisições, como faria o servidor
+            await asyncio.sleep(0)
+
+    inicio = time.perf_counter()
+    tarefa_consumo = asyncio.create_task(consumidor())
+    await asyncio.gather(*(publicador(i) for i in range(concorrencia)))
+    await tarefa_consumo
+    duracao = time.perf_counter() - inicio
+    await worker_b.encerrar()
+
+    return {
+        "eventos_s": eventos / duracao,
+        "p50": _percentil(latencias, 50) * 1000,
+        "p99": _percentil(latencias, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eventos", type=int, default=5000)
+    parser.add_argument("--concorrencia", type=int, default=8, help="corrotinas publicando")
+    parser.add_argument("--intervalo-ms", type=int, nargs="+", default=[10, 50], help="polling do backend sqlite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_util.DATABASE_PATH = os.path.join(temp_dir, "bench.db")
+        chat_evento_repo.criar_tabela()
+
+        print(f"Eventos: {args.eventos} | Publicadores: {args.concorrencia}")
+        cenarios = [("memoria", BackendMemoria)]
+        cenarios += [
+            (f"sqlite {ms:>3} ms", lambda ms=ms: BackendSQLite(intervalo_ms=ms))
+            for ms in args.intervalo_ms
+        ]
+        for rotulo, criar in cenarios:
+            if rotulo == "memoria":
+                # Sem workers separados: A e B são o mesmo processo/gerenciador
+                worker_a = worker_b = GerenciadorChat(criar())
+            else:
+                worker_a, worker_b = GerenciadorChat(criar()), GerenciadorChat(criar())
+            r = asyncio.run(_rodar(worker_a, worker_b, args.eventos, args.concorrencia))
+            print(
+                f"  {rotulo:<14} {r['eventos_s']:9.0f} eventos/s | "
+                f"latência p50 {r['p50']:8.2f} ms  p99 {r['p99']:8.2f} ms"
+            )
+
+        encerrar_executor()
+        db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de usuários: LIKE x índice FTS5 (usuario_busca).
+
+Mede a latência das duas buscas que usam o termo:
+
+  - autocomplete: usuario_repo.buscar_por_termo(termo, limit=10)
+                  (GET /api/chat/usuarios/buscar, a cada tecla)
+  - admin:        usuario_repo.obter_pagina(termo=...) — página de 10
+                  ordenada por nome, com o total exato
+
+comparando com a consulta antiga, LOWER(nome) LIKE LOWER('%termo%') OR
+LOWER(email) LIKE ..., que varre a tabela até achar `limit` linhas (ou até
+o fim, quando o termo é raro ou não existe).
+
+Os nomes são combinações de nomes e sobrenomes portugueses com acento; os
+termos são digitados sem acento, como no autocomplete. A consulta antiga
+recebe o termo com acento (sem isso ela não encontraria nada).
+
+Uso:
+    python benchmarks/bench_busca_usuarios.py
+    python benchmarks/bench_busca_usuarios.py --usuarios 100000 1000000 --repeticoes 20
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from repo import usuario_repo  # noqa: E402
+from sql import indices_sql  # noqa: E402
+from util import db_util  # noqa: E402
+from util.paginacao_util import obter_paginado  # noqa: E402
+
+NOMES = [
+    "João", "José", "Maria", "Ana", "Antônio", "Francisco", "Carlos", "Paulo",
+    "Pedro", "Lucas", "Luís", "Márcia", "Sebastião", "Conceição", "Letícia",
+    "Júlia", "Otávio", "Cecília", "Inês", "Vitória", "Fábio", "André", "Tânia",
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+    "Pereira", "Lima", "Gomes", "Araújo", "Gonçalves", "Magalhães", "Brandão",
+    "Falcão", "Simões", "Guimarães", "Assunção", "Damião", "Estêvão", "Nóbrega",
+]
+
+# (rótulo, termo sem acento para o FTS, termo com acento para o LIKE)
+TERMOS = [
+    ("prefixo curto", "jo", "jo"),
+    ("nome completo", "sebastiao nobrega", "sebastião nóbrega"),
+    ("email", "usuario123456", "usuario123456"),
+    ("inexistente", "xyzw", "xyzw"),
+]
+
+# Consulta de buscar_por_termo antes do índice FTS5
+BUSCAR_LIKE = """
+SELECT * FROM usuario
+WHERE (LOWER(nome) LIKE LOWER(?) OR LOWER(email) LIKE LOWER(?))
+LIMIT ?
+"""
+
+# Filtro de termo de usuario_repo.obter_pagina antes do índice FTS5
+FILTRO_LIKE = "WHERE (LOWER(nome) LIKE LOWER(?) ESCAPE '\\' OR LOWER(email) LIKE LOWER(?) ESCAPE '\\')"
+
+
+def _popular_banco(caminho: str, usuarios: int) -> None:
+    """Cria `usuarios` usuários; o índice FTS5 é mantido pelos triggers."""
+    db_util.DATABASE_PATH = caminho
+    usuario_repo.criar_tabela()
+
+    aleatorio = random.Random(42)
+    with sqlite3.connect(caminho) as conn:
+        conn.executemany(
+            "INSERT INTO usuario (nome, email, senha, perfil) VALUES (?, ?, 'x', 'Cliente')",
+            (
+                (
+                    f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)}",
+                    f"usuario{i}@example.com",
+                )
+                for i in range(usuarios)
+            ),
+        )
+        conn.execute(indices_sql.CRIAR_INDICE_USUARIO_NOME)
+
+
+def _buscar_like(termo: str, limite: int = 10) -> list:
+    with db_util.obter_conexao() as conn:
+        padrao = f"%{termo}%"
+        return conn.execute(BUSCAR_LIKE, (padrao, padrao, limite)).fetchall()
+
+
+def _padrao_contem(termo: str) -> str:
+    """Padrão LIKE de "contém" com %, _ e \\ escapados (ESCAPE '\\')."""
+    escapado = termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escapado}%"
+
+
+def _pagina_like(termo: str):
+    padrao = _padrao_contem(termo)
+    return obter_paginado(
+        sql_count=f"SELECT COUNT(*) as total FROM usuario {FILTRO_LIKE}",
+        sql_dados=f"SELECT * FROM usuario {FILTRO_LIKE} ORDER BY nome, id",
+        params=(padrao, padrao),
+        pagina=1,
+        por_pagina=10,
+    )
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    """Tempo médio (ms) de `repeticoes` execuções."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuarios", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    for usuarios in args.usuarios:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            inicio = time.perf_counter()
+            _popular_banco(os.path.join(temp_dir, "bench.db"), usuarios)
+            print(f"{usuarios} usuários (banco e índice criados em {time.perf_counter() - inicio:.1f} s)")
+
+            for rotulo, termo, termo_like in TERMOS:
+                fts = _medir(lambda: usuario_repo.buscar_por_termo(termo, limit=10), args.repeticoes)
+                like = _medir(lambda: _buscar_like(termo_like), args.repeticoes)
+                print(
+                    f"  autocomplete {rotulo:<14} FTS5 {fts:8.2f} ms | LIKE {like:8.2f} ms | "
+                    f"ganho {like / fts:7.1f}x"
+                )
+            for rotulo, termo, termo_like in TERMOS:
+                total = usuario_repo.obter_pagina(termo=termo).total
+                fts = _medir(lambda: usuario_repo.obter_pagina(termo=termo), args.repeticoes)
+                like = _medir(lambda: _pagina_like(termo_like), max(1, args.repeticoes // 5))
+                print(
+                    f"  admin        {rotulo:<14} FTS5 {fts:8.2f} ms | LIKE {like:8.2f} ms | "
+                    f"ganho {like / fts:7.1f}x | total {total}"
+                )
+            db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
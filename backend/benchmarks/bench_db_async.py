@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark do acesso assíncrono ao banco (util/db_async.executar_db).
+
+Simula um worker sob carga mista: várias corrotinas fazem buscas de usuários
+(query que varre a tabela, como o autocomplete do chat) enquanto outras
+corrotinas "leves" — equivalentes a um stream SSE ou a uma rota que não toca
+o banco — medem quanto tempo o event loop leva para atendê-las.
+
+Compara dois modos:
+  - bloqueante: repositório chamado direto na corrotina (comportamento antigo)
+  - executor:   repositório chamado via ``await executar_db(...)``
+
+Para cada modo imprime p50/p99 da latência das corrotinas leves e das
+buscas, além do throughput das buscas.
+
+Uso:
+    python benchmarks/bench_db_async.py
+    python benchmarks/bench_db_async.py --usuarios 50000 --buscas 8 --leves 50 --segundos 5
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from repo import usuario_repo  # noqa: E402
+from util import db_util  # noqa: E402
+from util.db_async import encerrar_executor, executar_db  # noqa: E402
+
+
+def _popular_banco(caminho: str, quantidade: int) -> None:
+    """Cria a tabela de usuários com `quantidade` registros."""
+    db_util.DATABASE_PATH = caminho
+    usuario_repo.criar_tabela()
+    with sqlite3.connect(caminho) as conn:
+        conn.executemany(
+            "INSERT INTO usuario (nome, email, senha, perfil) VALUES (?, ?, 'x', 'Cliente')",
+            ((f"Usuario {i}", f"usuario{i}@example.com") for i in range(quantidade)),
+        )
+
+
+def _percentil(amostras: list[float], p: int) -> float:
+    """Percentil p (1-99) das amostras."""
+    if len(amostras) < 2:
+        return amostras[0] if amostras else 0.0
+    return statistics.quantiles(amostras, n=100, method="inclusive")[p - 1]
+
+
+async def _rodar(modo: str, segundos: float, buscas: int, leves: int) -> dict:
+    fim = time.perf_counter() + segundos
+    latencias_leves: list[float] = []
+    latencias_buscas: list[float] = []
+
+    async def busca():
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            if modo == "executor":
+                await executar_db(usuario_repo.buscar_por_termo, "inexistente", limit=10)
+            else:
+                usuario_repo.buscar_por_termo("inexistente", limit=10)
+                await asyncio.sleep(0)
+            latencias_buscas.append(time.perf_counter() - inicio)
+
+    async def leve():
+        # Pede para acordar em 5 ms; o atraso além disso é tempo em que o
+        # event loop esteve ocupado (bloqueado) e não pôde atendê-la.
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            await asyncio.sleep(0.005)
+            latencias_leves.append(time.perf_counter() - inicio - 0.005)
+
+    await asyncio.gather(*[busca() for _ in range(buscas)], *[leve() for _ in range(leves)])
+
+    return {
+        "leve_p50": _percentil(latencias_leves, 50) * 1000,
+        "leve_p99": _percentil(latencias_leves, 99) * 1000,
+        "busca_p50": _percentil(latencias_buscas, 50) * 1000,
+        "busca_p99": _percentil(latencias_buscas, 99) * 1000,
+        "buscas_s": len(latencias_buscas) / segundos,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuarios", type=int, default=20000)
+    parser.add_argument("--buscas", type=int, default=4, help="corrotinas fazendo buscas")
+    parser.add_argument("--leves", type=int, default=20, help="corrotinas leves medindo latência")
+    parser.add_argument("--segundos", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _popular_banco(os.path.join(temp_dir, "bench.db"), args.usuarios)
+
+        print(
+            f"Usuários: {args.usuarios} | Buscas: {args.buscas} | "
+            f"Leves: {args.leves} | Duração: {args.segundos}s"
+        )
+        for modo in ("bloqueante", "executor"):
+            r = asyncio.run(_rodar(modo, args.segundos, args.buscas, args.leves))
+            print(
+                f"  {modo:<10} leves p50 {r['leve_p50']:7.2f} ms  p99 {r['leve_p99']:7.2f} ms | "
+                f"buscas p50 {r['busca_p50']:7.2f} ms  p99 {r['busca_p99']:7.2f} ms | "
+                f"{r['buscas_s']:7.0f} buscas/s"
+            )
+
+        encerrar_executor()
+        db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
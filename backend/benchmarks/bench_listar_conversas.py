@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark da listagem de conversas do chat (GET /api/chat/conversas).
+
+Compara o carregamento antigo (N+1: para cada participação, busca sala,
+participantes, outro usuário, última mensagem e não lidas, depois ordena e
+pagina em Python) com chat_sala_repo.listar_conversas_por_usuario, que
+resolve a página inteira em uma única consulta.
+
+Uso:
+    python benchmarks/bench_listar_conversas.py
+    python benchmarks/bench_listar_conversas.py --salas 10 100 1000 --mensagens 20 --repeticoes 20
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from repo import (  # noqa: E402
+    chat_mensagem_repo,
+    chat_participante_repo,
+    chat_sala_repo,
+    usuario_repo,
+)
+from sql import indices_sql  # noqa: E402
+from util import db_util  # noqa: E402
+
+LIMIT = 12
+
+
+def _popular_banco(caminho: str, salas: int, mensagens_por_sala: int) -> int:
+    """Cria um usuário com `salas` conversas; retorna o ID desse usuário."""
+    db_util.DATABASE_PATH = caminho
+    usuario_repo.criar_tabela()
+    chat_sala_repo.criar_tabela()
+    chat_participante_repo.criar_tabela()
+    chat_mensagem_repo.criar_tabela()
+
+    base = datetime(2025, 1, 1)
+    with sqlite3.connect(caminho) as conn:
+        conn.execute(indices_sql.CRIAR_INDICE_CHAT_MENSAGEM_SALA_ID)
+        conn.execute(indices_sql.CRIAR_INDICE_CHAT_PARTICIPANTE_USUARIO)
+        conn.executemany(
+            "INSERT INTO usuario (id, nome, email, senha, perfil) VALUES (?, ?, ?, 'x', 'Cliente')",
+            ((i, f"Usuario {i}", f"usuario{i}@example.com") for i in range(1, salas + 2)),
+        )
+        for outro_id in range(2, salas + 2):
+            sala_id = chat_sala_repo.gerar_sala_id(1, outro_id)
+            atividade = (base + timedelta(minutes=outro_id)).strftime("%Y-%m-%d %H:%M:%S")
+            conn.execute("INSERT INTO chat_sala VALUES (?, ?, ?)", (sala_id, atividade, atividade))
+            conn.executemany(
+                "INSERT INTO chat_participante (sala_id, usuario_id, ultima_leitura) VALUES (?, ?, NULL)",
+                ((sala_id, 1), (sala_id, outro_id)),
+            )
+            conn.executemany(
+                "INSERT INTO chat_mensagem (sala_id, usuario_id, mensagem, data_envio) VALUES (?, ?, ?, ?)",
+                (
+                    (sala_id, outro_id if j % 2 else 1, f"Mensagem {j}", atividade)
+                    for j in range(mensagens_por_sala)
+                ),
+            )
+    return 1
+
+
+def _listar_n_mais_1(usuario_id: int) -> list:
+    """Reproduz a listagem anterior (5 consultas por sala + ordenação em Python)."""
+    conversas = []
+    for participacao in chat_participante_repo.listar_por_usuario(usuario_id):
+        sala = chat_sala_repo.obter_por_id(participacao.sala_id)
+        participantes = chat_participante_repo.listar_por_sala(sala.id)
+        outro = next(p for p in participantes if p.usuario_id != usuario_id)
+        outro_usuario = usuario_repo.obter_por_id(outro.usuario_id)
+        ultima = chat_mensagem_repo.obter_ultima_mensagem_sala(sala.id)
+        nao_lidas = chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario_id)
+        conversas.append((sala, outro_usuario, ultima, nao_lidas))
+    minimo = datetime.min.replace(tzinfo=timezone.utc)
+    conversas.sort(key=lambda c: c[0].ultima_atividade or minimo, reverse=True)
+    return conversas[:LIMIT]
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    """Tempo médio (ms) de `repeticoes` execuções."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--salas", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--mensagens", type=int, default=20, help="mensagens por sala")
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"Página: {LIMIT} conversas | Mensagens por sala: {args.mensagens}")
+    for salas in args.salas:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            usuario_id = _popular_banco(os.path.join(temp_dir, "bench.db"), salas, args.mensagens)
+
+            antigo = _medir(lambda: _listar_n_mais_1(usuario_id), args.repeticoes)
+            novo = _medir(
+                lambda: chat_sala_repo.listar_conversas_por_usuario(usuario_id, LIMIT, 0),
+                args.repeticoes,
+            )
+            print(
+                f"  {salas:>5} salas: N+1 {antigo:9.2f} ms | consulta única {novo:8.2f} ms | "
+                f"ganho {antigo / novo:6.1f}x"
+            )
+            db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
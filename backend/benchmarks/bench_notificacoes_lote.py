@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark do envio da mesma notificação a muitos usuários.
+
+Compara, para N destinatários (padrão 100 mil usuários do perfil Cliente):
+
+  - individual:  criar_notificacao em laço (uma conexão do pool e um commit
+                 por notificação); medido numa amostra e extrapolado para N
+  - executemany: INSERT com executemany numa única transação (referência)
+  - lote ids:    criar_notificacoes_em_lote(usuario_ids=...) — INSERT ... SELECT
+                 com json_each, uma transação por lote
+  - lote perfil: criar_notificacoes_em_lote(perfil=...) — INSERT ... SELECT
+                 direto de usuario, keyset por id, uma transação por lote
+
+Uso:
+    python benchmarks/bench_notificacoes_lote.py
+    python benchmarks/bench_notificacoes_lote.py --usuarios 100000 --amostra 5000 --lote 1000 5000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from model.notificacao_model import TipoNotificacao  # noqa: E402
+from repo import notificacao_repo, usuario_repo  # noqa: E402
+from sql import indices_sql  # noqa: E402
+from sql.notificacao_sql import INSERIR  # noqa: E402
+from util import db_util  # noqa: E402
+from util.db_async import encerrar_executor  # noqa: E402
+from util.notificacao_util import criar_notificacao, criar_notificacoes_em_lote  # noqa: E402
+from util.perfis import Perfil  # noqa: E402
+
+TITULO = "Manutenção programada"
+MENSAGEM = "O sistema ficará indisponível no domingo às 2h."
+
+
+def _popular_banco(caminho: str, usuarios: int) -> list[int]:
+    db_util.DATABASE_PATH = caminho
+    usuario_repo.criar_tabela()
+    notificacao_repo.criar_tabela()
+    with sqlite3.connect(caminho) as conn:
+        conn.execute(indices_sql.CRIAR_INDICE_USUARIO_PERFIL)
+        conn.execute(indices_sql.CRIAR_INDICE_NOTIFICACAO_USUARIO_LIDA_DATA)
+        conn.executemany(
+            "INSERT INTO usuario (id, nome, email, senha, perfil) VALUES (?, ?, ?, 'x', 'Cliente')",
+            ((i, f"Usuario {i}", f"usuario{i}@example.com") for i in range(1, usuarios + 1)),
+        )
+    return list(range(1, usuarios + 1))
+
+
+def _limpar():
+    with db_util.obter_conexao() as conn:
+        conn.execute("DELETE FROM notificacao")
+
+
+def _contar() -> int:
+    with db_util.obter_conexao() as conn:
+        return conn.execute("SELECT COUNT(*) FROM notificacao").fetchone()[0]
+
+
+def _individual(ids: list[int]):
+    for usuario_id in ids:
+        criar_notificacao(usuario_id, TITULO, MENSAGEM)
+
+
+def _executemany(ids: list[int]):
+    with db_util.obter_conexao() as conn:
+        conn.executemany(
+            INSERIR,
+            ((u, TITULO, MENSAGEM, TipoNotificacao.INFO.value, None) for u in ids),
+        )
+
+
+def _medir(funcao, *args, **kwargs) -> float:
+    _limpar()
+    inicio = time.perf_counter()
+    funcao(*args, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuarios", type=int, default=100_000)
+    parser.add_argument("--amostra", type=int, default=5000, help="notificações do modo individual")
+    parser.add_argument("--lote", type=int, nargs="+", default=[1000, 5000], help="usuários por transação")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ids = _popular_banco(os.path.join(temp_dir, "bench.db"), args.usuarios)
+        n = len(ids)
+        print(f"Destinatários: {n}")
+
+        amostra = min(args.amostra, n)
+        segundos = _medir(_individual, ids[:amostra]) * n / amostra
+        print(f"  {'individual':<20} {segundos:8.2f} s  {n / segundos:10.0f} notif/s  (extrapolado de {amostra})")
+
+        cenarios = [("executemany", _executemany, (ids,), {})]
+        for lote in args.lote:
+            cenarios.append((f"lote ids ({lote})", criar_notificacoes_em_lote, (TITULO, MENSAGEM),
+                             {"usuario_ids": ids, "tamanho_lote": lote}))
+            cenarios.append((f"lote perfil ({lote})", criar_notificacoes_em_lote, (TITULO, MENSAGEM),
+                             {"perfil": Perfil.CLIENTE.value, "tamanho_lote": lote}))
+
+        for rotulo, funcao, posicionais, nomeados in cenarios:
+            segundos = _medir(funcao, *posicionais, **nomeados)
+            assert _contar() == n, rotulo
+            print(f"  {rotulo:<20} {segundos:8.2f} s  {n / segundos:10.0f} notif/s")
+
+        encerrar_executor()
+        db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark da paginação do histórico do chat (GET /api/chat/mensagens/{sala_id}).
+
+Compara, para salas com 10 mil, 100 mil e 1 milhão de mensagens, o custo de
+carregar uma janela de 50 mensagens em diferentes profundidades do histórico:
+
+  - offset: chat_mensagem_repo.listar_por_sala (LIMIT/OFFSET)
+  - cursor: chat_mensagem_repo.listar_janela_por_sala (keyset por (sala_id, id))
+
+Uso:
+    python benchmarks/bench_paginacao_mensagens.py
+    python benchmarks/bench_paginacao_mensagens.py --mensagens 10000 100000 --repeticoes 50
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from repo import chat_mensagem_repo  # noqa: E402
+from sql import indices_sql  # noqa: E402
+from util import db_util  # noqa: E402
+
+JANELA = 50
+SALA_ID = "1_2"
+
+
+def _popular_banco(caminho: str, quantidade: int) -> None:
+    """Cria a sala alvo com `quantidade` mensagens e uma sala vizinha menor."""
+    db_util.DATABASE_PATH = caminho
+    chat_mensagem_repo.criar_tabela()
+    with sqlite3.connect(caminho) as conn:
+        conn.execute(indices_sql.CRIAR_INDICE_CHAT_MENSAGEM_SALA_ID)
+        conn.executemany(
+            "INSERT INTO chat_mensagem (sala_id, usuario_id, mensagem, data_envio) "
+            "VALUES (?, ?, 'Mensagem de teste', '2025-01-01 12:00:00')",
+            # Intercala outra sala para o histórico não ficar contíguo no disco
+            ((SALA_ID if i % 4 else "3_4", 1 + i % 2) for i in range(quantidade * 4 // 3)),
+        )
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    """Tempo médio (ms) de `repeticoes` execuções."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensagens", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Janela: {JANELA} mensagens")
+    for quantidade in args.mensagens:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _popular_banco(os.path.join(temp_dir, "bench.db"), quantidade)
+            total = chat_mensagem_repo.contar_por_sala(SALA_ID)
+            with db_util.obter_conexao() as conn:
+                ids = [r[0] for r in conn.execute(
+                    "SELECT id FROM chat_mensagem WHERE sala_id = ? ORDER BY id", (SALA_ID,)
+                )]
+
+            print(f"  {total} mensagens na sala:")
+            for rotulo, fracao in (("recentes", 1.0), ("meio", 0.5), ("mais antigas", 0.0)):
+                # Janela que termina na posição `fim` do histórico (ordem cronológica)
+                fim = max(JANELA, int(total * fracao))
+                offset = fim - JANELA
+                antes_de = ids[fim] if fim < total else None
+
+                tempo_offset = _medir(
+                    lambda: chat_mensagem_repo.listar_por_sala(SALA_ID, JANELA, offset),
+                    args.repeticoes,
+                )
+                tempo_cursor = _medir(
+                    lambda: chat_mensagem_repo.listar_janela_por_sala(SALA_ID, JANELA, antes_de_id=antes_de),
+                    args.repeticoes,
+                )
+                print(
+                    f"    {rotulo:<13} offset {tempo_offset:9.3f} ms | cursor {tempo_cursor:7.3f} ms | "
+                    f"ganho {tempo_offset / tempo_cursor:7.1f}x"
+                )
+            db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos perfis de armazenamento SQLite (util/db_util.PERFIS_ARMAZENAMENTO).
+
+Simula o padrão de uso do chat: várias threads escritoras inserindo mensagens
+curtas (uma transação por mensagem) enquanto threads leitoras consultam as
+últimas mensagens. Para cada perfil mede commits/s, leituras/s e quantos erros
+"database is locked" ocorreram.
+
+Uso:
+    python benchmarks/bench_perfil_armazenamento.py
+    python benchmarks/bench_perfil_armazenamento.py --segundos 10 --escritores 8 --leitores 4
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from util.db_util import PERFIS_ARMAZENAMENTO, PoolConexoes  # noqa: E402
+
+
+def _executar(perfil_nome: str, segundos: float, escritores: int, leitores: int) -> dict:
+    """Roda a carga mista contra um banco novo usando o perfil informado."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        caminho = os.path.join(temp_dir, "bench.db")
+        pool = PoolConexoes(
+            caminho,
+            tamanho_maximo=escritores + leitores,
+            perfil=PERFIS_ARMAZENAMENTO[perfil_nome],
+        )
+        conn = pool.obter()
+        conn.execute(
+            "CREATE TABLE mensagem (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "sala_id TEXT NOT NULL, texto TEXT NOT NULL)"
+        )
+        conn.commit()
+        pool.devolver(conn)
+
+        contadores = {"commits": 0, "leituras": 0, "bloqueios": 0}
+        trava = threading.Lock()
+        fim = time.perf_counter() + segundos
+
+        def escrever(indice: int):
+            commits = bloqueios = 0
+            while time.perf_counter() < fim:
+                conn = pool.obter()
+                try:
+                    conn.execute(
+                        "INSERT INTO mensagem (sala_id, texto) VALUES (?, ?)",
+                        (f"sala_{indice % 4}", "mensagem de teste"),
+                    )
+                    conn.commit()
+                    commits += 1
+                except sqlite3.OperationalError:
+                    bloqueios += 1
+                finally:
+                    pool.devolver(conn)
+            with trava:
+                contadores["commits"] += commits
+                contadores["bloqueios"] += bloqueios
+
+        def ler():
+            leituras = bloqueios = 0
+            while time.perf_counter() < fim:
+                conn = pool.obter()
+                try:
+                    conn.execute(
+                        "SELECT id, texto FROM mensagem WHERE sala_id = ? "
+                        "ORDER BY id DESC LIMIT 50",
+                        ("sala_0",),
+                    ).fetchall()
+                    leituras += 1
+                except sqlite3.OperationalError:
+                    bloqueios += 1
+                finally:
+                    pool.devolver(conn)
+            with trava:
+                contadores["leituras"] += leituras
+                contadores["bloqueios"] += bloqueios
+
+        threads = [threading.Thread(target=escrever, args=(i,)) for i in range(escritores)]
+        threads += [threading.Thread(target=ler) for _ in range(leitores)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        pool.fechar()
+
+    return {
+        "commits_s": contadores["commits"] / segundos,
+        "leituras_s": contadores["leituras"] / segundos,
+        "bloqueios": contadores["bloqueios"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--escritores", type=int, default=4)
+    parser.add_argument("--leitores", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"Duração: {args.segundos}s | Escritores: {args.escritores} | Leitores: {args.leitores}")
+    for nome in ("legado", "seguro", "desempenho"):
+        r = _executar(nome, args.segundos, args.escritores, args.leitores)
+        print(
+            f"  {nome:<11} commits {r['commits_s']:9.0f}/s | "
+            f"leituras {r['leituras_s']:9.0f}/s | bloqueios {r['bloqueios']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
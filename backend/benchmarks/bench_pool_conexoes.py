@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pool de conexões (util/db_util.obter_conexao).
+
+Compara o custo de abrir uma conexão nova por chamada (comportamento antigo:
+connect + registrar_adaptadores + PRAGMA foreign_keys + close) com o checkout
+de uma conexão reutilizada do pool, executando a mesma query trivial.
+
+Uso:
+    python benchmarks/bench_pool_conexoes.py
+    python benchmarks/bench_pool_conexoes.py --iteracoes 20000 --threads 8
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from util import db_util  # noqa: E402
+
+
+def _conexao_sem_pool(caminho: str):
+    """Reproduz o obter_conexao() anterior ao pool (uma conexão por chamada)."""
+    db_util.registrar_adaptadores()
+    conn = sqlite3.connect(caminho, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("SELECT id FROM item WHERE id = 1").fetchone()
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _conexao_com_pool():
+    with db_util.obter_conexao() as conn:
+        conn.execute("SELECT id FROM item WHERE id = 1").fetchone()
+
+
+def _medir(funcao, iteracoes: int, threads: int) -> float:
+    """Executa `funcao` iteracoes vezes divididas entre threads; retorna ops/s."""
+    por_thread = iteracoes // threads
+
+    def trabalho():
+        for _ in range(por_thread):
+            funcao()
+
+    workers = [threading.Thread(target=trabalho) for _ in range(threads)]
+    inicio = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return (por_thread * threads) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iteracoes", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        caminho = os.path.join(temp_dir, "bench.db")
+        with sqlite3.connect(caminho) as conn:
+            conn.execute("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+            conn.execute("INSERT INTO item VALUES (1)")
+
+        db_util.DATABASE_PATH = caminho
+
+        print(f"Iterações: {args.iteracoes} | Threads: {args.threads}")
+        for threads in sorted({1, args.threads}):
+            sem_pool = _medir(lambda: _conexao_sem_pool(caminho), args.iteracoes, threads)
+            com_pool = _medir(_conexao_com_pool, args.iteracoes, threads)
+            print(
+                f"  {threads} thread(s): sem pool {sem_pool:10.0f} ops/s | "
+                f"com pool {com_pool:10.0f} ops/s | ganho {com_pool / sem_pool:5.1f}x"
+            )
+
+        print("Métricas do pool:", db_util.obter_estatisticas_pool())
+        db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark da atualização do badge de notificações: polling x push SSE.
+
+Simula um minuto de tráfego com N usuários com a SPA aberta e conta as
+consultas SQL executadas no banco (trace callback em cada conexão do pool):
+
+  - polling: GET /notificacoes/nao-lidas a cada 30 s por usuário
+             (contar_nao_lidas + obter_nao_lidas)
+  - push:    criar_notificacao publica o novo total no stream SSE
+             (evento "notificacao") e o polling vira rede de segurança
+             a cada 5 min
+
+Nos dois modos são criadas as mesmas notificações no minuto; no modo push
+o benchmark confere que todas chegaram às filas SSE dos destinatários.
+
+Uso:
+    python benchmarks/bench_push_notificacoes.py
+    python benchmarks/bench_push_notificacoes.py --usuarios 1000 --notificacoes 200 --intervalo-seguranca 300
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from repo import notificacao_repo, usuario_repo  # noqa: E402
+from util import db_util  # noqa: E402
+from util.chat_manager import gerenciador_chat  # noqa: E402
+from util.db_async import encerrar_executor  # noqa: E402
+from util.notificacao_util import criar_notificacao  # noqa: E402
+
+INTERVALO_POLLING_ANTIGO = 30
+
+# Consultas executadas no banco (exclui PRAGMAs e controle de transação)
+_consultas = 0
+
+
+def _contar_consulta(sql: str):
+    global _consultas
+    if sql.lstrip()[:6].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        _consultas += 1
+
+
+def _instrumentar_pool():
+    """Registra o trace callback em cada conexão criada pelo pool."""
+    criar_original = db_util.PoolConexoes._criar_conexao
+
+    def criar_conexao(self):
+        conn = criar_original(self)
+        conn.set_trace_callback(_contar_consulta)
+        return conn
+
+    db_util.PoolConexoes._criar_conexao = criar_conexao
+
+
+def _popular_banco(caminho: str, usuarios: int):
+    db_util.DATABASE_PATH = caminho
+    usuario_repo.criar_tabela()
+    notificacao_repo.criar_tabela()
+    with sqlite3.connect(caminho) as conn:
+        conn.executemany(
+            "INSERT INTO usuario (id, nome, email, senha, perfil) VALUES (?, ?, ?, 'x', 'Cliente')",
+            ((i, f"Usuario {i}", f"usuario{i}@example.com") for i in range(1, usuarios + 1)),
+        )
+
+
+def _poll(usuario_id: int):
+    """Trabalho de banco de um GET /notificacoes/nao-lidas."""
+    notificacao_repo.contar_nao_lidas(usuario_id)
+    notificacao_repo.obter_nao_lidas(usuario_id, limite=5)
+
+
+def _rodar_polling(usuarios: int, notificacoes: int) -> dict:
+    global _consultas
+    _consultas = 0
+    inicio = time.perf_counter()
+    for i in range(notificacoes):
+        criar_notificacao(i % usuarios + 1, "Aviso", "Mensagem")
+    for _ in range(60 // INTERVALO_POLLING_ANTIGO):
+        for usuario_id in range(1, usuarios + 1):
+            _poll(usuario_id)
+    return {"consultas": _consultas, "segundos": time.perf_counter() - inicio, "entregues": 0}
+
+
+async def _rodar_push(usuarios: int, notificacoes: int, intervalo_seguranca: int) -> dict:
+    global _consultas
+    filas = [await gerenciador_chat.conectar(u) for u in range(1, usuarios + 1)]
+    _consultas = 0
+    inicio = time.perf_counter()
+    for i in range(notificacoes):
+        criar_notificacao(i % usuarios + 1, "Aviso", "Mensagem")
+        # Devolve o event loop entre requisições, como faria o servidor
+        await asyncio.sleep(0)
+    # Polling de segurança: fração dos usuários que consulta neste minuto
+    for usuario_id in range(1, usuarios * 60 // intervalo_seguranca + 1):
+        _poll(usuario_id)
+    duracao = time.perf_counter() - inicio
+    entregues = sum(fila.qsize() for fila in filas)
+    for u in range(1, usuarios + 1):
+        await gerenciador_chat.desconectar(u)
+    return {"consultas": _consultas, "segundos": duracao, "entregues": entregues}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuarios", type=int, default=1000, help="usuários com a SPA aberta")
+    parser.add_argument("--notificacoes", type=int, default=100, help="notificações criadas por minuto")
+    parser.add_argument("--intervalo-seguranca", type=int, default=300, help="polling de segurança (s)")
+    args = parser.parse_args()
+
+    _instrumentar_pool()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _popular_banco(os.path.join(temp_dir, "bench.db"), args.usuarios)
+
+        print(f"Usuários: {args.usuarios} | Notificações/min: {args.notificacoes}")
+        polling = _rodar_polling(args.usuarios, args.notificacoes)
+        push = asyncio.run(_rodar_push(args.usuarios, args.notificacoes, args.intervalo_seguranca))
+
+        for rotulo, r in (
+            (f"polling {INTERVALO_POLLING_ANTIGO}s", polling),
+            (f"push + {args.intervalo_seguranca}s", push),
+        ):
+            print(
+                f"  {rotulo:<12} {r['consultas']:7d} consultas/min | "
+                f"{r['segundos'] * 1000:8.1f} ms de banco/min | "
+                f"{r['entregues']:5d} eventos SSE"
+            )
+        economia = polling["consultas"] - push["consultas"]
+        print(f"  Economia: {economia} consultas/min ({economia / max(polling['consultas'], 1):.0%})")
+
+        encerrar_executor()
+        db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark do RateLimiter: GCRA x janela deslizante.
+
+Para N identificadores distintos (padrão 10 mil e 100 mil IPs), mede:
+
+  - verificar:  tempo médio por chamada em rodadas sobre todos os IPs
+                (cada rodada = uma tentativa por IP)
+  - consultas:  obter_tentativas_restantes + obter_tempo_reset por IP
+  - memória:    bytes alocados pelo estado do limiter (tracemalloc)
+
+O GCRA guarda um float por IP; a janela deslizante guarda uma lista com o
+instante de cada tentativa (até max_tentativas por IP).
+
+Uso:
+    python benchmarks/bench_rate_limiter.py
+    python benchmarks/bench_rate_limiter.py --ips 10000 100000 --rodadas 5 --max-tentativas 20
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from util.rate_limiter import ALGORITMOS, RateLimiter  # noqa: E402
+
+
+def _preencher(algoritmo: str, ips: list[str], rodadas: int, max_tentativas: int) -> tuple[RateLimiter, float]:
+    limiter = RateLimiter(max_tentativas=max_tentativas, janela_minutos=60, nome=algoritmo, algoritmo=algoritmo)
+    inicio = time.perf_counter()
+    for _ in range(rodadas):
+        for ip in ips:
+            limiter.verificar(ip)
+    return limiter, time.perf_counter() - inicio
+
+
+def _medir(algoritmo: str, ips: list[str], rodadas: int, max_tentativas: int) -> dict:
+    # Memória numa execução à parte: o tracemalloc distorce os tempos
+    tracemalloc.start()
+    limiter, _ = _preencher(algoritmo, ips, rodadas, max_tentativas)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del limiter
+
+    limiter, verificar = _preencher(algoritmo, ips, rodadas, max_tentativas)
+
+    inicio = time.perf_counter()
+    for ip in ips:
+        limiter.obter_tentativas_restantes(ip)
+        limiter.obter_tempo_reset(ip)
+    consultas = time.perf_counter() - inicio
+
+    assert limiter.obter_tentativas_restantes(ips[0]) == max(0, max_tentativas - rodadas)
+    return {
+        "verificar_ns": verificar / (rodadas * len(ips)) * 1e9,
+        "consultas_ns": consultas / len(ips) * 1e9,
+        "memoria": memoria,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ips", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--rodadas", type=int, default=5, help="tentativas por IP")
+    parser.add_argument("--max-tentativas", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Tentativas por IP: {args.rodadas} | max_tentativas: {args.max_tentativas}")
+    for n in args.ips:
+        ips = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(n)]
+        print(f"IPs distintos: {n}")
+        for algoritmo in ALGORITMOS:
+            r = _medir(algoritmo, ips, args.rodadas, args.max_tentativas)
+            print(
+                f"  {algoritmo:<18} verificar {r['verificar_ns']:7.0f} ns | "
+                f"restantes+reset {r['consultas_ns']:7.0f} ns | "
+                f"estado {r['memoria'] / 2**20:7.1f} MiB ({r['memoria'] / n:5.0f} B/IP)"
+            )
+
+
+if __name__ == "__main__":
+    main()
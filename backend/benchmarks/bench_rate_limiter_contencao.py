@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark de contenção do DynamicRateLimiter com muitas threads.
+
+Cada thread faz verificações em IPs próprios no mesmo limiter (como as
+threads do executor e do event loop de um worker), em dois modos:
+
+  - leitura sempre:   relê max/janela do ConfigCache a cada verificar
+                      (duas chamadas a config.obter_int, cada uma tomando o
+                      RLock global do cache) — comportamento anterior
+  - versão do config: compara ConfigCache.obter_versao() com a versão lida
+                      por último e só relê quando ela muda (limpar/limpar_chave)
+
+Mostra o total de verificações por segundo e quantas vezes o RLock do
+ConfigCache foi adquirido.
+
+Uso:
+    python benchmarks/bench_rate_limiter_contencao.py
+    python benchmarks/bench_rate_limiter_contencao.py --threads 1 4 16 64 --verificacoes 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from repo import configuracao_repo  # noqa: E402
+from util import db_util  # noqa: E402
+from util.config_cache import ConfigCache  # noqa: E402
+from util.rate_limiter import DynamicRateLimiter  # noqa: E402
+
+
+class _LimiterLeituraSempre(DynamicRateLimiter):
+    """Relê o config a cada chamada, como antes da versão do ConfigCache."""
+
+    def _atualizar_valores(self) -> None:
+        self._versao_config = -1
+        super()._atualizar_valores()
+
+
+class _LockContado:
+    """RLock que conta as aquisições (substitui ConfigCache._lock)."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.aquisicoes = 0
+
+    def __enter__(self):
+        self._lock.acquire()
+        self.aquisicoes += 1
+        return self
+
+    def __exit__(self, *args):
+        self._lock.release()
+
+
+def _rodar(classe, threads: int, verificacoes: int) -> tuple[float, int]:
+    limiter = classe(
+        chave_max="rate_limit_bench_max",
+        chave_minutos="rate_limit_bench_minutos",
+        padrao_max=1_000_000,
+        padrao_minutos=1,
+        nome=f"bench_{classe.__name__}",
+    )
+    lock = ConfigCache._lock = _LockContado()
+    barreira = threading.Barrier(threads + 1)
+
+    def trabalhar(indice: int):
+        ips = [f"10.{indice}.{i >> 8 & 255}.{i & 255}" for i in range(256)]
+        barreira.wait()
+        for i in range(verificacoes):
+            limiter.verificar(ips[i & 255])
+
+    pool = [threading.Thread(target=trabalhar, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - inicio, lock.aquisicoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--verificacoes", type=int, default=20_000, help="verificações por thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_util.DATABASE_PATH = os.path.join(temp_dir, "bench.db")
+        configuracao_repo.criar_tabela()
+        lock_original = ConfigCache._lock
+
+        print(f"Verificações por thread: {args.verificacoes}")
+        for threads in args.threads:
+            total = threads * args.verificacoes
+            for rotulo, classe in (("leitura sempre", _LimiterLeituraSempre), ("versão do config", DynamicRateLimiter)):
+                segundos, aquisicoes = _rodar(classe, threads, args.verificacoes)
+                print(
+                    f"  {threads:3d} threads  {rotulo:<17} {total / segundos:10.0f} verificações/s | "
+                    f"{aquisicoes:8d} aquisições do lock"
+                )
+
+        ConfigCache._lock = lock_original
+        db_util.fechar_pool()
+
+
+if __name__ == "__main__":
+    main()
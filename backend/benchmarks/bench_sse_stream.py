@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark do stream SSE do chat (GET /api/chat/stream) por conexão.
+
+Um produtor enfileira eventos para um usuário (rajadas de mensagens
+intercaladas com atualizações de contador, como ao marcar salas como lidas)
+enquanto o stream os consome. Compara:
+
+  - antigo: um evento por chunk + asyncio.sleep(0.1) após cada evento
+  - lote:   util/chat_manager.fluxo_sse (drena, coalesce e escreve em lote)
+
+Para cada modo imprime eventos consumidos da fila por segundo, chunks
+escritos, bytes e o backlog restante na fila ao final.
+
+Uso:
+    python benchmarks/bench_sse_stream.py
+    python benchmarks/bench_sse_stream.py --taxa 2000 --segundos 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Raiz do projeto = pasta pai de benchmarks/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("RUNNING_MODE", "Development")
+
+from util.chat_manager import fluxo_sse  # noqa: E402
+
+
+async def _fluxo_antigo(fila: asyncio.Queue):
+    """Laço anterior de stream_mensagens."""
+    while True:
+        evento = await fila.get()
+        yield f"data: {json.dumps(evento)}\n\n"
+        await asyncio.sleep(0.1)
+
+
+async def _rodar(modo: str, taxa: int, segundos: float) -> dict:
+    fila: asyncio.Queue = asyncio.Queue()
+    fluxo = _fluxo_antigo(fila) if modo == "antigo" else fluxo_sse(fila)
+    fim = time.perf_counter() + segundos
+    produzidos = 0
+
+    async def produtor():
+        nonlocal produzidos
+        # Rajadas a cada 10 ms: mensagens de 4 salas + contador repetido
+        por_rajada = max(1, taxa // 100)
+        while time.perf_counter() < fim:
+            for i in range(por_rajada):
+                sala = f"1_{2 + i % 4}"
+                if i % 2:
+                    fila.put_nowait({"tipo": "atualizar_contador", "sala_id": sala})
+                else:
+                    fila.put_nowait({"tipo": "nova_mensagem", "sala_id": sala, "mensagem": {"id": produzidos}})
+                produzidos += 1
+            await asyncio.sleep(0.01)
+
+    chunks = 0
+    tamanho = 0
+
+    async def consumidor():
+        nonlocal chunks, tamanho
+        async for chunk in fluxo:
+            chunks += 1
+            tamanho += len(chunk)
+            if time.perf_counter() >= fim:
+                break
+
+    await asyncio.gather(produtor(), consumidor())
+    await fluxo.aclose()
+
+    consumidos = produzidos - fila.qsize()
+    return {
+        "eventos_s": consumidos / segundos,
+        "chunks": chunks,
+        "kb": tamanho / 1024,
+        "backlog": fila.qsize(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taxa", type=int, default=1000, help="eventos produzidos por segundo")
+    parser.add_argument("--segundos", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"Taxa: {args.taxa} eventos/s | Duração: {args.segundos}s")
+    for modo in ("antigo", "lote"):
+        r = asyncio.run(_rodar(modo, args.taxa, args.segundos))
+        print(
+            f"  {modo:<7} {r['eventos_s']:9.0f} eventos/s | {r['chunks']:6d} chunks | "
+            f"{r['kb']:8.1f} KB | backlog {r['backlog']:6d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from dtos.validators import (
+    validar_string_obrigatoria,
+    validar_tipo,
+)
+from model.notificacao_model import TipoNotificacao
+from util.perfis import Perfil
+
+# Máximo de IDs aceitos em um envio por lista (para perfis inteiros, use perfil)
+MAX_USUARIOS_POR_ENVIO = 100_000
+
+
+class EnviarNotificacaoLoteDTO(BaseModel):
+    """DTO para envio da mesma notificação a vários usuários (admin)."""
+
+    titulo: str = Field(..., description="Título curto da notificação")
+    mensagem: str = Field(..., description="Texto da notificação")
+    tipo: str = Field(default="info", description="Tipo visual: info, sucesso, aviso, erro")
+    url_acao: Optional[str] = Field(
+        default=None, description="URL para onde o usuário vai ao clicar"
+    )
+    usuario_ids: Optional[list[int]] = Field(
+        default=None,
+        description="IDs dos destinatários (informe este OU perfil)",
+        max_length=MAX_USUARIOS_POR_ENVIO,
+    )
+    perfil: Optional[str] = Field(
+        default=None, description="Perfil cujos usuários serão todos notificados"
+    )
+
+    _validar_titulo = field_validator("titulo")(
+        validar_string_obrigatoria(nome_campo="Título", tamanho_minimo=3, tamanho_maximo=200)
+    )
+
+    _validar_mensagem = field_validator("mensagem")(
+        validar_string_obrigatoria(nome_campo="Mensagem", tamanho_minimo=3, tamanho_maximo=2000)
+    )
+
+    _validar_tipo = field_validator("tipo")(validar_tipo("Tipo", TipoNotificacao))
+
+    @field_validator("perfil")
+    @classmethod
+    def _validar_perfil(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        return validar_tipo("Perfil", Perfil)(cls, v)
+
+    @model_validator(mode="after")
+    def _validar_destinatarios(self) -> "EnviarNotificacaoLoteDTO":
+        if (self.usuario_ids is None) == (self.perfil is None):
+            raise ValueError("Informe usuario_ids ou perfil (apenas um dos dois).")
+        if self.usuario_ids is not None and not self.usuario_ids:
+            raise ValueError("Informe ao menos um destinatário.")
+        return self
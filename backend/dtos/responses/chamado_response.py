@@ -60,6 +60,14 @@ class ChamadoResponse(BaseModel):
     usuario_email: Optional[str] = None
     mensagens_nao_lidas: int = 0
     tem_resposta_admin: bool = False
+    trecho_busca: Optional[str] = Field(
+        default=None,
+        description=(
+            "Trecho do título ou de uma mensagem que casou com a busca, com os "
+            "termos entre <mark> e </mark> (presente apenas na listagem com q; texto "
+            "sem escapar HTML)"
+        ),
+    )
     interacoes: Optional[list[ChamadoInteracaoResponse]] = Field(
         default=None,
         description="Histórico de interações (presente apenas no detalhe)",
@@ -88,6 +96,7 @@ class ChamadoResponse(BaseModel):
             usuario_email=chamado.usuario_email,
             mensagens_nao_lidas=chamado.mensagens_nao_lidas,
             tem_resposta_admin=chamado.tem_resposta_admin,
+            trecho_busca=chamado.trecho_busca,
             interacoes=(
                 [ChamadoInteracaoResponse.de_interacao(i) for i in interacoes]
                 if interacoes is not None
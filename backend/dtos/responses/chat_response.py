@@ -1,9 +1,10 @@
 """Schemas de resposta do módulo de chat (mensageria 1-a-1 via SSE)."""
 from datetime import datetime
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from model.chat_conversa_model import ChatConversa
 from model.chat_mensagem_model import ChatMensagem
 from model.chat_sala_model import ChatSala
 from model.usuario_model import Usuario
@@ -63,6 +64,18 @@ class ChatMensagemResponse(BaseModel):
         )
 
 
+class ChatMensagensCursorResponse(BaseModel):
+    """Janela de mensagens de uma sala na paginação por cursor (keyset)."""
+
+    items: List[ChatMensagemResponse] = Field(
+        default_factory=list, description="Mensagens da janela, em ordem cronológica"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor opaco para a próxima janela na mesma direção (None se não houver mais)",
+    )
+
+
 class UltimaMensagemResponse(BaseModel):
     """Resumo da última mensagem exibido na lista de conversas."""
 
@@ -114,6 +127,26 @@ class ConversaResponse(BaseModel):
             ultima_atividade=sala.ultima_atividade,
         )
 
+    @classmethod
+    def de_conversa(cls, conversa: ChatConversa) -> "ConversaResponse":
+        """Constrói o response a partir do resumo agregado da conversa."""
+        return cls(
+            sala_id=conversa.sala.id,
+            outro_usuario=UsuarioBuscaResponse(
+                id=conversa.outro_usuario_id,
+                nome=conversa.outro_usuario_nome,
+                email=conversa.outro_usuario_email,
+                foto_url=obter_caminho_foto_usuario(conversa.outro_usuario_id),
+            ),
+            ultima_mensagem=(
+                UltimaMensagemResponse.de_mensagem(conversa.ultima_mensagem)
+                if conversa.ultima_mensagem
+                else None
+            ),
+            nao_lidas=conversa.nao_lidas,
+            ultima_atividade=conversa.sala.ultima_atividade,
+        )
+
 
 class EventoNovaMensagemSSE(BaseModel):
     """Evento SSE emitido quando uma nova mensagem é enviada em uma sala.
@@ -139,6 +172,17 @@ class EventoAtualizarContadorSSE(BaseModel):
     sala_id: str = Field(..., description="Identificador da sala afetada")
 
 
+class EventoRessincronizarSSE(BaseModel):
+    """Evento SSE emitido na reconexão quando os eventos perdidos não estão
+    mais no buffer de replay (``Last-Event-ID`` antigo demais ou de outro
+    worker). Sinaliza ao cliente para recarregar conversas e mensagens.
+
+    Gerado em ``util/chat_manager.EVENTO_RESSINCRONIZAR``.
+    """
+
+    tipo: Literal["ressincronizar"] = "ressincronizar"
+
+
 class TotalNaoLidasResponse(BaseModel):
     """Total de mensagens não lidas em todas as salas do usuário."""
 
@@ -146,8 +190,18 @@ class TotalNaoLidasResponse(BaseModel):
 
 
 class ChatHealthResponse(BaseModel):
-    """Status do subsistema de chat (conexões SSE ativas)."""
+    """Status do subsistema de chat (conexões SSE ativas e atraso das filas)."""
 
     status: str = Field(..., description="Estado do serviço de chat")
     conexoes_ativas: int = Field(..., description="Quantidade de conexões SSE ativas")
+    eventos_pendentes: int = Field(0, description="Eventos aguardando envio em todas as filas SSE")
+    atraso_maximo_segundos: float = Field(
+        0.0, description="Idade do evento pendente mais antigo entre todas as conexões"
+    )
+    eventos_descartados: int = Field(
+        0, description="Eventos descartados por filas cheias (consumidores lentos)"
+    )
+    desconectados_por_lentidao: int = Field(
+        0, description="Conexões encerradas pela política de fila 'desconectar'"
+    )
     timestamp: datetime = Field(..., description="Momento da verificação")
@@ -83,3 +83,29 @@ class SalvarConfigResultadoResponse(BaseModel):
         description="Chaves enviadas que não existem no banco (ignoradas)",
     )
     message: str = Field(..., description="Mensagem legível do resultado")
+
+
+class ConfigCacheEstatisticasResponse(BaseModel):
+    """Contadores e estado do cache de configurações neste worker (admin)."""
+
+    acertos: int = Field(..., description="Leituras de chaves presentes no snapshot")
+    ausentes: int = Field(..., description="Leituras de chaves ausentes (retornaram o padrão)")
+    leituras: int
+    taxa_acerto: float = Field(..., description="acertos / leituras")
+    cargas: int = Field(..., description="Cargas em que a leitura esperou pelo banco")
+    revalidacoes: int = Field(..., description="Consultas à versão em segundo plano")
+    recargas: int = Field(..., description="Revalidações que recarregaram o snapshot")
+    erros: int = Field(..., description="Falhas do banco ao carregar ou revalidar")
+    leituras_obsoletas: int = Field(..., description="Leituras servidas durante uma revalidação")
+    leituras_em_erro: int = Field(..., description="Leituras servidas com o erro em cache")
+    chaves: int = Field(..., description="Configurações no snapshot")
+    carregado: bool
+    idade_snapshot_segundos: Optional[float] = None
+    versao_banco: int
+    versao_local: int
+    revalidando: bool
+    em_erro: bool
+    ultimo_erro: Optional[str] = None
+    verificacao_ms: int
+    ttl_segundos: int
+    erro_ttl_ms: int
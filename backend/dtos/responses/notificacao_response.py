@@ -1,11 +1,14 @@
 """Schemas de resposta do módulo de notificações in-app."""
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Literal, Optional
 
 from pydantic import BaseModel, Field
 
 from model.notificacao_model import Notificacao
 
+if TYPE_CHECKING:
+    from util.notificacao_util import EnvioLote
+
 
 class NotificacaoResponse(BaseModel):
     """Representação pública de uma notificação."""
@@ -64,3 +67,87 @@ class NaoLidasResponse(BaseModel):
     items: list[NotificacaoResumoResponse] = Field(
         default_factory=list, description="Últimas notificações não lidas (resumo)"
     )
+
+
+class EventoNotificacaoSSE(BaseModel):
+    """Evento SSE emitido quando as notificações não lidas do usuário mudam.
+
+    Enviado pelo stream ``GET /chat/stream`` ao criar uma notificação (com o
+    resumo dela) e ao marcar/excluir notificações (só com o novo total). O
+    frontend atualiza o badge sem consultar ``/notificacoes/nao-lidas``.
+    Gerado em ``util/notificacao_util.publicar_nao_lidas``.
+    """
+
+    tipo: Literal["notificacao"] = "notificacao"
+    nao_lidas: int = Field(..., description="Total atualizado de notificações não lidas")
+    notificacao: Optional[NotificacaoResumoResponse] = Field(
+        None, description="Notificação recém-criada (ausente em marcar/excluir)"
+    )
+
+
+class EventoNotificacaoLoteSSE(BaseModel):
+    """Evento SSE emitido aos destinatários de um envio de notificações em lote.
+
+    Um único evento por lote (o mesmo para todos os destinatários), sem
+    consultar a contagem de cada usuário: o frontend soma ``incremento`` ao
+    badge. Gerado em ``util/notificacao_util.criar_notificacoes_em_lote``.
+    """
+
+    tipo: Literal["notificacao_lote"] = "notificacao_lote"
+    incremento: int = Field(1, description="Notificações não lidas acrescentadas a cada destinatário")
+
+
+class EnvioLoteResponse(BaseModel):
+    """Progresso de um envio de notificações em lote (admin)."""
+
+    id: str = Field(..., description="Identificador do envio")
+    status: str = Field(..., description="em_andamento, concluido, interrompido ou erro")
+    total: int = Field(..., description="Destinatários previstos")
+    criadas: int = Field(..., description="Notificações criadas até agora")
+    percentual: float = Field(..., description="Progresso de 0 a 100")
+    erro: Optional[str] = None
+    iniciado_em: datetime
+    concluido_em: Optional[datetime] = None
+
+    @classmethod
+    def de_envio(cls, envio: "EnvioLote") -> "EnvioLoteResponse":
+        """Constrói o response a partir do estado do envio (util)."""
+        return cls(
+            id=envio.id,
+            status=envio.status,
+            total=envio.total,
+            criadas=envio.criadas,
+            percentual=envio.percentual,
+            erro=envio.erro,
+            iniciado_em=envio.iniciado_em,
+            concluido_em=envio.concluido_em,
+        )
+
+
+class ExecucaoRetencaoResponse(BaseModel):
+    """Resultado de uma execução da retenção de notificações."""
+
+    removidas: int = Field(..., description="Notificações removidas")
+    arquivadas: int = Field(..., description="Notificações gravadas em notificacao_arquivo")
+    lotes: int = Field(..., description="Transações de exclusão executadas")
+    removidas_por_tipo: dict[str, int] = Field(default_factory=dict)
+    duracao_segundos: float
+    executada_em: datetime
+
+
+class RetencaoNotificacoesResponse(BaseModel):
+    """Política vigente e métricas da retenção de notificações (admin)."""
+
+    politica: dict[str, int] = Field(..., description="Dias de retenção por tipo (0 = manter sempre)")
+    arquivar: bool
+    intervalo_horas: float = Field(..., description="Intervalo do job agendado (0 = desligado)")
+    agendada: bool = Field(..., description="Se o job está agendado neste worker")
+    em_execucao: bool
+    execucoes: int = Field(..., description="Execuções desde o início do worker")
+    removidas_total: int
+    arquivadas_total: int
+    removidas_por_tipo: dict[str, int] = Field(default_factory=dict)
+    ultima_execucao: Optional[ExecucaoRetencaoResponse] = None
+    arquivo: dict[str, int] = Field(
+        default_factory=dict, description="Lotes, notificações e bytes em notificacao_arquivo"
+    )
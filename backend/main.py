@@ -30,6 +30,7 @@ from repo import (
     chamado_interacao_repo,
     indices_repo,
     notificacao_repo,
+    notificacao_arquivo_repo,
     auditoria_repo,
     pagamento_repo,
 )
@@ -47,10 +48,24 @@ from routes.pagamento_routes import router as pagamento_router
 from routes.admin_pagamentos_routes import router as admin_pagamentos_router
 from routes.admin_backups_routes import router as admin_backups_router
 from routes.admin_usuarios_routes import router as admin_usuarios_router
+from routes.admin_notificacoes_routes import router as admin_notificacoes_router
 
 # Seeds
 from util.seed_data import inicializar_dados
 
+# Pool de conexões do banco
+from util.db_util import (
+    fechar_pool,
+    obter_estatisticas_pool,
+    obter_perfil_ativo,
+    verificar_perfil_armazenamento,
+)
+from util.db_async import encerrar_executor, obter_estatisticas_executor
+from util.chat_manager import gerenciador_chat
+from util.notificacao_retencao import agendador_retencao
+from util.notificacao_util import encerrar_envios_lote
+from util.rate_limiter import registro_limiters
+
 # CSRF Protection
 from util.csrf_protection import MiddlewareProtecaoCSRF
 
@@ -102,10 +117,17 @@ TABELAS = [
     (chat_participante_repo, "chat_participante"),
     (chat_mensagem_repo, "chat_mensagem"),
     (notificacao_repo, "notificacao"),
+    (notificacao_arquivo_repo, "notificacao_arquivo"),
     (auditoria_repo, "auditoria"),
     (pagamento_repo, "pagamento"),
 ]
 
+# Aplicar/conferir o perfil de armazenamento (WAL, synchronous, busy_timeout...)
+try:
+    verificar_perfil_armazenamento()
+except sqlite3.Error as e:
+    logger.error(f"Erro ao verificar perfil de armazenamento: {e}", exc_info=True)
+
 logger.info("Criando tabelas do banco de dados...")
 try:
     for repo, nome in TABELAS:
@@ -126,10 +148,12 @@ try:
     from util.migrar_config import (
         migrar_configs_para_banco,
         garantir_configs_pagamento,
+        garantir_configs_notificacoes,
     )
 
     migrar_configs_para_banco()
     garantir_configs_pagamento()
+    garantir_configs_notificacoes()
 except sqlite3.Error as e:
     logger.error(f"Erro ao migrar configurações: {e}", exc_info=True)
 
@@ -148,6 +172,7 @@ ROUTERS = [
     (admin_pagamentos_router, ["Admin - Pagamentos"], "admin de pagamentos"),
     (admin_backups_router, ["Admin - Backups"], "admin de backups"),
     (admin_usuarios_router, ["Admin - Usuários"], "admin de usuários"),
+    (admin_notificacoes_router, ["Admin - Notificações"], "admin de notificações"),
 ]
 
 for router, tags, nome in ROUTERS:
@@ -157,8 +182,65 @@ for router, tags, nome in ROUTERS:
 
 @app.get("/health", tags=["Infra"])
 async def health_check():
-    """Endpoint de health check."""
-    return {"status": "healthy"}
+    """Endpoint de health check (perfil de armazenamento, pool e executor do banco)."""
+    return {
+        "status": "healthy",
+        "banco": {
+            "perfil": obter_perfil_ativo(),
+            "pool": obter_estatisticas_pool(),
+            "executor": obter_estatisticas_executor(),
+        },
+    }
+
+
+@app.on_event("startup")
+async def iniciar_broadcast_chat():
+    """Inicia o backend de broadcast do chat (consumo de eventos de outros workers)."""
+    await gerenciador_chat.iniciar()
+
+
+@app.on_event("startup")
+async def iniciar_varredura_rate_limiters():
+    """Inicia a remoção periódica dos IPs expirados nos rate limiters."""
+    await registro_limiters.iniciar_varredura()
+
+
+@app.on_event("shutdown")
+async def encerrar_varredura_rate_limiters():
+    """Cancela a varredura dos rate limiters."""
+    await registro_limiters.encerrar_varredura()
+
+
+@app.on_event("startup")
+async def iniciar_retencao_notificacoes():
+    """Agenda a retenção periódica das notificações antigas."""
+    await agendador_retencao.iniciar()
+
+
+@app.on_event("shutdown")
+async def encerrar_retencao_notificacoes():
+    """Cancela a retenção agendada antes de fechar o pool."""
+    await agendador_retencao.encerrar()
+
+
+@app.on_event("shutdown")
+async def encerrar_envios_notificacoes():
+    """Interrompe os envios de notificações em lote antes de fechar o pool."""
+    await encerrar_envios_lote()
+
+
+@app.on_event("shutdown")
+async def encerrar_broadcast_chat():
+    """Encerra o backend de broadcast do chat antes de fechar o pool."""
+    await gerenciador_chat.encerrar()
+
+
+@app.on_event("shutdown")
+def encerrar_pool_conexoes():
+    """Encerra o executor e fecha as conexões do pool ao encerrar a aplicação."""
+    encerrar_executor()
+    fechar_pool()
+    logger.info("Pool de conexões do banco encerrado")
 
 
 # ---------------------------------------------------------------------------
@@ -53,3 +53,5 @@ class Chamado:
     usuario_email: Optional[str] = None
     mensagens_nao_lidas: int = 0
     tem_resposta_admin: bool = False
+    # Trecho que casou com a busca do admin (termos entre <mark> e </mark>)
+    trecho_busca: Optional[str] = None
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from model.chat_mensagem_model import ChatMensagem
+from model.chat_sala_model import ChatSala
+
+
+@dataclass
+class ChatConversa:
+    """
+    Resumo de uma conversa do ponto de vista de um participante.
+
+    Não é uma tabela: é o resultado agregado da listagem de conversas
+    (sala + outro participante + última mensagem + não lidas).
+
+    Attributes:
+        sala: Sala de chat
+        outro_usuario_id: ID do outro participante
+        outro_usuario_nome: Nome do outro participante
+        outro_usuario_email: E-mail do outro participante
+        ultima_mensagem: Última mensagem da sala (None se vazia)
+        nao_lidas: Mensagens do outro participante ainda não lidas
+    """
+    sala: ChatSala
+    outro_usuario_id: int
+    outro_usuario_nome: str
+    outro_usuario_email: str
+    ultima_mensagem: Optional[ChatMensagem] = None
+    nao_lidas: int = 0
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class ChatEvento:
+    """
+    Evento do chat publicado no log compartilhado entre workers.
+
+    Attributes:
+        id: ID sequencial do evento (ordem de publicação)
+        origem: Identificador do worker que publicou o evento
+        destinatarios: IDs dos usuários que devem receber o evento
+        payload: Evento SSE (dicionário já pronto para serialização)
+    """
+    id: int
+    origem: str
+    destinatarios: List[int]
+    payload: dict
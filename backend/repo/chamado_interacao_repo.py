@@ -1,8 +1,13 @@
+import json
 import sqlite3
 from typing import Optional
 from model.chamado_interacao_model import ChamadoInteracao, TipoInteracao
 from sql.chamado_interacao_sql import (
     CRIAR_TABELA,
+    CRIAR_TABELA_BUSCA,
+    EXISTE_TABELA_BUSCA,
+    RECONSTRUIR_BUSCA,
+    CRIAR_TRIGGERS_BUSCA,
     INSERIR,
     OBTER_POR_CHAMADO,
     OBTER_POR_ID,
@@ -10,6 +15,7 @@ from sql.chamado_interacao_sql import (
     EXCLUIR_POR_CHAMADO,
     MARCAR_COMO_LIDAS,
     CONTAR_NAO_LIDAS_POR_CHAMADO,
+    CONTAR_NAO_LIDAS_POR_CHAMADOS,
     TEM_RESPOSTA_ADMIN,
 )
 from util.db_util import obter_conexao
@@ -48,12 +54,23 @@ def criar_tabela() -> bool:
     """
     Cria a tabela de interações de chamados no banco de dados se não existir.
 
+    Também cria o índice FTS5 das mensagens (chamado_interacao_busca) e os
+    triggers que o mantêm atualizado.
+
     Returns:
         True se operação foi bem sucedida
     """
     with obter_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+
+        # Num banco que já tinha mensagens, indexa as existentes
+        indice_novo = cursor.execute(EXISTE_TABELA_BUSCA).fetchone() is None
+        cursor.execute(CRIAR_TABELA_BUSCA)
+        for trigger in CRIAR_TRIGGERS_BUSCA:
+            cursor.execute(trigger)
+        if indice_novo:
+            cursor.execute(RECONSTRUIR_BUSCA)
         return True
 
 
@@ -199,6 +216,31 @@ def obter_contador_nao_lidas(usuario_id: int) -> dict[int, int]:
         return resultado
 
 
+def obter_contador_nao_lidas_por_chamados(
+    chamado_ids: list[int], usuario_id: int
+) -> dict[int, int]:
+    """
+    Como obter_contador_nao_lidas, mas só para os chamados informados.
+
+    Usado pelas listagens paginadas: conta pelo índice de chamado_id apenas
+    as interações dos chamados da página, em vez de agrupar a tabela toda.
+
+    Args:
+        chamado_ids: IDs dos chamados a contar
+        usuario_id: ID do usuário para excluir suas próprias mensagens da contagem
+
+    Returns:
+        Dict {chamado_id: quantidade_nao_lidas} (sem os chamados sem não lidas)
+    """
+    if not chamado_ids:
+        return {}
+
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CONTAR_NAO_LIDAS_POR_CHAMADOS, (json.dumps(chamado_ids), usuario_id))
+        return {row["chamado_id"]: row["nao_lidas"] for row in cursor.fetchall()}
+
+
 def tem_resposta_admin(chamado_id: int) -> bool:
     """
     Verifica se um chamado possui ao menos uma resposta de administrador.
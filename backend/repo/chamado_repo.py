@@ -3,8 +3,8 @@ Repositório de Chamados de Suporte.
 
 NOTA SOBRE IMPORTS CIRCULARES:
 Este módulo usa lazy imports para `chamado_interacao_repo` nas funções
-`obter_todos()` e `obter_por_usuario()`. Isso é necessário porque existe
-uma dependência mútua entre os repositórios de chamado e interação.
+`obter_todos()`, `obter_pagina_admin()` e `obter_por_usuario()`. Isso é
+necessário porque existe uma dependência mútua entre os repositórios de chamado e interação.
 
 O padrão de lazy import (import dentro da função) é uma solução aceita
 em Python para evitar imports circulares. Alternativas como refatorar
@@ -19,6 +19,10 @@ from enum import Enum
 from model.chamado_model import Chamado, StatusChamado, PrioridadeChamado
 from sql.chamado_sql import (
     CRIAR_TABELA,
+    CRIAR_TABELA_BUSCA,
+    EXISTE_TABELA_BUSCA,
+    RECONSTRUIR_BUSCA,
+    CRIAR_TRIGGERS_BUSCA,
     INSERIR,
     OBTER_TODOS,
     OBTER_POR_USUARIO,
@@ -27,8 +31,19 @@ from sql.chamado_sql import (
     EXCLUIR,
     CONTAR_ABERTOS_POR_USUARIO,
     CONTAR_PENDENTES,
+    POSICAO_PRIORIDADE,
+    LISTAR_ADMIN,
+    CONTAR_ADMIN,
+    FILTRO_ADMIN_STATUS,
+    FILTRO_ADMIN_PRIORIDADE,
+    ORDENAR_ADMIN,
+    ORDENAR_ADMIN_POR_DATA,
+    LISTAR_ADMIN_BUSCA,
+    CONTAR_ADMIN_BUSCA,
+    ORDENAR_ADMIN_POR_RELEVANCIA,
 )
 from util.db_util import obter_conexao
+from util.paginacao_util import Paginacao, expressao_busca_prefixo, obter_paginado
 from util.datetime_util import agora
 from util.logger_config import logger
 
@@ -60,6 +75,7 @@ def _converter_enum_seguro(valor: str, tipo_enum: Type[T], padrao: T) -> T:
 def _row_to_chamado(row: sqlite3.Row) -> Chamado:
     usuario_nome = row["usuario_nome"] if "usuario_nome" in row.keys() else None
     usuario_email = row["usuario_email"] if "usuario_email" in row.keys() else None
+    trecho_busca = row["trecho_busca"] if "trecho_busca" in row.keys() else None
 
     return Chamado(
         id=row["id"],
@@ -74,7 +90,8 @@ def _row_to_chamado(row: sqlite3.Row) -> Chamado:
         data_abertura=row["data_abertura"],
         data_fechamento=row["data_fechamento"],
         usuario_nome=usuario_nome,
-        usuario_email=usuario_email
+        usuario_email=usuario_email,
+        trecho_busca=trecho_busca,
     )
 
 
@@ -82,6 +99,14 @@ def criar_tabela() -> bool:
     with obter_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+
+        # Índice de busca dos títulos; num banco que já tinha chamados, indexa os existentes
+        indice_novo = cursor.execute(EXISTE_TABELA_BUSCA).fetchone() is None
+        cursor.execute(CRIAR_TABELA_BUSCA)
+        for trigger in CRIAR_TRIGGERS_BUSCA:
+            cursor.execute(trigger)
+        if indice_novo:
+            cursor.execute(RECONSTRUIR_BUSCA)
         return True
 
 
@@ -116,6 +141,106 @@ def obter_todos(usuario_logado_id: int) -> list[Chamado]:
         return chamados
 
 
+def _montar_consulta_admin(
+    expressao: Optional[str],
+    status: Optional[str],
+    prioridade: Optional[str],
+) -> tuple[str, str, tuple]:
+    """
+    Monta as consultas de contagem e de dados da listagem do admin.
+
+    Args:
+        expressao: Consulta FTS5 do termo (expressao_busca_prefixo) ou None
+        status: Valor de StatusChamado para filtrar
+        prioridade: Valor de PrioridadeChamado para filtrar
+
+    Returns:
+        (sql_count, sql_dados sem LIMIT/OFFSET, parâmetros de ambas)
+    """
+    condicoes: list[str] = []
+    # A expressão é o ?1 de BUSCA_ADMIN_RELEVANCIA; os filtros vêm depois
+    params: list = [expressao] if expressao else []
+
+    if status:
+        condicoes.append(FILTRO_ADMIN_STATUS)
+        params.append(status)
+    if prioridade:
+        # Prioridade desconhecida vira posição 0: nenhum chamado corresponde
+        condicoes.append(FILTRO_ADMIN_PRIORIDADE)
+        params.append(POSICAO_PRIORIDADE.get(prioridade, 0))
+
+    where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    if expressao:
+        sql_count = f"{CONTAR_ADMIN_BUSCA}{where}"
+        sql_dados = f"{LISTAR_ADMIN_BUSCA}{where} {ORDENAR_ADMIN_POR_RELEVANCIA}"
+    else:
+        sql_count = f"{CONTAR_ADMIN}{where}"
+        ordem = ORDENAR_ADMIN_POR_DATA if prioridade else ORDENAR_ADMIN
+        sql_dados = f"{LISTAR_ADMIN}{where} {ordem}"
+    return sql_count, sql_dados, tuple(params)
+
+
+def obter_pagina_admin(
+    usuario_logado_id: int,
+    pagina: int = 1,
+    por_pagina: int = 10,
+    termo: Optional[str] = None,
+    status: Optional[str] = None,
+    prioridade: Optional[str] = None,
+) -> Paginacao:
+    """
+    Retorna uma página da listagem de chamados do admin, filtrada e paginada no banco.
+
+    Sem termo, mesma ordem de obter_todos (prioridade, depois mais recentes),
+    servida pelos índices idx_chamado_status_prioridade_data/idx_chamado_prioridade_data.
+    Com termo, busca nos índices FTS5 do título (chamado_busca), das mensagens
+    (chamado_interacao_busca) e do nome/e-mail do autor (usuario_busca) e
+    ordena por relevância (bm25); cada chamado traz em trecho_busca o trecho
+    que casou, com os termos entre <mark> e </mark>.
+
+    Args:
+        usuario_logado_id: ID do admin (exclui as próprias mensagens das não lidas)
+        pagina: Número da página (1-based; ajustada ao intervalo válido)
+        por_pagina: Quantidade de chamados por página
+        termo: Palavras buscadas no mesmo campo, sem diferenciar maiúsculas
+            nem acentos; a última vale como prefixo
+        status: Valor de StatusChamado para filtrar
+        prioridade: Valor de PrioridadeChamado para filtrar
+
+    Returns:
+        Paginacao com os Chamado da página e o total filtrado
+    """
+    from repo import chamado_interacao_repo
+
+    expressao = None
+    if termo and termo.strip():
+        # Palavras completas exatas, a última como prefixo: o prefixo de uma
+        # palavra comum ("pedido"*) percorreria o índice inteiro
+        expressao = expressao_busca_prefixo(termo, so_ultima=True)
+        if expressao is None:
+            # Só pontuação: nenhuma palavra para buscar
+            return Paginacao(items=[], total=0, pagina_atual=1, por_pagina=por_pagina)
+
+    sql_count, sql_dados, params = _montar_consulta_admin(expressao, status, prioridade)
+    paginacao = obter_paginado(
+        sql_count=sql_count,
+        sql_dados=sql_dados,
+        params=params,
+        pagina=pagina,
+        por_pagina=por_pagina,
+        row_converter=_row_to_chamado,
+    )
+
+    # Não lidas só dos chamados da página
+    contador_nao_lidas = chamado_interacao_repo.obter_contador_nao_lidas_por_chamados(
+        [chamado.id for chamado in paginacao.items], usuario_logado_id
+    )
+    for chamado in paginacao.items:
+        chamado.mensagens_nao_lidas = contador_nao_lidas.get(chamado.id, 0)
+
+    return paginacao
+
+
 def obter_por_usuario(usuario_id: int) -> list[Chamado]:
     from repo import chamado_interacao_repo
 
@@ -0,0 +1,100 @@
+"""
+Repositório para operações com a tabela chat_evento.
+"""
+import json
+from datetime import timedelta
+from typing import List
+from sqlite3 import Row
+
+from model.chat_evento_model import ChatEvento
+from sql.chat_evento_sql import (
+    CRIAR_TABELA,
+    INSERIR,
+    LISTAR_APOS,
+    OBTER_ULTIMO_ID,
+    EXCLUIR_ANTERIORES_A
+)
+from util.db_util import obter_conexao
+from util.datetime_util import agora
+
+
+def _row_to_evento(row: Row) -> ChatEvento:
+    """Converte uma row do banco em objeto ChatEvento."""
+    return ChatEvento(
+        id=row["id"],
+        origem=row["origem"],
+        destinatarios=json.loads(row["destinatarios"]),
+        payload=json.loads(row["payload"])
+    )
+
+
+def criar_tabela():
+    """Cria a tabela chat_evento se não existir."""
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA)
+
+
+def inserir(origem: str, destinatarios: List[int], payload: dict) -> int:
+    """
+    Publica um evento no log.
+
+    Args:
+        origem: Identificador do worker publicador
+        destinatarios: IDs dos usuários que devem receber o evento
+        payload: Evento SSE (serializável em JSON)
+
+    Returns:
+        ID do evento publicado
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(INSERIR, (
+            origem,
+            json.dumps(destinatarios),
+            json.dumps(payload, default=str),
+            agora()
+        ))
+        return cursor.lastrowid
+
+
+def listar_apos(ultimo_id: int, limite: int = 500) -> List[ChatEvento]:
+    """
+    Lista os eventos publicados depois de `ultimo_id`, em ordem de publicação.
+
+    Args:
+        ultimo_id: ID do último evento já consumido
+        limite: Máximo de eventos retornados
+
+    Returns:
+        Lista de ChatEvento
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(LISTAR_APOS, (ultimo_id, limite))
+        return [_row_to_evento(row) for row in cursor.fetchall()]
+
+
+def obter_ultimo_id() -> int:
+    """Retorna o ID do evento mais recente (0 se o log estiver vazio)."""
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_ULTIMO_ID)
+        return cursor.fetchone()[0]
+
+
+def excluir_antigos(retencao_segundos: float) -> int:
+    """
+    Remove eventos mais antigos que a retenção.
+
+    Args:
+        retencao_segundos: Idade máxima (s) dos eventos mantidos no log
+
+    Returns:
+        Quantidade de eventos removidos
+    """
+    limite = agora() - timedelta(seconds=retencao_segundos)
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(EXCLUIR_ANTERIORES_A, (limite,))
+        return cursor.rowcount
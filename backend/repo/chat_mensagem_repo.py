@@ -1,7 +1,7 @@
 """
 Repositório para operações com a tabela chat_mensagem.
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlite3 import Row
 
 from model.chat_mensagem_model import ChatMensagem
@@ -10,11 +10,14 @@ from sql.chat_mensagem_sql import (
     INSERIR,
     OBTER_POR_ID,
     LISTAR_POR_SALA,
+    LISTAR_POR_SALA_ANTES_DE,
+    LISTAR_POR_SALA_DEPOIS_DE,
     CONTAR_POR_SALA,
     MARCAR_COMO_LIDAS,
     OBTER_ULTIMA_MENSAGEM_SALA,
     EXCLUIR
 )
+from sql.chat_participante_sql import INCREMENTAR_NAO_LIDAS, ZERAR_NAO_LIDAS
 from util.db_util import obter_conexao
 from util.datetime_util import agora
 
@@ -51,6 +54,9 @@ def inserir(sala_id: str, usuario_id: int, mensagem: str) -> ChatMensagem:
     """
     Insere uma nova mensagem em uma sala.
 
+    Na mesma transação, incrementa o contador de não lidas dos demais
+    participantes da sala.
+
     Args:
         sala_id: ID da sala
         usuario_id: ID do usuário que enviou
@@ -65,6 +71,7 @@ def inserir(sala_id: str, usuario_id: int, mensagem: str) -> ChatMensagem:
         cursor = conn.cursor()
         cursor.execute(INSERIR, (sala_id, usuario_id, mensagem, data_envio, None))
         mensagem_id = cursor.lastrowid
+        cursor.execute(INCREMENTAR_NAO_LIDAS, (sala_id, usuario_id))
 
     return ChatMensagem(
         id=mensagem_id,
@@ -116,6 +123,46 @@ def listar_por_sala(sala_id: str, limit: int = 50, offset: int = 0) -> List[Chat
         return [_row_to_mensagem(row) for row in rows]
 
 
+def listar_janela_por_sala(
+    sala_id: str,
+    limit: int = 50,
+    antes_de_id: Optional[int] = None,
+    depois_de_id: Optional[int] = None,
+) -> Tuple[List[ChatMensagem], bool]:
+    """
+    Lista uma janela de mensagens de uma sala por cursor (keyset).
+
+    Sem `depois_de_id`, retorna as `limit` mensagens mais recentes com ID
+    menor que `antes_de_id` (ou as mais recentes da sala, se omitido). Com
+    `depois_de_id`, retorna as `limit` mensagens seguintes a esse ID.
+
+    Args:
+        sala_id: ID da sala
+        limit: Tamanho máximo da janela
+        antes_de_id: Retornar mensagens anteriores a este ID (exclusivo)
+        depois_de_id: Retornar mensagens posteriores a este ID (exclusivo)
+
+    Returns:
+        Tupla (mensagens em ordem cronológica, tem_mais), onde tem_mais indica
+        se existem mais mensagens na mesma direção
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        # Busca limit + 1 para saber se há mais mensagens sem um COUNT
+        if depois_de_id is not None:
+            cursor.execute(LISTAR_POR_SALA_DEPOIS_DE, (sala_id, depois_de_id, limit + 1))
+        else:
+            referencia = antes_de_id if antes_de_id is not None else 2**63 - 1
+            cursor.execute(LISTAR_POR_SALA_ANTES_DE, (sala_id, referencia, limit + 1))
+        rows = cursor.fetchall()
+
+    tem_mais = len(rows) > limit
+    mensagens = [_row_to_mensagem(row) for row in rows[:limit]]
+    if depois_de_id is None:
+        mensagens.reverse()
+    return mensagens, tem_mais
+
+
 def contar_por_sala(sala_id: str) -> int:
     """
     Conta o total de mensagens em uma sala.
@@ -138,6 +185,8 @@ def marcar_como_lidas(sala_id: str, usuario_id: int) -> bool:
     """
     Marca como lidas todas as mensagens não lidas de outros usuários em uma sala.
 
+    Também zera o contador de não lidas do usuário na sala.
+
     Args:
         sala_id: ID da sala
         usuario_id: ID do usuário que está marcando como lidas
@@ -148,7 +197,9 @@ def marcar_como_lidas(sala_id: str, usuario_id: int) -> bool:
     with obter_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute(MARCAR_COMO_LIDAS, (agora(), sala_id, usuario_id))
-        return cursor.rowcount > 0
+        marcadas = cursor.rowcount
+        cursor.execute(ZERAR_NAO_LIDAS, (sala_id, usuario_id))
+        return marcadas > 0
 
 
 def obter_ultima_mensagem_sala(sala_id: str) -> Optional[ChatMensagem]:
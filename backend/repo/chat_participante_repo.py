@@ -7,16 +7,20 @@ from sqlite3 import Row
 from model.chat_participante_model import ChatParticipante
 from sql.chat_participante_sql import (
     CRIAR_TABELA,
+    ADICIONAR_COLUNA_NAO_LIDAS,
     INSERIR,
     OBTER_POR_SALA_E_USUARIO,
     LISTAR_POR_SALA,
     LISTAR_POR_USUARIO,
     ATUALIZAR_ULTIMA_LEITURA,
     CONTAR_MENSAGENS_NAO_LIDAS,
+    SOMAR_NAO_LIDAS_POR_USUARIO,
+    RECONCILIAR_NAO_LIDAS,
     EXCLUIR
 )
 from util.db_util import obter_conexao
 from util.datetime_util import agora
+from util.logger_config import logger
 
 
 def _row_to_participante(row: Row) -> ChatParticipante:
@@ -29,16 +33,32 @@ def _row_to_participante(row: Row) -> ChatParticipante:
     return ChatParticipante(
         sala_id=row["sala_id"],
         usuario_id=row["usuario_id"],
-        ultima_leitura=ultima_leitura
+        ultima_leitura=ultima_leitura,
+        nao_lidas=row["nao_lidas"] if "nao_lidas" in row.keys() else 0
     )
 
 
 def criar_tabela():
-    """Cria a tabela chat_participante se não existir."""
+    """
+    Cria a tabela chat_participante se não existir.
+
+    Se a tabela já existir sem a coluna `nao_lidas` (banco legado), adiciona
+    a coluna e reconstrói os contadores a partir das mensagens.
+    """
     with obter_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
 
+        # Migração: adicionar contador de não lidas se não existir (bancos legados)
+        try:
+            cursor.execute(ADICIONAR_COLUNA_NAO_LIDAS)
+        except Exception:
+            # Coluna já existe — ignorar erro
+            return
+
+    logger.info("Coluna 'nao_lidas' adicionada à tabela chat_participante (migração).")
+    reconciliar_nao_lidas()
+
 
 def adicionar_participante(sala_id: str, usuario_id: int) -> ChatParticipante:
     """
@@ -149,13 +169,50 @@ def contar_mensagens_nao_lidas(sala_id: str, usuario_id: int) -> int:
     """
     with obter_conexao() as conn:
         cursor = conn.cursor()
-        # Passar usuario_id 3 vezes: para sala_id, usuario_id != ?, e duas vezes na subquery
-        cursor.execute(CONTAR_MENSAGENS_NAO_LIDAS, (sala_id, usuario_id, usuario_id, usuario_id))
+        cursor.execute(CONTAR_MENSAGENS_NAO_LIDAS, (sala_id, usuario_id))
         row = cursor.fetchone()
 
         return row["total"] if row else 0
 
 
+def contar_nao_lidas_total(usuario_id: int) -> int:
+    """
+    Soma as mensagens não lidas de todas as salas do usuário.
+
+    Args:
+        usuario_id: ID do usuário
+
+    Returns:
+        Total de mensagens não lidas
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(SOMAR_NAO_LIDAS_POR_USUARIO, (usuario_id,))
+        row = cursor.fetchone()
+
+        return row["total"] if row else 0
+
+
+def reconciliar_nao_lidas() -> int:
+    """
+    Reconstrói os contadores de não lidas a partir das mensagens.
+
+    Corrige divergências do contador desnormalizado (ex.: mensagens inseridas
+    ou excluídas fora do repositório).
+
+    Returns:
+        Quantidade de contadores corrigidos
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(RECONCILIAR_NAO_LIDAS)
+        corrigidos = cursor.rowcount
+
+    if corrigidos > 0:
+        logger.warning(f"Contadores de não lidas corrigidos na reconciliação: {corrigidos}")
+    return corrigidos
+
+
 def excluir(sala_id: str, usuario_id: int) -> bool:
     """
     Remove um participante de uma sala.
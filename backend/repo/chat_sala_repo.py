@@ -1,15 +1,18 @@
 """
 Repositório para operações com a tabela chat_sala.
 """
-from typing import Optional
+from typing import List, Optional
 from sqlite3 import Row
 
+from model.chat_conversa_model import ChatConversa
+from model.chat_mensagem_model import ChatMensagem
 from model.chat_sala_model import ChatSala
 from sql.chat_sala_sql import (
     CRIAR_TABELA,
     INSERIR,
     OBTER_POR_ID,
     ATUALIZAR_ULTIMA_ATIVIDADE,
+    LISTAR_CONVERSAS_POR_USUARIO,
     EXCLUIR
 )
 from util.db_util import obter_conexao
@@ -34,6 +37,35 @@ def _row_to_sala(row: Row) -> ChatSala:
     )
 
 
+def _row_to_conversa(row: Row) -> ChatConversa:
+    """Converte uma row da listagem de conversas em objeto ChatConversa."""
+    sala = ChatSala(
+        id=row["sala_id"],
+        criada_em=row["criada_em"],
+        ultima_atividade=row["ultima_atividade"]
+    )
+
+    ultima_mensagem = None
+    if row["mensagem_id"] is not None:
+        ultima_mensagem = ChatMensagem(
+            id=row["mensagem_id"],
+            sala_id=row["sala_id"],
+            usuario_id=row["mensagem_usuario_id"],
+            mensagem=row["mensagem"],
+            data_envio=row["data_envio"],
+            lida_em=row["lida_em"]
+        )
+
+    return ChatConversa(
+        sala=sala,
+        outro_usuario_id=row["outro_usuario_id"],
+        outro_usuario_nome=row["outro_usuario_nome"],
+        outro_usuario_email=row["outro_usuario_email"],
+        ultima_mensagem=ultima_mensagem,
+        nao_lidas=row["nao_lidas"]
+    )
+
+
 def criar_tabela():
     """Cria a tabela chat_sala se não existir."""
     with obter_conexao() as conn:
@@ -133,6 +165,33 @@ def atualizar_ultima_atividade(sala_id: str) -> bool:
         return cursor.rowcount > 0
 
 
+def listar_conversas_por_usuario(usuario_id: int, limit: int = 12, offset: int = 0) -> List[ChatConversa]:
+    """
+    Lista uma página das conversas de um usuário em uma única consulta.
+
+    Cada conversa traz a sala, o outro participante, a última mensagem e a
+    quantidade de mensagens não lidas pelo usuário. Ordenação (última
+    atividade mais recente primeiro) e paginação são feitas no SQL.
+
+    Args:
+        usuario_id: ID do usuário
+        limit: Quantidade máxima de conversas
+        offset: Quantidade de conversas a pular
+
+    Returns:
+        Lista de objetos ChatConversa
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            LISTAR_CONVERSAS_POR_USUARIO,
+            (usuario_id, usuario_id, limit, offset)
+        )
+        rows = cursor.fetchall()
+
+        return [_row_to_conversa(row) for row in rows]
+
+
 def excluir(sala_id: str) -> bool:
     """
     Exclui uma sala (cascade deleta participantes e mensagens).
@@ -7,6 +7,10 @@ from sql.configuracao_sql import (
     OBTER_POR_CHAVE,
     OBTER_TODOS,
     ATUALIZAR,
+    CRIAR_TABELA_VERSAO,
+    INICIAR_VERSAO,
+    OBTER_VERSAO,
+    CRIAR_TRIGGERS_VERSAO,
 )
 from util.db_util import obter_conexao
 from util.logger_config import logger
@@ -34,6 +38,10 @@ def criar_tabela() -> bool:
     with obter_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+        cursor.execute(CRIAR_TABELA_VERSAO)
+        cursor.execute(INICIAR_VERSAO)
+        for trigger in CRIAR_TRIGGERS_VERSAO:
+            cursor.execute(trigger)
         return True
 
 
@@ -55,6 +63,21 @@ def obter_todos() -> list[Configuracao]:
         return [_row_to_configuracao(row) for row in rows]
 
 
+def obter_versao() -> int:
+    """
+    Obtém a versão das configurações.
+
+    A versão é incrementada por triggers a cada INSERT, UPDATE ou DELETE em
+    configuracao, inclusive por outros processos.
+
+    Returns:
+        Versão atual (0 se a linha de versão não existir)
+    """
+    with obter_conexao() as conn:
+        row = conn.execute(OBTER_VERSAO).fetchone()
+        return row["versao"] if row else 0
+
+
 def obter_por_categoria() -> dict[str, list[Configuracao]]:
     """
     Obtém todas as configurações agrupadas por categoria.
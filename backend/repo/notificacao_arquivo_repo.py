@@ -0,0 +1,67 @@
+"""
+Repositório do arquivo de notificações (tabela notificacao_arquivo).
+
+As notificações removidas pela retenção podem ser arquivadas: cada lote
+removido vira uma linha com as notificações em JSON comprimido (zlib). A
+inserção acontece na mesma transação da exclusão, em
+notificacao_repo.excluir_antigas; aqui ficam a (des)compactação e a leitura.
+"""
+
+import json
+import zlib
+from typing import Optional
+
+from sql.notificacao_arquivo_sql import (
+    CRIAR_TABELA,
+    OBTER_DADOS_POR_ID,
+    OBTER_RESUMO,
+)
+from util.db_util import obter_conexao
+
+
+def criar_tabela() -> bool:
+    """Cria a tabela notificacao_arquivo se não existir."""
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA)
+        return True
+
+
+def compactar(notificacoes: list[dict]) -> bytes:
+    """Serializa as notificações em JSON e comprime com zlib."""
+    return zlib.compress(json.dumps(notificacoes, default=str).encode("utf-8"))
+
+
+def descompactar(dados: bytes) -> list[dict]:
+    """Operação inversa de compactar()."""
+    return json.loads(zlib.decompress(dados).decode("utf-8"))
+
+
+def obter_notificacoes(arquivo_id: int) -> Optional[list[dict]]:
+    """
+    Retorna as notificações de um lote arquivado (None se não existir).
+
+    Args:
+        arquivo_id: ID da linha em notificacao_arquivo
+
+    Returns:
+        Lista de dicts com as colunas originais da notificação
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_DADOS_POR_ID, (arquivo_id,))
+        row = cursor.fetchone()
+        return descompactar(row["dados"]) if row else None
+
+
+def obter_resumo() -> dict:
+    """Retorna lotes, notificações e bytes comprimidos no arquivo."""
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_RESUMO)
+        row = cursor.fetchone()
+        return {
+            "lotes": row["lotes"],
+            "notificacoes": row["notificacoes"],
+            "bytes": row["bytes"],
+        }
@@ -13,6 +13,7 @@ Uso direto (para casos específicos):
     notificacoes = notificacao_repo.obter_por_usuario(usuario_id, limite=5)
 """
 
+import json
 import sqlite3
 from typing import Optional
 
@@ -20,16 +21,26 @@ from model.notificacao_model import Notificacao, TipoNotificacao
 from sql.notificacao_sql import (
     CRIAR_TABELA,
     INSERIR,
+    INSERIR_PARA_USUARIOS,
+    INSERIR_PARA_PERFIL,
     OBTER_POR_USUARIO,
+    CONTAR_POR_USUARIO,
+    OBTER_PAGINA_POR_USUARIO,
+    OBTER_POR_ID,
     OBTER_NAO_LIDAS_POR_USUARIO,
     CONTAR_NAO_LIDAS,
+    CONTAR_NAO_LIDAS_POR_USUARIOS,
     MARCAR_COMO_LIDA,
     MARCAR_TODAS_COMO_LIDAS,
     EXCLUIR,
+    EXCLUIR_ANTIGAS,
     EXCLUIR_LIDAS,
 )
+from sql.notificacao_arquivo_sql import INSERIR as INSERIR_ARQUIVO
+from repo import notificacao_arquivo_repo
 from util.db_util import obter_conexao
 from util.logger_config import logger
+from util.paginacao_util import Paginacao, obter_paginado
 
 
 def _row_to_notificacao(row: sqlite3.Row) -> Notificacao:
@@ -97,6 +108,81 @@ def inserir(
         return None
 
 
+def inserir_para_usuarios(
+    usuario_ids: list[int],
+    titulo: str,
+    mensagem: str,
+    tipo: TipoNotificacao = TipoNotificacao.INFO,
+    url_acao: Optional[str] = None,
+) -> list[int]:
+    """
+    Cria a mesma notificação para vários usuários em uma única transação.
+
+    IDs de usuários inexistentes são ignorados.
+
+    Args:
+        usuario_ids: IDs dos usuários destinatários
+        titulo, mensagem, tipo, url_acao: Conteúdo da notificação (ver inserir)
+
+    Returns:
+        IDs dos usuários efetivamente notificados, em ordem crescente
+
+    Prefira util.notificacao_util.criar_notificacoes_em_lote(), que divide
+    listas grandes em lotes e envia o novo total pelo stream SSE.
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(INSERIR_PARA_USUARIOS, (
+            titulo,
+            mensagem,
+            tipo.value,
+            url_acao,
+            json.dumps(usuario_ids),
+        ))
+        # O SQLite não garante a ordem das linhas do RETURNING
+        return sorted(row["usuario_id"] for row in cursor.fetchall())
+
+
+def inserir_para_perfil(
+    perfil: str,
+    titulo: str,
+    mensagem: str,
+    tipo: TipoNotificacao = TipoNotificacao.INFO,
+    url_acao: Optional[str] = None,
+    apos_usuario_id: int = 0,
+    limite: int = 1000,
+) -> list[int]:
+    """
+    Cria a mesma notificação para um lote de usuários de um perfil.
+
+    Percorre os usuários do perfil por keyset em usuario.id: chame de novo
+    com `apos_usuario_id` igual ao último ID retornado até vir uma lista
+    menor que `limite`.
+
+    Args:
+        perfil: Perfil dos destinatários (ex: Perfil.CLIENTE.value)
+        titulo, mensagem, tipo, url_acao: Conteúdo da notificação (ver inserir)
+        apos_usuario_id: Notifica apenas usuários com ID maior que este
+        limite: Máximo de usuários notificados nesta chamada
+
+    Returns:
+        IDs dos usuários notificados, em ordem crescente
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(INSERIR_PARA_PERFIL, (
+            titulo,
+            mensagem,
+            tipo.value,
+            url_acao,
+            perfil,
+            apos_usuario_id,
+            limite,
+        ))
+        # O SQLite não garante a ordem das linhas do RETURNING
+        return sorted(row["usuario_id"] for row in cursor.fetchall())
+
+
 def obter_por_usuario(usuario_id: int, limite: int = 20) -> list[Notificacao]:
     """
     Retorna as notificações mais recentes do usuário (lidas e não lidas).
@@ -114,6 +200,46 @@ def obter_por_usuario(usuario_id: int, limite: int = 20) -> list[Notificacao]:
         return [_row_to_notificacao(row) for row in cursor.fetchall()]
 
 
+def obter_pagina_por_usuario(usuario_id: int, pagina: int = 1, por_pagina: int = 15) -> Paginacao:
+    """
+    Retorna uma página das notificações do usuário, paginada no banco.
+
+    Args:
+        usuario_id: ID do usuário
+        pagina: Número da página (1-based; ajustada ao intervalo válido)
+        por_pagina: Quantidade de notificações por página
+
+    Returns:
+        Paginacao com as Notificacao da página (mais recentes primeiro)
+    """
+    return obter_paginado(
+        sql_count=CONTAR_POR_USUARIO,
+        sql_dados=OBTER_PAGINA_POR_USUARIO,
+        params=(usuario_id,),
+        pagina=pagina,
+        por_pagina=por_pagina,
+        row_converter=_row_to_notificacao,
+    )
+
+
+def obter_por_id(notificacao_id: int, usuario_id: int) -> Optional[Notificacao]:
+    """
+    Retorna uma notificação se ela pertencer ao usuário.
+
+    Args:
+        notificacao_id: ID da notificação
+        usuario_id: ID do usuário (verificação de propriedade)
+
+    Returns:
+        Notificacao ou None se não existir ou for de outro usuário
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_POR_ID, (notificacao_id, usuario_id))
+        row = cursor.fetchone()
+        return _row_to_notificacao(row) if row else None
+
+
 def obter_nao_lidas(usuario_id: int, limite: int = 10) -> list[Notificacao]:
     """
     Retorna somente as notificações não lidas do usuário.
@@ -150,6 +276,22 @@ def contar_nao_lidas(usuario_id: int) -> int:
         return row["total"] if row else 0
 
 
+def contar_nao_lidas_por_usuarios(usuario_ids: list[int]) -> dict[int, int]:
+    """
+    Conta as notificações não lidas de vários usuários em uma consulta.
+
+    Args:
+        usuario_ids: IDs dos usuários
+
+    Returns:
+        Dicionário usuario_id -> não lidas (usuários sem não lidas ficam de fora)
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CONTAR_NAO_LIDAS_POR_USUARIOS, (json.dumps(usuario_ids),))
+        return {row["usuario_id"]: row["total"] for row in cursor.fetchall()}
+
+
 def marcar_como_lida(notificacao_id: int, usuario_id: int) -> bool:
     """
     Marca uma notificação específica como lida.
@@ -220,3 +362,43 @@ def excluir_lidas(usuario_id: int) -> int:
         cursor = conn.cursor()
         cursor.execute(EXCLUIR_LIDAS, (usuario_id,))
         return cursor.rowcount
+
+
+def excluir_antigas(
+    tipo: TipoNotificacao,
+    dias: int,
+    limite: int = 500,
+    arquivar: bool = False,
+) -> int:
+    """
+    Exclui um lote das notificações de um tipo mais antigas que `dias`.
+
+    Usado pela retenção (util/notificacao_retencao.py), que chama esta função
+    em laço até retornar menos que `limite`: cada chamada é uma transação
+    curta, para não bloquear os demais escritores do banco.
+
+    Args:
+        tipo: Tipo das notificações a excluir
+        dias: Idade mínima (em dias) das notificações excluídas
+        limite: Máximo de notificações excluídas nesta chamada
+        arquivar: Se True, grava as linhas removidas (comprimidas) em
+            notificacao_arquivo na mesma transação
+
+    Returns:
+        Número de notificações excluídas
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(EXCLUIR_ANTIGAS, (tipo.value, f"-{int(dias)} days", limite))
+        linhas = sorted((dict(row) for row in cursor.fetchall()), key=lambda n: n["id"])
+        if arquivar and linhas:
+            cursor.execute(INSERIR_ARQUIVO, (
+                tipo.value,
+                len(linhas),
+                linhas[0]["id"],
+                linhas[-1]["id"],
+                min(n["data_criacao"] for n in linhas),
+                max(n["data_criacao"] for n in linhas),
+                notificacao_arquivo_repo.compactar(linhas),
+            ))
+        return len(linhas)
@@ -7,6 +7,7 @@ permitindo exibir detalhes corretos mesmo após trocar de provedor.
 """
 
 import sqlite3
+from datetime import date, timedelta
 from typing import Optional
 
 from model.pagamento_model import Pagamento, StatusPagamento
@@ -24,10 +25,18 @@ from sql.pagamento_sql import (
     ATUALIZAR_PREFERENCE,
     EXCLUIR,
     ADICIONAR_COLUNA_PROVIDER,
+    LISTAR_ADMIN,
+    CONTAR_ADMIN,
+    FILTRO_ADMIN_STATUS,
+    FILTRO_ADMIN_PROVIDER,
+    FILTRO_ADMIN_DATA_INICIO,
+    FILTRO_ADMIN_DATA_FIM,
+    ORDENAR_ADMIN,
 )
 from util.db_util import obter_conexao
-from util.datetime_util import agora
+from util.datetime_util import agora, inicio_do_dia
 from util.logger_config import logger
+from util.paginacao_util import Paginacao, obter_paginado
 
 
 def _row_to_pagamento(row: sqlite3.Row) -> Pagamento:
@@ -122,6 +131,57 @@ def obter_todos() -> list[Pagamento]:
         return [_row_to_pagamento(row) for row in rows]
 
 
+def obter_pagina_admin(
+    pagina: int = 1,
+    por_pagina: int = 10,
+    status: Optional[str] = None,
+    provider: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+) -> Paginacao:
+    """
+    Retorna uma página dos pagamentos do sistema, filtrada e paginada no banco.
+
+    As datas são dias do calendário local (APP_TIMEZONE) e o intervalo é
+    inclusivo: data_fim cobre o dia inteiro.
+
+    Args:
+        pagina: Número da página (1-based; ajustada ao intervalo válido)
+        por_pagina: Quantidade de pagamentos por página
+        status: Valor de StatusPagamento para filtrar
+        provider: Chave do provedor (ex: 'mercadopago', 'stripe')
+        data_inicio: Primeiro dia de criação incluído
+        data_fim: Último dia de criação incluído
+
+    Returns:
+        Paginacao com os Pagamento da página (mais recentes primeiro) e o total filtrado
+    """
+    condicoes: list[str] = []
+    params: list = []
+    if status:
+        condicoes.append(FILTRO_ADMIN_STATUS)
+        params.append(status)
+    if provider:
+        condicoes.append(FILTRO_ADMIN_PROVIDER)
+        params.append(provider)
+    if data_inicio:
+        condicoes.append(FILTRO_ADMIN_DATA_INICIO)
+        params.append(inicio_do_dia(data_inicio))
+    if data_fim:
+        condicoes.append(FILTRO_ADMIN_DATA_FIM)
+        params.append(inicio_do_dia(data_fim + timedelta(days=1)))
+
+    where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return obter_paginado(
+        sql_count=f"{CONTAR_ADMIN}{where}",
+        sql_dados=f"{LISTAR_ADMIN}{where} {ORDENAR_ADMIN}",
+        params=tuple(params),
+        pagina=pagina,
+        por_pagina=por_pagina,
+        row_converter=_row_to_pagamento,
+    )
+
+
 def obter_por_usuario(usuario_id: int) -> list[Pagamento]:
     """
     Retorna todos os pagamentos de um usuário específico.
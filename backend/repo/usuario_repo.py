@@ -11,15 +11,27 @@ from sql.usuario_sql import (
     OBTER_POR_ID,
     OBTER_TODOS,
     OBTER_QUANTIDADE,
+    OBTER_QUANTIDADE_POR_PERFIL,
     OBTER_POR_EMAIL,
     ATUALIZAR_TOKEN,
     OBTER_POR_TOKEN,
     LIMPAR_TOKEN,
+    REDEFINIR_SENHA,
     OBTER_TODOS_POR_PERFIL,
     BUSCAR_POR_TERMO,
+    CRIAR_TABELA_BUSCA,
+    EXISTE_TABELA_BUSCA,
+    RECONSTRUIR_BUSCA,
+    CRIAR_TRIGGERS_BUSCA,
+    LISTAR_PAGINA,
+    CONTAR_PAGINA,
+    FILTRO_PERFIL,
+    FILTRO_TERMO,
+    ORDENAR_POR_NOME,
 )
 from util.db_util import obter_conexao
 from util.foto_util import criar_foto_padrao_usuario
+from util.paginacao_util import Paginacao, expressao_busca_prefixo, obter_paginado
 
 
 def _row_to_usuario(row: sqlite3.Row) -> Usuario:
@@ -49,6 +61,14 @@ def criar_tabela() -> bool:
     with obter_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+
+        # Índice de busca textual; num banco que já tinha usuários, indexa os existentes
+        indice_novo = cursor.execute(EXISTE_TABELA_BUSCA).fetchone() is None
+        cursor.execute(CRIAR_TABELA_BUSCA)
+        for trigger in CRIAR_TRIGGERS_BUSCA:
+            cursor.execute(trigger)
+        if indice_novo:
+            cursor.execute(RECONSTRUIR_BUSCA)
         return True
 
 
@@ -122,6 +142,14 @@ def obter_quantidade() -> int:
         return row["quantidade"] if row else 0
 
 
+def obter_quantidade_por_perfil(perfil: str) -> int:
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_QUANTIDADE_POR_PERFIL, (perfil,))
+        row = cursor.fetchone()
+        return row["quantidade"] if row else 0
+
+
 def obter_por_email(email: str) -> Optional[Usuario]:
     with obter_conexao() as conn:
         cursor = conn.cursor()
@@ -156,6 +184,19 @@ def limpar_token(id: int) -> bool:
         return cursor.rowcount > 0
 
 
+def redefinir_senha(id: int, senha: str, token: str) -> bool:
+    """
+    Grava a nova senha e limpa o token de redefinição na mesma transação.
+
+    Returns:
+        True se o token ainda era o do usuário (senha alterada), False caso contrário
+    """
+    with obter_conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(REDEFINIR_SENHA, (senha, id, token))
+        return cursor.rowcount > 0
+
+
 def obter_todos_por_perfil(perfil: str) -> list[Usuario]:
     with obter_conexao() as conn:
         cursor = conn.cursor()
@@ -168,6 +209,10 @@ def buscar_por_termo(termo: str, limit: int = 10) -> list[Usuario]:
     """
     Busca usuários por termo (pesquisa em nome e email).
 
+    Usa o índice FTS5 usuario_busca: cada palavra do termo casa com o início
+    de uma palavra do nome ou do email, sem diferenciar maiúsculas e acentos
+    ("joao sil" encontra "João da Silva").
+
     Args:
         termo: Termo de busca
         limit: Número máximo de resultados
@@ -175,8 +220,58 @@ def buscar_por_termo(termo: str, limit: int = 10) -> list[Usuario]:
     Returns:
         Lista de usuários que correspondem à busca
     """
+    expressao = expressao_busca_prefixo(termo)
+    if expressao is None:
+        return []
+
     with obter_conexao() as conn:
         cursor = conn.cursor()
-        cursor.execute(BUSCAR_POR_TERMO, (f"%{termo}%", f"%{termo}%", limit))
+        cursor.execute(BUSCAR_POR_TERMO, (expressao, limit))
         rows = cursor.fetchall()
         return [_row_to_usuario(row) for row in rows]
+
+
+def obter_pagina(
+    pagina: int = 1,
+    por_pagina: int = 10,
+    perfil: Optional[str] = None,
+    termo: Optional[str] = None,
+) -> Paginacao:
+    """
+    Retorna uma página de usuários ordenada por nome, filtrada e paginada no banco.
+
+    Diferente de buscar_por_termo, não há limite de resultados: o total é o
+    número exato de usuários que atendem aos filtros. O termo usa o mesmo
+    índice FTS5 (prefixos de palavras, sem diferenciar acentos).
+
+    Args:
+        pagina: Número da página (1-based; ajustada ao intervalo válido)
+        por_pagina: Quantidade de usuários por página
+        perfil: Perfil para filtrar (valor de Perfil)
+        termo: Busca em nome e email (ver buscar_por_termo)
+
+    Returns:
+        Paginacao com os Usuario da página e o total filtrado
+    """
+    condicoes: list[str] = []
+    params: list = []
+    if perfil:
+        condicoes.append(FILTRO_PERFIL)
+        params.append(perfil)
+    if termo and termo.strip():
+        expressao = expressao_busca_prefixo(termo)
+        if expressao is None:
+            # Só pontuação: nenhuma palavra para buscar
+            return Paginacao(items=[], total=0, pagina_atual=1, por_pagina=por_pagina)
+        condicoes.append(FILTRO_TERMO)
+        params.append(expressao)
+
+    where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return obter_paginado(
+        sql_count=f"{CONTAR_PAGINA}{where}",
+        sql_dados=f"{LISTAR_PAGINA}{where} {ORDENAR_POR_NOME}",
+        params=tuple(params),
+        pagina=pagina,
+        por_pagina=por_pagina,
+        row_converter=_row_to_usuario,
+    )
@@ -79,7 +79,7 @@ async def criar_backup(
 ):
     """Cria um novo backup manual do banco de dados."""
     assert usuario_logado is not None
-    checar_rate_limit(admin_backups_limiter, request)
+    await checar_rate_limit(admin_backups_limiter, request)
 
     sucesso, mensagem = backup_util.criar_backup()
     if not sucesso:
@@ -117,7 +117,7 @@ async def download_backup(
 ):
     """Faz o download binário de um arquivo de backup."""
     assert usuario_logado is not None
-    checar_rate_limit(backup_download_limiter, request)
+    await checar_rate_limit(backup_download_limiter, request)
 
     # O util valida o nome (proteção contra path traversal) e a existência
     caminho_backup = backup_util.obter_caminho_backup(nome_arquivo)
@@ -159,7 +159,7 @@ async def restaurar_backup(
     criado antes da restauração e o util valida integridade com rollback.
     """
     assert usuario_logado is not None
-    checar_rate_limit(admin_backups_limiter, request)
+    await checar_rate_limit(admin_backups_limiter, request)
 
     logger.warning(
         f"Admin {usuario_logado.id} iniciou restauração de backup: {nome_arquivo}"
@@ -211,7 +211,7 @@ async def excluir_backup(
 ):
     """Exclui um arquivo de backup."""
     assert usuario_logado is not None
-    checar_rate_limit(admin_backups_limiter, request)
+    await checar_rate_limit(admin_backups_limiter, request)
 
     sucesso, mensagem = backup_util.excluir_backup(nome_arquivo)
     if not sucesso:
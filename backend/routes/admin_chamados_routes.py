@@ -39,7 +39,6 @@ from util.api_helpers import checar_rate_limit
 from util.auth_decorator import requer_autenticacao
 from util.datetime_util import agora
 from util.logger_config import logger
-from util.paginacao_util import paginar
 from util.perfis import Perfil
 from util.rate_limiter import DynamicRateLimiter
 
@@ -95,24 +94,14 @@ async def listar(
     """Lista todos os chamados do sistema (paginado, com filtros)."""
     assert usuario_logado is not None
 
-    chamados = chamado_repo.obter_todos(usuario_logado.id)
-
-    # Filtros em memória
-    if q:
-        termo = q.strip().lower()
-        chamados = [
-            c
-            for c in chamados
-            if termo in c.titulo.lower()
-            or (c.usuario_nome and termo in c.usuario_nome.lower())
-            or (c.usuario_email and termo in c.usuario_email.lower())
-        ]
-    if status_filtro:
-        chamados = [c for c in chamados if c.status.value == status_filtro]
-    if prioridade:
-        chamados = [c for c in chamados if c.prioridade.value == prioridade]
-
-    paginacao = paginar(chamados, pagina, por_pagina)
+    paginacao = chamado_repo.obter_pagina_admin(
+        usuario_logado.id,
+        pagina=pagina,
+        por_pagina=por_pagina,
+        termo=q,
+        status=status_filtro,
+        prioridade=prioridade,
+    )
     return PaginaResponse.de_paginacao(
         paginacao,
         [ChamadoResponse.de_chamado(c) for c in paginacao.items],
@@ -164,7 +153,7 @@ async def responder(
     ``{"dto_mensagem": {"mensagem": "..."}, "dto_status": {"status": "..."}}``.
     """
     assert usuario_logado is not None
-    checar_rate_limit(admin_chamado_responder_limiter, request)
+    await checar_rate_limit(admin_chamado_responder_limiter, request)
 
     _obter_chamado(id)
 
@@ -17,6 +17,7 @@ from dtos.configuracao_dto import SalvarConfiguracaoLoteDTO
 # Schemas (saída)
 from dtos.responses.comum import PaginaResponse
 from dtos.responses.config_response import (
+    ConfigCacheEstatisticasResponse,
     ConfigListaResponse,
     SalvarConfigResultadoResponse,
 )
@@ -81,6 +82,16 @@ async def get_listar_configuracoes(
     return ConfigListaResponse.de_agrupado(agrupado)
 
 
+@router.get("/configuracoes/cache", response_model=ConfigCacheEstatisticasResponse)
+@requer_autenticacao([Perfil.ADMIN.value])
+async def get_estatisticas_cache_configuracoes(
+    request: Request, usuario_logado: Optional[UsuarioLogado] = None
+):
+    """Retorna os contadores (acertos, ausentes, erros...) do cache de configurações neste worker."""
+    assert usuario_logado is not None
+    return ConfigCacheEstatisticasResponse(**config.obter_estatisticas())
+
+
 @router.put("/configuracoes", response_model=SalvarConfigResultadoResponse)
 @requer_autenticacao([Perfil.ADMIN.value])
 async def put_salvar_configuracoes(
@@ -95,7 +106,7 @@ async def put_salvar_configuracoes(
     A estilização de toast é responsabilidade do frontend no SPA.
     """
     assert usuario_logado is not None
-    checar_rate_limit(admin_config_limiter, request)
+    await checar_rate_limit(admin_config_limiter, request)
 
     try:
         quantidade_atualizada, chaves_nao_encontradas = (
@@ -221,7 +232,7 @@ async def get_auditoria_logs(
     unificando-as em um único endpoint JSON parametrizado por query string.
     """
     assert usuario_logado is not None
-    checar_rate_limit(admin_config_limiter, request)
+    await checar_rate_limit(admin_config_limiter, request)
 
     data_consulta = data or agora().strftime('%Y-%m-%d')
 
@@ -0,0 +1,149 @@
+# =============================================================================
+# Rotas administrativas de Notificações (API JSON) — envio em lote e retenção
+# =============================================================================
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+# DTOs (entrada)
+from dtos.notificacao_dto import EnviarNotificacaoLoteDTO
+
+# Schemas (saída)
+from dtos.responses.notificacao_response import (
+    EnvioLoteResponse,
+    ExecucaoRetencaoResponse,
+    RetencaoNotificacoesResponse,
+)
+
+# Models
+from model.notificacao_model import TipoNotificacao
+from model.usuario_logado_model import UsuarioLogado
+
+# Repositórios
+from repo import notificacao_arquivo_repo
+
+# Utilities
+from util.api_helpers import checar_rate_limit
+from util.auth_decorator import requer_autenticacao
+from util.db_async import executar_db
+from util.logger_config import logger
+from util.notificacao_retencao import executar_retencao, obter_estatisticas
+from util.notificacao_util import iniciar_envio_lote, obter_envio_lote
+from util.perfis import Perfil
+from util.rate_limiter import DynamicRateLimiter
+
+router = APIRouter(prefix="/admin/notificacoes")
+
+# =============================================================================
+# Rate Limiters
+# =============================================================================
+
+# Envio em lote e retenção manual (restritivo - mexem em muitas linhas)
+admin_notificacoes_limiter = DynamicRateLimiter(
+    chave_max="rate_limit_admin_notificacoes_max",
+    chave_minutos="rate_limit_admin_notificacoes_minutos",
+    padrao_max=5,
+    padrao_minutos=5,
+    nome="admin_notificacoes",
+)
+
+
+# =============================================================================
+# Envio em lote
+# =============================================================================
+
+@router.post(
+    "/lote",
+    response_model=EnvioLoteResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@requer_autenticacao([Perfil.ADMIN.value])
+async def enviar_lote(
+    request: Request,
+    dto: EnviarNotificacaoLoteDTO,
+    usuario_logado: Optional[UsuarioLogado] = None,
+):
+    """
+    Envia a mesma notificação a uma lista de usuários ou a um perfil inteiro.
+
+    O envio roda em segundo plano; acompanhe o progresso em
+    GET /admin/notificacoes/lote/{id}.
+    """
+    assert usuario_logado is not None
+    await checar_rate_limit(admin_notificacoes_limiter, request)
+
+    envio = await iniciar_envio_lote(
+        titulo=dto.titulo,
+        mensagem=dto.mensagem,
+        tipo=TipoNotificacao(dto.tipo),
+        url_acao=dto.url_acao,
+        usuario_ids=dto.usuario_ids,
+        perfil=dto.perfil,
+    )
+    destino = f"perfil {dto.perfil}" if dto.perfil else f"{envio.total} usuário(s)"
+    logger.info(
+        f"Envio de notificações em lote {envio.id} iniciado por admin "
+        f"{usuario_logado.id} para {destino}: {dto.titulo}"
+    )
+    return EnvioLoteResponse.de_envio(envio)
+
+
+@router.get("/lote/{envio_id}", response_model=EnvioLoteResponse)
+@requer_autenticacao([Perfil.ADMIN.value])
+async def obter_progresso_lote(
+    request: Request,
+    envio_id: str,
+    usuario_logado: Optional[UsuarioLogado] = None,
+):
+    """Retorna o progresso de um envio em lote (404 se desconhecido)."""
+    assert usuario_logado is not None
+
+    envio = obter_envio_lote(envio_id)
+    if envio is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Envio não encontrado.",
+        )
+    return EnvioLoteResponse.de_envio(envio)
+
+
+# =============================================================================
+# Retenção
+# =============================================================================
+
+@router.get("/retencao", response_model=RetencaoNotificacoesResponse)
+@requer_autenticacao([Perfil.ADMIN.value])
+async def obter_retencao(
+    request: Request,
+    usuario_logado: Optional[UsuarioLogado] = None,
+):
+    """Retorna a política de retenção e as métricas acumuladas neste worker."""
+    assert usuario_logado is not None
+
+    estatisticas = obter_estatisticas()
+    estatisticas["arquivo"] = await executar_db(notificacao_arquivo_repo.obter_resumo)
+    return RetencaoNotificacoesResponse(**estatisticas)
+
+
+@router.post("/retencao/executar", response_model=ExecucaoRetencaoResponse)
+@requer_autenticacao([Perfil.ADMIN.value])
+async def executar_retencao_agora(
+    request: Request,
+    usuario_logado: Optional[UsuarioLogado] = None,
+):
+    """Executa a retenção imediatamente (409 se já houver uma em andamento)."""
+    assert usuario_logado is not None
+    await checar_rate_limit(admin_notificacoes_limiter, request)
+
+    resultado = await executar_retencao()
+    if resultado is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A retenção de notificações já está em execução.",
+        )
+    logger.info(
+        f"Retenção de notificações executada por admin {usuario_logado.id}: "
+        f"{resultado['removidas']} removida(s)"
+    )
+    return ExecucaoRetencaoResponse(**resultado)
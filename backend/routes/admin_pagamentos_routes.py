@@ -2,7 +2,8 @@
 Rotas administrativas de pagamentos (API JSON).
 
 Permite que administradores:
-- Listem todos os pagamentos do sistema (paginado, com filtro opcional por status)
+- Listem todos os pagamentos do sistema (paginado, com filtros opcionais por
+  status, provedor e período)
 - Visualizem detalhes completos de qualquer pagamento, incluindo dados do provedor
 """
 
@@ -10,6 +11,7 @@ Permite que administradores:
 # Imports
 # =============================================================================
 
+from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Request, HTTPException, status
@@ -21,7 +23,6 @@ from model.usuario_logado_model import UsuarioLogado
 from repo import pagamento_repo
 from util.auth_decorator import requer_autenticacao
 from util.logger_config import logger
-from util.paginacao_util import paginar
 from util.payment_service import PaymentService
 from util.perfis import Perfil
 
@@ -42,34 +43,43 @@ router = APIRouter(prefix="/admin/pagamentos")
 async def listar(
     request: Request,
     status_filtro: Optional[str] = None,
+    provider: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
     pagina: int = 1,
     por_pagina: int = 10,
     usuario_logado: Optional[UsuarioLogado] = None,
 ):
     """
-    Lista todos os pagamentos do sistema (paginado), com filtro opcional por status.
+    Lista todos os pagamentos do sistema (paginado), com filtros opcionais.
 
     Query params:
         status_filtro: Filtra por status (ex: ?status_filtro=Aprovado)
+        provider: Filtra pelo provedor que criou o pagamento (ex: ?provider=stripe)
+        data_inicio: Criados a partir deste dia (AAAA-MM-DD, inclusivo)
+        data_fim: Criados até este dia (AAAA-MM-DD, inclusivo)
         pagina: Página atual (1-based)
         por_pagina: Itens por página
     """
     assert usuario_logado is not None
 
-    todos_pagamentos = pagamento_repo.obter_todos()
-
-    # Aplicar filtro por status se informado
-    if status_filtro and StatusPagamento.existe(status_filtro):
-        pagamentos = [p for p in todos_pagamentos if p.status.value == status_filtro]
-    else:
-        pagamentos = todos_pagamentos
+    # Status desconhecido é ignorado (lista todos)
+    if status_filtro and not StatusPagamento.existe(status_filtro):
         status_filtro = None
 
-    paginacao = paginar(pagamentos, pagina, por_pagina)
+    paginacao = pagamento_repo.obter_pagina_admin(
+        pagina=pagina,
+        por_pagina=por_pagina,
+        status=status_filtro,
+        provider=provider,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    )
 
     logger.info(
         f"Admin {usuario_logado.id} listou pagamentos "
-        f"(filtro={status_filtro}, total={paginacao.total})"
+        f"(filtro={status_filtro}, provider={provider}, "
+        f"periodo={data_inicio}..{data_fim}, total={paginacao.total})"
     )
 
     items = [PagamentoResponse.de_pagamento(p) for p in paginacao.items]
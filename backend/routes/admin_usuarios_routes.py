@@ -24,7 +24,6 @@ from repo import usuario_repo
 from util.api_helpers import checar_rate_limit
 from util.auth_decorator import requer_autenticacao
 from util.logger_config import logger
-from util.paginacao_util import paginar
 from util.perfis import Perfil
 from util.rate_limiter import DynamicRateLimiter
 from util.security import criar_hash_senha
@@ -92,18 +91,9 @@ async def listar(
     """Lista usuários de forma paginada, com filtros opcionais por perfil e termo (q)."""
     assert usuario_logado is not None
 
-    termo = (q or "").strip()
-    if termo:
-        # Busca por nome/email (limite alto para permitir paginação em memória)
-        usuarios = usuario_repo.buscar_por_termo(termo, limit=1000)
-        if perfil:
-            usuarios = [u for u in usuarios if u.perfil == perfil]
-    elif perfil:
-        usuarios = usuario_repo.obter_todos_por_perfil(perfil)
-    else:
-        usuarios = usuario_repo.obter_todos()
-
-    paginacao = paginar(usuarios, pagina=pagina, por_pagina=por_pagina)
+    paginacao = usuario_repo.obter_pagina(
+        pagina=pagina, por_pagina=por_pagina, perfil=perfil, termo=q
+    )
     items = [UsuarioResponse.de_usuario(u) for u in paginacao.items]
     return PaginaResponse.de_paginacao(paginacao, items)
 
@@ -139,7 +129,7 @@ async def criar(
 ):
     """Cria um novo usuário. Valida disponibilidade de e-mail (409)."""
     assert usuario_logado is not None
-    checar_rate_limit(admin_usuarios_limiter, request)
+    await checar_rate_limit(admin_usuarios_limiter, request)
 
     disponivel, mensagem_erro = verificar_email_disponivel(dto.email)
     if not disponivel:
@@ -178,7 +168,7 @@ async def alterar(
 ):
     """Altera nome, e-mail e perfil de um usuário. Valida e-mail para outro id (409)."""
     assert usuario_logado is not None
-    checar_rate_limit(admin_usuarios_limiter, request)
+    await checar_rate_limit(admin_usuarios_limiter, request)
 
     if dto.id != id:
         raise HTTPException(
@@ -224,7 +214,7 @@ async def excluir(
 ):
     """Exclui um usuário. Impede que o admin exclua a si mesmo (403)."""
     assert usuario_logado is not None
-    checar_rate_limit(admin_usuarios_limiter, request)
+    await checar_rate_limit(admin_usuarios_limiter, request)
 
     usuario = _obter_usuario_ou_404(id)
 
@@ -25,11 +25,13 @@ from repo import usuario_repo
 from util.api_helpers import checar_rate_limit
 from util.auth_decorator import criar_sessao, destruir_sessao, requer_autenticacao
 from util.csrf_protection import obter_token_csrf
+from util.db_async import executar_db
 from util.datetime_util import agora
 from util.email_service import servico_email
 from util.logger_config import logger
 from util.perfis import Perfil
 from util.rate_limiter import DynamicRateLimiter
+from util.rate_limit_armazenamento import RATE_LIMIT_AUTH_BLOQUEAR_EM_FALHA
 from util.security import (
     criar_hash_senha,
     verificar_senha,
@@ -53,6 +55,7 @@ login_limiter = DynamicRateLimiter(
     padrao_max=5,
     padrao_minutos=5,
     nome="login",
+    bloquear_em_falha=RATE_LIMIT_AUTH_BLOQUEAR_EM_FALHA,
 )
 cadastro_limiter = DynamicRateLimiter(
     chave_max="rate_limit_cadastro_max",
@@ -60,6 +63,7 @@ cadastro_limiter = DynamicRateLimiter(
     padrao_max=3,
     padrao_minutos=10,
     nome="cadastro",
+    bloquear_em_falha=RATE_LIMIT_AUTH_BLOQUEAR_EM_FALHA,
 )
 esqueci_senha_limiter = DynamicRateLimiter(
     chave_max="rate_limit_esqueci_senha_max",
@@ -67,6 +71,7 @@ esqueci_senha_limiter = DynamicRateLimiter(
     padrao_max=1,
     padrao_minutos=1,
     nome="esqueci_senha",
+    bloquear_em_falha=RATE_LIMIT_AUTH_BLOQUEAR_EM_FALHA,
 )
 
 
@@ -85,7 +90,7 @@ async def get_csrf_token(request: Request):
 async def get_me(request: Request, usuario_logado: Optional[UsuarioLogado] = None):
     """Retorna o usuário autenticado atual (401 se não houver sessão)."""
     assert usuario_logado is not None
-    usuario = usuario_repo.obter_por_id(usuario_logado.id)
+    usuario = await executar_db(usuario_repo.obter_por_id, usuario_logado.id)
     if not usuario:
         destruir_sessao(request)
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail="Sessão inválida.")
@@ -99,9 +104,9 @@ async def get_me(request: Request, usuario_logado: Optional[UsuarioLogado] = Non
 @router.post("/login", response_model=UsuarioResponse)
 async def post_login(request: Request, dto: LoginDTO):
     """Autentica o usuário e cria a sessão."""
-    checar_rate_limit(login_limiter, request)
+    await checar_rate_limit(login_limiter, request)
 
-    usuario = usuario_repo.obter_por_email(dto.email)
+    usuario = await executar_db(usuario_repo.obter_por_email, dto.email)
     if not usuario or not verificar_senha(dto.senha, usuario.senha):
         logger.warning(f"Login falhou para: {dto.email}")
         raise HTTPException(
@@ -135,7 +140,7 @@ async def post_logout(request: Request):
 )
 async def post_cadastrar(request: Request, dto: CadastroDTO):
     """Cria um novo usuário."""
-    checar_rate_limit(cadastro_limiter, request)
+    await checar_rate_limit(cadastro_limiter, request)
 
     # Guarda anti-escalada de privilégio: o perfil chega do cliente, então o
     # servidor precisa rejeitar qualquer perfil fora da lista de auto-cadastro
@@ -153,7 +158,7 @@ async def post_cadastrar(request: Request, dto: CadastroDTO):
             },
         )
 
-    disponivel, mensagem_erro = verificar_email_disponivel(dto.email)
+    disponivel, mensagem_erro = await executar_db(verificar_email_disponivel, dto.email)
     if not disponivel:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -171,7 +176,7 @@ async def post_cadastrar(request: Request, dto: CadastroDTO):
         senha=criar_hash_senha(dto.senha),
         perfil=dto.perfil,
     )
-    usuario_id = usuario_repo.inserir(usuario)
+    usuario_id = await executar_db(usuario_repo.inserir, usuario)
     if not usuario_id:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -181,7 +186,7 @@ async def post_cadastrar(request: Request, dto: CadastroDTO):
     logger.info(f"Novo usuário cadastrado: {usuario.email}")
     servico_email.enviar_boas_vindas(usuario.email, usuario.nome)
 
-    criado = usuario_repo.obter_por_id(usuario_id)
+    criado = await executar_db(usuario_repo.obter_por_id, usuario_id)
     return UsuarioResponse.de_usuario(criado)
 
 
@@ -192,13 +197,13 @@ async def post_cadastrar(request: Request, dto: CadastroDTO):
 @router.post("/esqueci-senha", response_model=MensagemResponse)
 async def post_esqueci_senha(request: Request, dto: EsqueciSenhaDTO):
     """Solicita recuperação de senha; e-mail com link para o SPA."""
-    checar_rate_limit(esqueci_senha_limiter, request)
+    await checar_rate_limit(esqueci_senha_limiter, request)
 
-    usuario = usuario_repo.obter_por_email(dto.email)
+    usuario = await executar_db(usuario_repo.obter_por_email, dto.email)
     if usuario:
         token = gerar_token_redefinicao()
         data_expiracao = obter_data_expiracao_token(horas=TOKEN_EXPIRACAO_HORAS)
-        usuario_repo.atualizar_token(usuario.email, token, data_expiracao)
+        await executar_db(usuario_repo.atualizar_token, usuario.email, token, data_expiracao)
         enviado = servico_email.enviar_recuperacao_senha(
             usuario.email, usuario.nome, token
         )
@@ -219,7 +224,7 @@ async def post_esqueci_senha(request: Request, dto: EsqueciSenhaDTO):
 @router.post("/redefinir-senha", response_model=MensagemResponse)
 async def post_redefinir_senha(request: Request, dto: RedefinirSenhaDTO):
     """Redefine a senha a partir do token recebido por e-mail."""
-    usuario = usuario_repo.obter_por_token(dto.token)
+    usuario = await executar_db(usuario_repo.obter_por_token, dto.token)
     if not usuario or not usuario.data_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -244,8 +249,12 @@ async def post_redefinir_senha(request: Request, dto: RedefinirSenhaDTO):
         )
 
     senha_hash = criar_hash_senha(dto.senha)
-    usuario_repo.atualizar_senha(usuario.id, senha_hash)
-    usuario_repo.limpar_token(usuario.id)
+    if not await executar_db(usuario_repo.redefinir_senha, usuario.id, senha_hash, dto.token):
+        # Token já usado por outro pedido entre a leitura e a gravação
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token inválido ou expirado.",
+        )
     logger.info(f"Senha redefinida para: {usuario.email}")
 
     return MensagemResponse(message="Senha redefinida com sucesso.")
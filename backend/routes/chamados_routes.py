@@ -142,7 +142,7 @@ async def criar(
 ):
     """Abre um novo chamado, criando a interação inicial com a descrição."""
     assert usuario_logado is not None
-    checar_rate_limit(chamado_criar_limiter, request)
+    await checar_rate_limit(chamado_criar_limiter, request)
 
     chamado = Chamado(
         id=0,
@@ -219,7 +219,7 @@ async def responder(
 ):
     """Adiciona uma resposta do usuário ao próprio chamado."""
     assert usuario_logado is not None
-    checar_rate_limit(chamado_responder_limiter, request)
+    await checar_rate_limit(chamado_responder_limiter, request)
 
     chamado = _obter_chamado_do_usuario(id, usuario_logado)
 
@@ -12,12 +12,10 @@ não usa ``response_model`` nem retorna JSON estruturado.
 
 # Standard library
 import asyncio
-import json
-from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Union
 
 # Third-party
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
 
 # DTOs (entrada)
@@ -27,6 +25,7 @@ from dtos.chat_dto import CriarSalaDTO, EnviarMensagemDTO
 from dtos.responses.chat_response import (
     ChatHealthResponse,
     ChatMensagemResponse,
+    ChatMensagensCursorResponse,
     ChatSalaResponse,
     ConversaResponse,
     EventoAtualizarContadorSSE,
@@ -50,9 +49,11 @@ from repo import (
 # Utilities
 from util.api_helpers import checar_rate_limit
 from util.auth_decorator import requer_autenticacao
-from util.chat_manager import gerenciador_chat
+from util.chat_manager import fluxo_sse, gerenciador_chat
+from util.db_async import executar_db
 from util.datetime_util import agora
 from util.logger_config import logger
+from util.paginacao_util import ID_MAXIMO, codificar_cursor, decodificar_cursor
 from util.perfis import Perfil
 from util.rate_limiter import DynamicRateLimiter
 
@@ -62,6 +63,9 @@ from util.rate_limiter import DynamicRateLimiter
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
+# Tamanho máximo de uma janela de mensagens na paginação por cursor
+LIMITE_JANELA_MENSAGENS = 100
+
 # =============================================================================
 # Rate Limiters
 # =============================================================================
@@ -96,6 +100,37 @@ chat_listagem_limiter = DynamicRateLimiter(
 )
 
 
+# =============================================================================
+# Helpers (executados no executor do banco via executar_db)
+# =============================================================================
+
+def _criar_sala_com_participantes(usuario_id: int, outro_usuario_id: int):
+    """Cria ou obtém a sala e garante os dois participantes."""
+    sala = chat_sala_repo.criar_ou_obter_sala(usuario_id, outro_usuario_id)
+
+    # Adicionar participantes se ainda não existirem
+    if not chat_participante_repo.obter_por_sala_e_usuario(sala.id, usuario_id):
+        chat_participante_repo.adicionar_participante(sala.id, usuario_id)
+
+    if not chat_participante_repo.obter_por_sala_e_usuario(sala.id, outro_usuario_id):
+        chat_participante_repo.adicionar_participante(sala.id, outro_usuario_id)
+
+    return sala
+
+
+def _inserir_mensagem(sala_id: str, usuario_id: int, mensagem: str):
+    """Insere a mensagem e atualiza a última atividade da sala."""
+    nova_mensagem = chat_mensagem_repo.inserir(sala_id, usuario_id, mensagem)
+    chat_sala_repo.atualizar_ultima_atividade(sala_id)
+    return nova_mensagem
+
+
+def _marcar_lidas(sala_id: str, usuario_id: int) -> None:
+    """Marca as mensagens como lidas e registra a leitura."""
+    chat_mensagem_repo.marcar_como_lidas(sala_id, usuario_id)
+    chat_participante_repo.atualizar_ultima_leitura(sala_id, usuario_id)
+
+
 # =============================================================================
 # Stream SSE (mantido como stream — NÃO é JSON estruturado)
 # =============================================================================
@@ -106,7 +141,14 @@ async def stream_mensagens(request: Request, usuario_logado: Optional[UsuarioLog
     """
     Endpoint SSE para receber mensagens em tempo real.
 
-    Cada usuário mantém UMA conexão que recebe mensagens de TODAS as suas salas.
+    Cada conexão recebe mensagens de TODAS as salas do usuário; o usuário pode
+    manter várias conexões (abas) ao mesmo tempo. Cada evento leva um ``id:``
+    e, na reconexão automática do ``EventSource``, o header ``Last-Event-ID``
+    faz o servidor reenviar os eventos perdidos (ou um evento
+    ``ressincronizar`` se eles não estiverem mais no buffer).
+    Eventos acumulados são enviados juntos em um único chunk (contadores
+    repetidos da mesma sala são coalescidos) e, sem eventos, o stream envia
+    um comentário de heartbeat a cada CHAT_SSE_HEARTBEAT_SEGUNDOS.
 
     Observação: o ``EventSource`` do browser envia automaticamente o cookie de
     sessão e GET é isento de CSRF, portanto não há header CSRF exigido aqui.
@@ -115,25 +157,22 @@ async def stream_mensagens(request: Request, usuario_logado: Optional[UsuarioLog
     assert usuario_logado is not None
     usuario_id = usuario_logado.id
 
+    # Header enviado pelo EventSource ao reconectar (ID de outro worker ou
+    # inválido resulta em "ressincronizar")
+    ultimo_evento_id: Optional[str] = request.headers.get("last-event-id") or None
+
     async def event_generator():
-        # Conectar usuário ao GerenciadorChat
-        queue = await gerenciador_chat.conectar(usuario_id)
+        # Conectar usuário ao GerenciadorChat (com replay, se reconexão)
+        queue = await gerenciador_chat.conectar(usuario_id, ultimo_evento_id)
         try:
-            while True:
-                # Aguardar mensagem na fila
-                evento = await queue.get()
-
-                # Formatar como SSE
-                sse_data = f"data: {json.dumps(evento)}\n\n"
-                yield sse_data
-
-                # Pequeno delay para não sobrecarregar
-                await asyncio.sleep(0.1)
+            # Eventos em lote (drenados e coalescidos) + heartbeat periódico
+            async for chunk in fluxo_sse(queue):
+                yield chunk
         except asyncio.CancelledError:
             logger.info(f"[SSE] Conexão cancelada para usuário {usuario_id}")
         finally:
             # Desconectar ao fechar stream
-            await gerenciador_chat.desconectar(usuario_id)
+            await gerenciador_chat.desconectar(usuario_id, queue)
 
     return StreamingResponse(
         event_generator(),
@@ -159,7 +198,7 @@ async def criar_ou_obter_sala(
 ):
     """Cria ou obtém a sala de chat entre o usuário logado e outro usuário."""
     assert usuario_logado is not None
-    checar_rate_limit(chat_sala_limiter, request)
+    await checar_rate_limit(chat_sala_limiter, request)
 
     # Não pode criar sala consigo mesmo
     if dto.outro_usuario_id == usuario_logado.id:
@@ -169,23 +208,14 @@ async def criar_ou_obter_sala(
         )
 
     # Verificar se outro usuário existe
-    outro_usuario = usuario_repo.obter_por_id(dto.outro_usuario_id)
+    outro_usuario = await executar_db(usuario_repo.obter_por_id, dto.outro_usuario_id)
     if not outro_usuario:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usuário não encontrado.",
         )
 
-    # Criar ou obter sala
-    sala = chat_sala_repo.criar_ou_obter_sala(usuario_logado.id, dto.outro_usuario_id)
-
-    # Adicionar participantes se ainda não existirem
-    if not chat_participante_repo.obter_por_sala_e_usuario(sala.id, usuario_logado.id):
-        chat_participante_repo.adicionar_participante(sala.id, usuario_logado.id)
-
-    if not chat_participante_repo.obter_por_sala_e_usuario(sala.id, dto.outro_usuario_id):
-        chat_participante_repo.adicionar_participante(sala.id, dto.outro_usuario_id)
-
+    sala = await executar_db(_criar_sala_com_participantes, usuario_logado.id, dto.outro_usuario_id)
     return ChatSalaResponse.de_sala(sala)
 
 
@@ -203,75 +233,105 @@ async def listar_conversas(
 ):
     """Lista conversas do usuário (sala, outro participante, última mensagem e não lidas)."""
     assert usuario_logado is not None
-    checar_rate_limit(chat_listagem_limiter, request)
-
-    usuario_id = usuario_logado.id
-
-    # Obter todas as participações do usuário
-    participacoes = chat_participante_repo.listar_por_usuario(usuario_id)
+    await checar_rate_limit(chat_listagem_limiter, request)
 
-    conversas: List[ConversaResponse] = []
-    for participacao in participacoes:
-        sala = chat_sala_repo.obter_por_id(participacao.sala_id)
-        if not sala:
-            continue
-
-        # Obter o outro participante da sala
-        participantes = chat_participante_repo.listar_por_sala(sala.id)
-        outro_participante = next(
-            (p for p in participantes if p.usuario_id != usuario_id),
-            None,
-        )
-        if not outro_participante:
-            continue
-
-        # Obter dados do outro usuário
-        outro_usuario = usuario_repo.obter_por_id(outro_participante.usuario_id)
-        if not outro_usuario:
-            continue
-
-        ultima_mensagem = chat_mensagem_repo.obter_ultima_mensagem_sala(sala.id)
-        nao_lidas = chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario_id)
-
-        conversas.append(
-            ConversaResponse.de_dados(sala, outro_usuario, ultima_mensagem, nao_lidas)
-        )
-
-    # Ordenar por última atividade (mais recente primeiro)
-    _epoch_min = datetime.min.replace(tzinfo=timezone.utc)
-    conversas.sort(
-        key=lambda c: c.ultima_atividade or _epoch_min,
-        reverse=True,
+    # Uma única consulta: ordenação por última atividade e paginação no SQL
+    conversas = await executar_db(
+        chat_sala_repo.listar_conversas_por_usuario, usuario_logado.id, limit, offset
     )
+    return [ConversaResponse.de_conversa(c) for c in conversas]
 
-    # Aplicar paginação
-    return conversas[offset:offset + limit]
 
-
-@router.get("/mensagens/{sala_id}", response_model=List[ChatMensagemResponse])
+@router.get(
+    "/mensagens/{sala_id}",
+    response_model=Union[List[ChatMensagemResponse], ChatMensagensCursorResponse],
+)
 @requer_autenticacao()
 async def listar_mensagens(
     request: Request,
     sala_id: str,
     limit: int = 50,
     offset: int = 0,
+    before_id: Optional[int] = Query(default=None, ge=0, le=ID_MAXIMO),
+    after_id: Optional[int] = Query(default=None, ge=0, le=ID_MAXIMO),
+    cursor: Optional[str] = None,
     usuario_logado: Optional[UsuarioLogado] = None,
 ):
-    """Lista mensagens de uma sala específica com paginação."""
+    """
+    Lista mensagens de uma sala específica com paginação.
+
+    Dois modos:
+
+    - **offset** (padrão, compatibilidade): ``limit``/``offset`` sobre as
+      mensagens em ordem cronológica; retorna uma lista.
+    - **cursor** (keyset), ativado por ``before_id``, ``after_id`` ou
+      ``cursor``: retorna ``{items, next_cursor}``. Sem ``after_id``, a janela
+      traz as mensagens mais recentes anteriores a ``before_id`` (ou as mais
+      recentes da sala); com ``after_id``, as seguintes a esse ID. Os itens
+      vêm sempre em ordem cronológica e ``next_cursor`` continua na mesma
+      direção.
+    """
     assert usuario_logado is not None
-    checar_rate_limit(chat_listagem_limiter, request)
+    await checar_rate_limit(chat_listagem_limiter, request)
 
     usuario_id = usuario_logado.id
 
+    modo_cursor = before_id is not None or after_id is not None or cursor is not None
+    if modo_cursor:
+        if cursor is not None:
+            if before_id is not None or after_id is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Use cursor ou before_id/after_id, não ambos.",
+                )
+            try:
+                direcao, referencia_id = decodificar_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor inválido.",
+                )
+            if direcao == "antes":
+                before_id = referencia_id
+            else:
+                after_id = referencia_id
+        elif before_id is not None and after_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Informe before_id ou after_id, não ambos.",
+            )
+
     # Verificar se usuário participa da sala
-    if not chat_participante_repo.obter_por_sala_e_usuario(sala_id, usuario_id):
+    if not await executar_db(chat_participante_repo.obter_por_sala_e_usuario, sala_id, usuario_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem acesso a esta sala.",
         )
 
-    mensagens = chat_mensagem_repo.listar_por_sala(sala_id, limit, offset)
-    return [ChatMensagemResponse.de_mensagem(msg) for msg in mensagens]
+    if not modo_cursor:
+        mensagens = await executar_db(chat_mensagem_repo.listar_por_sala, sala_id, limit, offset)
+        return [ChatMensagemResponse.de_mensagem(msg) for msg in mensagens]
+
+    limit = max(1, min(limit, LIMITE_JANELA_MENSAGENS))
+    mensagens, tem_mais = await executar_db(
+        chat_mensagem_repo.listar_janela_por_sala,
+        sala_id,
+        limit,
+        antes_de_id=before_id,
+        depois_de_id=after_id,
+    )
+
+    next_cursor = None
+    if tem_mais and mensagens:
+        if after_id is not None:
+            next_cursor = codificar_cursor("depois", mensagens[-1].id)
+        else:
+            next_cursor = codificar_cursor("antes", mensagens[0].id)
+
+    return ChatMensagensCursorResponse(
+        items=[ChatMensagemResponse.de_mensagem(msg) for msg in mensagens],
+        next_cursor=next_cursor,
+    )
 
 
 @router.post(
@@ -287,29 +347,25 @@ async def enviar_mensagem(
 ):
     """Envia uma mensagem em uma sala e faz broadcast via SSE para os participantes."""
     assert usuario_logado is not None
-    checar_rate_limit(chat_mensagem_limiter, request)
+    await checar_rate_limit(chat_mensagem_limiter, request)
 
     usuario_id = usuario_logado.id
 
     # Verificar se usuário participa da sala
-    if not chat_participante_repo.obter_por_sala_e_usuario(dto.sala_id, usuario_id):
+    if not await executar_db(chat_participante_repo.obter_por_sala_e_usuario, dto.sala_id, usuario_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem acesso a esta sala.",
         )
 
     # Verificar se sala existe
-    if not chat_sala_repo.obter_por_id(dto.sala_id):
+    if not await executar_db(chat_sala_repo.obter_por_id, dto.sala_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Sala não encontrada.",
         )
 
-    # Inserir mensagem
-    nova_mensagem = chat_mensagem_repo.inserir(dto.sala_id, usuario_id, dto.mensagem)
-
-    # Atualizar última atividade da sala
-    chat_sala_repo.atualizar_ultima_atividade(dto.sala_id)
+    nova_mensagem = await executar_db(_inserir_mensagem, dto.sala_id, usuario_id, dto.mensagem)
 
     resposta = ChatMensagemResponse.de_mensagem(nova_mensagem)
 
@@ -336,14 +392,13 @@ async def marcar_como_lidas(
     usuario_id = usuario_logado.id
 
     # Verificar se usuário participa da sala
-    if not chat_participante_repo.obter_por_sala_e_usuario(sala_id, usuario_id):
+    if not await executar_db(chat_participante_repo.obter_por_sala_e_usuario, sala_id, usuario_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem acesso a esta sala.",
         )
 
-    chat_mensagem_repo.marcar_como_lidas(sala_id, usuario_id)
-    chat_participante_repo.atualizar_ultima_leitura(sala_id, usuario_id)
+    await executar_db(_marcar_lidas, sala_id, usuario_id)
 
     # Notificar via SSE para atualizar contador (payload tipado)
     evento_sse = EventoAtualizarContadorSSE(sala_id=sala_id)
@@ -362,16 +417,9 @@ async def contar_nao_lidas_total(
 ):
     """Conta o total de mensagens não lidas em todas as salas do usuário."""
     assert usuario_logado is not None
-    usuario_id = usuario_logado.id
-
-    participacoes = chat_participante_repo.listar_por_usuario(usuario_id)
-
-    total_nao_lidas = 0
-    for participacao in participacoes:
-        total_nao_lidas += chat_participante_repo.contar_mensagens_nao_lidas(
-            participacao.sala_id, usuario_id
-        )
-
+    total_nao_lidas = await executar_db(
+        chat_participante_repo.contar_nao_lidas_total, usuario_logado.id
+    )
     return TotalNaoLidasResponse(total=total_nao_lidas)
 
 
@@ -393,12 +441,12 @@ async def buscar_usuarios(
     contactados via sistema de chamados.
     """
     assert usuario_logado is not None
-    checar_rate_limit(busca_usuarios_limiter, request)
+    await checar_rate_limit(busca_usuarios_limiter, request)
 
     if len(q) < 2:
         return []
 
-    usuarios = usuario_repo.buscar_por_termo(q, limit=10)
+    usuarios = await executar_db(usuario_repo.buscar_por_termo, q, limit=10)
 
     usuarios_filtrados = [
         u
@@ -415,10 +463,14 @@ async def buscar_usuarios(
 
 @router.get("/health", response_model=ChatHealthResponse)
 async def chat_health():
-    """Health check do sistema de chat (conexões SSE ativas)."""
+    """Health check do sistema de chat (conexões SSE ativas e atraso das filas)."""
     estatisticas = gerenciador_chat.obter_estatisticas()
     return ChatHealthResponse(
         status="healthy",
         conexoes_ativas=estatisticas["total_usuarios_ativos"],
+        eventos_pendentes=estatisticas["total_pendentes"],
+        atraso_maximo_segundos=estatisticas["atraso_maximo_segundos"],
+        eventos_descartados=estatisticas["total_descartados"],
+        desconectados_por_lentidao=estatisticas["desconectados_por_lentidao"],
         timestamp=agora(),
     )
@@ -3,11 +3,14 @@ Rotas do sistema de notificações in-app (API JSON).
 
 Endpoints disponíveis:
 - GET    /notificacoes               → Lista paginada das notificações do usuário
-- GET    /notificacoes/nao-lidas     → Contagem + resumo das não lidas (polling)
+- GET    /notificacoes/nao-lidas     → Contagem + resumo das não lidas (carga inicial)
 - PATCH  /notificacoes/{id}/lida     → Marca uma notificação como lida
 - PATCH  /notificacoes/marcar-todas  → Marca todas as notificações como lidas
 - DELETE /notificacoes/{id}          → Exclui uma notificação específica
 - DELETE /notificacoes/lidas         → Exclui todas as notificações já lidas
+
+Mudanças no total de não lidas são enviadas pelo stream SSE do chat
+(evento "notificacao", ver util/notificacao_util.publicar_nao_lidas).
 """
 
 from typing import Optional
@@ -30,8 +33,9 @@ from repo import notificacao_repo
 
 # Utilities
 from util.auth_decorator import requer_autenticacao
+from util.db_async import executar_db
 from util.logger_config import logger
-from util.paginacao_util import paginar
+from util.notificacao_util import publicar_nao_lidas
 
 router = APIRouter(prefix="/notificacoes")
 
@@ -50,8 +54,9 @@ async def listar(
     """Lista as notificações do usuário logado com paginação."""
     assert usuario_logado is not None
 
-    todas = notificacao_repo.obter_por_usuario(usuario_logado.id, limite=100)
-    paginacao = paginar(todas, pagina=pagina, por_pagina=15)
+    paginacao = await executar_db(
+        notificacao_repo.obter_pagina_por_usuario, usuario_logado.id, pagina, 15
+    )
 
     items = [NotificacaoResponse.de_notificacao(n) for n in paginacao.items]
     return PaginaResponse.de_paginacao(paginacao, items)
@@ -66,12 +71,13 @@ async def obter_nao_lidas(
     """
     Retorna a contagem e um resumo das notificações não lidas.
 
-    Usado pelo frontend para polling (atualizar badge do navbar a cada 30s).
+    Usado pelo frontend ao abrir a página e num polling de segurança longo;
+    as atualizações do badge chegam pelo stream SSE (evento "notificacao").
     """
     assert usuario_logado is not None
 
-    total = notificacao_repo.contar_nao_lidas(usuario_logado.id)
-    nao_lidas = notificacao_repo.obter_nao_lidas(usuario_logado.id, limite=5)
+    total = await executar_db(notificacao_repo.contar_nao_lidas, usuario_logado.id)
+    nao_lidas = await executar_db(notificacao_repo.obter_nao_lidas, usuario_logado.id, limite=5)
 
     return NaoLidasResponse(
         total=total,
@@ -92,8 +98,9 @@ async def marcar_todas_lidas(
     """Marca todas as notificações do usuário logado como lidas."""
     assert usuario_logado is not None
 
-    total = notificacao_repo.marcar_todas_como_lidas(usuario_logado.id)
+    total = await executar_db(notificacao_repo.marcar_todas_como_lidas, usuario_logado.id)
     if total > 0:
+        await executar_db(publicar_nao_lidas, usuario_logado.id)
         return MensagemResponse(
             message=f"{total} notificação(ões) marcada(s) como lida(s)."
         )
@@ -111,15 +118,19 @@ async def marcar_lida(
     assert usuario_logado is not None
 
     # Garantir que a notificação pertence ao usuário logado.
-    notificacoes = notificacao_repo.obter_por_usuario(usuario_logado.id, limite=100)
-    notificacao = next((n for n in notificacoes if n.id == notificacao_id), None)
+    notificacao = await executar_db(
+        notificacao_repo.obter_por_id, notificacao_id, usuario_logado.id
+    )
     if notificacao is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notificação não encontrada.",
         )
 
-    notificacao_repo.marcar_como_lida(notificacao_id, usuario_logado.id)
+    await executar_db(notificacao_repo.marcar_como_lida, notificacao_id, usuario_logado.id)
+    if not notificacao.lida:
+        # Atualiza o badge das outras abas/dispositivos do usuário
+        await executar_db(publicar_nao_lidas, usuario_logado.id)
     notificacao.lida = True
     logger.info(
         f"Notificação {notificacao_id} marcada como lida - Usuário ID: {usuario_logado.id}"
@@ -140,7 +151,7 @@ async def excluir_lidas(
     """Exclui todas as notificações já lidas do usuário logado."""
     assert usuario_logado is not None
 
-    total = notificacao_repo.excluir_lidas(usuario_logado.id)
+    total = await executar_db(notificacao_repo.excluir_lidas, usuario_logado.id)
     if total > 0:
         return MensagemResponse(message=f"{total} notificação(ões) excluída(s).")
     return MensagemResponse(message="Não há notificações lidas para excluir.")
@@ -156,13 +167,14 @@ async def excluir(
     """Exclui uma notificação específica do usuário logado."""
     assert usuario_logado is not None
 
-    sucesso = notificacao_repo.excluir(notificacao_id, usuario_logado.id)
+    sucesso = await executar_db(notificacao_repo.excluir, notificacao_id, usuario_logado.id)
     if not sucesso:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notificação não encontrada.",
         )
 
+    await executar_db(publicar_nao_lidas, usuario_logado.id)
     logger.info(
         f"Notificação {notificacao_id} excluída - Usuário ID: {usuario_logado.id}"
     )
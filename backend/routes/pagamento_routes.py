@@ -97,7 +97,7 @@ async def criar(
         5. Retorna {init_point, pagamento_id}
     """
     assert usuario_logado is not None
-    checar_rate_limit(pagamento_criar_limiter, request)
+    await checar_rate_limit(pagamento_criar_limiter, request)
 
     provider = PaymentService.obter_provider()
 
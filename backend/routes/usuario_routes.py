@@ -138,7 +138,7 @@ async def put_senha(
 ):
     """Altera a senha do usuário logado."""
     assert usuario_logado is not None
-    checar_rate_limit(alterar_senha_limiter, request)
+    await checar_rate_limit(alterar_senha_limiter, request)
 
     usuario = _obter_usuario_atual(usuario_logado)
 
@@ -189,7 +189,7 @@ async def put_foto(
 ):
     """Atualiza a foto de perfil (imagem cropada em base64)."""
     assert usuario_logado is not None
-    checar_rate_limit(upload_foto_limiter, request)
+    await checar_rate_limit(upload_foto_limiter, request)
 
     usuario_id = usuario_logado.id
 
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Script standalone para reconstruir os contadores de mensagens não lidas do chat.
+
+O contador `chat_participante.nao_lidas` é mantido pelo repositório a cada
+mensagem inserida/lida. Este script o recalcula a partir das mensagens (a
+mesma reconciliação que chat_participante_repo.criar_tabela executa uma
+única vez, ao migrar um banco sem a coluna) para reparos manuais, e pode
+ser agendado via cron. A aplicação não a executa a cada startup: o UPDATE
+percorre todos os participantes segurando a trava de escrita.
+
+Uso:
+    python scripts/reconciliar_nao_lidas.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'dados.db')
+
+# Raiz do projeto = pasta pai de scripts/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from repo import chat_participante_repo
+from util.db_util import fechar_pool
+
+
+def main():
+    if not os.path.exists(DATABASE_PATH):
+        print(f"❌ Banco de dados não encontrado em: {DATABASE_PATH}")
+        sys.exit(1)
+
+    try:
+        corrigidos = chat_participante_repo.reconciliar_nao_lidas()
+    finally:
+        fechar_pool()
+
+    if corrigidos:
+        print(f"✅ {corrigidos} contador(es) de não lidas corrigido(s).")
+    else:
+        print("✅ Contadores de não lidas já estavam consistentes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,53 @@ CREATE TABLE IF NOT EXISTS chamado_interacao (
 )
 """
 
+# Índice das mensagens para a busca do admin (ver BUSCA_ADMIN_RELEVANCIA em
+# sql/chamado_sql.py), com o mesmo tokenizador de chamado_busca
+CRIAR_TABELA_BUSCA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS chamado_interacao_busca USING fts5(
+    mensagem,
+    content='chamado_interacao',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)
+"""
+
+EXISTE_TABELA_BUSCA = (
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chamado_interacao_busca'"
+)
+
+# Reindexa todas as mensagens (bancos criados antes do índice)
+RECONSTRUIR_BUSCA = "INSERT INTO chamado_interacao_busca (chamado_interacao_busca) VALUES ('rebuild')"
+
+# Cada mensagem nova entra no índice na mesma transação do INSERT; a
+# exclusão do chamado remove as mensagens em cascata, disparando o delete.
+CRIAR_TRIGGERS_BUSCA = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_chamado_interacao_busca_insert
+    AFTER INSERT ON chamado_interacao
+    BEGIN
+        INSERT INTO chamado_interacao_busca (rowid, mensagem) VALUES (new.id, new.mensagem);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_chamado_interacao_busca_delete
+    AFTER DELETE ON chamado_interacao
+    BEGIN
+        INSERT INTO chamado_interacao_busca (chamado_interacao_busca, rowid, mensagem)
+        VALUES ('delete', old.id, old.mensagem);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_chamado_interacao_busca_update
+    AFTER UPDATE OF mensagem ON chamado_interacao
+    BEGIN
+        INSERT INTO chamado_interacao_busca (chamado_interacao_busca, rowid, mensagem)
+        VALUES ('delete', old.id, old.mensagem);
+        INSERT INTO chamado_interacao_busca (rowid, mensagem) VALUES (new.id, new.mensagem);
+    END
+    """,
+]
+
 INSERIR = """
 INSERT INTO chamado_interacao (chamado_id, usuario_id, mensagem, tipo, status_resultante)
 VALUES (?, ?, ?, ?, ?)
@@ -84,6 +131,17 @@ WHERE data_leitura IS NULL
 GROUP BY chamado_id
 """
 
+# Mesma contagem restrita a uma lista de chamados (JSON com os IDs), para
+# listagens paginadas que só precisam dos chamados da página
+CONTAR_NAO_LIDAS_POR_CHAMADOS = """
+SELECT chamado_id, COUNT(*) as nao_lidas
+FROM chamado_interacao
+WHERE chamado_id IN (SELECT value FROM json_each(?))
+  AND data_leitura IS NULL
+  AND usuario_id != ?
+GROUP BY chamado_id
+"""
+
 TEM_RESPOSTA_ADMIN = """
 SELECT COUNT(*) as total
 FROM chamado_interacao
@@ -77,3 +77,173 @@ SELECT COUNT(*) as total
 FROM chamado
 WHERE status IN ('Aberto', 'Em Análise')
 """
+
+# =============================================================================
+# Busca textual (FTS5)
+# =============================================================================
+
+# Índice dos títulos, com o mesmo tokenizador de usuario_busca (sem
+# diferenciar acentos). As mensagens ficam em chamado_interacao_busca
+# (sql/chamado_interacao_sql.py); a busca do admin consulta os dois.
+CRIAR_TABELA_BUSCA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS chamado_busca USING fts5(
+    titulo,
+    content='chamado',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)
+"""
+
+EXISTE_TABELA_BUSCA = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chamado_busca'"
+
+# Reindexa todos os chamados (bancos criados antes do índice)
+RECONSTRUIR_BUSCA = "INSERT INTO chamado_busca (chamado_busca) VALUES ('rebuild')"
+
+# Mantêm chamado_busca em sincronia com chamado (ver CRIAR_TRIGGERS_BUSCA
+# de sql/usuario_sql.py). A exclusão em cascata também dispara os triggers.
+CRIAR_TRIGGERS_BUSCA = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_chamado_busca_insert
+    AFTER INSERT ON chamado
+    BEGIN
+        INSERT INTO chamado_busca (rowid, titulo) VALUES (new.id, new.titulo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_chamado_busca_delete
+    AFTER DELETE ON chamado
+    BEGIN
+        INSERT INTO chamado_busca (chamado_busca, rowid, titulo)
+        VALUES ('delete', old.id, old.titulo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_chamado_busca_update
+    AFTER UPDATE OF titulo ON chamado
+    BEGIN
+        INSERT INTO chamado_busca (chamado_busca, rowid, titulo)
+        VALUES ('delete', old.id, old.titulo);
+        INSERT INTO chamado_busca (rowid, titulo) VALUES (new.id, new.titulo);
+    END
+    """,
+]
+
+# =============================================================================
+# Listagem do admin (montada por chamado_repo.obter_pagina_admin)
+# =============================================================================
+
+# Posição de cada prioridade na listagem (Urgente primeiro)
+POSICAO_PRIORIDADE = {"Urgente": 1, "Alta": 2, "Média": 3, "Baixa": 4}
+
+# Mesma expressão dos índices idx_chamado_status_prioridade_data e
+# idx_chamado_prioridade_data (sql/indices_sql.py): o SQLite só usa um
+# índice de expressão quando a consulta repete a expressão idêntica, tanto
+# no ORDER BY quanto no filtro por prioridade.
+ORDEM_PRIORIDADE = (
+    "(CASE prioridade WHEN 'Urgente' THEN 1 WHEN 'Alta' THEN 2 "
+    "WHEN 'Média' THEN 3 WHEN 'Baixa' THEN 4 END)"
+)
+
+LISTAR_ADMIN = """
+SELECT c.*,
+       u.nome as usuario_nome,
+       u.email as usuario_email
+FROM chamado c
+INNER JOIN usuario u ON c.usuario_id = u.id
+"""
+
+# O total não precisa do JOIN com usuario: conta só no índice
+CONTAR_ADMIN = "SELECT COUNT(*) as total FROM chamado c"
+
+FILTRO_ADMIN_STATUS = "c.status = ?"
+
+FILTRO_ADMIN_PRIORIDADE = f"{ORDEM_PRIORIDADE} = ?"
+
+ORDENAR_ADMIN = f"ORDER BY {ORDEM_PRIORIDADE}, c.data_abertura DESC, c.id DESC"
+
+# Com a prioridade fixada pelo filtro, o primeiro termo é constante e o
+# índice já entrega as linhas por data
+ORDENAR_ADMIN_POR_DATA = "ORDER BY c.data_abertura DESC, c.id DESC"
+
+# -----------------------------------------------------------------------------
+# Listagem do admin com busca textual
+# -----------------------------------------------------------------------------
+
+# Pesos sobre o bm25 (negativo: quanto menor, mais relevante). Um termo no
+# título pesa mais que o mesmo termo perdido numa conversa longa.
+PESO_BUSCA_TITULO = 2.0
+PESO_BUSCA_MENSAGEM = 1.0
+PESO_BUSCA_USUARIO = 1.0
+
+# Trecho com os termos entre <mark> e </mark> (texto puro, sem escapar HTML;
+# quem exibe deve tratar o restante como texto)
+_TRECHO = "'<mark>', '</mark>', '…', 16"
+
+# Cada chamado que casa com a expressão (mesmo parâmetro nos três ?) pelo
+# título, por uma mensagem ou pelo nome/e-mail do autor (usuario_busca).
+# Fica a melhor pontuação de cada chamado e o trecho da correspondência que
+# a deu (coluna "nua" ao lado de MIN, garantida pelo SQLite).
+BUSCA_ADMIN_RELEVANCIA = f"""
+WITH correspondencia AS (
+    SELECT rowid AS chamado_id,
+           bm25(chamado_busca) * {PESO_BUSCA_TITULO} AS pontuacao,
+           snippet(chamado_busca, 0, {_TRECHO}) AS trecho
+    FROM chamado_busca
+    WHERE chamado_busca MATCH ?1
+    UNION ALL
+    SELECT ci.chamado_id,
+           bm25(chamado_interacao_busca) * {PESO_BUSCA_MENSAGEM},
+           snippet(chamado_interacao_busca, 0, {_TRECHO})
+    FROM chamado_interacao_busca
+    INNER JOIN chamado_interacao ci ON ci.id = chamado_interacao_busca.rowid
+    WHERE chamado_interacao_busca MATCH ?1
+    UNION ALL
+    SELECT ch.id, bm25(usuario_busca) * {PESO_BUSCA_USUARIO}, NULL
+    FROM usuario_busca
+    INNER JOIN chamado ch ON ch.usuario_id = usuario_busca.rowid
+    WHERE usuario_busca MATCH ?1
+),
+relevancia AS (
+    SELECT chamado_id, MIN(pontuacao) AS pontuacao, trecho
+    FROM correspondencia
+    GROUP BY chamado_id
+)
+"""
+
+# CROSS JOIN fixa os chamados encontrados como laço externo: com filtro de
+# status o SQLite preferiria percorrer todos os chamados do status pelo
+# índice e procurar cada um entre os encontrados
+LISTAR_ADMIN_BUSCA = f"""{BUSCA_ADMIN_RELEVANCIA}
+SELECT c.*,
+       u.nome as usuario_nome,
+       u.email as usuario_email,
+       r.trecho as trecho_busca
+FROM relevancia r
+CROSS JOIN chamado c ON c.id = r.chamado_id
+INNER JOIN usuario u ON c.usuario_id = u.id
+"""
+
+# O total só precisa dos chamados encontrados: sem bm25 nem snippet, que
+# custam mais que a própria busca nos índices
+CONTAR_ADMIN_BUSCA = """
+WITH encontrado AS (
+    SELECT rowid AS chamado_id
+    FROM chamado_busca
+    WHERE chamado_busca MATCH ?1
+    UNION
+    SELECT ci.chamado_id
+    FROM chamado_interacao_busca
+    INNER JOIN chamado_interacao ci ON ci.id = chamado_interacao_busca.rowid
+    WHERE chamado_interacao_busca MATCH ?1
+    UNION
+    SELECT ch.id
+    FROM usuario_busca
+    INNER JOIN chamado ch ON ch.usuario_id = usuario_busca.rowid
+    WHERE usuario_busca MATCH ?1
+)
+SELECT COUNT(*) as total
+FROM encontrado r
+CROSS JOIN chamado c ON c.id = r.chamado_id
+"""
+
+ORDENAR_ADMIN_POR_RELEVANCIA = "ORDER BY r.pontuacao, c.id DESC"
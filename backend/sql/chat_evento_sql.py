@@ -0,0 +1,41 @@
+"""
+SQL statements para a tabela chat_evento.
+Log de eventos do chat compartilhado entre workers (backend de broadcast
+"sqlite" de util/chat_broadcast.py).
+"""
+
+# Cada evento publicado por um worker vira uma linha; os demais workers
+# consomem as linhas com id maior que o último visto. `destinatarios` é a
+# lista de IDs de usuário em JSON e `origem` identifica o worker publicador
+# (que já entregou o evento localmente e ignora a própria linha).
+CRIAR_TABELA = """
+CREATE TABLE IF NOT EXISTS chat_evento (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    origem TEXT NOT NULL,
+    destinatarios TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    criado_em TIMESTAMP NOT NULL
+)
+"""
+
+INSERIR = """
+INSERT INTO chat_evento (origem, destinatarios, payload, criado_em)
+VALUES (?, ?, ?, ?)
+"""
+
+# Busca pela PRIMARY KEY: custo proporcional aos eventos novos, não ao log.
+LISTAR_APOS = """
+SELECT id, origem, destinatarios, payload
+FROM chat_evento
+WHERE id > ?
+ORDER BY id
+LIMIT ?
+"""
+
+OBTER_ULTIMO_ID = """
+SELECT COALESCE(MAX(id), 0) FROM chat_evento
+"""
+
+EXCLUIR_ANTERIORES_A = """
+DELETE FROM chat_evento WHERE criado_em < ?
+"""
@@ -35,6 +35,26 @@ ORDER BY id ASC
 LIMIT ? OFFSET ?
 """
 
+# Paginação por cursor (keyset): usa o índice (sala_id, id) e não degrada
+# com a profundidade do histórico, ao contrário de OFFSET.
+# Janela das mensagens mais recentes anteriores a um ID (mais novas primeiro)
+LISTAR_POR_SALA_ANTES_DE = """
+SELECT id, sala_id, usuario_id, mensagem, data_envio[timestamp], lida_em[timestamp]
+FROM chat_mensagem
+WHERE sala_id = ? AND id < ?
+ORDER BY id DESC
+LIMIT ?
+"""
+
+# Janela das mensagens posteriores a um ID (mais antigas primeiro)
+LISTAR_POR_SALA_DEPOIS_DE = """
+SELECT id, sala_id, usuario_id, mensagem, data_envio[timestamp], lida_em[timestamp]
+FROM chat_mensagem
+WHERE sala_id = ? AND id > ?
+ORDER BY id ASC
+LIMIT ?
+"""
+
 CONTAR_POR_SALA = """
 SELECT COUNT(*) as total
 FROM chat_mensagem
@@ -8,55 +8,93 @@ CREATE TABLE IF NOT EXISTS chat_participante (
     sala_id TEXT NOT NULL,
     usuario_id INTEGER NOT NULL,
     ultima_leitura TIMESTAMP,
+    nao_lidas INTEGER NOT NULL DEFAULT 0,
     PRIMARY KEY (sala_id, usuario_id),
     FOREIGN KEY (sala_id) REFERENCES chat_sala(id) ON DELETE CASCADE,
     FOREIGN KEY (usuario_id) REFERENCES usuario(id) ON DELETE CASCADE
 )
 """
 
+# Migração de bancos criados antes do contador desnormalizado
+ADICIONAR_COLUNA_NAO_LIDAS = """
+ALTER TABLE chat_participante ADD COLUMN nao_lidas INTEGER NOT NULL DEFAULT 0
+"""
+
 INSERIR = """
-INSERT INTO chat_participante (sala_id, usuario_id, ultima_leitura)
-VALUES (?, ?, ?)
+INSERT INTO chat_participante (sala_id, usuario_id, ultima_leitura, nao_lidas)
+VALUES (?, ?, ?, 0)
 """
 
 OBTER_POR_SALA_E_USUARIO = """
-SELECT sala_id, usuario_id, ultima_leitura[timestamp]
+SELECT sala_id, usuario_id, ultima_leitura[timestamp], nao_lidas
 FROM chat_participante
 WHERE sala_id = ? AND usuario_id = ?
 """
 
 LISTAR_POR_SALA = """
-SELECT sala_id, usuario_id, ultima_leitura[timestamp]
+SELECT sala_id, usuario_id, ultima_leitura[timestamp], nao_lidas
 FROM chat_participante
 WHERE sala_id = ?
 """
 
 LISTAR_POR_USUARIO = """
-SELECT sala_id, usuario_id, ultima_leitura[timestamp]
+SELECT sala_id, usuario_id, ultima_leitura[timestamp], nao_lidas
 FROM chat_participante
 WHERE usuario_id = ?
 """
 
+# Registrar a leitura também zera o contador de não lidas
 ATUALIZAR_ULTIMA_LEITURA = """
 UPDATE chat_participante
-SET ultima_leitura = ?
+SET ultima_leitura = ?, nao_lidas = 0
 WHERE sala_id = ? AND usuario_id = ?
 """
 
+# Contador desnormalizado: mantido por chat_mensagem_repo.inserir (incrementa
+# para os demais participantes) e zerado ao marcar como lidas / registrar a
+# leitura. A verdade de referência é RECONCILIAR_NAO_LIDAS.
 CONTAR_MENSAGENS_NAO_LIDAS = """
-SELECT COUNT(*) as total
-FROM chat_mensagem m
-WHERE m.sala_id = ?
-  AND m.usuario_id != ?
-  AND (
-    (SELECT cp.ultima_leitura
-     FROM chat_participante cp
-     WHERE cp.sala_id = m.sala_id AND cp.usuario_id = ?) IS NULL
-    OR
-    (SELECT cp.ultima_leitura
-     FROM chat_participante cp
-     WHERE cp.sala_id = m.sala_id AND cp.usuario_id = ?) < m.data_envio
-  )
+SELECT nao_lidas AS total
+FROM chat_participante
+WHERE sala_id = ? AND usuario_id = ?
+"""
+
+SOMAR_NAO_LIDAS_POR_USUARIO = """
+SELECT COALESCE(SUM(nao_lidas), 0) AS total
+FROM chat_participante
+WHERE usuario_id = ?
+"""
+
+INCREMENTAR_NAO_LIDAS = """
+UPDATE chat_participante
+SET nao_lidas = nao_lidas + 1
+WHERE sala_id = ? AND usuario_id != ?
+"""
+
+ZERAR_NAO_LIDAS = """
+UPDATE chat_participante
+SET nao_lidas = 0
+WHERE sala_id = ? AND usuario_id = ?
+"""
+
+# Recalcula os contadores a partir das mensagens (mensagens dos outros
+# participantes enviadas após a última leitura). Só altera as linhas
+# divergentes, então o rowcount indica quantos contadores foram corrigidos.
+RECONCILIAR_NAO_LIDAS = """
+UPDATE chat_participante
+SET nao_lidas = real.total
+FROM (
+    SELECT cp.sala_id, cp.usuario_id, COUNT(m.id) AS total
+    FROM chat_participante cp
+    LEFT JOIN chat_mensagem m
+        ON m.sala_id = cp.sala_id
+       AND m.usuario_id != cp.usuario_id
+       AND (cp.ultima_leitura IS NULL OR cp.ultima_leitura < m.data_envio)
+    GROUP BY cp.sala_id, cp.usuario_id
+) AS real
+WHERE real.sala_id = chat_participante.sala_id
+  AND real.usuario_id = chat_participante.usuario_id
+  AND chat_participante.nao_lidas != real.total
 """
 
 EXCLUIR = """
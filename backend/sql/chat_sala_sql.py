@@ -28,6 +28,42 @@ SET ultima_atividade = ?
 WHERE id = ?
 """
 
+# Página de conversas de um usuário em uma única consulta.
+# A CTE `pagina` ordena e pagina as salas antes de tocar em chat_mensagem;
+# para cada sala da página, a última mensagem é obtida por MAX(id), resolvido
+# pelo índice de chat_mensagem(sala_id), e as não lidas vêm do contador
+# desnormalizado de chat_participante — o custo não cresce com o total de
+# salas nem de mensagens do usuário.
+# Parâmetros: usuario_id, usuario_id, limit, offset
+LISTAR_CONVERSAS_POR_USUARIO = """
+WITH pagina AS (
+    SELECT s.id AS sala_id, s.criada_em, s.ultima_atividade,
+           eu.nao_lidas,
+           u.id AS outro_usuario_id, u.nome AS outro_usuario_nome,
+           u.email AS outro_usuario_email
+    FROM chat_participante eu
+    INNER JOIN chat_sala s ON s.id = eu.sala_id
+    INNER JOIN chat_participante outro
+        ON outro.sala_id = eu.sala_id AND outro.usuario_id != ?
+    INNER JOIN usuario u ON u.id = outro.usuario_id
+    WHERE eu.usuario_id = ?
+    ORDER BY s.ultima_atividade DESC, s.id
+    LIMIT ? OFFSET ?
+)
+SELECT p.sala_id,
+       p.criada_em AS "criada_em [timestamp]",
+       p.ultima_atividade AS "ultima_atividade [timestamp]",
+       p.outro_usuario_id, p.outro_usuario_nome, p.outro_usuario_email,
+       m.id AS mensagem_id, m.usuario_id AS mensagem_usuario_id, m.mensagem,
+       m.data_envio AS "data_envio [timestamp]",
+       m.lida_em AS "lida_em [timestamp]",
+       p.nao_lidas
+FROM pagina p
+LEFT JOIN chat_mensagem m
+    ON m.id = (SELECT MAX(id) FROM chat_mensagem WHERE sala_id = p.sala_id)
+ORDER BY p.ultima_atividade DESC, p.sala_id
+"""
+
 EXCLUIR = """
 DELETE FROM chat_sala
 WHERE id = ?
@@ -14,3 +14,29 @@ OBTER_POR_CHAVE = "SELECT * FROM configuracao WHERE chave = ?"
 OBTER_TODOS = "SELECT * FROM configuracao ORDER BY chave"
 
 ATUALIZAR = "UPDATE configuracao SET valor = ? WHERE chave = ?"
+
+# Versão das configurações: um contador numa linha única, incrementado por
+# triggers em qualquer escrita na tabela configuracao (de qualquer processo).
+# Cada worker compara a versão com a do snapshot que tem em memória
+# (util/config_cache.py) e recarrega quando ela muda.
+CRIAR_TABELA_VERSAO = """
+CREATE TABLE IF NOT EXISTS configuracao_versao (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    versao INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+INICIAR_VERSAO = "INSERT OR IGNORE INTO configuracao_versao (id, versao) VALUES (1, 0)"
+
+OBTER_VERSAO = "SELECT versao FROM configuracao_versao WHERE id = 1"
+
+CRIAR_TRIGGERS_VERSAO = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tr_configuracao_versao_{operacao.lower()}
+    AFTER {operacao} ON configuracao
+    BEGIN
+        UPDATE configuracao_versao SET versao = versao + 1 WHERE id = 1;
+    END
+    """
+    for operacao in ("INSERT", "UPDATE", "DELETE")
+]
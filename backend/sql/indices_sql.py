@@ -1,4 +1,24 @@
+from sql.chamado_sql import ORDEM_PRIORIDADE
+
 # Índices da tabela usuario
+# Composto (perfil, nome): a listagem do admin (usuario_repo.obter_pagina)
+# filtra por perfil e ordena por nome, e o total por perfil é contado só no
+# índice. O índice de nome atende a listagem sem filtro de perfil, que
+# percorre os nomes em ordem e para no LIMIT.
+CRIAR_INDICE_USUARIO_PERFIL_NOME = """
+CREATE INDEX IF NOT EXISTS idx_usuario_perfil_nome
+ON usuario(perfil, nome)
+"""
+
+CRIAR_INDICE_USUARIO_NOME = """
+CREATE INDEX IF NOT EXISTS idx_usuario_nome
+ON usuario(nome)
+"""
+
+# Só de perfil (termina no rowid): o fan-out de notificações por perfil
+# (notificacao_sql.INSERIR_PARA_PERFIL) busca perfil = ? AND id > ? e lê os
+# ids já em ordem, sem ordenar. O composto acima não serve para isso: dentro
+# do perfil ele está em ordem de nome.
 CRIAR_INDICE_USUARIO_PERFIL = """
 CREATE INDEX IF NOT EXISTS idx_usuario_perfil
 ON usuario(perfil)
@@ -16,9 +36,26 @@ CREATE INDEX IF NOT EXISTS idx_chamado_usuario_id
 ON chamado(usuario_id)
 """
 
-CRIAR_INDICE_CHAMADO_STATUS = """
-CREATE INDEX IF NOT EXISTS idx_chamado_status
-ON chamado(status)
+# Compostos (status, prioridade, data_abertura): a listagem do admin
+# (chamado_repo.obter_pagina_admin) filtra por status e/ou prioridade e
+# ordena por prioridade (Urgente primeiro) e data de abertura. A prioridade
+# entra pela posição (ORDEM_PRIORIDADE), não pelo texto, para que a ordem do
+# índice seja a da listagem e o LIMIT/OFFSET pare cedo, sem ordenar em
+# memória. O índice com status substitui o antigo só de status, removido
+# abaixo; o sem status atende a listagem sem filtro e o filtro só de
+# prioridade.
+CRIAR_INDICE_CHAMADO_STATUS_PRIORIDADE_DATA = f"""
+CREATE INDEX IF NOT EXISTS idx_chamado_status_prioridade_data
+ON chamado(status, {ORDEM_PRIORIDADE}, data_abertura DESC, id DESC)
+"""
+
+CRIAR_INDICE_CHAMADO_PRIORIDADE_DATA = f"""
+CREATE INDEX IF NOT EXISTS idx_chamado_prioridade_data
+ON chamado({ORDEM_PRIORIDADE}, data_abertura DESC, id DESC)
+"""
+
+REMOVER_INDICE_CHAMADO_STATUS_LEGADO = """
+DROP INDEX IF EXISTS idx_chamado_status
 """
 
 # Índices da tabela chamado_interacao
@@ -28,9 +65,16 @@ ON chamado_interacao(chamado_id)
 """
 
 # Índices da tabela chat_mensagem
-CRIAR_INDICE_CHAT_MENSAGEM_SALA = """
-CREATE INDEX IF NOT EXISTS idx_chat_mensagem_sala_id
-ON chat_mensagem(sala_id)
+# Composto (sala_id, id): atende a paginação por cursor (WHERE sala_id = ?
+# AND id < ? ORDER BY id DESC) e as buscas por sala. Substitui o índice
+# antigo só de sala_id, removido abaixo para não duplicar custo de escrita.
+CRIAR_INDICE_CHAT_MENSAGEM_SALA_ID = """
+CREATE INDEX IF NOT EXISTS idx_chat_mensagem_sala_id_id
+ON chat_mensagem(sala_id, id)
+"""
+
+REMOVER_INDICE_CHAT_MENSAGEM_SALA_LEGADO = """
+DROP INDEX IF EXISTS idx_chat_mensagem_sala_id
 """
 
 # Índices da tabela chat_participante
@@ -41,17 +85,77 @@ CREATE INDEX IF NOT EXISTS idx_chat_participante_usuario_id
 ON chat_participante(usuario_id)
 """
 
+# Índices da tabela notificacao
+# Composto (usuario_id, lida, data_criacao): o badge (COUNT ... WHERE
+# usuario_id = ? AND lida = 0) e o resumo de não lidas (ORDER BY data_criacao
+# DESC) são resolvidos só no índice; a listagem completa do usuário usa o
+# prefixo usuario_id e ordena apenas as linhas dele.
+CRIAR_INDICE_NOTIFICACAO_USUARIO_LIDA_DATA = """
+CREATE INDEX IF NOT EXISTS idx_notificacao_usuario_lida_data
+ON notificacao(usuario_id, lida, data_criacao)
+"""
+
+# Composto (tipo, data_criacao): a retenção (EXCLUIR_ANTIGAS) lê as mais
+# antigas de cada tipo em ordem, sem varrer a tabela a cada lote.
+CRIAR_INDICE_NOTIFICACAO_TIPO_DATA = """
+CREATE INDEX IF NOT EXISTS idx_notificacao_tipo_data
+ON notificacao(tipo, data_criacao)
+"""
+
+# Índices da tabela pagamento
+# A listagem do admin (pagamento_repo.obter_pagina_admin) ordena por
+# data_criacao DESC e filtra por status, provedor e intervalo de datas.
+# Cada filtro de igualdade tem um composto terminado em data_criacao, que
+# entrega as linhas já na ordem da listagem e resolve o intervalo de datas
+# no próprio índice; sem filtro, o índice só de data_criacao é percorrido
+# de trás para frente e para no LIMIT.
+CRIAR_INDICE_PAGAMENTO_DATA = """
+CREATE INDEX IF NOT EXISTS idx_pagamento_data_criacao
+ON pagamento(data_criacao)
+"""
+
+CRIAR_INDICE_PAGAMENTO_STATUS_DATA = """
+CREATE INDEX IF NOT EXISTS idx_pagamento_status_data
+ON pagamento(status, data_criacao)
+"""
+
+CRIAR_INDICE_PAGAMENTO_PROVIDER_DATA = """
+CREATE INDEX IF NOT EXISTS idx_pagamento_provider_data
+ON pagamento(provider, data_criacao)
+"""
+
+# Composto (usuario_id, data_criacao): "meus pagamentos" (OBTER_POR_USUARIO)
+# sem ordenar em memória, e o ON DELETE CASCADE ao excluir um usuário
+# deixa de varrer a tabela
+CRIAR_INDICE_PAGAMENTO_USUARIO_DATA = """
+CREATE INDEX IF NOT EXISTS idx_pagamento_usuario_data
+ON pagamento(usuario_id, data_criacao)
+"""
+
 # Lista de todos os índices para criação
 TODOS_INDICES = [
     # Usuario
+    CRIAR_INDICE_USUARIO_PERFIL_NOME,
+    CRIAR_INDICE_USUARIO_NOME,
     CRIAR_INDICE_USUARIO_PERFIL,
     CRIAR_INDICE_USUARIO_TOKEN,
     # Chamado
     CRIAR_INDICE_CHAMADO_USUARIO,
-    CRIAR_INDICE_CHAMADO_STATUS,
+    CRIAR_INDICE_CHAMADO_STATUS_PRIORIDADE_DATA,
+    CRIAR_INDICE_CHAMADO_PRIORIDADE_DATA,
+    REMOVER_INDICE_CHAMADO_STATUS_LEGADO,
     # Chamado Interação
     CRIAR_INDICE_INTERACAO_CHAMADO,
     # Chat
-    CRIAR_INDICE_CHAT_MENSAGEM_SALA,
+    CRIAR_INDICE_CHAT_MENSAGEM_SALA_ID,
+    REMOVER_INDICE_CHAT_MENSAGEM_SALA_LEGADO,
     CRIAR_INDICE_CHAT_PARTICIPANTE_USUARIO,
+    # Notificação
+    CRIAR_INDICE_NOTIFICACAO_USUARIO_LIDA_DATA,
+    CRIAR_INDICE_NOTIFICACAO_TIPO_DATA,
+    # Pagamento
+    CRIAR_INDICE_PAGAMENTO_DATA,
+    CRIAR_INDICE_PAGAMENTO_STATUS_DATA,
+    CRIAR_INDICE_PAGAMENTO_PROVIDER_DATA,
+    CRIAR_INDICE_PAGAMENTO_USUARIO_DATA,
 ]
@@ -0,0 +1,39 @@
+"""
+SQL statements para a tabela notificacao_arquivo.
+Arquivo compactado das notificações removidas pela retenção
+(util/notificacao_retencao.py).
+"""
+
+# Cada linha guarda um lote removido: as notificações em JSON comprimido com
+# zlib na coluna `dados`, mais o intervalo de ids e datas para consulta sem
+# descomprimir.
+CRIAR_TABELA = """
+CREATE TABLE IF NOT EXISTS notificacao_arquivo (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    quantidade INTEGER NOT NULL,
+    primeiro_id INTEGER NOT NULL,
+    ultimo_id INTEGER NOT NULL,
+    data_inicial TIMESTAMP,
+    data_final TIMESTAMP,
+    dados BLOB NOT NULL,
+    arquivado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+INSERIR = """
+INSERT INTO notificacao_arquivo
+    (tipo, quantidade, primeiro_id, ultimo_id, data_inicial, data_final, dados)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+OBTER_DADOS_POR_ID = """
+SELECT dados FROM notificacao_arquivo WHERE id = ?
+"""
+
+OBTER_RESUMO = """
+SELECT COUNT(*) as lotes,
+       COALESCE(SUM(quantidade), 0) as notificacoes,
+       COALESCE(SUM(LENGTH(dados)), 0) as bytes
+FROM notificacao_arquivo
+"""
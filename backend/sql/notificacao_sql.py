@@ -17,17 +17,61 @@ INSERT INTO notificacao (usuario_id, titulo, mensagem, tipo, url_acao)
 VALUES (?, ?, ?, ?, ?)
 """
 
+# Fan-out em lote: um único INSERT ... SELECT por lote, a partir da tabela
+# usuario. Destinatários inexistentes são ignorados (sem violar a FK) e o
+# RETURNING devolve os usuários efetivamente notificados, sem ordem garantida
+# pelo SQLite (o repositório os ordena). O keyset em usuario.id
+# (id > ? ORDER BY id LIMIT ?) percorre o perfil em lotes pelo
+# índice idx_usuario_perfil (perfil, rowid): cada lote começa por uma busca
+# no índice e lê os ids já ordenados, sem TEMP B-TREE.
+INSERIR_PARA_USUARIOS = """
+INSERT INTO notificacao (usuario_id, titulo, mensagem, tipo, url_acao)
+SELECT id, ?, ?, ?, ? FROM usuario
+WHERE id IN (SELECT value FROM json_each(?))
+ORDER BY id
+RETURNING usuario_id
+"""
+
+INSERIR_PARA_PERFIL = """
+INSERT INTO notificacao (usuario_id, titulo, mensagem, tipo, url_acao)
+SELECT id, ?, ?, ?, ? FROM usuario
+WHERE perfil = ? AND id > ?
+ORDER BY id
+LIMIT ?
+RETURNING usuario_id
+"""
+
+# Desempate por id: data_criacao tem resolução de segundos e a paginação
+# precisa de uma ordem total para não repetir nem pular itens.
 OBTER_POR_USUARIO = """
 SELECT * FROM notificacao
 WHERE usuario_id = ?
-ORDER BY data_criacao DESC
+ORDER BY data_criacao DESC, id DESC
 LIMIT ?
 """
 
+# Paginação no banco (util.paginacao_util.obter_paginado acrescenta LIMIT/OFFSET)
+CONTAR_POR_USUARIO = """
+SELECT COUNT(*) as total FROM notificacao
+WHERE usuario_id = ?
+"""
+
+OBTER_PAGINA_POR_USUARIO = """
+SELECT * FROM notificacao
+WHERE usuario_id = ?
+ORDER BY data_criacao DESC, id DESC
+"""
+
+# Busca pela PRIMARY KEY com verificação de propriedade (uma linha)
+OBTER_POR_ID = """
+SELECT * FROM notificacao
+WHERE id = ? AND usuario_id = ?
+"""
+
 OBTER_NAO_LIDAS_POR_USUARIO = """
 SELECT * FROM notificacao
 WHERE usuario_id = ? AND lida = 0
-ORDER BY data_criacao DESC
+ORDER BY data_criacao DESC, id DESC
 LIMIT ?
 """
 
@@ -36,6 +80,12 @@ SELECT COUNT(*) as total FROM notificacao
 WHERE usuario_id = ? AND lida = 0
 """
 
+CONTAR_NAO_LIDAS_POR_USUARIOS = """
+SELECT usuario_id, COUNT(*) as total FROM notificacao
+WHERE usuario_id IN (SELECT value FROM json_each(?)) AND lida = 0
+GROUP BY usuario_id
+"""
+
 MARCAR_COMO_LIDA = """
 UPDATE notificacao SET lida = 1
 WHERE id = ? AND usuario_id = ?
@@ -51,9 +101,20 @@ DELETE FROM notificacao
 WHERE id = ? AND usuario_id = ?
 """
 
+# Retenção: remove um lote das notificações mais antigas de um tipo. O corte
+# é um modificador do datetime() passado como parâmetro (ex.: '-30 days').
+# A subconsulta percorre idx_notificacao_tipo_data a partir do início; como
+# cada lote apaga o que leu, o seguinte recomeça logo depois, sem varrer a
+# tabela. O RETURNING devolve as linhas removidas (para o arquivamento).
 EXCLUIR_ANTIGAS = """
 DELETE FROM notificacao
-WHERE usuario_id = ? AND data_criacao < datetime('now', '-? days')
+WHERE id IN (
+    SELECT id FROM notificacao
+    WHERE tipo = ? AND data_criacao < datetime('now', ?)
+    ORDER BY data_criacao
+    LIMIT ?
+)
+RETURNING *
 """
 
 EXCLUIR_LIDAS = """
@@ -94,3 +94,28 @@ GROUP BY status
 ADICIONAR_COLUNA_PROVIDER = """
 ALTER TABLE pagamento ADD COLUMN provider TEXT NOT NULL DEFAULT 'mercadopago'
 """
+
+# =============================================================================
+# Listagem do admin (montada por pagamento_repo.obter_pagina_admin)
+# =============================================================================
+
+LISTAR_ADMIN = """
+SELECT p.*, u.nome as usuario_nome
+FROM pagamento p
+INNER JOIN usuario u ON p.usuario_id = u.id
+"""
+
+# Os filtros são todos de pagamento: o total não precisa do JOIN
+CONTAR_ADMIN = "SELECT COUNT(*) as total FROM pagamento p"
+
+FILTRO_ADMIN_STATUS = "p.status = ?"
+
+FILTRO_ADMIN_PROVIDER = "p.provider = ?"
+
+# Intervalo semiaberto [início, fim) em UTC, no formato gravado pelo
+# adaptador de datetime (comparação de texto preserva a ordem)
+FILTRO_ADMIN_DATA_INICIO = "p.data_criacao >= ?"
+
+FILTRO_ADMIN_DATA_FIM = "p.data_criacao < ?"
+
+ORDENAR_ADMIN = "ORDER BY p.data_criacao DESC, p.id DESC"
@@ -0,0 +1,59 @@
+"""
+SQL statements para a tabela rate_limit.
+Estado do GCRA compartilhado entre workers (armazenamento "sqlite" de
+util/rate_limit_armazenamento.py), num arquivo próprio, separado do banco
+da aplicação.
+"""
+
+# Uma linha por (limiter, identificador) com o TAT do GCRA: instante
+# (time.monotonic, comum a todos os processos do host) em que o
+# identificador volta a ter a rajada cheia.
+CRIAR_TABELA = """
+CREATE TABLE IF NOT EXISTS rate_limit (
+    limiter TEXT NOT NULL,
+    identificador TEXT NOT NULL,
+    tat REAL NOT NULL,
+    PRIMARY KEY (limiter, identificador)
+) WITHOUT ROWID
+"""
+
+# GCRA numa única instrução atômica. O TAT efetivo é o gravado, ou "agora"
+# se ele já passou ou está além de agora + janela (valor de antes de um
+# reboot, quando o relógio monotônico recomeça). O UPDATE só acontece se a
+# nova tentativa couber na janela: o RETURNING devolve uma linha quando a
+# tentativa é permitida e nenhuma quando é bloqueada.
+CONSUMIR = """
+INSERT INTO rate_limit (limiter, identificador, tat)
+VALUES (:limiter, :identificador, :agora + :intervalo)
+ON CONFLICT (limiter, identificador) DO UPDATE SET
+    tat = (CASE WHEN tat < :agora OR tat > :agora + :janela THEN :agora ELSE tat END) + :intervalo
+WHERE (CASE WHEN tat < :agora OR tat > :agora + :janela THEN :agora ELSE tat END) + :intervalo
+      <= :agora + :janela + :tolerancia
+RETURNING tat
+"""
+
+OBTER_TAT = """
+SELECT tat FROM rate_limit
+WHERE limiter = ? AND identificador = ?
+"""
+
+EXCLUIR = """
+DELETE FROM rate_limit
+WHERE limiter = ? AND identificador = ?
+"""
+
+EXCLUIR_POR_LIMITER = """
+DELETE FROM rate_limit
+WHERE limiter = ?
+"""
+
+# Expirados: TAT no passado (rajada cheia) ou de antes de um reboot
+EXCLUIR_EXPIRADOS = """
+DELETE FROM rate_limit
+WHERE limiter = ? AND (tat <= ? OR tat > ?)
+"""
+
+CONTAR_POR_LIMITER = """
+SELECT COUNT(*) FROM rate_limit
+WHERE limiter = ?
+"""
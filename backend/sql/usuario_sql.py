@@ -37,6 +37,8 @@ OBTER_TODOS = "SELECT * FROM usuario ORDER BY nome"
 
 OBTER_QUANTIDADE = "SELECT COUNT(*) as quantidade FROM usuario"
 
+OBTER_QUANTIDADE_POR_PERFIL = "SELECT COUNT(*) as quantidade FROM usuario WHERE perfil = ?"
+
 OBTER_POR_EMAIL = "SELECT * FROM usuario WHERE email = ?"
 
 ATUALIZAR_TOKEN = """
@@ -56,18 +58,105 @@ SET token_redefinicao = NULL, data_token = NULL
 WHERE id = ?
 """
 
+# Troca a senha e invalida o token num único UPDATE (uma transação). O token
+# no WHERE impede que dois pedidos com o mesmo token redefinam a senha.
+REDEFINIR_SENHA = """
+UPDATE usuario
+SET senha = ?, token_redefinicao = NULL, data_token = NULL,
+    data_atualizacao = CURRENT_TIMESTAMP
+WHERE id = ? AND token_redefinicao = ?
+"""
+
 OBTER_TODOS_POR_PERFIL = """
 SELECT * FROM usuario
 WHERE perfil = ?
 ORDER BY nome
 """
 
+# =============================================================================
+# Busca textual (FTS5)
+# =============================================================================
+
+# Índice FTS5 "external content" sobre usuario(nome, email): guarda só o
+# índice invertido e lê o texto da própria tabela usuario (rowid = id).
+# unicode61 com remove_diacritics 2 ignora maiúsculas e acentos ("joao"
+# encontra "João"); @, . e _ separam tokens, então o e-mail é buscável pelas
+# partes ("maria.souza@..." -> maria, souza, ...). prefix='2 3' guarda
+# índices dos prefixos de 2 e 3 letras: o autocomplete começa em 2 letras e
+# são os prefixos curtos que casam com mais palavras (sem eles, "jo"* junta
+# as listas de todas as palavras começadas por "jo" a cada tecla).
+CRIAR_TABELA_BUSCA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS usuario_busca USING fts5(
+    nome,
+    email,
+    content='usuario',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+)
+"""
+
+EXISTE_TABELA_BUSCA = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usuario_busca'"
+
+# Reindexa todos os usuários (bancos criados antes do índice)
+RECONSTRUIR_BUSCA = "INSERT INTO usuario_busca (usuario_busca) VALUES ('rebuild')"
+
+# Mantêm usuario_busca em sincronia com usuario. Em tabelas external
+# content a remoção exige os valores antigos (comando 'delete').
+CRIAR_TRIGGERS_BUSCA = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_usuario_busca_insert
+    AFTER INSERT ON usuario
+    BEGIN
+        INSERT INTO usuario_busca (rowid, nome, email)
+        VALUES (new.id, new.nome, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_usuario_busca_delete
+    AFTER DELETE ON usuario
+    BEGIN
+        INSERT INTO usuario_busca (usuario_busca, rowid, nome, email)
+        VALUES ('delete', old.id, old.nome, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tr_usuario_busca_update
+    AFTER UPDATE OF nome, email ON usuario
+    BEGIN
+        INSERT INTO usuario_busca (usuario_busca, rowid, nome, email)
+        VALUES ('delete', old.id, old.nome, old.email);
+        INSERT INTO usuario_busca (rowid, nome, email)
+        VALUES (new.id, new.nome, new.email);
+    END
+    """,
+]
+
+# Sem ORDER BY: as primeiras correspondências do índice (ordenar por
+# relevância exige pontuar todas e custa caro em prefixos curtos)
 BUSCAR_POR_TERMO = """
 SELECT id, nome, email, senha, perfil,
        token_redefinicao, data_token,
        data_cadastro AS "data_cadastro [timestamp]",
        data_atualizacao AS "data_atualizacao [timestamp]"
 FROM usuario
-WHERE (LOWER(nome) LIKE LOWER(?) OR LOWER(email) LIKE LOWER(?))
-LIMIT ?
+WHERE id IN (
+    SELECT rowid FROM usuario_busca WHERE usuario_busca MATCH ? LIMIT ?
+)
 """
+
+# =============================================================================
+# Listagem do admin (montada por usuario_repo.obter_pagina)
+# =============================================================================
+
+LISTAR_PAGINA = "SELECT * FROM usuario"
+
+CONTAR_PAGINA = "SELECT COUNT(*) as total FROM usuario"
+
+FILTRO_PERFIL = "perfil = ?"
+
+FILTRO_TERMO = "id IN (SELECT rowid FROM usuario_busca WHERE usuario_busca MATCH ?)"
+
+# id desempata homônimos e mantém a ordem estável entre páginas; os índices
+# idx_usuario_perfil_nome e idx_usuario_nome já terminam no rowid
+ORDENAR_POR_NOME = "ORDER BY nome, id"
@@ -46,11 +46,16 @@ def setup_test_database():
     """
     yield _TEST_DB_PATH
 
-    # Limpar: remover arquivo de banco após todos os testes
-    try:
-        os.unlink(_TEST_DB_PATH)
-    except Exception:
-        pass
+    # Fechar conexões do pool antes de remover os arquivos
+    from util.db_util import fechar_pool
+    fechar_pool()
+
+    # Limpar: remover arquivo de banco (e -wal/-shm do modo WAL) após todos os testes
+    for sufixo in ("", "-wal", "-shm"):
+        try:
+            os.unlink(_TEST_DB_PATH + sufixo)
+        except Exception:
+            pass
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -104,12 +109,14 @@ def limpar_chat_manager():
     # Limpar antes do teste
     gerenciador_chat._connections.clear()
     gerenciador_chat._active_connections.clear()
+    gerenciador_chat._replay.clear()
 
     yield
 
     # Limpar depois do teste também
     gerenciador_chat._connections.clear()
     gerenciador_chat._active_connections.clear()
+    gerenciador_chat._replay.clear()
 
 
 @pytest.fixture(scope="function", autouse=True)
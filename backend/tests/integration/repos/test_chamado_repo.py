@@ -111,6 +111,241 @@ class TestChamadoRepoObterTodos:
         assert chamado_id in ids
 
 
+class TestChamadoRepoObterPaginaAdmin:
+    """Testes para a função obter_pagina_admin (filtros e paginação no banco)."""
+
+    @staticmethod
+    def _inserir(usuario_id, titulo, prioridade, status=StatusChamado.ABERTO):
+        return chamado_repo.inserir(Chamado(
+            id=0,
+            titulo=titulo,
+            status=status,
+            prioridade=prioridade,
+            usuario_id=usuario_id
+        ))
+
+    def test_ordem_por_prioridade_e_total(self, usuario_repo_teste, admin_repo_teste):
+        """Deve ordenar por prioridade (Urgente primeiro) e paginar com o total filtrado."""
+        baixa = self._inserir(usuario_repo_teste, "Baixa", PrioridadeChamado.BAIXA)
+        urgente = self._inserir(usuario_repo_teste, "Urgente", PrioridadeChamado.URGENTE)
+        media_1 = self._inserir(usuario_repo_teste, "Média 1", PrioridadeChamado.MEDIA)
+        media_2 = self._inserir(usuario_repo_teste, "Média 2", PrioridadeChamado.MEDIA)
+
+        pagina_1 = chamado_repo.obter_pagina_admin(admin_repo_teste, pagina=1, por_pagina=3)
+        pagina_2 = chamado_repo.obter_pagina_admin(admin_repo_teste, pagina=2, por_pagina=3)
+
+        assert [c.id for c in pagina_1.items] == [urgente, media_2, media_1]
+        assert [c.id for c in pagina_2.items] == [baixa]
+        assert pagina_1.total == 4
+        assert pagina_2.pagina_atual == 2
+        assert pagina_1.items[0].usuario_email is not None
+
+    def test_filtros_combinados(self, usuario_repo_teste, admin_repo_teste):
+        """Deve aplicar status, prioridade e termo juntos."""
+        alvo = self._inserir(usuario_repo_teste, "Erro no boleto", PrioridadeChamado.ALTA)
+        self._inserir(usuario_repo_teste, "Erro no login", PrioridadeChamado.BAIXA)
+        self._inserir(
+            usuario_repo_teste, "Erro no boleto antigo", PrioridadeChamado.ALTA, StatusChamado.RESOLVIDO
+        )
+
+        paginacao = chamado_repo.obter_pagina_admin(
+            admin_repo_teste,
+            termo="  BOLETO ",
+            status=StatusChamado.ABERTO.value,
+            prioridade=PrioridadeChamado.ALTA.value,
+        )
+
+        assert [c.id for c in paginacao.items] == [alvo]
+        assert paginacao.total == 1
+
+    def test_termo_busca_nome_e_email_do_autor(self, usuario_repo_teste, admin_repo_teste):
+        """Deve encontrar chamados pelo nome ou e-mail do autor."""
+        chamado_id = self._inserir(usuario_repo_teste, "Sem termo no título", PrioridadeChamado.MEDIA)
+        usuario = usuario_repo.obter_por_id(usuario_repo_teste)
+
+        por_email = chamado_repo.obter_pagina_admin(admin_repo_teste, termo=usuario.email.upper())
+        por_nome = chamado_repo.obter_pagina_admin(admin_repo_teste, termo=usuario.nome)
+
+        assert [c.id for c in por_email.items] == [chamado_id]
+        assert [c.id for c in por_nome.items] == [chamado_id]
+
+    def test_sintaxe_do_termo_e_literal(self, usuario_repo_teste, admin_repo_teste):
+        """Operadores e curingas no termo são só palavras; só a última vale como prefixo."""
+        desconto = self._inserir(usuario_repo_teste, "Desconto de 10% não aplicado", PrioridadeChamado.MEDIA)
+        self._inserir(usuario_repo_teste, "Boleto vencido", PrioridadeChamado.MEDIA)
+
+        paginacao = chamado_repo.obter_pagina_admin(admin_repo_teste, termo='desconto OR "boleto')
+        pontuacao = chamado_repo.obter_pagina_admin(admin_repo_teste, termo="% *")
+        prefixo = chamado_repo.obter_pagina_admin(admin_repo_teste, termo="10% desc")
+        palavra_incompleta = chamado_repo.obter_pagina_admin(admin_repo_teste, termo="desc 10%")
+
+        assert paginacao.total == 0
+        assert pontuacao.total == 0
+        assert [c.id for c in prefixo.items] == [desconto]
+        assert palavra_incompleta.total == 0
+
+    def test_prioridade_desconhecida_nao_retorna_nada(self, usuario_repo_teste, admin_repo_teste):
+        """Prioridade inválida deve resultar em página vazia, sem erro."""
+        self._inserir(usuario_repo_teste, "Qualquer", PrioridadeChamado.ALTA)
+
+        paginacao = chamado_repo.obter_pagina_admin(admin_repo_teste, prioridade="Crítica")
+
+        assert paginacao.items == []
+        assert paginacao.total == 0
+
+    def test_nao_lidas_dos_chamados_da_pagina(self, usuario_repo_teste, admin_repo_teste):
+        """Deve contar as mensagens não lidas de outros usuários nos chamados da página."""
+        chamado_id = self._inserir(usuario_repo_teste, "Com mensagens", PrioridadeChamado.MEDIA)
+        for autor in (usuario_repo_teste, usuario_repo_teste, admin_repo_teste):
+            chamado_interacao_repo.inserir(ChamadoInteracao(
+                id=0,
+                chamado_id=chamado_id,
+                usuario_id=autor,
+                mensagem="Mensagem",
+                tipo=TipoInteracao.ABERTURA,
+                data_interacao=None,
+                status_resultante=None
+            ))
+
+        paginacao = chamado_repo.obter_pagina_admin(admin_repo_teste)
+
+        assert paginacao.items[0].mensagens_nao_lidas == 2
+
+    @pytest.mark.parametrize("status, prioridade", [
+        (None, None),
+        ("Aberto", None),
+        (None, "Alta"),
+        ("Aberto", "Alta"),
+    ])
+    def test_consultas_usam_indice_sem_ordenar_em_memoria(self, status, prioridade):
+        """Contagem e página devem sair dos índices compostos, sem TEMP B-TREE."""
+        from util.db_util import obter_conexao
+
+        sql_count, sql_dados, params = chamado_repo._montar_consulta_admin(None, status, prioridade)
+        with obter_conexao() as conn:
+            plano = conn.execute(f"EXPLAIN QUERY PLAN {sql_count}", params).fetchall()
+            plano += conn.execute(
+                f"EXPLAIN QUERY PLAN {sql_dados} LIMIT ? OFFSET ?", (*params, 10, 0)
+            ).fetchall()
+        detalhes = " ".join(row["detail"] for row in plano)
+        assert "TEMP B-TREE" not in detalhes
+        if status or prioridade:
+            assert "idx_chamado_status_prioridade_data" in detalhes or "idx_chamado_prioridade_data" in detalhes
+
+
+
+class TestChamadoRepoBuscaTextual:
+    """Testes da busca do admin nos índices FTS5 de títulos e mensagens."""
+
+    @staticmethod
+    def _inserir(usuario_id, titulo):
+        return chamado_repo.inserir(Chamado(
+            id=0,
+            titulo=titulo,
+            status=StatusChamado.ABERTO,
+            prioridade=PrioridadeChamado.MEDIA,
+            usuario_id=usuario_id
+        ))
+
+    @staticmethod
+    def _mensagem(chamado_id, usuario_id, mensagem):
+        return chamado_interacao_repo.inserir(ChamadoInteracao(
+            id=0,
+            chamado_id=chamado_id,
+            usuario_id=usuario_id,
+            mensagem=mensagem,
+            tipo=TipoInteracao.RESPOSTA_USUARIO,
+            data_interacao=None,
+            status_resultante=None
+        ))
+
+    def test_encontra_mensagem_inserida_com_trecho(self, usuario_repo_teste, admin_repo_teste):
+        """Mensagem nova entra no índice pelo trigger e volta com os termos marcados."""
+        chamado_id = self._inserir(usuario_repo_teste, "Dúvida geral")
+        self._mensagem(chamado_id, usuario_repo_teste, "A impressora da sala de reuniões não liga")
+
+        paginacao = chamado_repo.obter_pagina_admin(admin_repo_teste, termo="IMPRESSORA reunioes")
+
+        assert [c.id for c in paginacao.items] == [chamado_id]
+        assert paginacao.items[0].trecho_busca == (
+            "A <mark>impressora</mark> da sala de <mark>reuniões</mark> não liga"
+        )
+
+    def test_titulo_e_mensagem_ordenados_por_relevancia(self, usuario_repo_teste, admin_repo_teste):
+        """Termo no título pesa mais que o mesmo termo numa mensagem longa."""
+        pela_mensagem = self._inserir(usuario_repo_teste, "Problema no acesso")
+        self._mensagem(
+            pela_mensagem, usuario_repo_teste,
+            "Depois da atualização de ontem nenhum colaborador do setor financeiro "
+            "consegue abrir o sistema, nem mesmo para emitir o boleto do mês",
+        )
+        pelo_titulo = self._inserir(usuario_repo_teste, "Boleto duplicado")
+        self._inserir(usuario_repo_teste, "Sem relação")
+
+        paginacao = chamado_repo.obter_pagina_admin(admin_repo_teste, termo="boleto")
+
+        assert [c.id for c in paginacao.items] == [pelo_titulo, pela_mensagem]
+        assert paginacao.total == 2
+        assert paginacao.items[0].trecho_busca == "<mark>Boleto</mark> duplicado"
+
+    def test_chamado_com_varias_mensagens_aparece_uma_vez(self, usuario_repo_teste, admin_repo_teste):
+        """Várias correspondências do mesmo chamado contam como um resultado."""
+        chamado_id = self._inserir(usuario_repo_teste, "Erro de certificado")
+        for _ in range(3):
+            self._mensagem(chamado_id, admin_repo_teste, "O certificado expirou")
+
+        paginacao = chamado_repo.obter_pagina_admin(admin_repo_teste, termo="certificado")
+
+        assert [c.id for c in paginacao.items] == [chamado_id]
+        assert paginacao.total == 1
+
+    def test_paginacao_da_busca(self, usuario_repo_teste, admin_repo_teste):
+        """Total conta todos os chamados encontrados; a página traz só os seus."""
+        ids = [self._inserir(usuario_repo_teste, f"Lentidão no relatório {i}") for i in range(5)]
+
+        pagina_1 = chamado_repo.obter_pagina_admin(admin_repo_teste, pagina=1, por_pagina=2, termo="lentidao")
+        pagina_3 = chamado_repo.obter_pagina_admin(admin_repo_teste, pagina=3, por_pagina=2, termo="lentidao")
+
+        assert pagina_1.total == 5
+        assert len(pagina_1.items) == 2
+        assert [c.id for c in pagina_3.items] == [ids[0]]
+
+    def test_indices_acompanham_alteracoes_e_exclusoes(self, usuario_repo_teste, admin_repo_teste):
+        """Título alterado e chamado excluído (com as mensagens, em cascata) saem do índice."""
+        from util.db_util import obter_conexao
+
+        renomeado = self._inserir(usuario_repo_teste, "Catraca travada")
+        excluido = self._inserir(usuario_repo_teste, "Outro assunto")
+        self._mensagem(excluido, usuario_repo_teste, "A catraca da portaria travou de novo")
+        with obter_conexao() as conn:
+            conn.execute("UPDATE chamado SET titulo = ? WHERE id = ?", ("Portão emperrado", renomeado))
+        chamado_repo.excluir(excluido)
+
+        assert chamado_repo.obter_pagina_admin(admin_repo_teste, termo="catraca").total == 0
+        assert [c.id for c in chamado_repo.obter_pagina_admin(admin_repo_teste, termo="portao").items] == [renomeado]
+
+    def test_busca_com_filtros_parte_dos_chamados_encontrados(self):
+        """Com status/prioridade, os filtros valem só para os encontrados, sem percorrer o índice do status."""
+        from util.db_util import obter_conexao
+
+        sql_count, sql_dados, params = chamado_repo._montar_consulta_admin('"boleto"*', "Aberto", "Alta")
+        with obter_conexao() as conn:
+            plano = conn.execute(f"EXPLAIN QUERY PLAN {sql_count}", params).fetchall()
+            plano += conn.execute(
+                f"EXPLAIN QUERY PLAN {sql_dados} LIMIT ? OFFSET ?", (*params, 10, 0)
+            ).fetchall()
+        detalhes = " ".join(row["detail"] for row in plano)
+        assert "idx_chamado_status_prioridade_data" not in detalhes
+        assert "SEARCH c USING INTEGER PRIMARY KEY" in detalhes
+
+    def test_sem_busca_nao_ha_trecho(self, usuario_repo_teste, admin_repo_teste):
+        """Listagem sem termo não preenche trecho_busca."""
+        self._inserir(usuario_repo_teste, "Qualquer")
+
+        paginacao = chamado_repo.obter_pagina_admin(admin_repo_teste)
+
+        assert paginacao.items[0].trecho_busca is None
+
 class TestChamadoRepoObterPorUsuario:
     """Testes para a função obter_por_usuario."""
 
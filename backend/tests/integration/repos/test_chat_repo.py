@@ -8,6 +8,8 @@ Testa os módulos:
 
 Esses testes usam banco de dados real para validar integração.
 """
+from datetime import datetime
+
 import pytest
 
 from repo import chat_sala_repo
@@ -17,6 +19,7 @@ from repo import usuario_repo
 from model.usuario_model import Usuario
 from util.security import criar_hash_senha
 from util.perfis import Perfil
+from util.db_util import obter_conexao
 
 
 # =============================================================================
@@ -254,6 +257,108 @@ class TestChatSalaRepoExcluir:
         assert resultado is False
 
 
+class TestChatSalaRepoListarConversas:
+    """Testes para a função listar_conversas_por_usuario."""
+
+    @staticmethod
+    def _criar_usuario(nome: str, email: str) -> int:
+        return usuario_repo.inserir(Usuario(
+            id=0,
+            nome=nome,
+            email=email,
+            senha="hash",
+            perfil=Perfil.CLIENTE.value
+        ))
+
+    @staticmethod
+    def _criar_conversa(usuario1_id: int, usuario2_id: int, ultima_atividade: datetime):
+        sala = chat_sala_repo.criar_ou_obter_sala(usuario1_id, usuario2_id)
+        chat_participante_repo.adicionar_participante(sala.id, usuario1_id)
+        chat_participante_repo.adicionar_participante(sala.id, usuario2_id)
+        with obter_conexao() as conn:
+            conn.execute(
+                "UPDATE chat_sala SET ultima_atividade = ? WHERE id = ?",
+                (ultima_atividade, sala.id)
+            )
+        return sala
+
+    def test_listar_conversas_sem_salas(self):
+        """Deve retornar lista vazia para usuário sem conversas."""
+        usuario_id = self._criar_usuario("Sem Conversas", "sem_conversas@example.com")
+
+        assert chat_sala_repo.listar_conversas_por_usuario(usuario_id) == []
+
+    def test_listar_conversas_agrega_dados(self):
+        """Deve trazer outro participante, última mensagem e não lidas."""
+        eu_id = self._criar_usuario("Conversa Eu", "conversa_eu@example.com")
+        outro_id = self._criar_usuario("Conversa Outro", "conversa_outro@example.com")
+        sala = self._criar_conversa(eu_id, outro_id, datetime(2025, 1, 1, 12, 0))
+
+        chat_mensagem_repo.inserir(sala.id, outro_id, "Primeira")
+        chat_mensagem_repo.inserir(sala.id, eu_id, "Resposta")
+        chat_mensagem_repo.inserir(sala.id, outro_id, "Última")
+
+        conversas = chat_sala_repo.listar_conversas_por_usuario(eu_id)
+
+        assert len(conversas) == 1
+        conversa = conversas[0]
+        assert conversa.sala.id == sala.id
+        assert conversa.outro_usuario_id == outro_id
+        assert conversa.outro_usuario_nome == "Conversa Outro"
+        assert conversa.outro_usuario_email == "conversa_outro@example.com"
+        assert conversa.ultima_mensagem.mensagem == "Última"
+        assert conversa.ultima_mensagem.usuario_id == outro_id
+        assert conversa.nao_lidas == 2
+
+    def test_listar_conversas_sala_sem_mensagens(self):
+        """Sala sem mensagens deve vir com última mensagem None e zero não lidas."""
+        eu_id = self._criar_usuario("Vazia Eu", "vazia_eu@example.com")
+        outro_id = self._criar_usuario("Vazia Outro", "vazia_outro@example.com")
+        self._criar_conversa(eu_id, outro_id, datetime(2025, 1, 1, 12, 0))
+
+        conversa = chat_sala_repo.listar_conversas_por_usuario(eu_id)[0]
+
+        assert conversa.ultima_mensagem is None
+        assert conversa.nao_lidas == 0
+
+    def test_listar_conversas_respeita_ultima_leitura(self):
+        """Mensagens anteriores à última leitura não contam como não lidas."""
+        eu_id = self._criar_usuario("Leitura Eu", "leitura_eu@example.com")
+        outro_id = self._criar_usuario("Leitura Outro", "leitura_outro@example.com")
+        sala = self._criar_conversa(eu_id, outro_id, datetime(2025, 1, 1, 12, 0))
+
+        chat_mensagem_repo.inserir(sala.id, outro_id, "Lida")
+        chat_participante_repo.atualizar_ultima_leitura(sala.id, eu_id)
+
+        conversa = chat_sala_repo.listar_conversas_por_usuario(eu_id)[0]
+
+        assert conversa.nao_lidas == 0
+        assert conversa.ultima_mensagem.mensagem == "Lida"
+
+    def test_listar_conversas_ordena_e_pagina_no_sql(self):
+        """Deve ordenar por última atividade (desc) e aplicar limit/offset."""
+        eu_id = self._criar_usuario("Pagina Eu", "pagina_eu@example.com")
+        salas = []
+        for i in range(5):
+            outro_id = self._criar_usuario(f"Pagina Outro {i}", f"pagina_outro{i}@example.com")
+            salas.append(self._criar_conversa(eu_id, outro_id, datetime(2025, 1, 1 + i, 12, 0)))
+
+        primeira_pagina = chat_sala_repo.listar_conversas_por_usuario(eu_id, limit=2, offset=0)
+        segunda_pagina = chat_sala_repo.listar_conversas_por_usuario(eu_id, limit=2, offset=2)
+
+        assert [c.sala.id for c in primeira_pagina] == [salas[4].id, salas[3].id]
+        assert [c.sala.id for c in segunda_pagina] == [salas[2].id, salas[1].id]
+
+    def test_listar_conversas_ignora_salas_de_outros(self):
+        """Não deve listar salas das quais o usuário não participa."""
+        eu_id = self._criar_usuario("Isolado Eu", "isolado_eu@example.com")
+        a_id = self._criar_usuario("Isolado A", "isolado_a@example.com")
+        b_id = self._criar_usuario("Isolado B", "isolado_b@example.com")
+        self._criar_conversa(a_id, b_id, datetime(2025, 1, 1, 12, 0))
+
+        assert chat_sala_repo.listar_conversas_por_usuario(eu_id) == []
+
+
 class TestChatSalaRepoCriarTabela:
     """Testes para a função criar_tabela."""
 
@@ -459,6 +564,58 @@ class TestChatMensagemRepoListar:
         assert len(mensagens) == 3
 
 
+class TestChatMensagemRepoListarJanela:
+    """Testes para a função listar_janela_por_sala (paginação por cursor)."""
+
+    @staticmethod
+    def _sala_com_mensagens(prefixo: str, quantidade: int):
+        usuario1_id = usuario_repo.inserir(Usuario(
+            id=0, nome=f"{prefixo} 1", email=f"{prefixo}1@example.com",
+            senha="hash", perfil=Perfil.CLIENTE.value
+        ))
+        usuario2_id = usuario_repo.inserir(Usuario(
+            id=0, nome=f"{prefixo} 2", email=f"{prefixo}2@example.com",
+            senha="hash", perfil=Perfil.CLIENTE.value
+        ))
+        sala = chat_sala_repo.criar_ou_obter_sala(usuario1_id, usuario2_id)
+        ids = [
+            chat_mensagem_repo.inserir(sala.id, usuario1_id, f"Msg {i}").id
+            for i in range(quantidade)
+        ]
+        return sala, ids
+
+    def test_janela_mais_recente_sem_referencia(self):
+        """Sem IDs de referência, deve trazer as mais recentes em ordem cronológica."""
+        sala, ids = self._sala_com_mensagens("janela_recente", 5)
+
+        mensagens, tem_mais = chat_mensagem_repo.listar_janela_por_sala(sala.id, limit=3)
+
+        assert [m.id for m in mensagens] == ids[2:]
+        assert tem_mais is True
+
+    def test_janela_antes_de_id(self):
+        """Deve trazer as mensagens anteriores ao ID informado."""
+        sala, ids = self._sala_com_mensagens("janela_antes", 5)
+
+        mensagens, tem_mais = chat_mensagem_repo.listar_janela_por_sala(
+            sala.id, limit=3, antes_de_id=ids[2]
+        )
+
+        assert [m.id for m in mensagens] == ids[:2]
+        assert tem_mais is False
+
+    def test_janela_depois_de_id(self):
+        """Deve trazer as mensagens posteriores ao ID informado."""
+        sala, ids = self._sala_com_mensagens("janela_depois", 5)
+
+        mensagens, tem_mais = chat_mensagem_repo.listar_janela_por_sala(
+            sala.id, limit=2, depois_de_id=ids[1]
+        )
+
+        assert [m.id for m in mensagens] == ids[2:4]
+        assert tem_mais is True
+
+
 class TestChatMensagemRepoContar:
     """Testes para a função contar_por_sala."""
 
@@ -901,6 +1058,106 @@ class TestChatParticipanteRepoContar:
         assert total >= 0  # Valor depende da implementação
 
 
+class TestChatParticipanteRepoContadorNaoLidas:
+    """Testes para o contador desnormalizado de não lidas."""
+
+    @staticmethod
+    def _criar_sala(prefixo: str):
+        usuario1_id = usuario_repo.inserir(Usuario(
+            id=0, nome=f"{prefixo} 1", email=f"{prefixo}1@example.com",
+            senha="hash", perfil=Perfil.CLIENTE.value
+        ))
+        usuario2_id = usuario_repo.inserir(Usuario(
+            id=0, nome=f"{prefixo} 2", email=f"{prefixo}2@example.com",
+            senha="hash", perfil=Perfil.CLIENTE.value
+        ))
+        sala = chat_sala_repo.criar_ou_obter_sala(usuario1_id, usuario2_id)
+        chat_participante_repo.adicionar_participante(sala.id, usuario1_id)
+        chat_participante_repo.adicionar_participante(sala.id, usuario2_id)
+        return sala, usuario1_id, usuario2_id
+
+    def test_inserir_incrementa_apenas_outros_participantes(self):
+        """Mensagem nova conta como não lida só para quem não a enviou."""
+        sala, usuario1_id, usuario2_id = self._criar_sala("contador_inc")
+
+        chat_mensagem_repo.inserir(sala.id, usuario1_id, "Msg 1")
+        chat_mensagem_repo.inserir(sala.id, usuario1_id, "Msg 2")
+
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario2_id) == 2
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario1_id) == 0
+        participante = chat_participante_repo.obter_por_sala_e_usuario(sala.id, usuario2_id)
+        assert participante.nao_lidas == 2
+
+    def test_marcar_como_lidas_zera_contador(self):
+        """marcar_como_lidas deve zerar o contador do usuário."""
+        sala, usuario1_id, usuario2_id = self._criar_sala("contador_marcar")
+        chat_mensagem_repo.inserir(sala.id, usuario1_id, "Msg")
+
+        chat_mensagem_repo.marcar_como_lidas(sala.id, usuario2_id)
+
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario2_id) == 0
+
+    def test_atualizar_ultima_leitura_zera_contador(self):
+        """atualizar_ultima_leitura deve zerar o contador do usuário."""
+        sala, usuario1_id, usuario2_id = self._criar_sala("contador_leitura")
+        chat_mensagem_repo.inserir(sala.id, usuario1_id, "Msg")
+
+        chat_participante_repo.atualizar_ultima_leitura(sala.id, usuario2_id)
+
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario2_id) == 0
+
+    def test_contar_nao_lidas_total_soma_salas(self):
+        """O total deve somar os contadores de todas as salas do usuário."""
+        sala, usuario1_id, usuario2_id = self._criar_sala("contador_total")
+        usuario3_id = usuario_repo.inserir(Usuario(
+            id=0, nome="contador_total 3", email="contador_total3@example.com",
+            senha="hash", perfil=Perfil.CLIENTE.value
+        ))
+        outra_sala = chat_sala_repo.criar_ou_obter_sala(usuario2_id, usuario3_id)
+        chat_participante_repo.adicionar_participante(outra_sala.id, usuario2_id)
+        chat_participante_repo.adicionar_participante(outra_sala.id, usuario3_id)
+
+        chat_mensagem_repo.inserir(sala.id, usuario1_id, "Da sala 1")
+        chat_mensagem_repo.inserir(outra_sala.id, usuario3_id, "Da sala 2")
+        chat_mensagem_repo.inserir(outra_sala.id, usuario3_id, "Da sala 2 de novo")
+
+        assert chat_participante_repo.contar_nao_lidas_total(usuario2_id) == 3
+        assert chat_participante_repo.contar_nao_lidas_total(usuario1_id) == 0
+
+    def test_contar_nao_lidas_total_sem_salas(self):
+        """Usuário sem salas deve ter total zero."""
+        assert chat_participante_repo.contar_nao_lidas_total(999999) == 0
+
+    def test_reconciliar_corrige_contadores_divergentes(self):
+        """A reconciliação deve reconstruir o contador a partir das mensagens."""
+        sala, usuario1_id, usuario2_id = self._criar_sala("contador_reconc")
+        chat_mensagem_repo.inserir(sala.id, usuario1_id, "Msg 1")
+        chat_mensagem_repo.inserir(sala.id, usuario1_id, "Msg 2")
+        with obter_conexao() as conn:
+            conn.execute(
+                "UPDATE chat_participante SET nao_lidas = 50 WHERE sala_id = ?",
+                (sala.id,)
+            )
+
+        corrigidos = chat_participante_repo.reconciliar_nao_lidas()
+
+        assert corrigidos == 2
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario2_id) == 2
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario1_id) == 0
+        assert chat_participante_repo.reconciliar_nao_lidas() == 0
+
+    def test_criar_tabela_migra_banco_legado(self):
+        """Tabela sem a coluna nao_lidas deve ser migrada e reconciliada."""
+        sala, usuario1_id, usuario2_id = self._criar_sala("contador_legado")
+        chat_mensagem_repo.inserir(sala.id, usuario1_id, "Msg antiga")
+        with obter_conexao() as conn:
+            conn.execute("ALTER TABLE chat_participante DROP COLUMN nao_lidas")
+
+        chat_participante_repo.criar_tabela()
+
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario2_id) == 1
+
+
 class TestChatParticipanteRepoExcluir:
     """Testes para a função excluir."""
 
@@ -382,6 +382,158 @@ class TestUsuarioRepoBuscarPorTermo:
         assert len(resultado) <= 3
 
 
+class TestUsuarioRepoObterPagina:
+    """Testes para a função obter_pagina (filtros e paginação no banco)."""
+
+    @staticmethod
+    def _inserir(nome, email, perfil=Perfil.CLIENTE.value):
+        return usuario_repo.inserir(Usuario(
+            id=0,
+            nome=nome,
+            email=email,
+            senha="hash",
+            perfil=perfil
+        ))
+
+    def test_ordena_por_nome_e_pagina(self):
+        """Deve ordenar por nome e paginar com o total."""
+        self._inserir("Carla", "carla@example.com")
+        self._inserir("Ana", "ana@example.com")
+        self._inserir("Bruno", "bruno@example.com")
+
+        pagina_1 = usuario_repo.obter_pagina(pagina=1, por_pagina=2)
+        pagina_2 = usuario_repo.obter_pagina(pagina=2, por_pagina=2)
+
+        assert [u.nome for u in pagina_1.items] == ["Ana", "Bruno"]
+        assert [u.nome for u in pagina_2.items] == ["Carla"]
+        assert pagina_1.total == 3
+
+    def test_filtra_por_perfil_e_termo(self):
+        """Deve combinar perfil e termo (nome ou email, sem diferenciar maiúsculas)."""
+        self._inserir("Vendedor Silva", "vs@example.com", Perfil.VENDEDOR.value)
+        self._inserir("Cliente Silva", "cs@example.com")
+        self._inserir("Vendedor Souza", "silva.souza@example.com", Perfil.VENDEDOR.value)
+
+        paginacao = usuario_repo.obter_pagina(perfil=Perfil.VENDEDOR.value, termo=" SILVA ")
+
+        assert [u.nome for u in paginacao.items] == ["Vendedor Silva", "Vendedor Souza"]
+        assert paginacao.total == 2
+
+    def test_termo_so_com_pontuacao_retorna_vazio(self):
+        """Termo sem palavras (ex: "%_") não deve listar todos os usuários."""
+        self._inserir("Fulano", "fulano@example.com")
+
+        paginacao = usuario_repo.obter_pagina(termo="%_")
+
+        assert paginacao.items == []
+        assert paginacao.total == 0
+
+    def test_total_da_busca_nao_e_truncado(self):
+        """O total deve contar todos os resultados (antes a busca parava em 1000)."""
+        from util.db_util import obter_conexao
+
+        with obter_conexao() as conn:
+            conn.executemany(
+                "INSERT INTO usuario (nome, email, senha, perfil) VALUES (?, ?, 'hash', ?)",
+                ((f"Massa {i:04d}", f"massa{i}@example.com", Perfil.CLIENTE.value) for i in range(1005)),
+            )
+
+        paginacao = usuario_repo.obter_pagina(pagina=101, por_pagina=10, termo="massa")
+
+        assert paginacao.total == 1005
+        assert paginacao.pagina_atual == 101
+        assert [u.nome for u in paginacao.items] == ["Massa 1000", "Massa 1001", "Massa 1002", "Massa 1003", "Massa 1004"]
+
+    @pytest.mark.parametrize("perfil", [None, Perfil.CLIENTE.value])
+    def test_consultas_usam_indice_sem_ordenar_em_memoria(self, perfil):
+        """Página e total devem sair dos índices de nome/perfil, sem TEMP B-TREE."""
+        from sql import usuario_sql
+        from util.db_util import obter_conexao
+
+        where, params = (f" WHERE {usuario_sql.FILTRO_PERFIL}", (perfil,)) if perfil else ("", ())
+        with obter_conexao() as conn:
+            plano = conn.execute(
+                f"EXPLAIN QUERY PLAN {usuario_sql.CONTAR_PAGINA}{where}", params
+            ).fetchall()
+            plano += conn.execute(
+                f"EXPLAIN QUERY PLAN {usuario_sql.LISTAR_PAGINA}{where} "
+                f"{usuario_sql.ORDENAR_POR_NOME} LIMIT ? OFFSET ?",
+                (*params, 10, 0),
+            ).fetchall()
+        detalhes = " ".join(row["detail"] for row in plano)
+        assert "TEMP B-TREE" not in detalhes
+        assert "idx_usuario_perfil_nome" in detalhes if perfil else "idx_usuario_nome" in detalhes
+
+
+class TestUsuarioRepoBuscaTextual:
+    """Índice FTS5 usuario_busca: tokenização, prefixos e sincronia por triggers."""
+
+    @staticmethod
+    def _inserir(nome, email):
+        return usuario_repo.inserir(Usuario(
+            id=0,
+            nome=nome,
+            email=email,
+            senha="hash",
+            perfil=Perfil.CLIENTE.value
+        ))
+
+    def test_ignora_acentos_e_maiusculas(self):
+        """"joao conceicao" deve encontrar "João da Conceição" (e vice-versa)."""
+        self._inserir("João da Conceição", "jc@example.com")
+        self._inserir("Joana Silva", "js@example.com")
+
+        assert [u.nome for u in usuario_repo.buscar_por_termo("JOAO conceicao")] == ["João da Conceição"]
+        assert [u.nome for u in usuario_repo.buscar_por_termo("Conceição")] == ["João da Conceição"]
+
+    def test_prefixo_de_cada_palavra(self):
+        """Cada palavra do termo casa com o início de uma palavra do nome ou email."""
+        self._inserir("Maria Souza", "maria.souza@empresa.com.br")
+        self._inserir("Mariana Souto", "msouto@example.com")
+
+        assert len(usuario_repo.buscar_por_termo("mar sou")) == 2
+        assert [u.nome for u in usuario_repo.buscar_por_termo("mar souz")] == ["Maria Souza"]
+        # Partes do email viram palavras
+        assert [u.nome for u in usuario_repo.buscar_por_termo("empresa")] == ["Maria Souza"]
+        # Não é busca por substring no meio da palavra
+        assert usuario_repo.buscar_por_termo("ouza") == []
+
+    def test_sintaxe_fts_no_termo_e_tratada_como_texto(self):
+        """Aspas, operadores e parênteses do termo não devem quebrar a consulta."""
+        self._inserir("Ana OR", "ana@example.com")
+
+        assert [u.nome for u in usuario_repo.buscar_por_termo('ana "OR" (')] == ["Ana OR"]
+        assert usuario_repo.buscar_por_termo('"*') == []
+
+    def test_triggers_acompanham_alteracao_e_exclusao(self):
+        """Alterar nome/email reindexa o usuário; excluir remove do índice."""
+        usuario_id = self._inserir("Nome Antigo", "antigo@example.com")
+        usuario = usuario_repo.obter_por_id(usuario_id)
+        usuario.nome = "Nome Novo"
+        usuario.email = "novo@example.com"
+        usuario_repo.alterar(usuario)
+
+        assert usuario_repo.buscar_por_termo("antigo") == []
+        assert [u.id for u in usuario_repo.buscar_por_termo("novo")] == [usuario_id]
+
+        usuario_repo.excluir(usuario_id)
+        assert usuario_repo.buscar_por_termo("novo") == []
+
+    def test_criar_tabela_indexa_usuarios_existentes(self):
+        """Num banco anterior ao índice, criar_tabela deve indexar os usuários já cadastrados."""
+        from util.db_util import obter_conexao
+
+        self._inserir("Usuário Legado", "legado@example.com")
+        with obter_conexao() as conn:
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER tr_usuario_busca_{trigger}")
+            conn.execute("DROP TABLE usuario_busca")
+
+        usuario_repo.criar_tabela()
+
+        assert [u.nome for u in usuario_repo.buscar_por_termo("legado")] == ["Usuário Legado"]
+
+
 class TestUsuarioRepoToken:
     """Testes para funções de token de redefinição de senha."""
 
@@ -457,6 +609,40 @@ class TestUsuarioRepoToken:
 
         assert resultado is False
 
+    def test_redefinir_senha_troca_senha_e_limpa_token(self):
+        """Deve gravar a senha e invalidar o token na mesma operação."""
+        usuario_id = usuario_repo.inserir(Usuario(
+            id=0,
+            nome="Teste Redefinir",
+            email="redefinir@example.com",
+            senha=criar_hash_senha("Senha@123"),
+            perfil=Perfil.CLIENTE.value
+        ))
+        usuario_repo.atualizar_token("redefinir@example.com", "token_redefinir", agora() + timedelta(hours=1))
+
+        resultado = usuario_repo.redefinir_senha(usuario_id, "novo_hash", "token_redefinir")
+
+        assert resultado is True
+        assert usuario_repo.obter_por_token("token_redefinir") is None
+        assert usuario_repo.obter_por_id(usuario_id).senha == "novo_hash"
+
+    def test_redefinir_senha_com_token_ja_usado(self):
+        """Token já consumido (ou de outro usuário) não deve alterar a senha."""
+        usuario_id = usuario_repo.inserir(Usuario(
+            id=0,
+            nome="Teste Token Usado",
+            email="token_usado@example.com",
+            senha=criar_hash_senha("Senha@123"),
+            perfil=Perfil.CLIENTE.value
+        ))
+        usuario_repo.atualizar_token("token_usado@example.com", "token_unico", agora() + timedelta(hours=1))
+        usuario_repo.redefinir_senha(usuario_id, "primeiro_hash", "token_unico")
+
+        resultado = usuario_repo.redefinir_senha(usuario_id, "segundo_hash", "token_unico")
+
+        assert resultado is False
+        assert usuario_repo.obter_por_id(usuario_id).senha == "primeiro_hash"
+
 
 class TestUsuarioRepoCriarTabela:
     """Testes para a função criar_tabela."""
@@ -31,11 +31,14 @@ def _seed_config(chave, valor, descricao="[Interface] Config de teste"):
     Insere/atualiza uma configuração diretamente no banco.
 
     O autouse `limpar_banco_dados` esvazia a tabela `configuracao` por teste,
-    então cada teste que depende de configs as semeia explicitamente.
+    então cada teste que depende de configs as semeia explicitamente. Como
+    a rota de salvamento, invalida o snapshot do ConfigCache após escrever.
     """
     from repo import configuracao_repo
+    from util.config_cache import config
 
     configuracao_repo.inserir_ou_atualizar(chave, valor, descricao)
+    config.limpar()
 
 
 # =============================================================================
@@ -70,6 +73,11 @@ class TestConfiguracoesAutorizacao:
         )
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_cache_nao_admin_403(self, cliente_autenticado):
+        """Cliente comum recebe 403 nas estatísticas do cache."""
+        response = cliente_autenticado.get("/api/admin/configuracoes/cache")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
     def test_auditoria_registros_nao_admin_403(self, cliente_autenticado):
         """Cliente comum recebe 403 na trilha de auditoria."""
         response = cliente_autenticado.get("/api/admin/auditoria/registros")
@@ -81,6 +89,34 @@ class TestConfiguracoesAutorizacao:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+# =============================================================================
+# Estatísticas do cache de configurações (GET)
+# =============================================================================
+
+class TestEstatisticasCache:
+    """GET /admin/configuracoes/cache — ConfigCacheEstatisticasResponse."""
+
+    def test_get_cache_contadores(self, admin_autenticado):
+        """Leituras do config aparecem nos contadores de acerto/ausente."""
+        from util.config_cache import config
+
+        _seed_config("app_name", "Meu App", "[Aplicação] Nome")
+        config.zerar_estatisticas()
+        config.obter("app_name")
+        config.obter("chave_inexistente", "padrao")
+
+        response = admin_autenticado.get("/api/admin/configuracoes/cache")
+
+        assert response.status_code == status.HTTP_200_OK
+        corpo = response.json()
+        assert corpo["acertos"] >= 1
+        assert corpo["ausentes"] >= 1
+        assert corpo["carregado"] is True
+        assert corpo["chaves"] >= 1
+        assert corpo["em_erro"] is False
+        assert corpo["ttl_segundos"] > 0
+
+
 # =============================================================================
 # Listagem de configurações (GET)
 # =============================================================================
@@ -20,8 +20,9 @@ Detalhe importante do endpoint `responder`: há DOIS modelos Pydantic no corpo
 import pytest
 from fastapi import status
 
+from model.chamado_interacao_model import ChamadoInteracao, TipoInteracao
 from model.chamado_model import Chamado, StatusChamado, PrioridadeChamado
-from repo import chamado_repo
+from repo import chamado_interacao_repo, chamado_repo
 from util.perfis import Perfil
 
 
@@ -141,6 +142,28 @@ class TestListar:
         assert corpo["total"] == 1
         assert "impressao" in corpo["items"][0]["titulo"].lower()
 
+    def test_lista_busca_q_nas_mensagens_com_trecho(self, admin_autenticado, cliente_id):
+        chamado_id = _criar_chamado(cliente_id, titulo="Dúvida geral")
+        chamado_interacao_repo.inserir(ChamadoInteracao(
+            id=0,
+            chamado_id=chamado_id,
+            usuario_id=cliente_id,
+            mensagem="O boleto de março veio duplicado",
+            tipo=TipoInteracao.ABERTURA,
+            data_interacao=None,
+            status_resultante=None,
+        ))
+        resp = admin_autenticado.get(
+            "/api/admin/chamados/", params={"q": "boleto marco"}
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        corpo = resp.json()
+        assert corpo["total"] == 1
+        assert corpo["items"][0]["id"] == chamado_id
+        assert corpo["items"][0]["trecho_busca"] == (
+            "O <mark>boleto</mark> de <mark>março</mark> veio duplicado"
+        )
+
     def test_lista_sem_sessao_401(self, client):
         resp = client.get("/api/admin/chamados/")
         assert resp.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,266 @@
+"""
+Testes do envio de notificações em lote
+(routes/admin_notificacoes_routes.py e util/notificacao_util.criar_notificacoes_em_lote).
+
+Cobre (todos sob /api/admin/notificacoes, ADMIN-only):
+    POST /api/admin/notificacoes/lote        → 202 + progresso inicial
+    GET  /api/admin/notificacoes/lote/{id}   → progresso do envio (404 se desconhecido)
+
+⚠️ A tabela `notificacao` NÃO é criada nem limpa pelo conftest — fazemos via fixture autouse.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+from fastapi import status
+
+from model.notificacao_model import TipoNotificacao
+from repo import notificacao_repo
+from util import notificacao_util
+from util.notificacao_util import EnvioLote, criar_notificacoes_em_lote
+from util.perfis import Perfil
+
+
+pytestmark = [pytest.mark.integration]
+
+
+def _csrf(client):
+    """Obtém um token CSRF válido para a sessão do cliente."""
+    return client.get("/api/csrf-token").json()["token"]
+
+
+@pytest.fixture(autouse=True)
+def _limpar_notificacoes():  # pyright: ignore
+    """A tabela `notificacao` não é criada nem limpa pelo conftest; fazemos aqui."""
+    from util.db_util import obter_conexao
+
+    def limpa():
+        with obter_conexao() as conn:
+            conn.execute("DELETE FROM notificacao")
+
+    notificacao_repo.criar_tabela()
+    limpa()
+    yield
+    limpa()
+
+
+@pytest.fixture
+def clientes(criar_usuario_direto):
+    """Cria 5 usuários com perfil Cliente e retorna seus IDs."""
+    return [
+        criar_usuario_direto(f"Cliente {i}", f"cliente{i}@example.com", "Senha@123")
+        for i in range(5)
+    ]
+
+
+def _aguardar_envio(client, envio_id, timeout=10):
+    """Consulta o progresso até o envio sair de em_andamento."""
+    limite = time.monotonic() + timeout
+    while True:
+        corpo = client.get(f"/api/admin/notificacoes/lote/{envio_id}").json()
+        if corpo["status"] != "em_andamento" or time.monotonic() > limite:
+            return corpo
+        time.sleep(0.02)
+
+
+# =============================================================================
+# util.notificacao_util.criar_notificacoes_em_lote
+# =============================================================================
+
+class TestCriarNotificacoesEmLote:
+    def test_perfil_em_lotes_com_progresso(self, clientes):
+        progresso = []
+        criadas = criar_notificacoes_em_lote(
+            "Manutenção", "Sistema indisponível no domingo.",
+            perfil=Perfil.CLIENTE.value, tamanho_lote=2, ao_progredir=progresso.append,
+        )
+
+        assert criadas == 5
+        assert progresso == [2, 4, 5]
+        assert all(notificacao_repo.contar_nao_lidas(u) == 1 for u in clientes)
+
+    def test_perfil_keyset_nao_depende_da_ordem_do_returning(self, clientes, monkeypatch):
+        """O RETURNING não tem ordem garantida: o cursor segue o maior ID do lote."""
+        original = notificacao_repo.inserir_para_perfil
+        monkeypatch.setattr(
+            notificacao_repo, "inserir_para_perfil",
+            lambda *args, **kwargs: original(*args, **kwargs)[::-1],
+        )
+
+        criadas = criar_notificacoes_em_lote(
+            "Aviso", "Mensagem", perfil=Perfil.CLIENTE.value, tamanho_lote=2
+        )
+
+        assert criadas == 5
+        assert all(notificacao_repo.contar_nao_lidas(u) == 1 for u in clientes)
+
+    def test_perfil_multiplo_do_lote_encerra(self, clientes):
+        progresso = []
+        criar_notificacoes_em_lote(
+            "Aviso", "Mensagem", perfil=Perfil.CLIENTE.value,
+            tamanho_lote=5, ao_progredir=progresso.append,
+        )
+        # Lote cheio: mais uma consulta (vazia) confirma o fim
+        assert progresso == [5, 5]
+
+    def test_lista_ignora_inexistentes_e_duplicados(self, clientes):
+        criadas = criar_notificacoes_em_lote(
+            "Aviso", "Mensagem", tipo=TipoNotificacao.AVISO,
+            usuario_ids=[clientes[0], clientes[1], clientes[0], 999999], tamanho_lote=2,
+        )
+
+        assert criadas == 2
+        assert notificacao_repo.contar_nao_lidas(clientes[0]) == 1
+        assert notificacao_repo.obter_nao_lidas(clientes[1])[0].tipo == TipoNotificacao.AVISO
+
+    def test_interrompe_antes_do_proximo_lote(self, clientes):
+        interromper = threading.Event()
+
+        criadas = criar_notificacoes_em_lote(
+            "Aviso", "Mensagem", perfil=Perfil.CLIENTE.value, tamanho_lote=2,
+            ao_progredir=lambda _: interromper.set(), interromper=interromper,
+        )
+
+        # O primeiro lote fica gravado; os seguintes não são enviados
+        assert criadas == 2
+        assert sum(notificacao_repo.contar_nao_lidas(u) for u in clientes) == 2
+
+    def test_exige_ids_ou_perfil(self):
+        with pytest.raises(ValueError):
+            criar_notificacoes_em_lote("Aviso", "Mensagem")
+        with pytest.raises(ValueError):
+            criar_notificacoes_em_lote("Aviso", "Mensagem", usuario_ids=[1], perfil="Cliente")
+
+    @pytest.mark.asyncio
+    async def test_um_evento_sse_por_lote(self, clientes):
+        from util.chat_manager import gerenciador_chat
+
+        fila = await gerenciador_chat.conectar(clientes[0])
+        await asyncio.to_thread(
+            criar_notificacoes_em_lote, "Aviso", "Mensagem", usuario_ids=clientes
+        )
+
+        evento = await asyncio.wait_for(fila.get(), timeout=5)
+        assert evento == {"tipo": "notificacao_lote", "incremento": 1}
+        await asyncio.sleep(0.05)
+        assert fila.empty()
+
+
+# =============================================================================
+# POST /api/admin/notificacoes/lote  +  GET /api/admin/notificacoes/lote/{id}
+# =============================================================================
+
+class TestEnviarLote:
+    def test_envio_por_perfil_conclui(self, admin_autenticado, clientes):
+        resp = admin_autenticado.post(
+            "/api/admin/notificacoes/lote",
+            json={"titulo": "Novidade", "mensagem": "Confira o novo recurso.", "perfil": "Cliente"},
+            headers={"X-CSRF-Token": _csrf(admin_autenticado)},
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        corpo = resp.json()
+        assert corpo["total"] == 5
+        assert set(corpo) >= {"id", "status", "criadas", "percentual", "iniciado_em"}
+
+        final = _aguardar_envio(admin_autenticado, corpo["id"])
+        assert final["status"] == "concluido"
+        assert final["criadas"] == 5
+        assert final["percentual"] == 100.0
+        assert final["concluido_em"] is not None
+        assert all(notificacao_repo.contar_nao_lidas(u) == 1 for u in clientes)
+
+    def test_envio_por_lista(self, admin_autenticado, clientes):
+        resp = admin_autenticado.post(
+            "/api/admin/notificacoes/lote",
+            json={
+                "titulo": "Pagamento",
+                "mensagem": "Sua fatura vence amanhã.",
+                "tipo": "aviso",
+                "url_acao": "/pagamentos",
+                "usuario_ids": clientes[:2],
+            },
+            headers={"X-CSRF-Token": _csrf(admin_autenticado)},
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+
+        final = _aguardar_envio(admin_autenticado, resp.json()["id"])
+        assert final["criadas"] == 2
+        notificacao = notificacao_repo.obter_nao_lidas(clientes[0])[0]
+        assert notificacao.url_acao == "/pagamentos"
+        assert notificacao_repo.contar_nao_lidas(clientes[2]) == 0
+
+    @pytest.mark.parametrize("destino", [
+        {},
+        {"perfil": "Cliente", "usuario_ids": [1]},
+        {"usuario_ids": []},
+        {"perfil": "Inexistente"},
+    ])
+    def test_destinatarios_invalidos_422(self, admin_autenticado, destino):
+        resp = admin_autenticado.post(
+            "/api/admin/notificacoes/lote",
+            json={"titulo": "Aviso", "mensagem": "Mensagem", **destino},
+            headers={"X-CSRF-Token": _csrf(admin_autenticado)},
+        )
+        assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_perfil_nao_admin_403(self, cliente_autenticado):
+        resp = cliente_autenticado.post(
+            "/api/admin/notificacoes/lote",
+            json={"titulo": "Aviso", "mensagem": "Mensagem", "perfil": "Cliente"},
+            headers={"X-CSRF-Token": _csrf(cliente_autenticado)},
+        )
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_sem_csrf_403(self, admin_autenticado):
+        resp = admin_autenticado.post(
+            "/api/admin/notificacoes/lote",
+            json={"titulo": "Aviso", "mensagem": "Mensagem", "perfil": "Cliente"},
+        )
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+        assert resp.json()["type"] == "forbidden"
+
+    def test_envio_desconhecido_404(self, admin_autenticado):
+        resp = admin_autenticado.get("/api/admin/notificacoes/lote/inexistente")
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+        assert resp.json()["type"] == "not_found"
+
+
+# =============================================================================
+# Envios em segundo plano: histórico em memória e encerramento
+# =============================================================================
+
+class TestEnviosEmSegundoPlano:
+    def test_descarte_preserva_envios_em_andamento(self, monkeypatch):
+        envios = OrderedDict(
+            (envio.id, envio) for envio in [
+                EnvioLote(id="antigo", total=10),
+                EnvioLote(id="concluido", total=10, status="concluido"),
+                EnvioLote(id="novo", total=10),
+            ]
+        )
+        monkeypatch.setattr(notificacao_util, "_envios_lote", envios)
+        monkeypatch.setattr(notificacao_util, "NOTIFICACOES_ENVIOS_MANTIDOS", 1)
+
+        notificacao_util._descartar_envios_antigos()
+
+        assert list(envios) == ["antigo", "novo"]
+
+    @pytest.mark.asyncio
+    async def test_encerrar_interrompe_e_aguarda(self, clientes, monkeypatch):
+        def criar_ate_interromper(*args, interromper, **kwargs):
+            assert interromper.wait(timeout=5)
+            return 0
+
+        monkeypatch.setattr(notificacao_util, "criar_notificacoes_em_lote", criar_ate_interromper)
+        envio = await notificacao_util.iniciar_envio_lote("Aviso", "Mensagem", usuario_ids=clientes)
+        await asyncio.sleep(0.05)
+        assert envio.status == "em_andamento"
+
+        await notificacao_util.encerrar_envios_lote()
+
+        assert envio.status == "interrompido"
+        assert envio.concluido_em is not None
+        assert notificacao_util._tarefas_envio == {}
+        assert not notificacao_util._encerrando.is_set()
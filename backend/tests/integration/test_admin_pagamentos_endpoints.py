@@ -3,7 +3,7 @@ Testes de endpoint do módulo administrativo de pagamentos
 (routes/admin_pagamentos_routes.py).
 
 Cobre caminhos felizes e tristes de:
-    GET  /api/admin/pagamentos        -> lista paginada (filtro opcional por status)
+    GET  /api/admin/pagamentos        -> lista paginada (filtros por status, provedor e período)
     GET  /api/admin/pagamentos/{id}   -> detalhes + dados do provedor
 
 Contrato (ver CLAUDE.md):
@@ -263,6 +263,106 @@ class TestListarFiltroStatus:
         assert corpo["total"] == 2
 
 
+def _definir_data_criacao(pagamento_id: int, data_utc: str) -> None:
+    """Regrava data_criacao (texto UTC, como o adaptador de datetime grava)."""
+    from util.db_util import obter_conexao
+
+    with obter_conexao() as conn:
+        conn.execute(
+            "UPDATE pagamento SET data_criacao = ? WHERE id = ?", (data_utc, pagamento_id)
+        )
+
+
+class TestListarFiltrosProviderPeriodo:
+    def test_filtro_provider(self, admin_autenticado, dono_pagamento):
+        _inserir_pagamento(usuario_id=dono_pagamento, provider="mercadopago")
+        stripe = _inserir_pagamento(usuario_id=dono_pagamento, provider="stripe")
+
+        resp = admin_autenticado.get("/api/admin/pagamentos?provider=stripe")
+        assert resp.status_code == status.HTTP_200_OK
+        corpo = resp.json()
+        assert corpo["total"] == 1
+        assert [i["id"] for i in corpo["items"]] == [stripe]
+
+    def test_filtro_periodo_inclusivo_no_horario_local(self, admin_autenticado, dono_pagamento):
+        # America/Sao_Paulo = UTC-3: 02:30 UTC do dia 11 ainda é dia 10 local
+        antes = _inserir_pagamento(usuario_id=dono_pagamento, descricao="antes")
+        inicio = _inserir_pagamento(usuario_id=dono_pagamento, descricao="inicio")
+        fim = _inserir_pagamento(usuario_id=dono_pagamento, descricao="fim")
+        depois = _inserir_pagamento(usuario_id=dono_pagamento, descricao="depois")
+        _definir_data_criacao(antes, "2025-03-01 02:59:59.999999")
+        _definir_data_criacao(inicio, "2025-03-01 03:00:00")
+        _definir_data_criacao(fim, "2025-03-11 02:30:00")
+        _definir_data_criacao(depois, "2025-03-11 03:00:00")
+
+        resp = admin_autenticado.get(
+            "/api/admin/pagamentos?data_inicio=2025-03-01&data_fim=2025-03-10"
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        corpo = resp.json()
+        assert corpo["total"] == 2
+        assert [i["id"] for i in corpo["items"]] == [fim, inicio]
+
+    def test_filtros_combinados(self, admin_autenticado, dono_pagamento):
+        alvo = _inserir_pagamento(
+            usuario_id=dono_pagamento, status_pag=StatusPagamento.APROVADO, provider="stripe"
+        )
+        _inserir_pagamento(
+            usuario_id=dono_pagamento, status_pag=StatusPagamento.PENDENTE, provider="stripe"
+        )
+        antigo = _inserir_pagamento(
+            usuario_id=dono_pagamento, status_pag=StatusPagamento.APROVADO, provider="stripe"
+        )
+        _definir_data_criacao(antigo, "2020-01-01 12:00:00")
+
+        resp = admin_autenticado.get(
+            "/api/admin/pagamentos",
+            params={
+                "status_filtro": StatusPagamento.APROVADO.value,
+                "provider": "stripe",
+                "data_inicio": "2021-01-01",
+            },
+        )
+        corpo = resp.json()
+        assert corpo["total"] == 1
+        assert [i["id"] for i in corpo["items"]] == [alvo]
+
+    def test_data_invalida_422(self, admin_autenticado):
+        resp = admin_autenticado.get("/api/admin/pagamentos?data_inicio=01/03/2025")
+        assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestIndicesPagamento:
+    @pytest.mark.parametrize("filtros, params, indice", [
+        ([], (), "idx_pagamento_data_criacao"),
+        (["FILTRO_ADMIN_STATUS"], ("Aprovado",), "idx_pagamento_status_data"),
+        (["FILTRO_ADMIN_PROVIDER"], ("stripe",), "idx_pagamento_provider_data"),
+        (
+            ["FILTRO_ADMIN_STATUS", "FILTRO_ADMIN_DATA_INICIO", "FILTRO_ADMIN_DATA_FIM"],
+            ("Aprovado", "2025-01-01", "2025-02-01"),
+            "idx_pagamento_status_data",
+        ),
+    ])
+    def test_listagem_usa_indice_sem_ordenar_em_memoria(self, filtros, params, indice):
+        from sql import pagamento_sql
+        from util.db_util import obter_conexao
+
+        condicoes = [getattr(pagamento_sql, f) for f in filtros]
+        where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        with obter_conexao() as conn:
+            plano = conn.execute(
+                f"EXPLAIN QUERY PLAN {pagamento_sql.CONTAR_ADMIN}{where}", params
+            ).fetchall()
+            plano += conn.execute(
+                f"EXPLAIN QUERY PLAN {pagamento_sql.LISTAR_ADMIN}{where} "
+                f"{pagamento_sql.ORDENAR_ADMIN} LIMIT ? OFFSET ?",
+                (*params, 10, 0),
+            ).fetchall()
+        detalhes = " ".join(row["detail"] for row in plano)
+        assert indice in detalhes
+        assert "TEMP B-TREE" not in detalhes
+
+
 # =============================================================================
 # GET /api/admin/pagamentos/{id}  — autorização
 # =============================================================================
@@ -0,0 +1,161 @@
+"""
+Testes para o módulo util/chat_broadcast.py
+
+Testa os backends de broadcast do chat, incluindo a entrega entre workers
+(instâncias do GerenciadorChat e processos distintos) pelo backend sqlite.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from repo import chat_evento_repo
+from util.chat_broadcast import (
+    BackendMemoria,
+    BackendSQLite,
+    criar_backend_broadcast,
+)
+from util.chat_manager import GerenciadorChat
+from util.db_util import obter_conexao
+
+RAIZ_BACKEND = Path(__file__).parent.parent.parent
+
+# Worker filho: conecta o usuário 2, consome o log e imprime o primeiro evento
+SCRIPT_WORKER = """
+import asyncio, json
+from util.chat_broadcast import BackendSQLite
+from util.chat_manager import GerenciadorChat
+
+async def main():
+    gerenciador = GerenciadorChat(BackendSQLite(intervalo_ms=10))
+    fila = await gerenciador.conectar(2)
+    await gerenciador.iniciar()
+    print("pronto", flush=True)
+    evento = await asyncio.wait_for(fila.get(), timeout=10)
+    print(json.dumps(evento), flush=True)
+    await gerenciador.encerrar()
+
+asyncio.run(main())
+"""
+
+
+@pytest.fixture
+def log_eventos():
+    """Garante a tabela chat_evento vazia antes de cada teste"""
+    chat_evento_repo.criar_tabela()
+    with obter_conexao() as conn:
+        conn.execute("DELETE FROM chat_evento")
+    yield
+
+
+class TestCriarBackend:
+    """Testes para a fábrica de backends"""
+
+    def test_cria_backend_por_nome(self):
+        assert isinstance(criar_backend_broadcast("memoria"), BackendMemoria)
+        assert isinstance(criar_backend_broadcast(" SQLite "), BackendSQLite)
+
+    def test_nome_invalido(self):
+        with pytest.raises(ValueError, match="CHAT_BROADCAST_BACKEND"):
+            criar_backend_broadcast("redis")
+
+    def test_gerenciador_usa_memoria_por_padrao(self):
+        assert isinstance(GerenciadorChat().backend, BackendMemoria)
+
+
+class TestBackendSQLite:
+    """Entrega entre dois workers que compartilham o banco"""
+
+    @pytest.mark.asyncio
+    async def test_entrega_para_outro_worker(self, log_eventos):
+        """Evento publicado no worker A chega ao usuário conectado no worker B"""
+        worker_a = GerenciadorChat(BackendSQLite())
+        worker_b = GerenciadorChat(BackendSQLite())
+        fila_1 = await worker_a.conectar(1)
+        fila_2 = await worker_b.conectar(2)
+
+        await worker_a.broadcast_para_sala("1_2", {"tipo": "nova_mensagem", "sala_id": "1_2"})
+
+        # Worker A entrega localmente na hora; worker B só após consumir o log
+        assert fila_1.get_nowait()["tipo"] == "nova_mensagem"
+        assert fila_2.empty()
+
+        assert await worker_b.backend.consumir_pendentes() == 1
+        assert fila_2.get_nowait() == {"tipo": "nova_mensagem", "sala_id": "1_2"}
+        assert worker_b.obter_estatisticas()["broadcast"]["total_recebidos"] == 1
+
+    @pytest.mark.asyncio
+    async def test_publicador_ignora_proprio_evento(self, log_eventos):
+        """O worker publicador não entrega duas vezes o evento que gravou"""
+        worker_a = GerenciadorChat(BackendSQLite())
+        fila_1 = await worker_a.conectar(1)
+
+        await worker_a.broadcast_para_sala("1_2", {"tipo": "nova_mensagem"})
+        fila_1.get_nowait()
+
+        assert await worker_a.backend.consumir_pendentes() == 1
+        assert fila_1.empty()
+
+    @pytest.mark.asyncio
+    async def test_iniciar_ignora_eventos_anteriores(self, log_eventos):
+        """Um worker que sobe depois não recebe eventos antigos do log"""
+        chat_evento_repo.inserir("outro-worker", [2], {"tipo": "antigo"})
+        worker_b = GerenciadorChat(BackendSQLite(intervalo_ms=10))
+        fila_2 = await worker_b.conectar(2)
+
+        await worker_b.iniciar()
+        try:
+            chat_evento_repo.inserir("outro-worker", [2], {"tipo": "novo"})
+            evento = await asyncio.wait_for(fila_2.get(), timeout=5)
+        finally:
+            await worker_b.encerrar()
+
+        assert evento == {"tipo": "novo"}
+        assert fila_2.empty()
+
+    @pytest.mark.asyncio
+    async def test_consumo_em_lotes(self, log_eventos):
+        """Mais eventos pendentes que o lote são lidos em consultas sucessivas"""
+        worker_b = GerenciadorChat(BackendSQLite(lote=3))
+        fila_2 = await worker_b.conectar(2)
+        for i in range(5):
+            chat_evento_repo.inserir("outro-worker", [2, 3], {"seq": i})
+
+        assert await worker_b.backend.consumir_pendentes() == 3
+        assert await worker_b.backend.consumir_pendentes() == 2
+        assert [fila_2.get_nowait()["seq"] for _ in range(5)] == [0, 1, 2, 3, 4]
+
+    def test_excluir_antigos(self, log_eventos):
+        chat_evento_repo.inserir("w", [1], {"tipo": "x"})
+
+        assert chat_evento_repo.excluir_antigos(60) == 0
+        assert chat_evento_repo.excluir_antigos(-1) == 1
+        assert chat_evento_repo.listar_apos(0) == []
+
+    @pytest.mark.asyncio
+    async def test_entrega_entre_processos(self, log_eventos):
+        """Mensagem publicada neste processo chega a um worker em outro processo"""
+        processo = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", SCRIPT_WORKER,
+            cwd=str(RAIZ_BACKEND),
+            env=dict(os.environ),
+            stdout=asyncio.subprocess.PIPE,
+        )
+        try:
+            pronto = await asyncio.wait_for(processo.stdout.readline(), timeout=30)
+            assert pronto.decode().strip() == "pronto"
+
+            worker_a = GerenciadorChat(BackendSQLite())
+            await worker_a.broadcast_para_sala("1_2", {"tipo": "nova_mensagem", "mensagem": "olá"})
+
+            linha = await asyncio.wait_for(processo.stdout.readline(), timeout=10)
+            assert json.loads(linha) == {"tipo": "nova_mensagem", "mensagem": "olá"}
+            assert await asyncio.wait_for(processo.wait(), timeout=10) == 0
+        finally:
+            if processo.returncode is None:
+                processo.kill()
+                await processo.wait()
@@ -27,9 +27,117 @@ gate de auth dispara ANTES de qualquer streaming.
 import pytest
 from fastapi import status
 
+from util.paginacao_util import codificar_cursor
 from util.perfis import Perfil
 
 
+def _criar_sessao_sse(email: str = "sse@example.com"):
+    """Cria um usuário e faz login real; retorna (usuario_id, cookie de sessão)."""
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from model.usuario_model import Usuario
+    from repo import usuario_repo
+    from util.security import criar_hash_senha
+
+    # Usuário próprio (autouse já limpou a tabela usuario antes do teste)
+    uid = usuario_repo.inserir(
+        Usuario(
+            id=0,
+            nome="Usuario SSE",
+            email=email,
+            senha=criar_hash_senha("Senha@123"),
+            perfil=Perfil.CLIENTE.value,
+        )
+    )
+
+    # Cookie de sessão assinado, via login real num TestClient síncrono.
+    with TestClient(app) as c:
+        tok = c.get("/api/csrf-token").json()["token"]
+        login = c.post(
+            "/api/login",
+            json={"email": email, "senha": "Senha@123"},
+            headers={"X-CSRF-Token": tok},
+        )
+        assert login.status_code == status.HTTP_200_OK
+        session_cookie = c.cookies.get("session")
+    assert session_cookie, "cookie de sessão não emitido no login"
+    return uid, session_cookie
+
+
+async def _ler_primeiro_chunk_sse(uid, session_cookie, headers=(), ao_conectar=None):
+    """Abre GET /api/chat/stream direto na app ASGI e devolve o primeiro chunk.
+
+    ``ao_conectar`` (corrotina) roda assim que a conexão é registrada no
+    GerenciadorChat. Retorna (início da resposta, corpo decodificado).
+    """
+    import asyncio
+
+    from main import app
+    from util.chat_manager import gerenciador_chat
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/chat/stream",
+        "raw_path": b"/api/chat/stream",
+        "query_string": b"",
+        "root_path": "",
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+        "headers": [
+            (b"host", b"testserver"),
+            (b"cookie", b"session=" + session_cookie.encode()),
+            *headers,
+        ],
+    }
+
+    inicio: dict = {}
+    body_chunks: list[bytes] = []
+    primeiro_chunk = asyncio.Event()
+
+    async def receive():
+        # Mantém a "conexão" aberta; só liberamos via cancel da task.
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            inicio["status"] = message["status"]
+            inicio["headers"] = dict(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            corpo = message.get("body") or b""
+            if corpo:
+                body_chunks.append(corpo)
+                primeiro_chunk.set()
+
+    app_task = asyncio.create_task(app(scope, receive, send))
+
+    try:
+        # Espera a conexão ser registrada no GerenciadorChat.
+        for _ in range(500):
+            if gerenciador_chat._connections.get(uid):
+                break
+            await asyncio.sleep(0.01)
+        assert gerenciador_chat._connections.get(uid), "usuário não foi registrado no GerenciadorChat"
+        if ao_conectar is not None:
+            await ao_conectar()
+
+        await asyncio.wait_for(primeiro_chunk.wait(), timeout=5)
+    finally:
+        app_task.cancel()
+        try:
+            await app_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        await gerenciador_chat.desconectar(uid)
+
+    return inicio, b"".join(body_chunks).decode()
+
+
 pytestmark = [pytest.mark.integration]
 
 
@@ -116,104 +224,49 @@ class TestStream:
         confirmamos que ele sai formatado como ``data: ...``. Cancelamos a task
         após o primeiro chunk (o ``finally`` do gerador desconecta o usuário).
         """
-        import asyncio
-
-        from fastapi.testclient import TestClient
-
-        from main import app
-        from model.usuario_model import Usuario
-        from repo import usuario_repo
         from util.chat_manager import gerenciador_chat
-        from util.security import criar_hash_senha
-
-        # Usuário próprio (autouse já limpou a tabela usuario antes do teste)
-        uid = usuario_repo.inserir(
-            Usuario(
-                id=0,
-                nome="Usuario SSE",
-                email="sse@example.com",
-                senha=criar_hash_senha("Senha@123"),
-                perfil=Perfil.CLIENTE.value,
-            )
-        )
 
-        # Cookie de sessão assinado, via login real num TestClient síncrono.
-        with TestClient(app) as c:
-            tok = c.get("/api/csrf-token").json()["token"]
-            login = c.post(
-                "/api/login",
-                json={"email": "sse@example.com", "senha": "Senha@123"},
-                headers={"X-CSRF-Token": tok},
-            )
-            assert login.status_code == status.HTTP_200_OK
-            session_cookie = c.cookies.get("session")
-        assert session_cookie, "cookie de sessão não emitido no login"
-
-        scope = {
-            "type": "http",
-            "asgi": {"version": "3.0", "spec_version": "2.3"},
-            "http_version": "1.1",
-            "method": "GET",
-            "scheme": "http",
-            "path": "/api/chat/stream",
-            "raw_path": b"/api/chat/stream",
-            "query_string": b"",
-            "root_path": "",
-            "server": ("testserver", 80),
-            "client": ("testclient", 50000),
-            "headers": [
-                (b"host", b"testserver"),
-                (b"cookie", b"session=" + session_cookie.encode()),
-            ],
-        }
-
-        inicio: dict = {}
-        body_chunks: list[bytes] = []
-        primeiro_chunk = asyncio.Event()
-
-        async def receive():
-            # Mantém a "conexão" aberta; só liberamos via cancel da task.
-            await asyncio.sleep(3600)
-            return {"type": "http.disconnect"}
-
-        async def send(message):
-            if message["type"] == "http.response.start":
-                inicio["status"] = message["status"]
-                inicio["headers"] = dict(message.get("headers", []))
-            elif message["type"] == "http.response.body":
-                corpo = message.get("body") or b""
-                if corpo:
-                    body_chunks.append(corpo)
-                    primeiro_chunk.set()
-
-        app_task = asyncio.create_task(app(scope, receive, send))
-
-        # Espera a conexão ser registrada e injeta um evento na fila do usuário.
-        fila = None
-        for _ in range(500):
-            fila = gerenciador_chat._connections.get(uid)
-            if fila is not None:
-                fila.put_nowait({"tipo": "teste_sse", "conteudo": "ola"})
-                break
-            await asyncio.sleep(0.01)
-        assert fila is not None, "usuário não foi registrado no GerenciadorChat"
+        uid, session_cookie = _criar_sessao_sse()
 
-        try:
-            await asyncio.wait_for(primeiro_chunk.wait(), timeout=5)
-        finally:
-            app_task.cancel()
-            try:
-                await app_task
-            except (asyncio.CancelledError, Exception):
-                pass
-            await gerenciador_chat.desconectar(uid)
+        async def injetar_evento():
+            filas = gerenciador_chat._connections[uid]
+            next(iter(filas)).put_nowait({"tipo": "teste_sse", "conteudo": "ola"})
+
+        inicio, corpo = await _ler_primeiro_chunk_sse(uid, session_cookie, ao_conectar=injetar_evento)
 
         assert inicio.get("status") == status.HTTP_200_OK
         assert b"text/event-stream" in inicio["headers"].get(b"content-type", b"")
-        corpo = b"".join(body_chunks).decode()
         assert "teste_sse" in corpo
         assert "ola" in corpo
 
+    async def test_last_event_id_reenvia_eventos_perdidos(self):
+        """Reconexão com Last-Event-ID recebe, com seus IDs, os eventos
+        entregues enquanto o usuário estava desconectado."""
+        from util.chat_manager import gerenciador_chat
+
+        uid, session_cookie = _criar_sessao_sse()
+
+        # Primeira conexão: recebe um evento e cai
+        fila = await gerenciador_chat.conectar(uid)
+        await gerenciador_chat.broadcast_para_sala(f"{uid}_999999", {"tipo": "teste_sse", "n": 1})
+        fila.get_nowait()
+        ultimo_id = fila.ultimo_id_lido
+        await gerenciador_chat.desconectar(uid, fila)
+
+        # Eventos perdidos durante a queda
+        for n in (2, 3):
+            await gerenciador_chat.broadcast_para_sala(f"{uid}_999999", {"tipo": "teste_sse", "n": n})
+
+        _, corpo = await _ler_primeiro_chunk_sse(
+            uid, session_cookie, headers=[(b"last-event-id", ultimo_id.encode())]
+        )
+
+        assert '"n": 1' not in corpo
+        assert '"n": 2' in corpo and '"n": 3' in corpo
+        prefixo, sequencia = ultimo_id.rsplit("-", 1)
+        assert f"id: {prefixo}-{int(sequencia) + 1}\n" in corpo
+        assert f"id: {prefixo}-{int(sequencia) + 2}\n" in corpo
+
     def test_stream_registrado_como_sse(self):
         """Verifica, sem abrir conexão viva, que a rota /api/chat/stream existe
         e está montada como GET sob /api/chat (inspeção da app, não request).
@@ -444,6 +497,86 @@ class TestListarMensagens:
         assert resp.json()["type"] == "rate_limited"
 
 
+class TestListarMensagensCursor:
+    """Paginação por cursor (keyset) em GET /api/chat/mensagens/{sala_id}."""
+
+    def _sala_com_mensagens(self, client, criar_usuario_direto, quantidade):
+        from repo import chat_mensagem_repo
+        outro = criar_usuario_direto("Cursor Outro", "cursoroutro@example.com", "Senha@123")
+        sala_id = _criar_sala(client, outro)
+        ids = [
+            chat_mensagem_repo.inserir(sala_id, outro, f"Mensagem {i}").id
+            for i in range(quantidade)
+        ]
+        return sala_id, ids
+
+    def test_janela_mais_recente_em_ordem_cronologica(self, cliente_autenticado, criar_usuario_direto):
+        sala_id, ids = self._sala_com_mensagens(cliente_autenticado, criar_usuario_direto, 5)
+        resp = cliente_autenticado.get(
+            f"/api/chat/mensagens/{sala_id}", params={"before_id": ids[-1] + 1, "limit": 2}
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        corpo = resp.json()
+        assert [m["id"] for m in corpo["items"]] == ids[3:5]
+        assert corpo["next_cursor"]
+
+    def test_next_cursor_percorre_historico_ate_o_fim(self, cliente_autenticado, criar_usuario_direto):
+        sala_id, ids = self._sala_com_mensagens(cliente_autenticado, criar_usuario_direto, 5)
+        vistos = []
+        params = {"before_id": ids[-1] + 1, "limit": 2}
+        while True:
+            corpo = cliente_autenticado.get(f"/api/chat/mensagens/{sala_id}", params=params).json()
+            vistos = [m["id"] for m in corpo["items"]] + vistos
+            if not corpo["next_cursor"]:
+                break
+            params = {"cursor": corpo["next_cursor"], "limit": 2}
+        assert vistos == ids
+
+    def test_after_id_retorna_mensagens_seguintes(self, cliente_autenticado, criar_usuario_direto):
+        sala_id, ids = self._sala_com_mensagens(cliente_autenticado, criar_usuario_direto, 4)
+        resp = cliente_autenticado.get(
+            f"/api/chat/mensagens/{sala_id}", params={"after_id": ids[0], "limit": 2}
+        )
+        corpo = resp.json()
+        assert [m["id"] for m in corpo["items"]] == ids[1:3]
+        seguinte = cliente_autenticado.get(
+            f"/api/chat/mensagens/{sala_id}", params={"cursor": corpo["next_cursor"], "limit": 2}
+        ).json()
+        assert [m["id"] for m in seguinte["items"]] == ids[3:]
+        assert seguinte["next_cursor"] is None
+
+    def test_modo_offset_continua_retornando_lista(self, cliente_autenticado, criar_usuario_direto):
+        sala_id, ids = self._sala_com_mensagens(cliente_autenticado, criar_usuario_direto, 3)
+        resp = cliente_autenticado.get(
+            f"/api/chat/mensagens/{sala_id}", params={"limit": 2, "offset": 1}
+        )
+        assert [m["id"] for m in resp.json()] == ids[1:3]
+
+    def test_cursor_invalido_400(self, cliente_autenticado, criar_usuario_direto):
+        sala_id, _ = self._sala_com_mensagens(cliente_autenticado, criar_usuario_direto, 1)
+        resp = cliente_autenticado.get(
+            f"/api/chat/mensagens/{sala_id}", params={"cursor": "nao-e-cursor"}
+        )
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_ids_fora_do_intervalo_do_sqlite(self, cliente_autenticado, criar_usuario_direto):
+        """IDs acima de 2**63-1 (direto ou no cursor) são erro do cliente, não 500."""
+        sala_id, _ = self._sala_com_mensagens(cliente_autenticado, criar_usuario_direto, 1)
+        url = f"/api/chat/mensagens/{sala_id}"
+
+        assert cliente_autenticado.get(url, params={"before_id": 2**63}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert cliente_autenticado.get(url, params={"after_id": -1}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        resp = cliente_autenticado.get(url, params={"cursor": codificar_cursor("antes", 2**63)})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_before_e_after_juntos_400(self, cliente_autenticado, criar_usuario_direto):
+        sala_id, ids = self._sala_com_mensagens(cliente_autenticado, criar_usuario_direto, 1)
+        resp = cliente_autenticado.get(
+            f"/api/chat/mensagens/{sala_id}", params={"before_id": ids[0], "after_id": ids[0]}
+        )
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
 # =============================================================================
 # POST /api/chat/mensagens
 # =============================================================================
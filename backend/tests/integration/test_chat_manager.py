@@ -6,9 +6,20 @@ Testa o gerenciador de conexões SSE para o sistema de chat.
 
 import pytest
 import asyncio
+import gc
+import tracemalloc
 from unittest.mock import AsyncMock, patch
 
-from util.chat_manager import GerenciadorChat, gerenciador_chat
+from util import chat_manager
+from util.chat_manager import (
+    EVENTO_RESSINCRONIZAR,
+    FIM_STREAM,
+    FilaSSE,
+    GerenciadorChat,
+    coalescer_eventos,
+    fluxo_sse,
+    gerenciador_chat,
+)
 
 
 class TestGerenciadorChat:
@@ -179,6 +190,21 @@ class TestGerenciadorChat:
         assert queue1 is not queue2
         assert gerenciador.esta_conectado(1)
 
+    @pytest.mark.asyncio
+    async def test_enviar_threadsafe_no_loop_guarda_a_task(self, gerenciador):
+        """Envio agendado no próprio loop fica referenciado até terminar"""
+        await gerenciador.iniciar()
+        queue = await gerenciador.conectar(1)
+
+        assert gerenciador.enviar_threadsafe([1], {"tipo": "teste"}) is True
+        assert len(gerenciador._tarefas_envio) == 1
+        gc.collect()
+
+        evento = await asyncio.wait_for(queue.get(), timeout=5)
+        await asyncio.sleep(0)
+        assert evento["tipo"] == "teste"
+        assert gerenciador._tarefas_envio == set()
+
 
 class TestGerenciadorChatSingleton:
     """Testes para a instância singleton"""
@@ -200,3 +226,412 @@ class TestGerenciadorChatSingleton:
 
         await gerenciador_chat.desconectar(999)
         assert not gerenciador_chat.esta_conectado(999)
+
+
+class TestCoalescerEventos:
+    """Testes para a função coalescer_eventos"""
+
+    def test_mantem_ultimo_contador_por_sala(self):
+        """Contadores repetidos da mesma sala viram um só, na última posição"""
+        eventos = [
+            {"tipo": "atualizar_contador", "sala_id": "1_2"},
+            {"tipo": "nova_mensagem", "sala_id": "1_2", "id": 1},
+            {"tipo": "atualizar_contador", "sala_id": "1_3"},
+            {"tipo": "atualizar_contador", "sala_id": "1_2"},
+        ]
+
+        assert coalescer_eventos(eventos) == [
+            {"tipo": "nova_mensagem", "sala_id": "1_2", "id": 1},
+            {"tipo": "atualizar_contador", "sala_id": "1_3"},
+            {"tipo": "atualizar_contador", "sala_id": "1_2"},
+        ]
+
+    def test_nao_coalesce_mensagens(self):
+        """Mensagens nunca são descartadas, mesmo que iguais"""
+        eventos = [{"tipo": "nova_mensagem", "sala_id": "1_2"}] * 3
+
+        assert coalescer_eventos(eventos) == eventos
+
+
+class TestFluxoSSE:
+    """Testes para o gerador do stream SSE"""
+
+    @pytest.mark.asyncio
+    async def test_envia_eventos_enfileirados_em_um_chunk(self):
+        """Eventos acumulados saem juntos, já coalescidos"""
+        fila = asyncio.Queue()
+        for i in range(3):
+            fila.put_nowait({"tipo": "nova_mensagem", "id": i})
+            fila.put_nowait({"tipo": "atualizar_contador", "sala_id": "1_2"})
+
+        fluxo = fluxo_sse(fila)
+        chunk = await fluxo.__anext__()
+        await fluxo.aclose()
+
+        assert chunk.count("data: ") == 4
+        assert chunk.count("atualizar_contador") == 1
+        assert chunk.endswith("\n\n")
+        assert fila.empty()
+
+    @pytest.mark.asyncio
+    async def test_respeita_lote_maximo(self):
+        """Cada chunk leva no máximo lote_maximo eventos"""
+        fila = asyncio.Queue()
+        for i in range(5):
+            fila.put_nowait({"tipo": "nova_mensagem", "id": i})
+
+        fluxo = fluxo_sse(fila, lote_maximo=2)
+        chunks = [await fluxo.__anext__() for _ in range(3)]
+        await fluxo.aclose()
+
+        assert [c.count("data: ") for c in chunks] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_sem_eventos(self):
+        """Sem eventos, envia comentário de heartbeat e não perde o próximo evento"""
+        fila = asyncio.Queue()
+        fluxo = fluxo_sse(fila, heartbeat_segundos=0.01)
+
+        assert await fluxo.__anext__() == ": heartbeat\n\n"
+        fila.put_nowait({"tipo": "nova_mensagem", "id": 1})
+        chunk = await fluxo.__anext__()
+        await fluxo.aclose()
+
+        assert '"id": 1' in chunk
+
+    @pytest.mark.asyncio
+    async def test_sem_atraso_entre_eventos(self):
+        """Eventos chegando um a um são enviados sem espera fixa"""
+        fila = asyncio.Queue()
+        fluxo = fluxo_sse(fila)
+        loop = asyncio.get_running_loop()
+
+        inicio = loop.time()
+        for i in range(50):
+            fila.put_nowait({"tipo": "nova_mensagem", "id": i})
+            await fluxo.__anext__()
+        await fluxo.aclose()
+
+        assert loop.time() - inicio < 1.0
+
+
+class TestFilaSSE:
+    """Testes para a fila limitada e as políticas de consumidor lento"""
+
+    def test_politica_invalida(self):
+        with pytest.raises(ValueError, match="Política de fila SSE"):
+            FilaSSE(10, "bloquear")
+        with pytest.raises(ValueError, match="Política de fila SSE"):
+            GerenciadorChat(politica_fila="bloquear")
+
+    def test_descartar_antigos(self):
+        """Com a fila cheia, o evento mais antigo dá lugar ao novo"""
+        fila = FilaSSE(3, "descartar_antigos")
+        for i in range(5):
+            assert fila.oferecer({"id": i}) is True
+
+        assert [fila.get_nowait()["id"] for _ in range(3)] == [2, 3, 4]
+        assert fila.total_descartados == 2
+        assert fila.total_entregues == 3
+
+    def test_coalescer_remove_contadores_repetidos(self):
+        """Coalescer abre espaço sem perder mensagens quando há redundância"""
+        fila = FilaSSE(3, "coalescer")
+        fila.oferecer({"tipo": "atualizar_contador", "sala_id": "1_2"})
+        fila.oferecer({"tipo": "nova_mensagem", "id": 1})
+        fila.oferecer({"tipo": "atualizar_contador", "sala_id": "1_2"})
+        fila.oferecer({"tipo": "nova_mensagem", "id": 2})
+
+        assert [fila.get_nowait().get("id") for _ in range(3)] == [1, None, 2]
+        assert fila.total_descartados == 1
+
+    def test_coalescer_sem_redundancia_descarta_antigos(self):
+        fila = FilaSSE(2, "coalescer")
+        for i in range(3):
+            fila.oferecer({"tipo": "nova_mensagem", "id": i})
+
+        assert [fila.get_nowait()["id"] for _ in range(2)] == [1, 2]
+
+    def test_desconectar(self):
+        """Com a fila cheia, descarta tudo e sinaliza o fim do stream"""
+        fila = FilaSSE(2, "desconectar")
+        fila.oferecer({"id": 1})
+        fila.oferecer({"id": 2})
+
+        assert fila.oferecer({"id": 3}) is False
+        assert fila.encerrada
+        assert fila.get_nowait() is FIM_STREAM
+        assert fila.oferecer({"id": 4}) is False
+
+    @pytest.mark.asyncio
+    async def test_atraso_segundos(self):
+        fila = FilaSSE(10)
+        assert fila.atraso_segundos() == 0.0
+
+        fila.oferecer({"id": 1})
+        await asyncio.sleep(0.02)
+
+        assert fila.atraso_segundos() >= 0.02
+        fila.get_nowait()
+        assert fila.atraso_segundos() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_fluxo_termina_com_fim_stream(self):
+        """O stream envia o que restou e termina ao receber FIM_STREAM"""
+        fila = FilaSSE(10)
+        fila.oferecer({"tipo": "nova_mensagem", "id": 1})
+        fila.encerrar()
+
+        chunks = [chunk async for chunk in fluxo_sse(fila)]
+
+        assert chunks == []
+        assert fila.total_descartados == 1
+
+
+class TestGerenciadorChatConsumidorLento:
+    """Política de consumidor lento aplicada pelo GerenciadorChat"""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_nao_bloqueia_com_fila_cheia(self):
+        gerenciador = GerenciadorChat(fila_maxima=2, politica_fila="descartar_antigos")
+        fila = await gerenciador.conectar(1)
+
+        for i in range(10):
+            await asyncio.wait_for(gerenciador.broadcast_para_sala("1_2", {"id": i}), timeout=1)
+
+        assert fila.qsize() == 2
+        stats = gerenciador.obter_estatisticas()
+        assert stats["total_pendentes"] == 2
+        assert stats["total_descartados"] == 8
+        assert stats["conexoes"][0]["usuario_id"] == 1
+
+    @pytest.mark.asyncio
+    async def test_desconecta_consumidor_lento(self):
+        gerenciador = GerenciadorChat(fila_maxima=2, politica_fila="desconectar")
+        fila = await gerenciador.conectar(1)
+
+        for i in range(3):
+            await gerenciador.broadcast_para_sala("1_2", {"id": i})
+
+        assert not gerenciador.esta_conectado(1)
+        assert fila.get_nowait() is FIM_STREAM
+        stats = gerenciador.obter_estatisticas()
+        assert stats["desconectados_por_lentidao"] == 1
+        assert stats["total_descartados"] == 2
+
+    @pytest.mark.asyncio
+    async def test_desconectar_preserva_conexao_mais_nova(self):
+        """O encerramento de um stream antigo não derruba a reconexão"""
+        gerenciador = GerenciadorChat()
+        antiga = await gerenciador.conectar(1)
+        await gerenciador.conectar(1)
+
+        await gerenciador.desconectar(1, antiga)
+
+        assert gerenciador.esta_conectado(1)
+
+    def test_health_expoe_metricas_das_filas(self, client):
+        response = client.get("/api/chat/health")
+
+        dados = response.json()
+        assert dados["eventos_pendentes"] == 0
+        assert dados["atraso_maximo_segundos"] == 0.0
+        assert "eventos_descartados" in dados
+        assert "desconectados_por_lentidao" in dados
+
+
+class TestSoakFilasSSE:
+    """Milhares de clientes ociosos e lentos não fazem a memória crescer"""
+
+    CLIENTES_OCIOSOS = 2000
+    CLIENTES_LENTOS = 200
+    FILA_MAXIMA = 20
+
+    async def _rodada(self, gerenciador: GerenciadorChat, eventos_por_sala: int):
+        total = self.CLIENTES_OCIOSOS + self.CLIENTES_LENTOS
+        for i in range(eventos_por_sala):
+            for usuario in range(1, total + 1, 2):
+                tipo = "atualizar_contador" if i % 2 else "nova_mensagem"
+                await gerenciador.broadcast_para_sala(
+                    f"{usuario}_{usuario + 1}", {"tipo": tipo, "sala_id": f"{usuario}_{usuario + 1}", "i": i}
+                )
+            # Deixa os clientes lentos consumirem um pouco
+            await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("politica", ["descartar_antigos", "coalescer"])
+    async def test_memoria_estavel(self, politica, monkeypatch):
+        # Buffers de replay do mesmo tamanho das filas: ambos enchem na 1ª rodada
+        monkeypatch.setattr(chat_manager, "CHAT_SSE_REPLAY_TAMANHO", self.FILA_MAXIMA)
+        gerenciador = GerenciadorChat(fila_maxima=self.FILA_MAXIMA, politica_fila=politica)
+        filas = [await gerenciador.conectar(u) for u in range(1, self.CLIENTES_OCIOSOS + self.CLIENTES_LENTOS + 1)]
+
+        async def cliente_lento(fila):
+            async for _ in fluxo_sse(fila, lote_maximo=1):
+                await asyncio.sleep(0.005)
+
+        lentos = [asyncio.create_task(cliente_lento(f)) for f in filas[self.CLIENTES_OCIOSOS:]]
+        tracemalloc.start()
+        try:
+            # Primeira rodada enche as filas; a partir daí a memória não cresce
+            await self._rodada(gerenciador, self.FILA_MAXIMA + 5)
+            gc.collect()
+            antes, _ = tracemalloc.get_traced_memory()
+            await self._rodada(gerenciador, self.FILA_MAXIMA * 2)
+            gc.collect()
+            depois, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            for tarefa in lentos:
+                tarefa.cancel()
+            await asyncio.gather(*lentos, return_exceptions=True)
+
+        assert all(f.qsize() <= self.FILA_MAXIMA for f in filas)
+        # Filas ilimitadas cresceriam ~15 MB na segunda rodada (2200 clientes x
+        # 40 eventos); a tolerância cobre só a oscilação dos blocos das deques
+        assert depois - antes < 5 * 1024 * 1024, f"memória cresceu {depois - antes} bytes"
+        stats = gerenciador.obter_estatisticas()
+        assert stats["total_descartados"] > 0
+        assert stats["total_pendentes"] <= len(filas) * self.FILA_MAXIMA
+
+
+class TestMultiplasConexoesEReplay:
+    """Várias conexões por usuário, IDs de evento e replay (Last-Event-ID)"""
+
+    @pytest.mark.asyncio
+    async def test_todas_as_conexoes_do_usuario_recebem(self):
+        gerenciador = GerenciadorChat()
+        aba1 = await gerenciador.conectar(1)
+        aba2 = await gerenciador.conectar(1)
+
+        await gerenciador.broadcast_para_sala("1_2", {"tipo": "nova_mensagem"})
+
+        assert aba1.get_nowait() == aba2.get_nowait() == {"tipo": "nova_mensagem"}
+        assert aba1.ultimo_id_lido == aba2.ultimo_id_lido
+        assert gerenciador.obter_estatisticas()["total_conexoes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_fechar_uma_aba_preserva_a_outra(self):
+        gerenciador = GerenciadorChat()
+        aba1 = await gerenciador.conectar(1)
+        aba2 = await gerenciador.conectar(1)
+
+        await gerenciador.desconectar(1, aba1)
+        await gerenciador.broadcast_para_sala("1_2", {"tipo": "nova_mensagem"})
+
+        assert gerenciador.esta_conectado(1)
+        assert aba1.empty()
+        assert not aba2.empty()
+
+    @pytest.mark.asyncio
+    async def test_ids_crescentes(self):
+        gerenciador = GerenciadorChat()
+        fila = await gerenciador.conectar(1)
+
+        ids = []
+        for i in range(3):
+            await gerenciador.broadcast_para_sala("1_2", {"i": i})
+            fila.get_nowait()
+            ids.append(fila.ultimo_id_lido)
+
+        prefixos, sequencias = zip(*(i.rsplit("-", 1) for i in ids))
+        assert len(set(prefixos)) == 1
+        assert [int(s) for s in sequencias] == sorted(int(s) for s in sequencias)
+        assert len(set(ids)) == 3
+
+    @pytest.mark.asyncio
+    async def test_reconexao_recebe_eventos_perdidos(self):
+        gerenciador = GerenciadorChat()
+        fila = await gerenciador.conectar(1)
+        await gerenciador.broadcast_para_sala("1_2", {"i": 0})
+        fila.get_nowait()
+        ultimo_id = fila.ultimo_id_lido
+        await gerenciador.desconectar(1, fila)
+
+        for i in (1, 2):
+            await gerenciador.broadcast_para_sala("1_2", {"i": i})
+        nova = await gerenciador.conectar(1, ultimo_evento_id=ultimo_id)
+
+        prefixo, sequencia = ultimo_id.rsplit("-", 1)
+        assert nova.get_nowait() == {"i": 1}
+        assert nova.ultimo_id_lido == f"{prefixo}-{int(sequencia) + 1}"
+        assert nova.get_nowait() == {"i": 2}
+        assert nova.empty()
+
+    @pytest.mark.asyncio
+    async def test_buffer_estourado_pede_ressincronizacao(self, monkeypatch):
+        monkeypatch.setattr(chat_manager, "CHAT_SSE_REPLAY_TAMANHO", 2)
+        gerenciador = GerenciadorChat()
+        fila = await gerenciador.conectar(1)
+        await gerenciador.broadcast_para_sala("1_2", {"i": 0})
+        fila.get_nowait()
+        ultimo_id = fila.ultimo_id_lido
+        await gerenciador.desconectar(1, fila)
+
+        for i in (1, 2, 3):
+            await gerenciador.broadcast_para_sala("1_2", {"i": i})
+        nova = await gerenciador.conectar(1, ultimo_evento_id=ultimo_id)
+
+        assert nova.get_nowait() == EVENTO_RESSINCRONIZAR
+        assert nova.empty()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ultimo_evento_id", ["1", "abc-1", "-1", "lixo"])
+    async def test_id_desconhecido_pede_ressincronizacao(self, ultimo_evento_id):
+        """Last-Event-ID sem o prefixo deste worker não é confiável"""
+        gerenciador = GerenciadorChat()
+
+        fila = await gerenciador.conectar(1, ultimo_evento_id=ultimo_evento_id)
+
+        assert fila.get_nowait() == EVENTO_RESSINCRONIZAR
+
+    @pytest.mark.asyncio
+    async def test_id_de_outro_worker_na_mesma_faixa_pede_ressincronizacao(self):
+        """Mesma sequência, outro worker: nada de replay parcial"""
+        outro_worker = GerenciadorChat()
+        gerenciador = GerenciadorChat()
+        fila_outro = await outro_worker.conectar(1)
+        fila = await gerenciador.conectar(1)
+        for i in range(3):
+            await outro_worker.broadcast_para_sala("1_2", {"i": i})
+            await gerenciador.broadcast_para_sala("1_2", {"i": i})
+        fila_outro.get_nowait()
+        await gerenciador.desconectar(1, fila)
+
+        nova = await gerenciador.conectar(1, ultimo_evento_id=fila_outro.ultimo_id_lido)
+
+        assert nova.get_nowait() == EVENTO_RESSINCRONIZAR
+        assert nova.empty()
+
+    @pytest.mark.asyncio
+    async def test_replay_expira_apos_desconexao(self, monkeypatch):
+        monkeypatch.setattr(chat_manager, "CHAT_SSE_REPLAY_SEGUNDOS", 0)
+        gerenciador = GerenciadorChat()
+        fila = await gerenciador.conectar(1)
+        await gerenciador.desconectar(1, fila)
+
+        await gerenciador.broadcast_para_sala("1_2", {"i": 0})
+        ultimo_id = gerenciador.obter_estatisticas()["replay"]["ultimo_evento_id"]
+        nova = await gerenciador.conectar(1, ultimo_evento_id=ultimo_id)
+
+        assert nova.empty()
+
+    @pytest.mark.asyncio
+    async def test_usuario_nunca_conectado_nao_guarda_eventos(self):
+        gerenciador = GerenciadorChat()
+
+        await gerenciador.broadcast_para_sala("1_2", {"i": 0})
+
+        assert gerenciador._replay == {}
+
+    @pytest.mark.asyncio
+    async def test_fluxo_sse_envia_id(self):
+        gerenciador = GerenciadorChat()
+        fila = await gerenciador.conectar(1)
+        await gerenciador.broadcast_para_sala("1_2", {"i": 0})
+
+        fluxo = fluxo_sse(fila)
+        chunk = await fluxo.__anext__()
+        await fluxo.aclose()
+
+        assert chunk == f'id: {fila.ultimo_id_lido}\ndata: {{"i": 0}}\n\n'
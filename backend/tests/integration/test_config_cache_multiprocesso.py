@@ -0,0 +1,92 @@
+"""
+Testes da invalidação do ConfigCache entre processos (util/config_cache.py).
+
+Dois processos usam o mesmo arquivo de banco: um worker lê uma configuração
+e a mantém no snapshot; outro worker a altera (como put_salvar_configuracoes,
+que só limpa o cache do próprio processo). O primeiro deve perceber a
+alteração pela versão em configuracao_versao, sem chamar config.limpar().
+"""
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from repo import configuracao_repo
+from util.db_util import obter_conexao
+
+
+pytestmark = [pytest.mark.integration]
+
+RAIZ_BACKEND = Path(__file__).resolve().parents[2]
+
+# Lê a chave, imprime o valor e espera (sem limpar o cache) até ele mudar
+_SCRIPT_LEITOR = textwrap.dedent("""
+    import time
+    from repo import configuracao_repo
+    from util.config_cache import config
+
+    configuracao_repo.criar_tabela()
+    configuracao_repo.inserir_ou_atualizar("payment_provider", "mercadopago", "")
+    print(config.obter("payment_provider"), flush=True)
+
+    inicio = time.monotonic()
+    while config.obter("payment_provider") == "mercadopago" and time.monotonic() - inicio < 10:
+        time.sleep(0.01)
+    print(config.obter("payment_provider"), flush=True)
+""")
+
+# Altera a chave e limpa apenas o próprio cache
+_SCRIPT_ESCRITOR = textwrap.dedent("""
+    from repo import configuracao_repo
+    from util.config_cache import config
+
+    configuracao_repo.atualizar_multiplas({"payment_provider": "stripe"})
+    config.limpar()
+""")
+
+
+def _env(caminho: Path) -> dict:
+    return {
+        "PATH": "",
+        "RUNNING_MODE": "Development",
+        "DATABASE_PATH": str(caminho),
+        "CONFIG_CACHE_VERIFICACAO_MS": "50",
+    }
+
+
+class TestInvalidacaoEntreProcessos:
+    def test_worker_percebe_alteracao_de_outro_worker(self, tmp_path):
+        env = _env(tmp_path / "dados.db")
+        leitor = subprocess.Popen(
+            [sys.executable, "-c", _SCRIPT_LEITOR],
+            cwd=RAIZ_BACKEND, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        try:
+            assert leitor.stdout.readline().strip() == "mercadopago"
+
+            subprocess.run(
+                [sys.executable, "-c", _SCRIPT_ESCRITOR],
+                cwd=RAIZ_BACKEND, env=env, check=True, timeout=60,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+
+            saida, _ = leitor.communicate(timeout=60)
+        finally:
+            leitor.kill()
+
+        assert leitor.returncode == 0
+        assert saida.strip().splitlines()[-1] == "stripe"
+
+
+class TestVersaoConfiguracao:
+    def test_escritas_incrementam_versao(self):
+        versao = configuracao_repo.obter_versao()
+
+        configuracao_repo.inserir_ou_atualizar("chave_versao", "1", "")
+        configuracao_repo.atualizar("chave_versao", "2")
+        with obter_conexao() as conn:
+            conn.execute("DELETE FROM configuracao WHERE chave = ?", ("chave_versao",))
+
+        assert configuracao_repo.obter_versao() == versao + 3
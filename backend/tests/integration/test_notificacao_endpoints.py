@@ -19,6 +19,9 @@ Contrato (ver CLAUDE.md):
 
 ⚠️ A tabela `notificacao` NÃO é limpa pelo conftest — limpamos via fixture autouse.
 """
+import asyncio
+from datetime import datetime
+
 import pytest
 from fastapi import status
 
@@ -126,6 +129,17 @@ class TestListar:
         assert corpo["total_paginas"] == 2  # 16 itens / 15 por página → 2 páginas
         assert len(corpo["items"]) == 1  # 16 - 15 = 1 item na segunda página
 
+    def test_paginacao_sem_limite_de_100(self, cliente_autenticado, usuario_logado_id):
+        """A paginação é feita no banco: notificações além das 100 últimas aparecem."""
+        ids = [_criar(usuario_logado_id, titulo=f"N{i}") for i in range(105)]
+
+        resp = cliente_autenticado.get("/api/notificacoes/?pagina=7")
+        corpo = resp.json()
+        assert corpo["total"] == 105
+        assert corpo["total_paginas"] == 7
+        # Mais recentes primeiro (desempate por id): a última página tem as mais antigas
+        assert [i["id"] for i in corpo["items"]] == ids[14::-1]
+
     def test_isolamento_nao_ve_notificacao_de_outro(
         self, cliente_autenticado, criar_usuario_direto
     ):
@@ -210,6 +224,19 @@ class TestMarcarLida:
         # Contador de não lidas deve ter zerado
         assert cliente_autenticado.get("/api/notificacoes/nao-lidas").json()["total"] == 0
 
+    def test_marca_notificacao_antiga(self, cliente_autenticado, usuario_logado_id):
+        """A verificação de propriedade não depende das 100 mais recentes."""
+        antiga = _criar(usuario_logado_id, titulo="Antiga")
+        for i in range(100):
+            _criar(usuario_logado_id, titulo=f"N{i}")
+
+        token = _csrf(cliente_autenticado)
+        resp = cliente_autenticado.patch(
+            f"/api/notificacoes/{antiga}/lida", headers={"X-CSRF-Token": token}
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()["titulo"] == "Antiga"
+
     def test_sem_sessao_401(self, client):
         # Com CSRF válido mas sem sessão → 401 (CSRF passa, auth falha).
         token = _csrf(client)
@@ -425,3 +452,112 @@ class TestExcluir:
 def _nao_lidas_do_usuario(usuario_id: int) -> int:
     from repo import notificacao_repo
     return notificacao_repo.contar_nao_lidas(usuario_id)
+
+
+# =============================================================================
+# Índice notificacao(usuario_id, lida, data_criacao)
+# =============================================================================
+
+class TestIndiceNotificacao:
+    @pytest.mark.parametrize("sql, params", [
+        ("CONTAR_NAO_LIDAS", (1,)),
+        ("OBTER_NAO_LIDAS_POR_USUARIO", (1, 5)),
+        ("CONTAR_POR_USUARIO", (1,)),
+    ])
+    def test_consultas_por_usuario_usam_indice(self, sql, params):
+        from sql import notificacao_sql
+        from util.db_util import obter_conexao
+
+        with obter_conexao() as conn:
+            plano = conn.execute(
+                f"EXPLAIN QUERY PLAN {getattr(notificacao_sql, sql)}", params
+            ).fetchall()
+        detalhes = " ".join(row["detail"] for row in plano)
+        assert "idx_notificacao_usuario_lida_data" in detalhes
+        assert "TEMP B-TREE" not in detalhes
+
+    def test_fan_out_por_perfil_percorre_indice_de_perfil(self):
+        """O keyset perfil = ? AND id > ? ORDER BY id busca no índice, sem ordenar."""
+        from sql import notificacao_sql
+        from util.db_util import obter_conexao
+
+        with obter_conexao() as conn:
+            plano = conn.execute(
+                f"EXPLAIN QUERY PLAN {notificacao_sql.INSERIR_PARA_PERFIL}",
+                ("t", "m", "info", None, "Cliente", 0, 500),
+            ).fetchall()
+        detalhes = " ".join(row["detail"] for row in plano)
+        assert "idx_usuario_perfil (perfil=? AND rowid>?)" in detalhes
+        assert "TEMP B-TREE" not in detalhes
+
+
+# =============================================================================
+# Push pelo stream SSE (evento "notificacao")
+# =============================================================================
+
+class TestPushSSE:
+    """criar_notificacao e as rotas de marcar/excluir publicam o novo total."""
+
+    @pytest.mark.asyncio
+    async def test_criar_notificacao_envia_evento(self, usuario_logado_id):
+        from util.chat_manager import gerenciador_chat
+
+        fila = await gerenciador_chat.conectar(usuario_logado_id)
+        nid = _criar(usuario_logado_id, titulo="Pagamento aprovado", url_acao="/pagamentos")
+
+        evento = await asyncio.wait_for(fila.get(), timeout=5)
+        assert evento["tipo"] == "notificacao"
+        assert evento["nao_lidas"] == 1
+        assert evento["notificacao"]["id"] == nid
+        assert evento["notificacao"]["titulo"] == "Pagamento aprovado"
+        assert evento["notificacao"]["url_acao"] == "/pagamentos"
+        # Com fuso, como a data_criacao devolvida pelas rotas REST
+        from repo import notificacao_repo
+        data_push = evento["notificacao"]["data_criacao"]
+        if isinstance(data_push, str):
+            data_push = datetime.fromisoformat(data_push)
+        data_rest = notificacao_repo.obter_por_id(nid, usuario_logado_id).data_criacao
+        assert data_push.utcoffset() == data_rest.utcoffset()
+        assert abs((data_push - data_rest).total_seconds()) <= 1
+
+    @pytest.mark.asyncio
+    async def test_criar_notificacao_de_outra_thread(self, usuario_logado_id):
+        """Chamada no executor de banco (executar_db) também chega ao stream."""
+        from util.chat_manager import gerenciador_chat
+
+        fila = await gerenciador_chat.conectar(usuario_logado_id)
+        await asyncio.to_thread(_criar, usuario_logado_id)
+        await asyncio.to_thread(_criar, usuario_logado_id)
+
+        totais = [(await asyncio.wait_for(fila.get(), timeout=5))["nao_lidas"] for _ in range(2)]
+        assert totais == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_marcar_todas_envia_total_zerado(self, cliente_autenticado, usuario_logado_id):
+        from util.chat_manager import gerenciador_chat
+
+        _criar(usuario_logado_id)
+        fila = await gerenciador_chat.conectar(usuario_logado_id)
+        token = _csrf(cliente_autenticado)
+        # O TestClient bloqueia: roda numa thread para o event loop do teste
+        # continuar entregando o evento agendado pela rota.
+        resp = await asyncio.to_thread(
+            cliente_autenticado.patch, "/api/notificacoes/marcar-todas",
+            headers={"X-CSRF-Token": token},
+        )
+        assert resp.status_code == status.HTTP_200_OK
+
+        evento = await asyncio.wait_for(fila.get(), timeout=5)
+        assert evento == {"tipo": "notificacao", "nao_lidas": 0, "notificacao": None}
+
+    def test_usuario_desconectado_nao_consulta_contagem(self, usuario_logado_id, monkeypatch):
+        """Sem conexão SSE (backend em memória), nem a contagem é consultada."""
+        from repo import notificacao_repo
+        from util.notificacao_util import publicar_nao_lidas
+
+        def falhar(*args, **kwargs):
+            raise AssertionError("contar_nao_lidas não deveria ser chamado")
+
+        monkeypatch.setattr(notificacao_repo, "contar_nao_lidas", falhar)
+        assert publicar_nao_lidas(usuario_logado_id) is False
+        assert _criar(usuario_logado_id) is not None
@@ -0,0 +1,262 @@
+"""
+Testes da retenção de notificações (util/notificacao_retencao.py).
+
+Cobre:
+    - política por tipo (configuracao), exclusão em lotes e arquivamento
+    - agendador em segundo plano
+    - GET  /api/admin/notificacoes/retencao           → política + métricas
+    - POST /api/admin/notificacoes/retencao/executar  → execução imediata
+
+⚠️ As tabelas `notificacao` e `notificacao_arquivo` NÃO são criadas nem
+limpas pelo conftest — fazemos via fixture autouse.
+"""
+import asyncio
+
+import pytest
+from fastapi import status
+
+from model.notificacao_model import TipoNotificacao
+from repo import configuracao_repo, notificacao_arquivo_repo, notificacao_repo
+from util.config_cache import config
+from util.db_util import obter_conexao
+from util.notificacao_retencao import (
+    RETENCAO_PADRAO_DIAS,
+    AgendadorRetencao,
+    executar_retencao,
+    obter_estatisticas,
+    obter_politica,
+)
+
+
+pytestmark = [pytest.mark.integration]
+
+
+def _csrf(client):
+    """Obtém um token CSRF válido para a sessão do cliente."""
+    return client.get("/api/csrf-token").json()["token"]
+
+
+@pytest.fixture(autouse=True)
+def _limpar_notificacoes():  # pyright: ignore
+    """As tabelas de notificação não são criadas nem limpas pelo conftest."""
+    def limpa():
+        with obter_conexao() as conn:
+            conn.execute("DELETE FROM notificacao")
+            conn.execute("DELETE FROM notificacao_arquivo")
+
+    notificacao_repo.criar_tabela()
+    notificacao_arquivo_repo.criar_tabela()
+    limpa()
+    yield
+    limpa()
+
+
+@pytest.fixture
+def usuario_id(criar_usuario_direto):
+    return criar_usuario_direto("Cliente", "cliente@example.com", "Senha@123")
+
+
+def _criar(usuario_id: int, tipo: TipoNotificacao, dias: int, titulo: str = "Aviso") -> int:
+    """Cria uma notificação com `dias` de idade."""
+    notificacao_id = notificacao_repo.inserir(usuario_id, titulo, "Mensagem", tipo)
+    with obter_conexao() as conn:
+        conn.execute(
+            "UPDATE notificacao SET data_criacao = datetime('now', ?) WHERE id = ?",
+            (f"-{dias} days", notificacao_id),
+        )
+    return notificacao_id
+
+
+def _ids_restantes() -> set[int]:
+    with obter_conexao() as conn:
+        return {row["id"] for row in conn.execute("SELECT id FROM notificacao")}
+
+
+# =============================================================================
+# Política e execução
+# =============================================================================
+
+class TestExecutarRetencao:
+    @pytest.mark.asyncio
+    async def test_remove_somente_as_que_excedem_o_tipo(self, usuario_id):
+        info_antiga = _criar(usuario_id, TipoNotificacao.INFO, 40)
+        info_recente = _criar(usuario_id, TipoNotificacao.INFO, 10)
+        aviso = _criar(usuario_id, TipoNotificacao.AVISO, 40)
+        erro_antigo = _criar(usuario_id, TipoNotificacao.ERRO, 200)
+
+        resultado = await executar_retencao(politica=dict(RETENCAO_PADRAO_DIAS), arquivar=False)
+
+        assert resultado["removidas"] == 2
+        assert resultado["removidas_por_tipo"] == {"info": 1, "sucesso": 0, "aviso": 0, "erro": 1}
+        assert _ids_restantes() == {info_recente, aviso}
+        assert info_antiga not in _ids_restantes() and erro_antigo not in _ids_restantes()
+
+    @pytest.mark.asyncio
+    async def test_exclui_em_lotes_limitados(self, usuario_id):
+        for _ in range(7):
+            _criar(usuario_id, TipoNotificacao.INFO, 40)
+
+        resultado = await executar_retencao(
+            politica={TipoNotificacao.INFO: 30}, arquivar=False, lote=3, pausa_ms=0
+        )
+
+        assert resultado["removidas"] == 7
+        assert resultado["lotes"] == 3
+        assert _ids_restantes() == set()
+
+    @pytest.mark.asyncio
+    async def test_zero_dias_mantem_para_sempre(self, usuario_id):
+        _criar(usuario_id, TipoNotificacao.ERRO, 5000)
+
+        resultado = await executar_retencao(politica={TipoNotificacao.ERRO: 0}, arquivar=False)
+
+        assert resultado["removidas"] == 0
+        assert resultado["lotes"] == 0
+        assert len(_ids_restantes()) == 1
+
+    @pytest.mark.asyncio
+    async def test_arquiva_comprimido_na_mesma_transacao(self, usuario_id):
+        ids = [_criar(usuario_id, TipoNotificacao.INFO, 40, f"Antiga {i}") for i in range(5)]
+
+        resultado = await executar_retencao(
+            politica={TipoNotificacao.INFO: 30}, arquivar=True, lote=3, pausa_ms=0
+        )
+
+        assert resultado["arquivadas"] == 5
+        assert notificacao_arquivo_repo.obter_resumo()["notificacoes"] == 5
+        with obter_conexao() as conn:
+            arquivos = [row["id"] for row in conn.execute("SELECT id FROM notificacao_arquivo ORDER BY id")]
+        assert len(arquivos) == 2
+        arquivadas = [n for a in arquivos for n in notificacao_arquivo_repo.obter_notificacoes(a)]
+        assert [n["id"] for n in arquivadas] == ids
+        assert arquivadas[0]["titulo"] == "Antiga 0"
+        assert arquivadas[0]["usuario_id"] == usuario_id
+
+    @pytest.mark.asyncio
+    async def test_acumula_metricas(self, usuario_id):
+        antes = obter_estatisticas()
+        _criar(usuario_id, TipoNotificacao.AVISO, 100)
+
+        await executar_retencao(politica={TipoNotificacao.AVISO: 90}, arquivar=False)
+
+        depois = obter_estatisticas()
+        assert depois["execucoes"] == antes["execucoes"] + 1
+        assert depois["removidas_total"] == antes["removidas_total"] + 1
+        assert depois["removidas_por_tipo"]["aviso"] == antes["removidas_por_tipo"]["aviso"] + 1
+        assert depois["ultima_execucao"]["removidas"] == 1
+
+    def test_politica_lida_da_configuracao(self):
+        assert obter_politica() == RETENCAO_PADRAO_DIAS
+
+        configuracao_repo.inserir_ou_atualizar("notificacao_retencao_dias_info", "7", "")
+        configuracao_repo.inserir_ou_atualizar("notificacao_retencao_dias_erro", "-1", "")
+        config.limpar()
+
+        politica = obter_politica()
+        assert politica[TipoNotificacao.INFO] == 7
+        assert politica[TipoNotificacao.ERRO] == 0
+
+    def test_garantir_configs_nao_sobrescreve(self):
+        from util.migrar_config import garantir_configs_notificacoes
+
+        configuracao_repo.inserir_ou_atualizar("notificacao_retencao_dias_aviso", "15", "")
+        garantir_configs_notificacoes()
+
+        assert configuracao_repo.obter_por_chave("notificacao_retencao_dias_aviso").valor == "15"
+        assert configuracao_repo.obter_por_chave("notificacao_retencao_dias_info").valor == "30"
+        assert configuracao_repo.obter_por_chave("notificacao_retencao_arquivar").valor == "false"
+
+    def test_exclusao_usa_indice_tipo_data(self):
+        from sql.notificacao_sql import EXCLUIR_ANTIGAS
+
+        with obter_conexao() as conn:
+            plano = conn.execute(
+                f"EXPLAIN QUERY PLAN {EXCLUIR_ANTIGAS}", ("info", "-30 days", 500)
+            ).fetchall()
+        detalhes = " ".join(row["detail"] for row in plano)
+        assert "idx_notificacao_tipo_data" in detalhes
+        assert "TEMP B-TREE" not in detalhes
+
+
+# =============================================================================
+# Agendador
+# =============================================================================
+
+class TestAgendadorRetencao:
+    @pytest.mark.asyncio
+    async def test_executa_em_segundo_plano(self, usuario_id):
+        _criar(usuario_id, TipoNotificacao.INFO, 400)
+        agendador = AgendadorRetencao(intervalo_horas=1, atraso_inicial=0)
+
+        await agendador.iniciar()
+        try:
+            for _ in range(100):
+                if not _ids_restantes():
+                    break
+                await asyncio.sleep(0.02)
+            assert _ids_restantes() == set()
+            assert agendador.ativo
+        finally:
+            await agendador.encerrar()
+        assert not agendador.ativo
+
+    @pytest.mark.asyncio
+    async def test_intervalo_zero_desliga(self):
+        agendador = AgendadorRetencao(intervalo_horas=0)
+        await agendador.iniciar()
+        assert not agendador.ativo
+
+
+# =============================================================================
+# GET/POST /api/admin/notificacoes/retencao
+# =============================================================================
+
+class TestRetencaoEndpoints:
+    def test_obter_politica_e_metricas(self, admin_autenticado):
+        resp = admin_autenticado.get("/api/admin/notificacoes/retencao")
+
+        assert resp.status_code == status.HTTP_200_OK
+        corpo = resp.json()
+        assert corpo["politica"] == {"info": 30, "sucesso": 30, "aviso": 90, "erro": 180}
+        assert corpo["arquivar"] is False
+        assert corpo["arquivo"] == {"lotes": 0, "notificacoes": 0, "bytes": 0}
+        assert set(corpo) >= {"execucoes", "removidas_total", "removidas_por_tipo", "agendada"}
+
+    def test_executar_agora(self, admin_autenticado, usuario_id):
+        _criar(usuario_id, TipoNotificacao.SUCESSO, 31)
+        recente = _criar(usuario_id, TipoNotificacao.SUCESSO, 1)
+
+        resp = admin_autenticado.post(
+            "/api/admin/notificacoes/retencao/executar",
+            headers={"X-CSRF-Token": _csrf(admin_autenticado)},
+        )
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()["removidas"] == 1
+        assert resp.json()["removidas_por_tipo"]["sucesso"] == 1
+        assert _ids_restantes() == {recente}
+
+    def test_executar_com_arquivamento_configurado(self, admin_autenticado, usuario_id):
+        configuracao_repo.inserir_ou_atualizar("notificacao_retencao_arquivar", "true", "")
+        config.limpar()
+        _criar(usuario_id, TipoNotificacao.INFO, 60)
+
+        resp = admin_autenticado.post(
+            "/api/admin/notificacoes/retencao/executar",
+            headers={"X-CSRF-Token": _csrf(admin_autenticado)},
+        )
+
+        assert resp.json()["arquivadas"] == 1
+        corpo = admin_autenticado.get("/api/admin/notificacoes/retencao").json()
+        assert corpo["arquivar"] is True
+        assert corpo["arquivo"]["notificacoes"] == 1
+
+    def test_perfil_nao_admin_403(self, cliente_autenticado):
+        assert cliente_autenticado.get(
+            "/api/admin/notificacoes/retencao"
+        ).status_code == status.HTTP_403_FORBIDDEN
+        resp = cliente_autenticado.post(
+            "/api/admin/notificacoes/retencao/executar",
+            headers={"X-CSRF-Token": _csrf(cliente_autenticado)},
+        )
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
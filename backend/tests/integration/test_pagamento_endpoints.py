@@ -578,10 +578,12 @@ class TestWebhookStripe:
         (``processar_webhook`` retorna None) e a rota traduz para HTTP 200
         ``{"status": "ignored"}`` (resposta rápida para não disparar reenvios).
         """
+        from repo import configuracao_repo
         from util.config_cache import config
 
         # Faz o adapter entrar no ramo de validação real de assinatura.
-        config._cache["stripe_webhook_secret"] = "whsec_test_dummy_secret"
+        configuracao_repo.inserir_ou_atualizar("stripe_webhook_secret", "whsec_test_dummy_secret")
+        config.limpar()
         try:
             payload = json.dumps(
                 {"id": "evt_1", "type": "checkout.session.completed"}
@@ -593,7 +595,8 @@ class TestWebhookStripe:
                 headers={"Stripe-Signature": "t=1,v1=assinatura_invalida"},
             )
         finally:
-            config._cache.pop("stripe_webhook_secret", None)
+            configuracao_repo.inserir_ou_atualizar("stripe_webhook_secret", "")
+            config.limpar()
 
         assert resp.status_code == status.HTTP_200_OK
         assert resp.json() == {"status": "ignored"}
@@ -0,0 +1,253 @@
+"""
+Testes do armazenamento compartilhado de rate limit
+(util/rate_limit_armazenamento.py).
+
+Cobre o GCRA sobre a tabela rate_limit (UPSERT atômico), a tolerância a
+falhas e o orçamento global com vários processos usando o mesmo arquivo.
+"""
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from util.api_helpers import checar_rate_limit
+from util.rate_limit_armazenamento import (
+    ArmazenamentoSQLite,
+    criar_armazenamento,
+)
+from util.rate_limiter import ALGORITMO_JANELA_DESLIZANTE, RateLimiter, RegistroLimiters
+
+
+pytestmark = [pytest.mark.integration]
+
+RAIZ_BACKEND = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def armazenamento(tmp_path):
+    armazenamento = ArmazenamentoSQLite(str(tmp_path / "rate_limit.db"))
+    yield armazenamento
+    armazenamento.fechar()
+
+
+@pytest.fixture
+def relogio():
+    """Substitui time.monotonic por um relógio controlado pelo teste."""
+    estado = {"agora": 1000.0}
+    with patch("util.rate_limiter.time.monotonic", side_effect=lambda: estado["agora"]):
+        yield estado
+
+
+class TestArmazenamentoSQLite:
+    def test_gcra_bloqueia_apos_a_rajada(self, armazenamento, relogio):
+        limiter = RateLimiter(max_tentativas=3, janela_minutos=1, nome="sqlite_rajada", armazenamento=armazenamento)
+
+        assert [limiter.verificar("ip") for _ in range(4)] == [True, True, True, False]
+        assert limiter.obter_tentativas_restantes("ip") == 0
+        assert limiter.obter_tempo_reset("ip").total_seconds() == pytest.approx(20)
+        assert limiter.tentativas == {}
+
+        relogio["agora"] += 20
+        assert limiter.verificar("ip") is True
+        assert limiter.verificar("ip") is False
+
+    def test_instancias_com_mesmo_nome_compartilham_orcamento(self, armazenamento):
+        worker_1 = RateLimiter(max_tentativas=4, janela_minutos=5, nome="sqlite_login", armazenamento=armazenamento)
+        worker_2 = RateLimiter(max_tentativas=4, janela_minutos=5, nome="sqlite_login", armazenamento=armazenamento)
+        outro = RateLimiter(max_tentativas=4, janela_minutos=5, nome="sqlite_cadastro", armazenamento=armazenamento)
+
+        permitidas = [w.verificar("ip") for w in (worker_1, worker_2) * 3]
+
+        assert permitidas.count(True) == 4
+        assert outro.verificar("ip") is True
+
+    def test_limpar_e_remover_expirados(self, armazenamento, relogio):
+        limiter = RateLimiter(max_tentativas=2, janela_minutos=1, nome="sqlite_expira", armazenamento=armazenamento)
+        limiter.verificar("antigo")
+        relogio["agora"] += 50
+        limiter.verificar("recente")
+        limiter.verificar("removido")
+        relogio["agora"] += 20
+
+        limiter.limpar("removido")
+        assert limiter.contar_identificadores() == 2
+        assert limiter.remover_expirados() == 1
+        assert limiter.contar_identificadores() == 1
+
+        limiter.limpar()
+        assert limiter.contar_identificadores() == 0
+
+    def test_estado_de_antes_do_reboot_e_ignorado(self, armazenamento, relogio):
+        limiter = RateLimiter(max_tentativas=1, janela_minutos=1, nome="sqlite_reboot", armazenamento=armazenamento)
+        with armazenamento._conexao() as conn:
+            conn.execute(
+                "INSERT INTO rate_limit (limiter, identificador, tat) VALUES (?, ?, ?)",
+                ("sqlite_reboot", "ip", relogio["agora"] + 10 * 86400),
+            )
+
+        assert limiter.obter_tempo_reset("ip") is None
+        assert limiter.verificar("ip") is True
+        assert limiter.verificar("ip") is False
+
+    def test_falha_no_armazenamento_permite(self, armazenamento):
+        limiter = RateLimiter(max_tentativas=1, janela_minutos=1, nome="sqlite_falha", armazenamento=armazenamento)
+
+        with patch.object(armazenamento._pool, "obter", side_effect=sqlite3.OperationalError("database is locked")):
+            assert limiter.verificar("ip") is True
+            assert limiter.verificar("ip") is True
+
+        assert armazenamento.obter_estatisticas()["total_erros"] == 2
+
+    def test_falha_no_armazenamento_nega_quando_configurado(self, armazenamento):
+        limiter = RateLimiter(
+            max_tentativas=5, janela_minutos=1, nome="sqlite_falha_fechada",
+            armazenamento=armazenamento, bloquear_em_falha=True,
+        )
+
+        with patch.object(armazenamento._pool, "obter", side_effect=sqlite3.OperationalError("database is locked")):
+            assert limiter.verificar("ip") is False
+
+        assert limiter.verificar("ip") is True
+        assert armazenamento.obter_estatisticas()["total_erros"] == 1
+
+    def test_limiters_de_autenticacao_negam_em_falha(self):
+        from routes.auth_routes import cadastro_limiter, esqueci_senha_limiter, login_limiter
+
+        assert all(
+            limiter.bloquear_em_falha
+            for limiter in (login_limiter, cadastro_limiter, esqueci_senha_limiter)
+        )
+
+    def test_falha_em_limpeza_e_contagem_nao_propaga(self, armazenamento):
+        limiter = RateLimiter(max_tentativas=1, janela_minutos=1, nome="sqlite_falha_limpeza", armazenamento=armazenamento)
+
+        with patch.object(armazenamento._pool, "obter", side_effect=sqlite3.OperationalError("database is locked")):
+            limiter.limpar("ip")
+            limiter.limpar()
+            assert limiter.remover_expirados() == 0
+            assert limiter.contar_identificadores() == 0
+
+        assert armazenamento.obter_estatisticas()["total_erros"] == 4
+
+    @pytest.mark.asyncio
+    async def test_checar_rate_limit_verifica_fora_do_event_loop(self, armazenamento):
+        limiter = RateLimiter(max_tentativas=1, janela_minutos=1, nome="sqlite_executor", armazenamento=armazenamento)
+        request = SimpleNamespace(client=SimpleNamespace(host="10.0.0.1"), headers={})
+        threads = []
+        consumir_original = armazenamento.consumir
+
+        def consumir(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return consumir_original(*args, **kwargs)
+
+        with patch.object(armazenamento, "consumir", side_effect=consumir):
+            await checar_rate_limit(limiter, request)
+            with pytest.raises(HTTPException) as exc:
+                await checar_rate_limit(limiter, request)
+
+        assert exc.value.status_code == 429
+        assert threads and threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_varredura_remove_expirados_fora_do_event_loop(self, armazenamento, relogio):
+        registro = RegistroLimiters()
+        compartilhado = RateLimiter(max_tentativas=1, janela_minutos=1, nome="sqlite_varredura", armazenamento=armazenamento)
+        local = RateLimiter(max_tentativas=1, janela_minutos=1, nome="memoria_varredura")
+        registro.registrar(compartilhado)
+        registro.registrar(local)
+        compartilhado.verificar("ip")
+        local.verificar("ip")
+        threads = []
+        remover_original = armazenamento.remover_expirados
+
+        def remover_expirados(*args):
+            threads.append(threading.get_ident())
+            return remover_original(*args)
+
+        relogio["agora"] += 120
+        with patch.object(armazenamento, "remover_expirados", side_effect=remover_expirados):
+            assert await registro.varrer_sem_bloquear() == 2
+
+        assert threads and threading.get_ident() not in threads
+        assert registro.obter_estatisticas()["varreduras"] == 1
+
+    def test_estatisticas_do_registro(self, armazenamento):
+        registro = RegistroLimiters()
+        limiter = RateLimiter(max_tentativas=5, janela_minutos=1, nome="sqlite_stats", armazenamento=armazenamento)
+        registro.registrar(limiter)
+        limiter.verificar("a")
+        limiter.verificar("b")
+
+        stats = registro.obter_estatisticas()["limiters"]["sqlite_stats"]
+        assert stats["armazenamento"] == "sqlite"
+        assert stats["identificadores_ativos"] == 2
+
+    def test_exige_gcra(self, armazenamento):
+        with pytest.raises(ValueError, match="gcra"):
+            RateLimiter(nome="sqlite_janela", algoritmo=ALGORITMO_JANELA_DESLIZANTE, armazenamento=armazenamento)
+
+    def test_criar_armazenamento(self, tmp_path):
+        assert criar_armazenamento("memoria") is None
+        with pytest.raises(ValueError, match="RATE_LIMIT_BACKEND"):
+            criar_armazenamento("redis")
+
+
+# =============================================================================
+# Orçamento global com vários processos
+# =============================================================================
+
+# Cada processo faz TENTATIVAS verificações do mesmo IP no limiter "login"
+# e imprime quantas foram permitidas.
+_SCRIPT_WORKER = textwrap.dedent("""
+    import sys, time
+    from util.rate_limit_armazenamento import criar_armazenamento
+    from util.rate_limiter import RateLimiter
+
+    backend, inicio, tentativas = sys.argv[1], float(sys.argv[2]), int(sys.argv[3])
+    limiter = RateLimiter(max_tentativas=5, janela_minutos=60, nome="login",
+                          armazenamento=criar_armazenamento(backend))
+    time.sleep(max(0.0, inicio - time.time()))
+    print(sum(limiter.verificar("203.0.113.7") for _ in range(tentativas)))
+""")
+
+
+def _rodar_workers(backend: str, caminho: Path, processos: int, tentativas: int) -> list[int]:
+    """Sobe `processos` workers ao mesmo tempo e retorna as permitidas por worker."""
+    env = {
+        "PATH": "",
+        "RUNNING_MODE": "Development",
+        "RATE_LIMIT_SQLITE_PATH": str(caminho),
+        "DATABASE_PATH": str(caminho.with_name("dados.db")),
+    }
+    # Todos começam juntos, depois de importar os módulos
+    inicio = time.time() + 3
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", _SCRIPT_WORKER, backend, str(inicio), str(tentativas)],
+            cwd=RAIZ_BACKEND, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        for _ in range(processos)
+    ]
+    saidas = [w.communicate(timeout=60)[0] for w in workers]
+    assert all(w.returncode == 0 for w in workers)
+    return [int(saida.strip().splitlines()[-1]) for saida in saidas]
+
+
+class TestOrcamentoGlobalMultiprocesso:
+    def test_sqlite_mantem_o_limite_entre_processos(self, tmp_path):
+        permitidas = _rodar_workers("sqlite", tmp_path / "rate_limit.db", processos=4, tentativas=10)
+
+        assert sum(permitidas) == 5
+
+    def test_memoria_multiplica_o_limite_por_processo(self, tmp_path):
+        permitidas = _rodar_workers("memoria", tmp_path / "rate_limit.db", processos=4, tentativas=10)
+
+        assert permitidas == [5, 5, 5, 5]
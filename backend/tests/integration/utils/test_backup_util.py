@@ -10,7 +10,8 @@ from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 import tempfile
-import shutil
+import threading
+from contextlib import closing
 
 from util.backup_util import (
     BackupInfo,
@@ -20,6 +21,7 @@ from util.backup_util import (
     _detectar_tipo_backup,
     _extrair_data_do_nome,
     _validar_integridade_backup,
+    _copiar_banco,
     criar_backup,
     listar_backups,
     restaurar_backup,
@@ -295,6 +297,65 @@ class TestCriarBackup:
         assert len(backups) == 1
         assert "_auto_" not in backups[0].name
 
+    def test_criar_backup_inclui_commits_no_wal(self, setup_backup_env):
+        """Em modo WAL, commits ainda não consolidados devem entrar no backup"""
+        conn = sqlite3.connect(str(setup_backup_env['db_path']))
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA wal_autocheckpoint = 0")
+        conn.execute("INSERT INTO teste (id) VALUES (42)")
+        conn.commit()
+
+        try:
+            sucesso, _ = criar_backup(automatico=False)
+        finally:
+            conn.close()
+
+        assert sucesso is True
+        backup = next(setup_backup_env['backup_dir'].glob("backup_*.db"))
+        conn_backup = sqlite3.connect(str(backup))
+        ids = [row[0] for row in conn_backup.execute("SELECT id FROM teste")]
+        conn_backup.close()
+        assert ids == [42]
+
+    def test_criar_backup_com_escritas_concorrentes(self, setup_backup_env):
+        """Backup durante escritas (WAL) deve ser um snapshot íntegro e consistente"""
+        db_path = setup_backup_env['db_path']
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("CREATE TABLE par (id INTEGER PRIMARY KEY, a INT, b INT)")
+        conn.executemany("INSERT INTO par (a, b) VALUES (?, ?)", ((i, i) for i in range(20000)))
+        conn.commit()
+        conn.close()
+
+        parar = threading.Event()
+        escritas = [0]
+
+        def escrever():
+            # Cada transação altera as duas colunas juntas: num snapshot consistente a == b
+            with closing(sqlite3.connect(str(db_path), timeout=10)) as escritor:
+                while not parar.is_set():
+                    with escritor:
+                        escritor.execute("UPDATE par SET a = a + 1, b = b + 1 WHERE id % 7 = ?", (escritas[0] % 7,))
+                        escritor.execute("INSERT INTO par (a, b) VALUES (0, 0)")
+                    escritas[0] += 1
+
+        thread = threading.Thread(target=escrever)
+        thread.start()
+        try:
+            resultados = [criar_backup(automatico=False) for _ in range(3)]
+        finally:
+            parar.set()
+            thread.join()
+
+        assert all(sucesso for sucesso, _ in resultados)
+        assert escritas[0] > 0
+        for backup in setup_backup_env['backup_dir'].glob("backup_*.db"):
+            assert _validar_integridade_backup(backup)[0] is True
+            assert not backup.with_name(backup.name + "-wal").exists()
+            with closing(sqlite3.connect(str(backup))) as conn_backup:
+                assert conn_backup.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+                assert conn_backup.execute("SELECT COUNT(*) FROM par WHERE a != b").fetchone()[0] == 0
+
     def test_criar_backup_automatico(self, setup_backup_env):
         """Deve criar backup automático com sucesso"""
         sucesso, mensagem = criar_backup(automatico=True)
@@ -589,6 +650,27 @@ class TestRestaurarBackup:
 
         assert "backup" in tabelas
 
+    def test_restaurar_com_conexao_aberta_em_wal(self, setup_restauracao):
+        """Conexão já aberta no banco em WAL deve ver o conteúdo restaurado, íntegro"""
+        db_path = setup_restauracao['db_path']
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA wal_autocheckpoint = 0")
+        conn.execute("INSERT INTO atual VALUES ('so_no_wal')")
+        conn.commit()
+
+        try:
+            sucesso, _, _ = restaurar_backup(setup_restauracao['nome_backup'])
+            tabelas = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+            valores = [row[0] for row in conn.execute("SELECT valor FROM backup")]
+        finally:
+            conn.close()
+
+        assert sucesso is True
+        assert tabelas == ["backup"]
+        assert valores == ["dados_backup"]
+        assert _validar_integridade_backup(db_path)[0] is True
+
     def test_restaurar_cria_backup_seguranca(self, setup_restauracao):
         """Deve criar backup de segurança antes de restaurar"""
         nome = setup_restauracao['nome_backup']
@@ -718,7 +800,7 @@ class TestBackupErrosIO:
 
             with patch('util.backup_util.BACKUP_DIR', backup_dir):
                 with patch('util.backup_util.DATABASE_PATH', str(db_path)):
-                    with patch('shutil.copy2', side_effect=OSError("Permission denied")):
+                    with patch('util.backup_util._copiar_banco', side_effect=OSError("Permission denied")):
                         sucesso, mensagem = criar_backup()
 
                         assert sucesso is False
@@ -816,17 +898,17 @@ class TestBackupErrosIO:
             with patch('util.backup_util.BACKUP_DIR', backup_dir):
                 with patch('util.backup_util.DATABASE_PATH', str(db_path)):
                     # Simular erro na cópia após validação
-                    original_copy = shutil.copy2
+                    original_copy = _copiar_banco
                     call_count = [0]
 
                     def copy_with_error(*args, **kwargs):
                         call_count[0] += 1
                         # Permitir criação de backup de segurança, falhar na restauração
-                        if call_count[0] > 1:
-                            raise OSError("Copy failed")
+                        if call_count[0] == 2:
+                            raise sqlite3.OperationalError("database is locked")
                         return original_copy(*args, **kwargs)
 
-                    with patch('shutil.copy2', side_effect=copy_with_error):
+                    with patch('util.backup_util._copiar_banco', side_effect=copy_with_error):
                         sucesso, mensagem, _ = restaurar_backup(nome)
                         # Pode falhar ou ter rollback
                         if not sucesso:
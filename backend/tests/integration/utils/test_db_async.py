@@ -0,0 +1,119 @@
+"""
+Testes para o módulo util/db_async.py
+
+Testa a execução de chamadas ao banco no executor dedicado, sem bloquear o
+event loop.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from util import db_async
+from util.db_async import executar_db, obter_estatisticas_executor
+from util.db_util import obter_conexao
+
+
+class TestExecutarDb:
+    """Testes para a função executar_db"""
+
+    @pytest.mark.asyncio
+    async def test_retorna_resultado_da_funcao(self):
+        """Deve repassar argumentos e devolver o retorno da função"""
+        resultado = await executar_db(lambda a, b=0: a + b, 2, b=3)
+
+        assert resultado == 5
+
+    @pytest.mark.asyncio
+    async def test_executa_fora_da_thread_do_event_loop(self):
+        """A função deve rodar numa thread do executor do banco"""
+        nome_thread = await executar_db(lambda: threading.current_thread().name)
+
+        assert nome_thread != threading.current_thread().name
+        assert nome_thread.startswith("db")
+
+    @pytest.mark.asyncio
+    async def test_relanca_excecao(self):
+        """Exceções da função devem chegar ao await e ser contabilizadas"""
+        erros_antes = obter_estatisticas_executor()["total_erros"]
+
+        def falhar():
+            raise ValueError("falha no repositório")
+
+        with pytest.raises(ValueError, match="falha no repositório"):
+            await executar_db(falhar)
+
+        assert obter_estatisticas_executor()["total_erros"] == erros_antes + 1
+
+    @pytest.mark.asyncio
+    async def test_propaga_contextvars(self):
+        """O contexto da corrotina deve ser visível dentro da thread"""
+        variavel = contextvars.ContextVar("variavel_teste", default=None)
+        variavel.set("valor da requisição")
+
+        assert await executar_db(variavel.get) == "valor da requisição"
+
+    @pytest.mark.asyncio
+    async def test_nao_bloqueia_event_loop(self):
+        """Enquanto uma query lenta roda, outras corrotinas continuam executando"""
+        batidas = []
+
+        async def batimento():
+            for _ in range(5):
+                batidas.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        tarefa = asyncio.create_task(batimento())
+        await executar_db(time.sleep, 0.2)
+        await tarefa
+
+        assert len(batidas) == 5
+        assert batidas[-1] - batidas[0] < 0.2
+
+    @pytest.mark.asyncio
+    async def test_usa_pool_de_conexoes(self):
+        """Funções de repositório devem conseguir usar obter_conexao na thread"""
+        def consultar():
+            with obter_conexao() as conn:
+                return conn.execute("SELECT 1").fetchone()[0]
+
+        assert await executar_db(consultar) == 1
+
+    @pytest.mark.asyncio
+    async def test_estatisticas(self):
+        """Estatísticas devem refletir as chamadas realizadas"""
+        total_antes = obter_estatisticas_executor()["total_chamadas"]
+
+        await asyncio.gather(*(executar_db(lambda: None) for _ in range(3)))
+
+        estatisticas = obter_estatisticas_executor()
+        assert estatisticas["total_chamadas"] == total_antes + 3
+        assert estatisticas["em_andamento"] == 0
+        assert estatisticas["threads"] == db_async.DB_EXECUTOR_THREADS
+
+    @pytest.mark.asyncio
+    async def test_executor_recriado_apos_encerrar(self):
+        """Após encerrar_executor, a próxima chamada deve criar um executor novo"""
+        await executar_db(lambda: None)
+        executor_antigo = db_async.obter_executor()
+
+        db_async.encerrar_executor()
+
+        assert await executar_db(lambda: 42) == 42
+        assert db_async.obter_executor() is not executor_antigo
+
+
+class TestHealthExecutor:
+    """Exposição das métricas do executor no health check"""
+
+    def test_health_inclui_executor(self, client):
+        """GET /health deve trazer as estatísticas do executor do banco"""
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        executor = response.json()["banco"]["executor"]
+        assert executor["threads"] == db_async.DB_EXECUTOR_THREADS
+        assert "total_chamadas" in executor
@@ -82,6 +82,228 @@ class TestObterConexao:
                         raise RuntimeError("Erro de teste")
 
 
+class TestPoolConexoes:
+    """Testes para o pool de conexões (PoolConexoes)"""
+
+    def test_reutiliza_conexao_devolvida(self):
+        """Conexão devolvida deve ser reutilizada no próximo checkout"""
+        from util.db_util import PoolConexoes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(os.path.join(temp_dir, "test.db"), tamanho_maximo=2)
+
+            conn1 = pool.obter()
+            pool.devolver(conn1)
+            conn2 = pool.obter()
+            pool.devolver(conn2)
+
+            assert conn1 is conn2
+            estatisticas = pool.obter_estatisticas()
+            assert estatisticas["total_criadas"] == 1
+            assert estatisticas["total_checkouts"] == 2
+            assert estatisticas["em_uso"] == 0
+            pool.fechar()
+
+    def test_configuracao_feita_na_criacao(self):
+        """Conexões do pool devem vir com foreign_keys e row_factory configurados"""
+        from util.db_util import PoolConexoes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(os.path.join(temp_dir, "test.db"))
+            conn = pool.obter()
+
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.row_factory is sqlite3.Row
+
+            pool.devolver(conn)
+            pool.fechar()
+
+    def test_pool_limitado_gera_timeout(self):
+        """Com todas as conexões em uso, deve lançar erro após o timeout"""
+        from util.db_util import PoolConexoes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(os.path.join(temp_dir, "test.db"), tamanho_maximo=1, timeout=0.05)
+            conn = pool.obter()
+
+            with pytest.raises(sqlite3.OperationalError, match="Timeout"):
+                pool.obter()
+
+            assert pool.obter_estatisticas()["total_timeouts"] == 1
+            pool.devolver(conn)
+            pool.fechar()
+
+    def test_aguarda_conexao_liberada_por_outra_thread(self):
+        """Checkout bloqueado deve prosseguir quando outra thread devolver a conexão"""
+        import threading
+        from util.db_util import PoolConexoes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(os.path.join(temp_dir, "test.db"), tamanho_maximo=1, timeout=5)
+            conn = pool.obter()
+            threading.Timer(0.05, pool.devolver, args=(conn,)).start()
+
+            conn2 = pool.obter()
+
+            assert conn2 is conn
+            assert pool.obter_estatisticas()["espera_maxima_ms"] > 0
+            pool.devolver(conn2)
+            pool.fechar()
+
+    def test_remove_conexoes_ociosas_expiradas(self):
+        """Conexões ociosas além de max_ocioso devem ser fechadas"""
+        from util.db_util import PoolConexoes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(os.path.join(temp_dir, "test.db"), max_ocioso=0)
+            conn1 = pool.obter()
+            pool.devolver(conn1)
+
+            conn2 = pool.obter()
+
+            assert conn2 is not conn1
+            assert pool.obter_estatisticas()["total_descartadas"] == 1
+            pool.devolver(conn2)
+            pool.fechar()
+
+    def test_health_check_descarta_conexao_invalida(self):
+        """Conexão que falha no health check deve ser substituída"""
+        from util.db_util import PoolConexoes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(os.path.join(temp_dir, "test.db"), verificar_apos=0)
+            conn1 = pool.obter()
+            pool.devolver(conn1)
+            conn1.close()  # Simula conexão quebrada enquanto ociosa
+
+            conn2 = pool.obter()
+
+            assert conn2 is not conn1
+            assert conn2.execute("SELECT 1").fetchone()[0] == 1
+            pool.devolver(conn2)
+            pool.fechar()
+
+    def test_devolver_desfaz_transacao_pendente(self):
+        """Conexão devolvida com transação aberta deve sofrer rollback"""
+        from util.db_util import PoolConexoes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "test.db")
+            pool = PoolConexoes(db_path)
+            conn = pool.obter()
+            conn.execute("CREATE TABLE test (id INTEGER PRIMARY KEY)")
+            conn.commit()
+            conn.execute("INSERT INTO test VALUES (1)")
+
+            pool.devolver(conn)
+
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM test").fetchone()[0] == 0
+            pool.fechar()
+
+    def test_obter_conexao_reutiliza_pool_global(self):
+        """Chamadas consecutivas de obter_conexao devem reutilizar a mesma conexão"""
+        from util.db_util import obter_conexao
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "test.db")
+
+            with patch('util.db_util.DATABASE_PATH', db_path):
+                with obter_conexao() as conn1:
+                    pass
+                with obter_conexao() as conn2:
+                    pass
+
+                assert conn1 is conn2
+
+    def test_pool_encerrado_rejeita_checkout(self):
+        """Pool encerrado não deve entregar conexões"""
+        from util.db_util import PoolConexoes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(os.path.join(temp_dir, "test.db"))
+            pool.fechar()
+
+            with pytest.raises(sqlite3.ProgrammingError):
+                pool.obter()
+
+
+class TestPerfilArmazenamento:
+    """Testes para o perfil de armazenamento (PRAGMAs por conexão)"""
+
+    def test_pool_aplica_pragmas_do_perfil(self):
+        """Conexões criadas pelo pool devem refletir o perfil configurado"""
+        from util.db_util import PoolConexoes, PERFIS_ARMAZENAMENTO
+
+        perfil = PERFIS_ARMAZENAMENTO["desempenho"]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(os.path.join(temp_dir, "test.db"), perfil=perfil)
+            conn = pool.obter()
+
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == perfil.busy_timeout_ms
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+            pool.devolver(conn)
+            pool.fechar()
+
+    def test_perfil_legado_mantem_rollback_journal(self):
+        """Perfil legado deve manter o journal_mode DELETE"""
+        from util.db_util import PoolConexoes, PERFIS_ARMAZENAMENTO
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolConexoes(
+                os.path.join(temp_dir, "test.db"), perfil=PERFIS_ARMAZENAMENTO["legado"]
+            )
+            conn = pool.obter()
+
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+            pool.devolver(conn)
+            pool.fechar()
+
+    def test_carregar_perfil_aplica_sobrescritas(self):
+        """Sobrescritas individuais devem prevalecer sobre o perfil base"""
+        from util.db_util import carregar_perfil_armazenamento
+
+        with patch('util.config.DB_PERFIL_ARMAZENAMENTO', 'seguro'), \
+                patch('util.config.DB_SYNCHRONOUS', 'normal'), \
+                patch('util.config.DB_BUSY_TIMEOUT_MS', '1234'):
+            perfil = carregar_perfil_armazenamento()
+
+        assert perfil.nome == "seguro"
+        assert perfil.journal_mode == "WAL"
+        assert perfil.synchronous == "NORMAL"
+        assert perfil.busy_timeout_ms == 1234
+
+    def test_carregar_perfil_invalido_falha(self):
+        """Perfil inexistente deve gerar ValueError"""
+        from util.db_util import carregar_perfil_armazenamento
+
+        with patch('util.config.DB_PERFIL_ARMAZENAMENTO', 'turbo'):
+            with pytest.raises(ValueError, match="DB_PERFIL_ARMAZENAMENTO"):
+                carregar_perfil_armazenamento()
+
+    def test_carregar_perfil_valor_pragma_invalido_falha(self):
+        """Valores textuais fora da lista aceita não podem chegar ao SQL"""
+        from util.db_util import carregar_perfil_armazenamento
+
+        with patch('util.config.DB_JOURNAL_MODE', 'WAL; DROP TABLE usuario'):
+            with pytest.raises(ValueError, match="DB_JOURNAL_MODE"):
+                carregar_perfil_armazenamento()
+
+    def test_verificar_perfil_sem_divergencias(self):
+        """Verificação no banco atual deve confirmar os PRAGMAs configurados"""
+        from util.db_util import verificar_perfil_armazenamento, PERFIL_ARMAZENAMENTO
+
+        resultado = verificar_perfil_armazenamento()
+
+        assert resultado["perfil"] == PERFIL_ARMAZENAMENTO.nome
+        assert resultado["pragmas"]["journal_mode"] == PERFIL_ARMAZENAMENTO.journal_mode
+        assert resultado["divergencias"] == []
+
+
 class TestAdaptarDatetime:
     """Testes para a função adaptar_datetime"""
 
@@ -5,11 +5,42 @@ Testa o cache de configurações do sistema, incluindo
 tratamento de erros, conversões de tipos e operações de cache.
 """
 
+import threading
+import time
+from types import MappingProxyType
+
 import pytest
 from unittest.mock import patch, MagicMock
 import sqlite3
 
-from util.config_cache import ConfigCache, config
+from util.config_cache import CONFIG_CACHE_TTL_SEGUNDOS, ConfigCache, config
+
+
+def _definir_snapshot(valores: dict):
+    """Instala um snapshot em memória, sem verificação de versão próxima."""
+    ConfigCache._snapshot = MappingProxyType(dict(valores))
+    ConfigCache._proxima_verificacao = time.monotonic() + 3600
+
+
+def _mock_repo(mock_repo, valores: dict, versao: int = 1):
+    """Configura o configuracao_repo mockado com as linhas e a versão dadas."""
+    mock_repo.obter_versao.return_value = versao
+    _mock_repo_linhas(mock_repo, valores)
+
+
+def _mock_repo_linhas(mock_repo, valores: dict):
+    mock_repo.obter_todos.return_value = [
+        MagicMock(chave=chave, valor=valor) for chave, valor in valores.items()
+    ]
+
+
+def _revalidar_agora():
+    """Vence o intervalo de verificação, dispara a revalidação e espera por ela."""
+    ConfigCache._proxima_verificacao = 0.0
+    ConfigCache.obter("_disparo")
+    thread = ConfigCache._revalidacao
+    if thread is not None:
+        thread.join(5)
 
 
 class TestConfigCacheObter:
@@ -20,59 +51,62 @@ class TestConfigCacheObter:
         ConfigCache.limpar()
 
     def test_obter_valor_do_cache(self):
-        """Quando valor está no cache, deve retornar sem acessar banco"""
-        # Preenche o cache manualmente
-        ConfigCache._cache["chave_teste"] = "valor_cacheado"
+        """Quando há snapshot, deve retornar sem acessar banco"""
+        _definir_snapshot({"chave_teste": "valor_cacheado"})
 
         with patch('util.config_cache.configuracao_repo') as mock_repo:
             resultado = ConfigCache.obter("chave_teste", "padrao")
 
-            # Não deve chamar o repo, pois está no cache
-            mock_repo.obter_por_chave.assert_not_called()
+            # Não deve chamar o repo, pois está no snapshot
+            mock_repo.obter_todos.assert_not_called()
+            mock_repo.obter_versao.assert_not_called()
             assert resultado == "valor_cacheado"
 
-    def test_obter_valor_do_banco(self):
-        """Quando valor não está no cache, deve buscar do banco"""
-        mock_config = MagicMock()
-        mock_config.valor = "valor_do_banco"
-
+    def test_obter_carrega_todas_em_uma_consulta(self):
+        """Sem snapshot, carrega todas as configurações de uma vez"""
         with patch('util.config_cache.configuracao_repo') as mock_repo:
-            mock_repo.obter_por_chave.return_value = mock_config
+            _mock_repo(mock_repo, {"chave_a": "valor_a", "chave_b": "valor_b"})
 
-            resultado = ConfigCache.obter("chave_nova", "padrao")
+            assert ConfigCache.obter("chave_a", "padrao") == "valor_a"
+            assert ConfigCache.obter("chave_b", "padrao") == "valor_b"
 
-            mock_repo.obter_por_chave.assert_called_once_with("chave_nova")
-            assert resultado == "valor_do_banco"
-            # Deve ter sido cacheado
-            assert ConfigCache._cache["chave_nova"] == "valor_do_banco"
+            mock_repo.obter_todos.assert_called_once_with()
+            mock_repo.obter_por_chave.assert_not_called()
 
     def test_obter_retorna_padrao_quando_nao_existe(self):
-        """Quando configuração não existe no banco, retorna padrão"""
+        """Quando configuração não existe no banco, retorna o padrão de cada chamada"""
         with patch('util.config_cache.configuracao_repo') as mock_repo:
-            mock_repo.obter_por_chave.return_value = None
+            _mock_repo(mock_repo, {})
 
-            resultado = ConfigCache.obter("chave_inexistente", "valor_padrao")
+            assert ConfigCache.obter("chave_inexistente", "valor_padrao") == "valor_padrao"
+            # O padrão não fica cacheado para a chave
+            assert ConfigCache.obter("chave_inexistente", "outro") == "outro"
 
-            assert resultado == "valor_padrao"
-            # Deve cachear o padrão também
-            assert ConfigCache._cache["chave_inexistente"] == "valor_padrao"
+    def test_snapshot_e_imutavel(self):
+        """O snapshot publicado não pode ser alterado por quem lê"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"chave": "valor"})
+            ConfigCache.obter("chave")
+
+        with pytest.raises(TypeError):
+            ConfigCache._snapshot["chave"] = "outro"  # type: ignore[index]
 
     def test_obter_sqlite_error_retorna_padrao(self):
         """Em caso de sqlite3.Error, retorna padrão sem crashar"""
         with patch('util.config_cache.configuracao_repo') as mock_repo:
-            mock_repo.obter_por_chave.side_effect = sqlite3.Error("Erro de banco")
+            mock_repo.obter_todos.side_effect = sqlite3.Error("Erro de banco")
 
             with patch('util.config_cache.logger') as mock_logger:
                 resultado = ConfigCache.obter("chave_erro", "padrao_erro")
 
                 assert resultado == "padrao_erro"
                 mock_logger.error.assert_called_once()
-                assert "Erro ao buscar configuração" in str(mock_logger.error.call_args)
+                assert "Erro ao carregar configurações" in str(mock_logger.error.call_args)
 
     def test_obter_exception_generica_retorna_padrao(self):
         """Em caso de Exception genérica, retorna padrão e loga como crítico"""
         with patch('util.config_cache.configuracao_repo') as mock_repo:
-            mock_repo.obter_por_chave.side_effect = Exception("Erro inesperado")
+            mock_repo.obter_todos.side_effect = Exception("Erro inesperado")
 
             with patch('util.config_cache.logger') as mock_logger:
                 resultado = ConfigCache.obter("chave_critica", "padrao_critico")
@@ -81,6 +115,164 @@ class TestConfigCacheObter:
                 mock_logger.critical.assert_called_once()
                 assert "Erro crítico" in str(mock_logger.critical.call_args)
 
+    def test_erro_nao_repete_consulta_antes_do_intervalo(self):
+        """Após falha, não consulta o banco de novo a cada leitura"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            mock_repo.obter_todos.side_effect = sqlite3.Error("database is locked")
+
+            with patch('util.config_cache.logger'):
+                for _ in range(5):
+                    assert ConfigCache.obter("chave", "padrao") == "padrao"
+
+            mock_repo.obter_todos.assert_called_once()
+
+
+class TestConfigCacheVersaoBanco:
+    """Testes da detecção de alterações pela versão no banco"""
+
+    def setup_method(self):
+        """Limpa o cache antes de cada teste"""
+        ConfigCache.limpar()
+
+    def test_recarrega_quando_versao_muda(self):
+        """Após o intervalo, uma versão nova no banco recarrega o snapshot"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"chave": "antigo"}, versao=1)
+            assert ConfigCache.obter("chave") == "antigo"
+
+            # Outro processo alterou a configuração
+            _mock_repo(mock_repo, {"chave": "novo"}, versao=2)
+            assert ConfigCache.obter("chave") == "antigo"
+
+            _revalidar_agora()
+            assert ConfigCache.obter("chave") == "novo"
+            assert mock_repo.obter_todos.call_count == 2
+
+    def test_mesma_versao_nao_recarrega(self):
+        """Versão inalterada: só a consulta da versão, sem recarregar"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"chave": "valor"}, versao=5)
+            ConfigCache.obter("chave")
+
+            _revalidar_agora()
+            assert ConfigCache.obter("chave") == "valor"
+
+            mock_repo.obter_todos.assert_called_once()
+            assert mock_repo.obter_versao.call_count == 2
+
+    def test_recarga_incrementa_versao_local(self):
+        """Recarregar o snapshot incrementa obter_versao() (limiters releem)"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"chave": "antigo"}, versao=1)
+            versao = ConfigCache.obter_versao()
+
+            _mock_repo(mock_repo, {"chave": "novo"}, versao=2)
+            _revalidar_agora()
+
+            assert ConfigCache.obter_versao() == versao + 1
+
+
+class TestConfigCacheRevalidacao:
+    """Testes de TTL, stale-while-revalidate e cache negativo de erros"""
+
+    def setup_method(self):
+        """Limpa o cache e os contadores antes de cada teste"""
+        ConfigCache.limpar()
+        ConfigCache.zerar_estatisticas()
+
+    def test_serve_snapshot_atual_enquanto_revalida(self):
+        """A leitura que dispara a revalidação não espera pelo banco"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"chave": "antigo"}, versao=1)
+            ConfigCache.obter("chave")
+
+            liberar = threading.Event()
+            mock_repo.obter_versao.side_effect = lambda: liberar.wait(5) and 2
+            _mock_repo_linhas(mock_repo, {"chave": "novo"})
+            ConfigCache._proxima_verificacao = 0.0
+
+            inicio = time.monotonic()
+            assert ConfigCache.obter("chave") == "antigo"
+            assert ConfigCache.obter("chave") == "antigo"
+            assert time.monotonic() - inicio < 1
+            assert ConfigCache.obter_estatisticas()["revalidando"] is True
+
+            thread = ConfigCache._revalidacao
+            liberar.set()
+            thread.join(5)
+
+            assert ConfigCache.obter("chave") == "novo"
+            stats = ConfigCache.obter_estatisticas()
+            assert stats["leituras_obsoletas"] == 2
+            assert stats["revalidacoes"] == 1
+            assert stats["recargas"] == 1
+
+    def test_ttl_recarrega_mesmo_sem_mudanca_de_versao(self):
+        """Snapshot mais velho que o TTL é recarregado"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"chave": "valor"}, versao=3)
+            ConfigCache.obter("chave")
+
+            ConfigCache._carregado_em -= CONFIG_CACHE_TTL_SEGUNDOS + 1
+            _revalidar_agora()
+
+            assert mock_repo.obter_todos.call_count == 2
+            assert ConfigCache.obter_estatisticas()["idade_snapshot_segundos"] < 1
+
+    def test_erro_na_revalidacao_mantem_valores(self):
+        """Banco fora do ar: segue com o snapshot e não reconsulta durante o TTL do erro"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"chave": "valor"}, versao=1)
+            ConfigCache.obter("chave")
+
+            mock_repo.obter_versao.side_effect = sqlite3.OperationalError("disk I/O error")
+            with patch('util.config_cache.logger'):
+                _revalidar_agora()
+                stats = ConfigCache.obter_estatisticas()
+                ConfigCache.zerar_estatisticas()
+                for _ in range(5):
+                    assert ConfigCache.obter("chave") == "valor"
+
+            assert mock_repo.obter_versao.call_count == 2
+            assert ConfigCache._revalidacao is None
+            assert stats["erros"] == 1
+            assert stats["em_erro"] is True
+            assert "disk I/O error" in stats["ultimo_erro"]
+            assert ConfigCache.obter_estatisticas()["leituras_em_erro"] == 5
+
+    def test_erro_expira_e_banco_volta(self):
+        """Vencido o TTL do erro, a revalidação volta a consultar o banco"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            mock_repo.obter_todos.side_effect = sqlite3.OperationalError("database is locked")
+            with patch('util.config_cache.logger'):
+                assert ConfigCache.obter("chave", "padrao") == "padrao"
+
+            mock_repo.obter_todos.side_effect = None
+            _mock_repo(mock_repo, {"chave": "valor"}, versao=1)
+            ConfigCache._erro_ate = ConfigCache._proxima_verificacao = 0.0
+            _revalidar_agora()
+
+            assert ConfigCache.obter("chave", "padrao") == "valor"
+            assert ConfigCache.obter_estatisticas()["em_erro"] is False
+
+    def test_contadores_de_acerto(self):
+        """Acertos, ausentes e cargas por leitura"""
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"a": "1", "b": "2"})
+            ConfigCache.obter("a")
+            ConfigCache.obter_int("b", 0)
+            ConfigCache.obter("inexistente", "x")
+            ConfigCache.obter_multiplos(["a", "c"], ["", ""])
+
+        stats = ConfigCache.obter_estatisticas()
+        assert stats["acertos"] == 3
+        assert stats["ausentes"] == 2
+        assert stats["leituras"] == 5
+        assert stats["taxa_acerto"] == 0.6
+        assert stats["cargas"] == 1
+        assert stats["chaves"] == 2
+        assert stats["carregado"] is True
+
 
 class TestConfigCacheObterInt:
     """Testes para o método obter_int()"""
@@ -91,7 +283,7 @@ class TestConfigCacheObterInt:
 
     def test_obter_int_conversao_sucesso(self):
         """Deve converter string numérica para int"""
-        ConfigCache._cache["numero"] = "42"
+        _definir_snapshot({"numero": "42"})
 
         resultado = ConfigCache.obter_int("numero", 0)
 
@@ -101,7 +293,7 @@ class TestConfigCacheObterInt:
     def test_obter_int_usa_padrao_quando_nao_existe(self):
         """Deve usar padrão quando chave não existe"""
         with patch('util.config_cache.configuracao_repo') as mock_repo:
-            mock_repo.obter_por_chave.return_value = None
+            _mock_repo(mock_repo, {})
 
             resultado = ConfigCache.obter_int("inexistente", 100)
 
@@ -109,7 +301,7 @@ class TestConfigCacheObterInt:
 
     def test_obter_int_valor_invalido_retorna_padrao(self):
         """Quando valor não é numérico, retorna padrão"""
-        ConfigCache._cache["texto"] = "nao_e_numero"
+        _definir_snapshot({"texto": "nao_e_numero"})
 
         with patch('util.config_cache.logger') as mock_logger:
             resultado = ConfigCache.obter_int("texto", 999)
@@ -120,7 +312,7 @@ class TestConfigCacheObterInt:
 
     def test_obter_int_valor_float_trunca(self):
         """Valor float na string deve funcionar"""
-        ConfigCache._cache["decimal"] = "3.14"
+        _definir_snapshot({"decimal": "3.14"})
 
         # int("3.14") levanta ValueError
         with patch('util.config_cache.logger'):
@@ -142,7 +334,7 @@ class TestConfigCacheObterBool:
         valores_true = ["true", "TRUE", "True", "1", "yes", "YES", "sim", "SIM", "verdadeiro"]
 
         for valor in valores_true:
-            ConfigCache._cache["bool_test"] = valor
+            _definir_snapshot({"bool_test": valor})
             resultado = ConfigCache.obter_bool("bool_test", False)
             assert resultado is True, f"'{valor}' deveria ser True"
 
@@ -151,7 +343,7 @@ class TestConfigCacheObterBool:
         valores_false = ["false", "FALSE", "0", "no", "nao", "não", "qualquer_coisa"]
 
         for valor in valores_false:
-            ConfigCache._cache["bool_test"] = valor
+            _definir_snapshot({"bool_test": valor})
             resultado = ConfigCache.obter_bool("bool_test", True)
             assert resultado is False, f"'{valor}' deveria ser False"
 
@@ -180,7 +372,7 @@ class TestConfigCacheObterFloat:
 
     def test_obter_float_conversao_sucesso(self):
         """Deve converter string para float"""
-        ConfigCache._cache["decimal"] = "3.14159"
+        _definir_snapshot({"decimal": "3.14159"})
 
         resultado = ConfigCache.obter_float("decimal", 0.0)
 
@@ -189,7 +381,7 @@ class TestConfigCacheObterFloat:
 
     def test_obter_float_inteiro_funciona(self):
         """Deve converter inteiro para float"""
-        ConfigCache._cache["inteiro"] = "42"
+        _definir_snapshot({"inteiro": "42"})
 
         resultado = ConfigCache.obter_float("inteiro", 0.0)
 
@@ -197,7 +389,7 @@ class TestConfigCacheObterFloat:
 
     def test_obter_float_valor_invalido_retorna_padrao(self):
         """Quando valor não é numérico, retorna padrão"""
-        ConfigCache._cache["texto"] = "nao_e_numero"
+        _definir_snapshot({"texto": "nao_e_numero"})
 
         with patch('util.config_cache.logger') as mock_logger:
             resultado = ConfigCache.obter_float("texto", 9.99)
@@ -207,7 +399,7 @@ class TestConfigCacheObterFloat:
 
     def test_obter_float_notacao_cientifica(self):
         """Deve aceitar notação científica"""
-        ConfigCache._cache["cientifico"] = "1.5e-10"
+        _definir_snapshot({"cientifico": "1.5e-10"})
 
         resultado = ConfigCache.obter_float("cientifico", 0.0)
 
@@ -223,8 +415,7 @@ class TestConfigCacheObterMultiplos:
 
     def test_obter_multiplos_sucesso(self):
         """Deve retornar dicionário com todas as configurações"""
-        ConfigCache._cache["config1"] = "valor1"
-        ConfigCache._cache["config2"] = "valor2"
+        _definir_snapshot({"config1": "valor1", "config2": "valor2"})
 
         resultado = ConfigCache.obter_multiplos(
             ["config1", "config2"],
@@ -236,7 +427,7 @@ class TestConfigCacheObterMultiplos:
     def test_obter_multiplos_usa_padroes(self):
         """Deve usar padrões quando configs não existem"""
         with patch('util.config_cache.configuracao_repo') as mock_repo:
-            mock_repo.obter_por_chave.return_value = None
+            _mock_repo(mock_repo, {})
 
             resultado = ConfigCache.obter_multiplos(
                 ["nova1", "nova2"],
@@ -270,38 +461,46 @@ class TestConfigCacheLimpar:
 
     def setup_method(self):
         """Prepara cache com dados de teste"""
-        ConfigCache._cache = {
+        _definir_snapshot({
             "chave1": "valor1",
             "chave2": "valor2",
             "chave3": "valor3"
-        }
-
-    def test_limpar_remove_todo_cache(self):
-        """limpar() deve remover todas as entradas do cache"""
-        assert len(ConfigCache._cache) == 3
+        })
 
+    def test_limpar_descarta_snapshot(self):
+        """limpar() deve descartar o snapshot; a próxima leitura recarrega"""
         ConfigCache.limpar()
 
-        assert len(ConfigCache._cache) == 0
-        assert ConfigCache._cache == {}
+        assert ConfigCache._snapshot is None
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            _mock_repo(mock_repo, {"chave1": "novo"})
+            assert ConfigCache.obter("chave1") == "novo"
+            assert ConfigCache.obter("chave2", "padrao") == "padrao"
+
+    def test_limpar_chave_recarrega_snapshot(self):
+        """limpar_chave() invalida o snapshot inteiro"""
+        ConfigCache.limpar_chave("chave1")
+
+        assert ConfigCache._snapshot is None
 
-    def test_limpar_chave_existente(self):
-        """limpar_chave() deve remover apenas a chave especificada"""
-        assert "chave1" in ConfigCache._cache
+    def test_limpar_incrementa_versao(self):
+        """limpar() e limpar_chave() devem incrementar a versão do cache"""
+        versao = ConfigCache._versao
 
         ConfigCache.limpar_chave("chave1")
+        assert ConfigCache._versao == versao + 1
+
+        ConfigCache.limpar()
+        assert ConfigCache._versao == versao + 2
 
-        assert "chave1" not in ConfigCache._cache
-        assert "chave2" in ConfigCache._cache
-        assert "chave3" in ConfigCache._cache
+    def test_obter_nao_altera_versao(self):
+        """Leituras do snapshot não devem alterar a versão"""
+        versao = ConfigCache.obter_versao()
 
-    def test_limpar_chave_inexistente(self):
-        """limpar_chave() não deve falhar para chave inexistente"""
-        # Não deve levantar exceção
-        ConfigCache.limpar_chave("chave_que_nao_existe")
+        ConfigCache.obter("chave1", "padrao")
+        ConfigCache.obter("chave_nova", "padrao")
 
-        # Cache deve permanecer intacto
-        assert len(ConfigCache._cache) == 3
+        assert ConfigCache.obter_versao() == versao
 
 
 class TestConfigCacheThreadSafety:
@@ -312,18 +511,35 @@ class TestConfigCacheThreadSafety:
         ConfigCache.limpar()
 
     def test_cache_usa_rlock(self):
-        """Verifica que a classe usa RLock para sincronização"""
+        """Verifica que a classe usa RLock para sincronizar as recargas"""
         # RLock não é um tipo diretamente, verificamos pelo nome do tipo
         assert type(ConfigCache._lock).__name__ == 'RLock'
 
-    def test_obter_thread_safe(self):
-        """Verifica que obter() funciona com cache populado"""
-        # Testa comportamento básico que demonstra thread-safety
-        ConfigCache._cache["teste"] = "valor"
+    def test_obter_nao_toma_lock(self):
+        """Leituras do snapshot não adquirem o lock"""
+        _definir_snapshot({"teste": "valor"})
+
+        with patch.object(ConfigCache, '_lock') as mock_lock:
+            assert ConfigCache.obter("teste", "padrao") == "valor"
+            assert ConfigCache.obter_int("inexistente", 3) == 3
+            ConfigCache.obter_versao()
+
+            mock_lock.acquire.assert_not_called()
+            mock_lock.__enter__.assert_not_called()
+
+    def test_verificacao_concorrente_nao_bloqueia(self):
+        """Se outra thread já verifica a versão, a leitura segue com o snapshot atual"""
+        _definir_snapshot({"teste": "valor"})
+        ConfigCache._proxima_verificacao = 0.0
+
+        with patch.object(ConfigCache, '_lock') as mock_lock, \
+                patch('util.config_cache.configuracao_repo') as mock_repo:
+            mock_lock.acquire.return_value = False
 
-        resultado = ConfigCache.obter("teste", "padrao")
+            assert ConfigCache.obter("teste", "padrao") == "valor"
 
-        assert resultado == "valor"
+            mock_lock.acquire.assert_called_once_with(blocking=False)
+            mock_repo.obter_versao.assert_not_called()
 
 
 class TestConfigInstanciaGlobal:
@@ -339,6 +555,6 @@ class TestConfigInstanciaGlobal:
 
         # Deve funcionar sem erro
         with patch('util.config_cache.configuracao_repo') as mock_repo:
-            mock_repo.obter_por_chave.return_value = None
+            _mock_repo(mock_repo, {})
             resultado = config.obter("teste", "valor_teste")
             assert resultado == "valor_teste"
@@ -4,15 +4,20 @@ Testes para o módulo util/rate_limiter.py
 Testa RateLimiter, DynamicRateLimiter e RegistroLimiters.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, patch
 from datetime import timedelta
 
 from util.rate_limiter import (
+    ALGORITMO_GCRA,
+    ALGORITMO_JANELA_DESLIZANTE,
     RateLimiter,
     DynamicRateLimiter,
     RegistroLimiters,
     obter_identificador_cliente,
+    registro_limiters,
 )
 
 
@@ -206,6 +211,175 @@ class TestRateLimiter:
         assert "5" in repr_str
 
 
+class TestAlgoritmos:
+    """Testes do GCRA e da janela deslizante com relógio monotônico simulado"""
+
+    @pytest.fixture
+    def relogio(self):
+        """Substitui time.monotonic por um relógio controlado pelo teste."""
+        estado = {"agora": 1000.0}
+        with patch("util.rate_limiter.time.monotonic", side_effect=lambda: estado["agora"]):
+            yield estado
+
+    def test_algoritmo_invalido_falha(self):
+        """Deve rejeitar algoritmo desconhecido"""
+        with pytest.raises(ValueError, match="algoritmo"):
+            RateLimiter(max_tentativas=5, janela_minutos=5, algoritmo="balde")
+
+    def test_gcra_guarda_um_float_por_identificador(self, relogio):
+        """GCRA: estado O(1) independente do número de tentativas"""
+        limiter = RateLimiter(max_tentativas=100, janela_minutos=1, algoritmo=ALGORITMO_GCRA)
+
+        for _ in range(50):
+            limiter.verificar("192.168.1.1")
+
+        assert isinstance(limiter.tentativas["192.168.1.1"], float)
+        assert limiter.obter_tentativas_restantes("192.168.1.1") == 50
+
+    def test_gcra_rajada_e_reposicao_gradual(self, relogio):
+        """GCRA: rajada de max_tentativas, depois uma a cada janela/max"""
+        limiter = RateLimiter(max_tentativas=3, janela_minutos=1, algoritmo=ALGORITMO_GCRA)
+
+        with patch("util.rate_limiter.logger"):
+            assert [limiter.verificar("ip") for _ in range(4)] == [True, True, True, False]
+            assert limiter.obter_tempo_reset("ip") == timedelta(seconds=20)
+
+            relogio["agora"] += 20
+            assert limiter.obter_tentativas_restantes("ip") == 1
+            assert limiter.verificar("ip") is True
+            assert limiter.verificar("ip") is False
+
+            relogio["agora"] += 60
+            assert limiter.obter_tentativas_restantes("ip") == 3
+            assert limiter.obter_tempo_reset("ip") is None
+
+    def test_gcra_intervalo_nao_exato(self, relogio):
+        """GCRA: janela/max inexato em ponto flutuante não nega a última da rajada"""
+        limiter = RateLimiter(max_tentativas=7, janela_minutos=1, algoritmo=ALGORITMO_GCRA)
+
+        with patch("util.rate_limiter.logger"):
+            assert all(limiter.verificar("ip") for _ in range(7))
+            assert limiter.verificar("ip") is False
+
+    def test_janela_deslizante_libera_quando_mais_antiga_sai(self, relogio):
+        """Janela deslizante: no máximo max_tentativas em qualquer janela"""
+        limiter = RateLimiter(max_tentativas=2, janela_minutos=1, algoritmo=ALGORITMO_JANELA_DESLIZANTE)
+
+        with patch("util.rate_limiter.logger"):
+            limiter.verificar("ip")
+            relogio["agora"] += 30
+            limiter.verificar("ip")
+            assert limiter.verificar("ip") is False
+            assert limiter.obter_tempo_reset("ip") == timedelta(seconds=30)
+
+            relogio["agora"] += 30
+            assert limiter.obter_tentativas_restantes("ip") == 1
+            assert limiter.verificar("ip") is True
+            assert limiter.verificar("ip") is False
+
+    def test_consultas_nao_criam_identificador(self):
+        """obter_tentativas_restantes/obter_tempo_reset não registram o IP"""
+        for algoritmo in (ALGORITMO_GCRA, ALGORITMO_JANELA_DESLIZANTE):
+            limiter = RateLimiter(max_tentativas=5, janela_minutos=5, algoritmo=algoritmo)
+
+            assert limiter.obter_tentativas_restantes("ip") == 5
+            assert limiter.obter_tempo_reset("ip") is None
+            assert limiter.tentativas == {}
+
+
+class TestEvicaoIdentificadores:
+    """Testes do limite LRU e da remoção de identificadores expirados"""
+
+    @pytest.fixture
+    def relogio(self):
+        """Substitui time.monotonic por um relógio controlado pelo teste."""
+        estado = {"agora": 1000.0}
+        with patch("util.rate_limiter.time.monotonic", side_effect=lambda: estado["agora"]):
+            yield estado
+
+    def test_max_identificadores_invalido_falha(self):
+        """Deve rejeitar max_identificadores negativo"""
+        with pytest.raises(ValueError, match="max_identificadores"):
+            RateLimiter(max_tentativas=5, janela_minutos=5, max_identificadores=-1)
+
+    @pytest.mark.parametrize("algoritmo", [ALGORITMO_GCRA, ALGORITMO_JANELA_DESLIZANTE])
+    def test_descarta_o_menos_recente_ao_encher(self, algoritmo):
+        """Ao exceder max_identificadores, o IP usado há mais tempo sai"""
+        limiter = RateLimiter(max_tentativas=5, janela_minutos=5, algoritmo=algoritmo, max_identificadores=3)
+
+        for ip in ("a", "b", "c", "a", "d"):
+            limiter.verificar(ip)
+
+        assert list(limiter.tentativas) == ["c", "a", "d"]
+        assert limiter.total_removidos_lru == 1
+
+    def test_ip_bloqueado_continua_recente(self):
+        """Tentativas bloqueadas também renovam a posição na LRU"""
+        limiter = RateLimiter(max_tentativas=1, janela_minutos=5, max_identificadores=2)
+
+        with patch("util.rate_limiter.logger"):
+            limiter.verificar("atacante")
+            limiter.verificar("b")
+            assert limiter.verificar("atacante") is False
+            limiter.verificar("c")
+
+        assert "atacante" in limiter.tentativas
+        assert "b" not in limiter.tentativas
+
+    @pytest.mark.parametrize("algoritmo", [ALGORITMO_GCRA, ALGORITMO_JANELA_DESLIZANTE])
+    def test_remover_expirados(self, relogio, algoritmo):
+        """Remove só os identificadores sem estado dentro da janela"""
+        limiter = RateLimiter(max_tentativas=2, janela_minutos=1, algoritmo=algoritmo)
+        limiter.verificar("antigo")
+        relogio["agora"] += 50
+        limiter.verificar("recente")
+        relogio["agora"] += 20
+
+        assert limiter.remover_expirados() == 1
+        assert list(limiter.tentativas) == ["recente"]
+        assert limiter.total_expirados == 1
+        assert limiter.obter_tentativas_restantes("antigo") == 2
+
+    def test_registro_reporta_contagens_e_remocoes(self, relogio):
+        """obter_estatisticas inclui identificadores e remoções"""
+        registro = RegistroLimiters()
+        limiter = RateLimiter(max_tentativas=5, janela_minutos=1, nome="evicao", max_identificadores=2)
+        registro.registrar(limiter)
+        for ip in ("a", "b", "c"):
+            limiter.verificar(ip)
+        relogio["agora"] += 120
+
+        assert registro.varrer() == 2
+
+        stats = registro.obter_estatisticas()
+        assert stats["total_identificadores"] == 0
+        assert stats["total_removidos_lru"] == 1
+        assert stats["total_expirados"] == 2
+        assert stats["varreduras"] == 1
+        assert stats["limiters"]["evicao"]["removidos_lru"] == 1
+        assert stats["limiters"]["evicao"]["max_identificadores"] == 2
+
+    def test_limiter_se_registra_no_registry_global(self):
+        """Todo limiter criado aparece em registro_limiters"""
+        limiter = RateLimiter(max_tentativas=5, janela_minutos=5, nome="auto_registro")
+
+        assert registro_limiters.obter("auto_registro") is limiter
+
+    @pytest.mark.asyncio
+    async def test_varredura_em_segundo_plano(self):
+        """A tarefa de varredura chama varrer_sem_bloquear periodicamente até ser encerrada"""
+        registro = RegistroLimiters()
+
+        with patch.object(registro, "varrer_sem_bloquear") as mock_varrer:
+            await registro.iniciar_varredura(intervalo_segundos=0.01)
+            assert registro.obter_estatisticas()["varredura_ativa"] is True
+            await asyncio.sleep(0.05)
+            await registro.encerrar_varredura()
+
+        assert mock_varrer.call_count >= 2
+        assert registro.obter_estatisticas()["varredura_ativa"] is False
+
+
 class TestDynamicRateLimiter:
     """Testes para a classe DynamicRateLimiter"""
 
@@ -251,6 +425,7 @@ class TestDynamicRateLimiter:
         """Deve atualizar valores quando config muda"""
         with patch('util.rate_limiter.config') as mock_config:
             # Valores iniciais
+            mock_config.obter_versao.return_value = 0
             mock_config.obter_int.side_effect = lambda k, d: {
                 "rate_test_max": 5,
                 "rate_test_minutos": 3
@@ -267,7 +442,8 @@ class TestDynamicRateLimiter:
             assert limiter.max_tentativas == 5
             assert limiter.janela_minutos == 3
 
-            # Simular mudança de config
+            # Simular mudança de config (config.limpar incrementa a versão)
+            mock_config.obter_versao.return_value = 1
             mock_config.obter_int.side_effect = lambda k, d: {
                 "rate_test_max": 20,
                 "rate_test_minutos": 10
@@ -279,6 +455,53 @@ class TestDynamicRateLimiter:
             assert limiter.max_tentativas == 20
             assert limiter.janela_minutos == 10
 
+    def test_nao_rele_config_sem_mudanca_de_versao(self):
+        """Sem limpeza do cache, verificar não consulta o config"""
+        with patch('util.rate_limiter.config') as mock_config:
+            mock_config.obter_versao.return_value = 7
+            mock_config.obter_int.side_effect = lambda k, d: d
+
+            limiter = DynamicRateLimiter(
+                chave_max="rate_test_max",
+                chave_minutos="rate_test_minutos",
+                nome="teste_versao"
+            )
+            mock_config.obter_int.reset_mock()
+
+            for _ in range(10):
+                limiter.verificar("ip")
+            limiter.obter_tentativas_restantes("ip")
+
+            mock_config.obter_int.assert_not_called()
+
+    def test_rele_config_apos_limpar(self):
+        """config.limpar() faz o limiter reler os valores na próxima verificação"""
+        from util.config_cache import ConfigCache
+
+        def linhas(valor):
+            return [MagicMock(chave="rate_versao_max", valor=valor)]
+
+        with patch('util.config_cache.configuracao_repo') as mock_repo:
+            mock_repo.obter_versao.return_value = 1
+            mock_repo.obter_todos.return_value = linhas("2")
+            ConfigCache.limpar()
+            limiter = DynamicRateLimiter(
+                chave_max="rate_versao_max",
+                chave_minutos="rate_versao_minutos",
+                nome="teste_limpar"
+            )
+            assert limiter.max_tentativas == 2
+
+            mock_repo.obter_todos.return_value = linhas("8")
+            limiter.verificar("ip")
+            assert limiter.max_tentativas == 2
+
+            ConfigCache.limpar_chave("rate_versao_max")
+            limiter.verificar("ip")
+            assert limiter.max_tentativas == 8
+
+        ConfigCache.limpar()
+
     def test_verificar_atualiza_valores(self):
         """verificar() deve atualizar valores antes de verificar"""
         with patch('util.rate_limiter.config') as mock_config:
@@ -1,17 +1,29 @@
 """Helpers transversais para rotas da API JSON."""
 from fastapi import HTTPException, Request, status
 
+from util.db_async import executar_db
 from util.logger_config import logger
 from util.rate_limiter import DynamicRateLimiter, obter_identificador_cliente
 
 
-def checar_rate_limit(limiter: DynamicRateLimiter, request: Request) -> None:
+async def checar_rate_limit(limiter: DynamicRateLimiter, request: Request) -> None:
     """
     Verifica o rate limit por IP e lança HTTPException 429 (com Retry-After)
     quando o limite é excedido.
+
+    Com armazenamento compartilhado (RATE_LIMIT_BACKEND=sqlite) a verificação
+    é uma escrita no SQLite, que pode esperar o lock do arquivo: ela roda no
+    executor do banco (executar_db) para não bloquear o event loop. Em
+    memória a verificação só lê e grava o dicionário do limiter, sem I/O, e
+    roda direto no event loop: o RateLimiter não tem lock, então o
+    dicionário não deve ser tocado por outra thread.
     """
     ip = obter_identificador_cliente(request)
-    if not limiter.verificar(ip):
+    if limiter.armazenamento is not None:
+        permitido = await executar_db(limiter.verificar, ip)
+    else:
+        permitido = limiter.verificar(ip)
+    if not permitido:
         logger.warning(f"Rate limit '{limiter.nome}' excedido para IP: {ip}")
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -4,7 +4,6 @@ Módulo de gerenciamento de backups do banco de dados SQLite.
 Fornece funções para criar, listar, restaurar e excluir backups do banco de dados.
 Os backups são armazenados no diretório 'backups/' com nomenclatura padronizada.
 """
-import shutil
 import sqlite3
 from contextlib import closing
 from pathlib import Path
@@ -177,6 +176,30 @@ def _validar_integridade_backup(caminho: Path) -> tuple[bool, str]:
         return False, mensagem
 
 
+def _copiar_banco(origem: Path, destino: Path) -> None:
+    """
+    Copia um banco SQLite pela API de backup do SQLite (sqlite3.Connection.backup).
+
+    Diferente de copiar o arquivo, a API lê um snapshot consistente da
+    origem (incluindo commits que ainda estão só no -wal) enquanto outras
+    conexões e workers continuam escrevendo, e grava no destino por uma
+    transação comum. Assim o destino pode ser o banco em uso: as demais
+    conexões, deste ou de outros processos, passam a ver o conteúdo novo sem
+    que o .db seja trocado sob um -wal/-shm antigo.
+
+    Args:
+        origem: Banco lido
+        destino: Banco sobrescrito (criado se não existir)
+
+    Raises:
+        sqlite3.Error: Falha na leitura ou gravação (ex.: banco bloqueado)
+    """
+    with closing(sqlite3.connect(str(origem))) as conn_origem:
+        with closing(sqlite3.connect(str(destino))) as conn_destino:
+            # pages=-1 (padrão): uma única etapa, sob uma só transação de leitura
+            conn_origem.backup(conn_destino)
+
+
 def _verificar_database_pos_restauracao() -> bool:
     """
     Verifica se o banco de dados atual está válido após restauração
@@ -216,8 +239,11 @@ def criar_backup(automatico: bool = False) -> tuple[bool, str]:
         nome_backup = agora().strftime(formato)
         caminho_backup = BACKUP_DIR / nome_backup
 
-        # Copiar arquivo do banco de dados
-        shutil.copy2(db_path, caminho_backup)
+        # Snapshot consistente, mesmo com escritas concorrentes (modo WAL)
+        _copiar_banco(db_path, caminho_backup)
+        # O backup é um arquivo único: sem -wal ao ser aberto ou baixado
+        with closing(sqlite3.connect(str(caminho_backup))) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE")
 
         # Obter tamanho do backup
         tamanho = caminho_backup.stat().st_size
@@ -229,7 +255,7 @@ def criar_backup(automatico: bool = False) -> tuple[bool, str]:
 
         return True, mensagem
 
-    except OSError as e:
+    except (OSError, sqlite3.Error) as e:
         mensagem = f"Erro ao criar backup: {str(e)}"
         logger.error(mensagem)
         return False, mensagem
@@ -342,9 +368,10 @@ def restaurar_backup(nome_arquivo: str, criar_backup_antes: bool = True) -> tupl
                 logger.warning(f"Falha ao criar backup de segurança: {msg}")
                 # Continua mesmo se falhar o backup automático
 
-        # Restaurar backup (copiar sobre o arquivo atual)
+        # Restaurar gravando o backup dentro do banco em uso (transação comum):
+        # as conexões do pool e dos outros workers continuam válidas
         db_path = Path(DATABASE_PATH)
-        shutil.copy2(caminho_backup, db_path)
+        _copiar_banco(caminho_backup, db_path)
 
         # VALIDAÇÃO PÓS-RESTAURAÇÃO: Verificar se banco restaurado está válido
         logger.info("Verificando integridade do banco após restauração...")
@@ -353,7 +380,7 @@ def restaurar_backup(nome_arquivo: str, criar_backup_antes: bool = True) -> tupl
             logger.error("Banco corrompido após restauração! Executando rollback...")
 
             if caminho_backup_seguranca and caminho_backup_seguranca.exists():
-                shutil.copy2(caminho_backup_seguranca, db_path)
+                _copiar_banco(caminho_backup_seguranca, db_path)
                 mensagem = (
                     f"Restauração falhou! Banco revertido para estado anterior. "
                     f"Backup '{nome_arquivo}' pode estar corrompido."
@@ -373,7 +400,7 @@ def restaurar_backup(nome_arquivo: str, criar_backup_antes: bool = True) -> tupl
 
         return True, mensagem, nome_backup_automatico
 
-    except OSError as e:
+    except (OSError, sqlite3.Error) as e:
         mensagem = f"Erro ao restaurar backup: {str(e)}"
         logger.error(mensagem)
 
@@ -381,10 +408,10 @@ def restaurar_backup(nome_arquivo: str, criar_backup_antes: bool = True) -> tupl
         if caminho_backup_seguranca and caminho_backup_seguranca.exists():
             try:
                 db_path = Path(DATABASE_PATH)
-                shutil.copy2(caminho_backup_seguranca, db_path)
+                _copiar_banco(caminho_backup_seguranca, db_path)
                 logger.info("Rollback executado com sucesso após exceção")
                 mensagem += " (Banco revertido para estado anterior)"
-            except OSError as rollback_error:
+            except (OSError, sqlite3.Error) as rollback_error:
                 logger.critical(f"Falha no rollback: {rollback_error}")
                 mensagem += " (CRÍTICO: Falha no rollback!)"
 
@@ -0,0 +1,214 @@
+"""
+Backends de broadcast do chat.
+
+O GerenciadorChat guarda as filas SSE na memória do processo. Com mais de um
+worker do uvicorn, o stream de um usuário pode estar em outro processo que
+não o que recebeu a mensagem. O backend de broadcast resolve isso: o
+gerenciador publica cada evento no backend e cada worker entrega localmente
+os eventos destinados aos usuários conectados a ele.
+
+Backends disponíveis (variável CHAT_BROADCAST_BACKEND):
+
+  - memoria: entrega direta no próprio processo (padrão; um único worker)
+  - sqlite:  log de eventos na tabela chat_evento, consumido por polling
+             em cada worker; não depende de serviços externos
+
+No backend sqlite, o worker publicador entrega o evento localmente na hora e
+grava a linha no log; os demais workers leem as linhas novas (busca pela
+PRIMARY KEY) a cada CHAT_BROADCAST_INTERVALO_MS e ignoram as que eles mesmos
+publicaram. Linhas mais antigas que CHAT_BROADCAST_RETENCAO_SEGUNDOS são
+removidas periodicamente.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, List, Optional
+
+from repo import chat_evento_repo
+from util.db_async import executar_db
+from util.logger_config import logger
+
+# Backend usado pelo gerenciador global: "memoria" ou "sqlite"
+CHAT_BROADCAST_BACKEND = os.getenv("CHAT_BROADCAST_BACKEND", "memoria")
+# Intervalo de polling do log de eventos (backend sqlite)
+CHAT_BROADCAST_INTERVALO_MS = int(os.getenv("CHAT_BROADCAST_INTERVALO_MS", "50"))
+# Idade máxima dos eventos mantidos no log (backend sqlite)
+CHAT_BROADCAST_RETENCAO_SEGUNDOS = int(os.getenv("CHAT_BROADCAST_RETENCAO_SEGUNDOS", "60"))
+
+# Função de entrega local: (usuario_id, evento) -> None
+EntregaLocal = Callable[[int, dict], Awaitable[None]]
+
+
+class BackendBroadcast:
+    """
+    Interface dos backends de broadcast.
+
+    O gerenciador vincula sua função de entrega local com `vincular` e passa a
+    publicar os eventos com `publicar`. `iniciar`/`encerrar` controlam tarefas
+    de fundo do backend (no-op por padrão).
+    """
+
+    nome = "base"
+    # True se os eventos chegam a conexões de outros workers
+    compartilhado = False
+
+    def __init__(self):
+        self._entregar: Optional[EntregaLocal] = None
+
+    def vincular(self, entregar: EntregaLocal):
+        """Define a função que entrega um evento às conexões deste worker."""
+        self._entregar = entregar
+
+    async def publicar(self, destinatarios: List[int], evento: dict):
+        """Publica um evento para os usuários de `destinatarios`."""
+        raise NotImplementedError
+
+    async def iniciar(self):
+        """Inicia as tarefas de fundo do backend."""
+
+    async def encerrar(self):
+        """Encerra as tarefas de fundo do backend."""
+
+    def obter_estatisticas(self) -> dict:
+        """Retorna estatísticas do backend."""
+        return {"backend": self.nome}
+
+
+class BackendMemoria(BackendBroadcast):
+    """Entrega os eventos diretamente no próprio processo (um único worker)."""
+
+    nome = "memoria"
+
+    async def publicar(self, destinatarios: List[int], evento: dict):
+        for usuario_id in destinatarios:
+            await self._entregar(usuario_id, evento)
+
+
+class BackendSQLite(BackendBroadcast):
+    """
+    Compartilha os eventos entre workers por meio da tabela chat_evento.
+
+    Args:
+        intervalo_ms: Intervalo de polling do log
+        retencao_segundos: Idade máxima dos eventos mantidos no log
+        lote: Máximo de eventos lidos por consulta
+    """
+
+    nome = "sqlite"
+    compartilhado = True
+
+    def __init__(
+        self,
+        intervalo_ms: int = CHAT_BROADCAST_INTERVALO_MS,
+        retencao_segundos: int = CHAT_BROADCAST_RETENCAO_SEGUNDOS,
+        lote: int = 500,
+    ):
+        super().__init__()
+        self.intervalo = intervalo_ms / 1000
+        self.retencao_segundos = retencao_segundos
+        self.lote = lote
+        # Identifica as linhas publicadas por este worker
+        self.origem = uuid.uuid4().hex
+        self._ultimo_id = 0
+        self._tarefa: Optional[asyncio.Task] = None
+        self._total_publicados = 0
+        self._total_recebidos = 0
+
+    async def publicar(self, destinatarios: List[int], evento: dict):
+        # Entrega local imediata; o log serve apenas aos outros workers
+        for usuario_id in destinatarios:
+            await self._entregar(usuario_id, evento)
+        await executar_db(chat_evento_repo.inserir, self.origem, destinatarios, evento)
+        self._total_publicados += 1
+
+    async def iniciar(self):
+        if self._tarefa is not None:
+            return
+        await executar_db(chat_evento_repo.criar_tabela)
+        # Eventos anteriores à subida do worker não interessam a ninguém dele
+        self._ultimo_id = await executar_db(chat_evento_repo.obter_ultimo_id)
+        self._tarefa = asyncio.create_task(self._consumir())
+        logger.info(
+            f"[ChatBroadcast] Backend sqlite iniciado (origem {self.origem[:8]}, "
+            f"polling {int(self.intervalo * 1000)} ms)"
+        )
+
+    async def encerrar(self):
+        if self._tarefa is None:
+            return
+        self._tarefa.cancel()
+        try:
+            await self._tarefa
+        except asyncio.CancelledError:
+            pass
+        self._tarefa = None
+
+    async def consumir_pendentes(self) -> int:
+        """
+        Lê e entrega os eventos novos de outros workers.
+
+        Returns:
+            Quantidade de eventos lidos do log (inclusive os próprios)
+        """
+        eventos = await executar_db(chat_evento_repo.listar_apos, self._ultimo_id, self.lote)
+        for evento in eventos:
+            self._ultimo_id = evento.id
+            if evento.origem == self.origem:
+                continue
+            self._total_recebidos += 1
+            for usuario_id in evento.destinatarios:
+                await self._entregar(usuario_id, evento.payload)
+        return len(eventos)
+
+    async def _consumir(self):
+        """Laço de polling do log de eventos."""
+        ultima_limpeza = time.monotonic()
+        while True:
+            try:
+                lidos = await self.consumir_pendentes()
+
+                if time.monotonic() - ultima_limpeza >= self.retencao_segundos:
+                    ultima_limpeza = time.monotonic()
+                    await executar_db(chat_evento_repo.excluir_antigos, self.retencao_segundos)
+
+                # Lote cheio: ainda há eventos pendentes, continua sem esperar
+                if lidos < self.lote:
+                    await asyncio.sleep(self.intervalo)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[ChatBroadcast] Erro ao consumir eventos: {e}", exc_info=True)
+                await asyncio.sleep(self.intervalo)
+
+    def obter_estatisticas(self) -> dict:
+        return {
+            "backend": self.nome,
+            "ultimo_evento_id": self._ultimo_id,
+            "total_publicados": self._total_publicados,
+            "total_recebidos": self._total_recebidos,
+            "consumindo": self._tarefa is not None,
+        }
+
+
+BACKENDS = {
+    BackendMemoria.nome: BackendMemoria,
+    BackendSQLite.nome: BackendSQLite,
+}
+
+
+def criar_backend_broadcast(nome: str = CHAT_BROADCAST_BACKEND) -> BackendBroadcast:
+    """
+    Cria o backend de broadcast pelo nome.
+
+    Raises:
+        ValueError: Se o nome não corresponder a um backend conhecido
+    """
+    chave = nome.strip().lower()
+    if chave not in BACKENDS:
+        raise ValueError(
+            f"CHAT_BROADCAST_BACKEND inválido: {nome!r} "
+            f"(opções: {', '.join(BACKENDS)})"
+        )
+    return BACKENDS[chave]()
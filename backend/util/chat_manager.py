@@ -3,64 +3,363 @@ Gerenciador de conexões SSE do chat.
 Mantém conexões ativas e faz broadcast de mensagens para usuários conectados.
 """
 import asyncio
-from typing import Dict, Set
+import json
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+from util.chat_broadcast import BackendBroadcast, BackendMemoria, criar_backend_broadcast
 from util.logger_config import logger
 
+# Intervalo sem eventos após o qual o stream envia um comentário de heartbeat
+# (mantém a conexão viva atrás de proxies que encerram conexões ociosas)
+CHAT_SSE_HEARTBEAT_SEGUNDOS = float(os.getenv("CHAT_SSE_HEARTBEAT_SEGUNDOS", "15"))
+# Máximo de eventos drenados da fila e escritos em um único chunk
+CHAT_SSE_LOTE_MAXIMO = int(os.getenv("CHAT_SSE_LOTE_MAXIMO", "256"))
+
+# Capacidade da fila de cada conexão SSE e política aplicada quando ela enche
+# (consumidor lento): "descartar_antigos", "coalescer" ou "desconectar"
+CHAT_SSE_FILA_MAXIMA = int(os.getenv("CHAT_SSE_FILA_MAXIMA", "500"))
+CHAT_SSE_POLITICA_FILA = os.getenv("CHAT_SSE_POLITICA_FILA", "coalescer")
+POLITICAS_FILA = ("descartar_antigos", "coalescer", "desconectar")
+
+# Replay de reconexão (Last-Event-ID): eventos mantidos por usuário e por
+# quanto tempo o buffer sobrevive depois que a última conexão do usuário fecha
+CHAT_SSE_REPLAY_TAMANHO = int(os.getenv("CHAT_SSE_REPLAY_TAMANHO", "100"))
+CHAT_SSE_REPLAY_SEGUNDOS = float(os.getenv("CHAT_SSE_REPLAY_SEGUNDOS", "60"))
+
+# Eventos que só sinalizam "reconsulte": vários da mesma sala equivalem a um
+TIPOS_COALESCIVEIS = {"atualizar_contador"}
+
+# Enviado na reconexão quando o buffer de replay não cobre o Last-Event-ID:
+# o cliente deve recarregar conversas/mensagens (ver EventoRessincronizarSSE)
+EVENTO_RESSINCRONIZAR = {"tipo": "ressincronizar"}
+
+# Marcador enfileirado quando o servidor encerra a conexão (consumidor lento)
+FIM_STREAM = object()
+
+
+def _chave_coalescivel(evento: dict):
+    """Chave de coalescência do evento, ou None se ele não for coalescível."""
+    if isinstance(evento, dict) and evento.get("tipo") in TIPOS_COALESCIVEIS:
+        return (evento["tipo"], evento.get("sala_id"))
+    return None
+
+
+@dataclass
+class ReplayUsuario:
+    """
+    Últimos eventos entregues a um usuário, para reenvio na reconexão.
+
+    Attributes:
+        base: Todo evento do usuário com sequência maior que `base` está no buffer
+        eventos: Pares (sequência do evento, evento), do mais antigo ao mais novo
+        expira_em: Instante (monotonic) em que o buffer pode ser descartado;
+            None enquanto o usuário tiver conexões abertas
+    """
+    base: int
+    eventos: Deque[Tuple[int, dict]] = field(
+        default_factory=lambda: deque(maxlen=CHAT_SSE_REPLAY_TAMANHO)
+    )
+    expira_em: Optional[float] = None
+
+    def registrar(self, sequencia: int, evento: dict):
+        """Guarda um evento; o mais antigo sai se o buffer estiver cheio."""
+        if len(self.eventos) == self.eventos.maxlen:
+            self.base = self.eventos[0][0]
+        self.eventos.append((sequencia, evento))
+
+    def expirado(self, agora: float) -> bool:
+        return self.expira_em is not None and agora >= self.expira_em
+
+
+class FilaSSE(asyncio.Queue):
+    """
+    Fila limitada de eventos de uma conexão SSE.
+
+    O broadcast nunca espera por espaço: `oferecer` enfileira sem bloquear e,
+    com a fila cheia, aplica a política configurada. Também registra o
+    instante de chegada de cada evento para medir o atraso do consumidor e o
+    ID do evento (linha `id:` do SSE), exposto em `ultimo_id_lido` a cada get.
+
+    Args:
+        maxsize: Capacidade da fila
+        politica: Uma de POLITICAS_FILA
+    """
+
+    def __init__(self, maxsize: int = CHAT_SSE_FILA_MAXIMA, politica: str = CHAT_SSE_POLITICA_FILA):
+        if politica not in POLITICAS_FILA:
+            raise ValueError(
+                f"Política de fila SSE inválida: {politica!r} (opções: {', '.join(POLITICAS_FILA)})"
+            )
+        super().__init__(maxsize)
+        self.politica = politica
+        self.encerrada = False
+        self.total_entregues = 0
+        self.total_descartados = 0
+        # ID do último evento retirado da fila (None se enfileirado sem ID)
+        self.ultimo_id_lido: Optional[str] = None
+        self._id_entrada: Optional[str] = None
+
+    # Ganchos de armazenamento do asyncio.Queue (mesmo padrão de LifoQueue)
+    def _init(self, maxsize):
+        self._queue = deque()
+        self._instantes = deque()
+        self._ids = deque()
+
+    def _put(self, item):
+        self._queue.append(item)
+        self._instantes.append(time.monotonic())
+        self._ids.append(self._id_entrada)
+        self._id_entrada = None
+
+    def _get(self):
+        self._instantes.popleft()
+        self.ultimo_id_lido = self._ids.popleft()
+        item = self._queue.popleft()
+        if item is not FIM_STREAM:
+            self.total_entregues += 1
+        return item
+
+    def atraso_segundos(self) -> float:
+        """Idade do evento mais antigo ainda não consumido (0 se vazia)."""
+        if not self._instantes:
+            return 0.0
+        return time.monotonic() - self._instantes[0]
+
+    def oferecer(self, evento: dict, evento_id: Optional[str] = None) -> bool:
+        """
+        Enfileira um evento sem bloquear, aplicando a política se estiver cheia.
+
+        Args:
+            evento: Evento SSE
+            evento_id: ID do evento (enviado na linha `id:` do SSE)
+
+        Returns:
+            False se a conexão foi (ou já estava) encerrada por lentidão
+        """
+        if self.encerrada:
+            return False
+        if self.full():
+            if self.politica == "desconectar":
+                self.encerrar()
+                return False
+            if self.politica == "coalescer":
+                self._coalescer()
+            # Sem espaço mesmo após coalescer: descarta os mais antigos
+            while self.full():
+                self._queue.popleft()
+                self._instantes.popleft()
+                self._ids.popleft()
+                self.total_descartados += 1
+        self._id_entrada = evento_id
+        self.put_nowait(evento)
+        return True
+
+    def encerrar(self):
+        """Descarta os eventos pendentes e sinaliza o fim do stream."""
+        self.total_descartados += len(self._queue)
+        self._queue.clear()
+        self._instantes.clear()
+        self._ids.clear()
+        self.encerrada = True
+        self.put_nowait(FIM_STREAM)
+
+    def _coalescer(self):
+        """Remove eventos coalescíveis repetidos, mantendo a última ocorrência."""
+        vistos = set()
+        itens = []
+        for item in reversed(list(zip(self._queue, self._instantes, self._ids))):
+            chave = _chave_coalescivel(item[0])
+            if chave is not None:
+                if chave in vistos:
+                    self.total_descartados += 1
+                    continue
+                vistos.add(chave)
+            itens.append(item)
+        itens.reverse()
+        self._queue = deque(item[0] for item in itens)
+        self._instantes = deque(item[1] for item in itens)
+        self._ids = deque(item[2] for item in itens)
+
 
 class GerenciadorChat:
     """
     Gerencia conexões SSE para o sistema de chat.
 
-    Cada usuário tem UMA conexão SSE que recebe mensagens de TODAS as suas salas.
+    Cada conexão SSE recebe mensagens de TODAS as salas do usuário, e um
+    usuário pode ter várias conexões ao mesmo tempo (abas, dispositivos).
     Quando uma mensagem é enviada em uma sala, o GerenciadorChat faz broadcast
-    para ambos os participantes da sala (se estiverem conectados).
+    para todas as conexões de ambos os participantes da sala.
+
+    Cada entrega recebe um ID "<prefixo>-<sequência>" e fica num buffer de
+    replay por usuário (CHAT_SSE_REPLAY_TAMANHO eventos, mantido por
+    CHAT_SSE_REPLAY_SEGUNDOS após a última conexão fechar). Na reconexão com
+    Last-Event-ID, os eventos perdidos são reenviados. O buffer é local ao
+    worker e o prefixo é único por instância (worker, processo): com vários
+    workers, o replay depende de a reconexão cair no mesmo worker (sticky
+    session); um ID de outro worker ou de antes de um restart tem outro
+    prefixo e o cliente é orientado a ressincronizar.
+
+    O broadcast passa pelo backend (ver util/chat_broadcast.py): com o backend
+    em memória a entrega é direta; com um backend compartilhado, cada worker
+    entrega localmente os eventos publicados por qualquer worker.
+
+    Cada conexão tem uma FilaSSE limitada: um consumidor lento (aba travada,
+    rede ruim) nunca bloqueia o broadcast nem acumula memória sem limite.
+
+    Args:
+        backend: Backend de broadcast (padrão: BackendMemoria)
+        fila_maxima: Capacidade da fila de cada conexão
+        politica_fila: Política aplicada com a fila cheia (POLITICAS_FILA)
     """
 
-    def __init__(self):
-        # Dicionário de filas: usuario_id -> asyncio.Queue
-        self._connections: Dict[int, asyncio.Queue] = {}
+    def __init__(
+        self,
+        backend: Optional[BackendBroadcast] = None,
+        fila_maxima: int = CHAT_SSE_FILA_MAXIMA,
+        politica_fila: str = CHAT_SSE_POLITICA_FILA,
+    ):
+        if politica_fila not in POLITICAS_FILA:
+            raise ValueError(
+                f"Política de fila SSE inválida: {politica_fila!r} (opções: {', '.join(POLITICAS_FILA)})"
+            )
+        self.fila_maxima = fila_maxima
+        self.politica_fila = politica_fila
+        # Conexões de cada usuário: usuario_id -> {FilaSSE, ...}
+        self._connections: Dict[int, Set[FilaSSE]] = {}
         # Set de usuários com conexão ativa
         self._active_connections: Set[int] = set()
+        # Buffers de replay por usuário e última sequência de evento atribuída.
+        # O prefixo identifica esta instância nos IDs de evento: sequências de
+        # outro worker (ou de antes de um restart) nunca são comparadas com
+        # as daqui.
+        self._replay: Dict[int, ReplayUsuario] = {}
+        self._prefixo_evento = uuid.uuid4().hex
+        self._ultima_sequencia = 0
+        self._ultima_limpeza_replay = time.monotonic()
+        # Métricas acumuladas de conexões já encerradas
+        self._descartados_encerradas = 0
+        self._desconectados_por_lentidao = 0
+        # Backend de broadcast entre workers
+        self.backend = backend or BackendMemoria()
+        self.backend.vincular(self._entregar_local)
+        # Event loop dos streams, para publicar a partir de código síncrono
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Envios agendados por enviar_threadsafe no próprio loop: o asyncio só
+        # guarda referência fraca às tasks, que poderiam ser coletadas antes
+        # de terminar
+        self._tarefas_envio: Set[asyncio.Task] = set()
+
+    async def iniciar(self):
+        """Inicia o backend de broadcast (startup da aplicação)."""
+        self._loop = asyncio.get_running_loop()
+        await self.backend.iniciar()
+
+    async def encerrar(self):
+        """Encerra o backend de broadcast (shutdown da aplicação)."""
+        await self.backend.encerrar()
 
-    async def conectar(self, usuario_id: int) -> asyncio.Queue:
+    async def conectar(self, usuario_id: int, ultimo_evento_id: Optional[str] = None) -> FilaSSE:
         """
         Registra nova conexão SSE para um usuário.
 
         Args:
             usuario_id: ID do usuário conectando
+            ultimo_evento_id: Last-Event-ID informado na reconexão; os eventos
+                posteriores ainda no buffer de replay são reenfileirados
 
         Returns:
-            Queue para envio de mensagens SSE
+            Fila (limitada) para envio de mensagens SSE
         """
-        queue = asyncio.Queue()
-        self._connections[usuario_id] = queue
+        self._loop = asyncio.get_running_loop()
+        queue = FilaSSE(self.fila_maxima, self.politica_fila)
+
+        replay = self._replay.get(usuario_id)
+        if replay is None or replay.expirado(time.monotonic()):
+            replay = ReplayUsuario(base=self._ultima_sequencia)
+            self._replay[usuario_id] = replay
+        replay.expira_em = None
+
+        if ultimo_evento_id is not None:
+            self._reenviar(queue, replay, ultimo_evento_id)
+
+        self._connections.setdefault(usuario_id, set()).add(queue)
         self._active_connections.add(usuario_id)
 
         logger.info(
             f"[GerenciadorChat] Usuário {usuario_id} conectado. "
-            f"Total conexões: {len(self._active_connections)}"
+            f"Total conexões: {self._total_conexoes()}"
         )
 
         return queue
 
-    async def desconectar(self, usuario_id: int):
+    def _formatar_evento_id(self, sequencia: int) -> str:
+        return f"{self._prefixo_evento}-{sequencia}"
+
+    def _sequencia_do_evento(self, evento_id: str) -> Optional[int]:
+        """Sequência de um ID emitido por esta instância, ou None (outro worker, inválido)."""
+        prefixo, _, sequencia = evento_id.rpartition("-")
+        if prefixo != self._prefixo_evento or not sequencia.isdigit():
+            return None
+        return int(sequencia)
+
+    def _reenviar(self, fila: FilaSSE, replay: ReplayUsuario, ultimo_evento_id: str):
+        """Enfileira os eventos posteriores a `ultimo_evento_id` (replay)."""
+        ultima = self._sequencia_do_evento(ultimo_evento_id)
+        if ultima is None or ultima < replay.base or ultima > self._ultima_sequencia:
+            # ID de outro worker ou buffer que não cobre o intervalo perdido
+            fila.oferecer(EVENTO_RESSINCRONIZAR, self._formatar_evento_id(self._ultima_sequencia))
+            return
+        for sequencia, evento in replay.eventos:
+            if sequencia > ultima:
+                fila.oferecer(evento, self._formatar_evento_id(sequencia))
+
+    async def desconectar(self, usuario_id: int, fila: Optional[FilaSSE] = None):
         """
         Remove conexão SSE de um usuário.
 
         Args:
             usuario_id: ID do usuário desconectando
+            fila: Fila da conexão encerrada; se omitida, remove todas as
+                conexões do usuário
         """
-        if usuario_id in self._connections:
-            del self._connections[usuario_id]
+        filas = self._connections.get(usuario_id, set())
+        if fila is not None and fila not in filas:
+            return
+
+        for removida in ([fila] if fila is not None else list(filas)):
+            self._descartados_encerradas += removida.total_descartados
+            filas.discard(removida)
 
-        if usuario_id in self._active_connections:
-            self._active_connections.remove(usuario_id)
+        if not filas:
+            self._connections.pop(usuario_id, None)
+            self._active_connections.discard(usuario_id)
+            # Mantém o replay por um tempo para a reconexão
+            replay = self._replay.get(usuario_id)
+            if replay is not None:
+                replay.expira_em = time.monotonic() + CHAT_SSE_REPLAY_SEGUNDOS
+            self._limpar_replay_expirado()
 
         logger.info(
             f"[GerenciadorChat] Usuário {usuario_id} desconectado. "
-            f"Total conexões: {len(self._active_connections)}"
+            f"Total conexões: {self._total_conexoes()}"
         )
 
+    def _limpar_replay_expirado(self):
+        """Descarta buffers de replay expirados (no máximo a cada 10 s)."""
+        agora_mono = time.monotonic()
+        if agora_mono - self._ultima_limpeza_replay < 10:
+            return
+        self._ultima_limpeza_replay = agora_mono
+        for usuario_id in [u for u, r in self._replay.items() if r.expirado(agora_mono)]:
+            del self._replay[usuario_id]
+
+    def _total_conexoes(self) -> int:
+        return sum(len(filas) for filas in self._connections.values())
+
     async def broadcast_para_sala(self, sala_id: str, mensagem_dict: dict):
         """
         Envia mensagem SSE para ambos os participantes de uma sala.
@@ -82,13 +381,88 @@ class GerenciadorChat:
             logger.error(f"[ChatManager] Erro ao parsear IDs do sala_id: {sala_id}")
             return
 
-        # Enviar para cada participante se estiver conectado
-        for usuario_id in [usuario1_id, usuario2_id]:
-            if usuario_id in self._connections:
-                await self._connections[usuario_id].put(mensagem_dict)
+        # Publicar no backend; cada worker entrega aos participantes conectados nele
+        await self.backend.publicar([usuario1_id, usuario2_id], mensagem_dict)
+
+    async def enviar_para_usuarios(self, usuario_ids: List[int], evento: dict):
+        """
+        Envia um evento SSE às conexões de vários usuários (em qualquer worker).
+
+        Args:
+            usuario_ids: IDs dos usuários destinatários
+            evento: Dicionário com os dados do evento
+        """
+        await self.backend.publicar(usuario_ids, evento)
+
+    def alcanca_usuario(self, usuario_id: int) -> bool:
+        """
+        Indica se um evento enviado ao usuário pode chegar a alguma conexão.
+
+        Com backend compartilhado, o usuário pode estar conectado em outro
+        worker; em memória, só se tiver conexão (ou replay ativo) aqui.
+        Permite evitar o trabalho de montar eventos que ninguém receberá.
+        """
+        if self.backend.compartilhado:
+            return True
+        replay = self._replay.get(usuario_id)
+        return replay is not None and not replay.expirado(time.monotonic())
+
+    def enviar_threadsafe(self, usuario_ids: List[int], evento: dict) -> bool:
+        """
+        Agenda `enviar_para_usuarios` a partir de código síncrono.
+
+        Pode ser chamado tanto no event loop (rota async chamando função
+        síncrona) quanto numa thread do executor de banco (util/db_async).
+
+        Returns:
+            True se o envio foi agendado, False se não há event loop ativo
+        """
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return False
+        try:
+            no_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            no_loop = False
+        coro = self.enviar_para_usuarios(usuario_ids, evento)
+        if no_loop:
+            tarefa = loop.create_task(coro)
+            self._tarefas_envio.add(tarefa)
+            tarefa.add_done_callback(self._tarefas_envio.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, loop)
+        return True
+
+    async def _entregar_local(self, usuario_id: int, mensagem_dict: dict):
+        """
+        Entrega um evento à conexão SSE do usuário neste worker, se houver.
+
+        Args:
+            usuario_id: ID do usuário destinatário
+            mensagem_dict: Dicionário com dados da mensagem a enviar
+        """
+        replay = self._replay.get(usuario_id)
+        if replay is None or replay.expirado(time.monotonic()):
+            logger.debug(f"[ChatManager] Usuário {usuario_id} não está conectado (não receberá via SSE)")
+            return
+
+        # Usuário conectado (ou reconectando): o evento entra no replay
+        self._ultima_sequencia += 1
+        replay.registrar(self._ultima_sequencia, mensagem_dict)
+        evento_id = self._formatar_evento_id(self._ultima_sequencia)
+
+        for fila in list(self._connections.get(usuario_id, ())):
+            if fila.oferecer(mensagem_dict, evento_id):
                 logger.debug(f"[ChatManager] Mensagem enviada para usuário {usuario_id} via SSE")
-            else:
-                logger.debug(f"[ChatManager] Usuário {usuario_id} não está conectado (não receberá via SSE)")
+                continue
+
+            # Política "desconectar": o stream recebe FIM_STREAM e se encerra
+            self._desconectados_por_lentidao += 1
+            logger.warning(
+                f"[ChatManager] Conexão do usuário {usuario_id} encerrada por lentidão "
+                f"(fila cheia com {self.fila_maxima} eventos)"
+            )
+            await self.desconectar(usuario_id, fila)
 
     def esta_conectado(self, usuario_id: int) -> bool:
         """
@@ -109,12 +483,128 @@ class GerenciadorChat:
         Returns:
             Dicionário com estatísticas
         """
+        conexoes = [
+            {
+                "usuario_id": usuario_id,
+                "pendentes": fila.qsize(),
+                "atraso_segundos": round(fila.atraso_segundos(), 3),
+                "entregues": fila.total_entregues,
+                "descartados": fila.total_descartados,
+            }
+            for usuario_id, filas in self._connections.items()
+            for fila in filas
+        ]
         return {
-            "total_conexoes": len(self._connections),
+            "total_conexoes": len(conexoes),
             "usuarios_ativos": list(self._active_connections),
-            "total_usuarios_ativos": len(self._active_connections)
+            "total_usuarios_ativos": len(self._active_connections),
+            "fila_maxima": self.fila_maxima,
+            "politica_fila": self.politica_fila,
+            "total_pendentes": sum(c["pendentes"] for c in conexoes),
+            "atraso_maximo_segundos": max((c["atraso_segundos"] for c in conexoes), default=0.0),
+            "total_descartados": self._descartados_encerradas + sum(c["descartados"] for c in conexoes),
+            "desconectados_por_lentidao": self._desconectados_por_lentidao,
+            "conexoes": conexoes,
+            "replay": {
+                "usuarios": len(self._replay),
+                "ultimo_evento_id": self._formatar_evento_id(self._ultima_sequencia),
+            },
+            "broadcast": self.backend.obter_estatisticas()
         }
 
 
-# Instância singleton global
-gerenciador_chat = GerenciadorChat()
+def coalescer_eventos(eventos: List[dict]) -> List[dict]:
+    """
+    Remove eventos redundantes de um lote.
+
+    Eventos de TIPOS_COALESCIVEIS repetidos para a mesma sala são reduzidos
+    a um só, mantido na posição da última ocorrência (preserva a ordem em
+    relação às mensagens). Os demais eventos passam inalterados.
+
+    Args:
+        eventos: Eventos na ordem em que foram enfileirados
+
+    Returns:
+        Lista de eventos sem duplicatas coalescíveis
+    """
+    return [evento for _, evento in _coalescer_pares([(None, evento) for evento in eventos])]
+
+
+def _coalescer_pares(pares: List[Tuple[Optional[str], dict]]) -> List[Tuple[Optional[str], dict]]:
+    """coalescer_eventos sobre pares (ID do evento, evento)."""
+    vistos = set()
+    resultado = []
+    for par in reversed(pares):
+        chave = _chave_coalescivel(par[1])
+        if chave is not None:
+            if chave in vistos:
+                continue
+            vistos.add(chave)
+        resultado.append(par)
+    resultado.reverse()
+    return resultado
+
+
+def _formatar_evento_sse(evento_id: Optional[str], evento: dict) -> str:
+    """Formata um evento no padrão text/event-stream."""
+    if evento_id is None:
+        return f"data: {json.dumps(evento)}\n\n"
+    return f"id: {evento_id}\ndata: {json.dumps(evento)}\n\n"
+
+
+async def fluxo_sse(
+    fila: asyncio.Queue,
+    heartbeat_segundos: float = CHAT_SSE_HEARTBEAT_SEGUNDOS,
+    lote_maximo: int = CHAT_SSE_LOTE_MAXIMO,
+) -> AsyncIterator[str]:
+    """
+    Gera os chunks do stream SSE a partir da fila de um usuário.
+
+    Aguarda o primeiro evento, drena o que mais estiver enfileirado (até
+    `lote_maximo`), coalesce os redundantes e escreve tudo em um único chunk.
+    Sem eventos por `heartbeat_segundos`, emite um comentário SSE. Termina ao
+    receber FIM_STREAM (conexão encerrada pelo servidor).
+
+    Args:
+        fila: Fila retornada por GerenciadorChat.conectar
+        heartbeat_segundos: Intervalo máximo sem escrita no stream
+        lote_maximo: Máximo de eventos por chunk
+
+    Yields:
+        Texto no formato text/event-stream
+    """
+    # A leitura pendente sobrevive ao timeout do heartbeat: cancelar um
+    # queue.get() no limite do timeout poderia perder um evento (Python < 3.12)
+    leitura: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if leitura is None:
+                leitura = asyncio.ensure_future(fila.get())
+            concluidas, _ = await asyncio.wait({leitura}, timeout=heartbeat_segundos)
+            if not concluidas:
+                yield ": heartbeat\n\n"
+                continue
+
+            eventos = [(getattr(fila, "ultimo_id_lido", None), leitura.result())]
+            leitura = None
+            while len(eventos) < lote_maximo and not fila.empty():
+                evento = fila.get_nowait()
+                eventos.append((getattr(fila, "ultimo_id_lido", None), evento))
+
+            fim = eventos[-1][1] is FIM_STREAM
+            if fim:
+                eventos.pop()
+            if eventos:
+                yield "".join(
+                    _formatar_evento_sse(evento_id, evento)
+                    for evento_id, evento in _coalescer_pares(eventos)
+                )
+            if fim:
+                return
+    finally:
+        if leitura is not None:
+            leitura.cancel()
+
+
+# Instância singleton global (backend definido por CHAT_BROADCAST_BACKEND)
+gerenciador_chat = GerenciadorChat(criar_backend_broadcast())
@@ -43,6 +43,18 @@ if RUNNING_MODE_CHECK.lower() != "development":
 # === Configurações do Banco de Dados ===
 DATABASE_PATH = os.getenv("DATABASE_PATH", "dados.db")
 
+# === Perfil de Armazenamento (PRAGMAs do SQLite) ===
+# Perfil base: "desempenho" (WAL + synchronous NORMAL), "seguro" (WAL + FULL)
+# ou "legado" (rollback journal, comportamento antigo). Ver util/db_util.py.
+DB_PERFIL_ARMAZENAMENTO = os.getenv("DB_PERFIL_ARMAZENAMENTO", "desempenho")
+# Sobrescritas individuais do perfil (vazio = usa o valor do perfil base)
+DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "")
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "")
+DB_BUSY_TIMEOUT_MS = os.getenv("DB_BUSY_TIMEOUT_MS", "")
+DB_CACHE_SIZE = os.getenv("DB_CACHE_SIZE", "")
+DB_MMAP_SIZE = os.getenv("DB_MMAP_SIZE", "")
+DB_TEMP_STORE = os.getenv("DB_TEMP_STORE", "")
+
 # === Configurações de Logging ===
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "30"))
@@ -80,6 +92,14 @@ TOAST_AUTO_HIDE_DELAY_MS = int(os.getenv("TOAST_AUTO_HIDE_DELAY_MS", "5000"))
 # "rate_limit_login_max"), com um padrão hardcoded como fallback. Os valores são
 # semeados no banco a partir do .env por util/migrar_config.py na inicialização e
 # ficam editáveis em runtime via PUT /api/admin/configuracoes.
+# O algoritmo, por outro lado, é fixo por processo: "gcra" (um float por IP,
+# permite rajada de max_tentativas) ou "janela_deslizante" (no máximo
+# max_tentativas em qualquer janela, guarda o instante de cada tentativa).
+RATE_LIMIT_ALGORITMO = os.getenv("RATE_LIMIT_ALGORITMO", "gcra")
+# Identificadores (IPs) mantidos por limiter, em ordem LRU, e intervalo da
+# varredura que remove os expirados (0 desliga a varredura).
+RATE_LIMIT_MAX_IDENTIFICADORES = int(os.getenv("RATE_LIMIT_MAX_IDENTIFICADORES", "50000"))
+RATE_LIMIT_VARREDURA_SEGUNDOS = int(os.getenv("RATE_LIMIT_VARREDURA_SEGUNDOS", "60"))
 
 # === Configurações de Pagamento ===
 # Mercado Pago
@@ -1,26 +1,202 @@
-from typing import Dict, Any, List
+import os
 import sqlite3
 import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 from repo import configuracao_repo
 from util.logger_config import logger
 
+# Intervalo mínimo entre consultas à versão das configurações no banco
+# (detecção de alterações feitas por outros workers)
+CONFIG_CACHE_VERIFICACAO_MS = int(os.getenv("CONFIG_CACHE_VERIFICACAO_MS", "1000"))
+# Idade máxima do snapshot: recarregado mesmo sem mudança de versão
+CONFIG_CACHE_TTL_SEGUNDOS = int(os.getenv("CONFIG_CACHE_TTL_SEGUNDOS", "300"))
+# Após uma falha do banco, tempo sem novas consultas (cache negativo do erro)
+CONFIG_CACHE_ERRO_TTL_MS = int(os.getenv("CONFIG_CACHE_ERRO_TTL_MS", "5000"))
+
+_SNAPSHOT_VAZIO: Mapping[str, str] = MappingProxyType({})
+
+
+def _contadores_zerados() -> Dict[str, int]:
+    return {
+        "acertos": 0,
+        "ausentes": 0,
+        "cargas": 0,
+        "revalidacoes": 0,
+        "recargas": 0,
+        "erros": 0,
+        "leituras_obsoletas": 0,
+        "leituras_em_erro": 0,
+    }
+
 
 class ConfigCache:
     """
     Cache de configurações do sistema para melhor performance.
 
-    Thread-safe: utiliza RLock para sincronização de acesso ao cache
-    em ambientes multi-thread.
+    Snapshot: todas as configurações são carregadas numa única consulta
+    (configuracao_repo.obter_todos) para um mapeamento imutável, trocado
+    por inteiro a cada recarga. Leituras não tomam lock: apenas consultam
+    o snapshot atual. O RLock serializa somente as recargas.
+
+    Invalidação entre processos: triggers incrementam a linha de
+    configuracao_versao a cada escrita em configuracao. No máximo a cada
+    CONFIG_CACHE_VERIFICACAO_MS, o snapshot é revalidado: a versão é
+    consultada e, se mudou (ou se o snapshot passou de
+    CONFIG_CACHE_TTL_SEGUNDOS), as configurações são recarregadas.
+    `limpar` descarta o snapshot local na hora.
+
+    Stale-while-revalidate: a revalidação roda numa thread em segundo plano
+    e as leituras continuam servindo o snapshot atual enquanto isso. Só a
+    primeira carga (início ou após `limpar`) faz a leitura esperar.
+
+    Falhas do banco: o snapshot atual continua em uso (ou os padrões, se
+    ainda não houver snapshot) e o erro fica em cache por
+    CONFIG_CACHE_ERRO_TTL_MS, sem nova consulta ao banco a cada leitura.
+
+    Versão: cada limpeza ou recarga incrementa um contador local. Quem guarda
+    valores derivados do cache (ex.: DynamicRateLimiter) compara
+    `obter_versao()` com a versão da última leitura e só relê quando ela
+    muda.
+
+    Os contadores de `obter_estatisticas` são incrementados sem lock no
+    caminho de leitura; sob concorrência são aproximados.
     """
-    _cache: Dict[str, Any] = {}
+    _snapshot: Optional[Mapping[str, str]] = None
+    _versao_banco: int = -1
+    _carregado_em: float = 0.0
+    _proxima_verificacao: float = 0.0
+    _erro_ate: float = 0.0
+    _ultimo_erro: Optional[str] = None
+    _revalidacao: Optional[threading.Thread] = None
     _lock: threading.RLock = threading.RLock()
+    _versao: int = 0
+    _contadores: Dict[str, int] = _contadores_zerados()
+
+    @classmethod
+    def _carregar(cls) -> None:
+        """
+        Recarrega o snapshot com todas as configurações do banco.
+
+        Deve ser chamado com o lock. Em caso de erro mantém o snapshot atual
+        (ou um vazio, se ainda não houver).
+        """
+        try:
+            # Versão antes das linhas: uma escrita no meio força nova recarga
+            versao = configuracao_repo.obter_versao()
+            valores = {c.chave: c.valor for c in configuracao_repo.obter_todos()}
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao carregar configurações do banco: {e}")
+            cls._registrar_erro(e)
+            return
+        except Exception as e:
+            logger.critical(f"Erro crítico ao carregar configurações: {e}")
+            cls._registrar_erro(e)
+            return
+
+        agora = time.monotonic()
+        cls._snapshot = MappingProxyType(valores)
+        cls._versao_banco = versao
+        cls._carregado_em = agora
+        cls._proxima_verificacao = agora + CONFIG_CACHE_VERIFICACAO_MS / 1000
+        cls._erro_ate = 0.0
+        cls._versao += 1
+
+    @classmethod
+    def _registrar_erro(cls, erro: Exception) -> None:
+        """Mantém os valores em uso e guarda o erro por CONFIG_CACHE_ERRO_TTL_MS."""
+        agora = time.monotonic()
+        cls._contadores["erros"] += 1
+        cls._ultimo_erro = str(erro)
+        if cls._snapshot is None:
+            cls._snapshot = _SNAPSHOT_VAZIO
+            cls._versao_banco = -1
+        cls._erro_ate = agora + CONFIG_CACHE_ERRO_TTL_MS / 1000
+        cls._proxima_verificacao = cls._erro_ate
+
+    @classmethod
+    def _revalidar(cls) -> None:
+        """
+        Consulta a versão no banco e recarrega o snapshot se preciso.
+
+        Roda na thread de revalidação, com o lock durante toda a operação
+        (uma `limpar` concorrente espera e vale depois dela).
+        """
+        with cls._lock:
+            try:
+                cls._contadores["revalidacoes"] += 1
+                try:
+                    versao = configuracao_repo.obter_versao()
+                except Exception as e:
+                    logger.error(f"Erro ao verificar versão das configurações: {e}")
+                    cls._registrar_erro(e)
+                    return
+
+                expirado = time.monotonic() - cls._carregado_em >= CONFIG_CACHE_TTL_SEGUNDOS
+                if versao != cls._versao_banco or expirado:
+                    versao_local = cls._versao
+                    cls._carregar()
+                    if cls._versao != versao_local:
+                        cls._contadores["recargas"] += 1
+                else:
+                    cls._erro_ate = 0.0
+                    cls._proxima_verificacao = time.monotonic() + CONFIG_CACHE_VERIFICACAO_MS / 1000
+            finally:
+                cls._revalidacao = None
+
+    @classmethod
+    def _obter_snapshot(cls) -> Mapping[str, str]:
+        """
+        Retorna o snapshot atual, carregando-o ou agendando revalidação se preciso.
+
+        Caminho comum sem lock. Sem snapshot (início ou após `limpar`), a
+        carga toma o lock e as demais threads esperam por ela. Vencido o
+        intervalo de verificação, a thread que obtém o lock dispara a
+        revalidação em segundo plano; todas seguem com o snapshot atual.
+        """
+        snapshot = cls._snapshot
+        agora = time.monotonic()
+        if snapshot is not None and agora < cls._proxima_verificacao:
+            return snapshot
+
+        if snapshot is None:
+            with cls._lock:
+                if cls._snapshot is None:
+                    cls._contadores["cargas"] += 1
+                    cls._carregar()
+                snapshot = cls._snapshot
+            return snapshot if snapshot is not None else _SNAPSHOT_VAZIO
+
+        if cls._lock.acquire(blocking=False):
+            try:
+                if cls._revalidacao is None and agora >= cls._proxima_verificacao:
+                    # Evita novos disparos até a revalidação reagendar
+                    cls._proxima_verificacao = agora + CONFIG_CACHE_VERIFICACAO_MS / 1000
+                    cls._revalidacao = threading.Thread(
+                        target=cls._revalidar, name="config-cache-revalidacao", daemon=True
+                    )
+                    cls._revalidacao.start()
+            finally:
+                cls._lock.release()
+        return snapshot
+
+    @classmethod
+    def _contar_leitura(cls, encontrada: bool) -> None:
+        """Atualiza os contadores de uma leitura (sem lock)."""
+        contadores = cls._contadores
+        contadores["acertos" if encontrada else "ausentes"] += 1
+        if cls._revalidacao is not None:
+            contadores["leituras_obsoletas"] += 1
+        if cls._erro_ate and time.monotonic() < cls._erro_ate:
+            contadores["leituras_em_erro"] += 1
 
     @classmethod
     def obter(cls, chave: str, padrao: str = "") -> str:
         """
-        Obtém configuração com cache e tratamento de erros.
+        Obtém configuração do snapshot em memória.
 
-        Thread-safe: utiliza lock para sincronização.
+        Sem lock: lê o snapshot imutável atual.
 
         Args:
             chave: Chave da configuração
@@ -32,30 +208,9 @@ class ConfigCache:
         Raises:
             Nenhuma exceção - retorna padrao em caso de erro
         """
-        with cls._lock:
-            # Retorna do cache se disponível
-            if chave in cls._cache:
-                return cls._cache[chave]
-
-            # Tenta buscar do banco com error handling
-            try:
-                config = configuracao_repo.obter_por_chave(chave)
-                if config:
-                    cls._cache[chave] = config.valor
-                    return config.valor
-                else:
-                    cls._cache[chave] = padrao
-                    return padrao
-
-            except sqlite3.Error as e:
-                logger.error(f"Erro ao buscar configuração '{chave}' do banco: {e}")
-                # Retorna padrão em vez de crashar a aplicação
-                return padrao
-
-            except Exception as e:
-                logger.critical(f"Erro crítico ao acessar configuração '{chave}': {e}")
-                # Ainda retorna padrão, mas loga como crítico
-                return padrao
+        valor = cls._obter_snapshot().get(chave)
+        cls._contar_leitura(valor is not None)
+        return padrao if valor is None else valor
 
     @classmethod
     def obter_int(cls, chave: str, padrao: int) -> int:
@@ -143,32 +298,91 @@ class ConfigCache:
             logger.error("obter_multiplos: número de chaves diferente de padrões")
             return dict(zip(chaves, padroes))
 
+        # Um único snapshot: valores consistentes entre si
+        snapshot = cls._obter_snapshot()
         resultado = {}
         for chave, padrao in zip(chaves, padroes):
-            resultado[chave] = cls.obter(chave, padrao)
-
+            valor = snapshot.get(chave)
+            cls._contar_leitura(valor is not None)
+            resultado[chave] = padrao if valor is None else valor
         return resultado
 
+    @classmethod
+    def obter_versao(cls) -> int:
+        """
+        Retorna a versão atual do cache.
+
+        Também faz a verificação periódica da versão no banco, para que quem
+        só consulta a versão perceba alterações de outros workers. Sem lock
+        no caminho comum: a leitura de um int é atômica e a versão só cresce.
+
+        Returns:
+            Contador incrementado a cada limpeza ou recarga do cache
+        """
+        cls._obter_snapshot()
+        return cls._versao
+
+    @classmethod
+    def obter_estatisticas(cls) -> Dict[str, Any]:
+        """
+        Retorna os contadores e o estado do cache neste worker.
+
+        Returns:
+            Dicionário com acertos, ausentes, cargas, revalidações, recargas,
+            erros, leituras obsoletas/em erro, taxa de acerto e o estado do
+            snapshot
+        """
+        contadores = dict(cls._contadores)
+        leituras = contadores["acertos"] + contadores["ausentes"]
+        snapshot = cls._snapshot
+        agora = time.monotonic()
+        return {
+            **contadores,
+            "leituras": leituras,
+            "taxa_acerto": round(contadores["acertos"] / leituras, 4) if leituras else 0.0,
+            "chaves": len(snapshot) if snapshot is not None else 0,
+            "carregado": snapshot is not None and cls._versao_banco >= 0,
+            "idade_snapshot_segundos": (
+                round(agora - cls._carregado_em, 3) if cls._carregado_em else None
+            ),
+            "versao_banco": cls._versao_banco,
+            "versao_local": cls._versao,
+            "revalidando": cls._revalidacao is not None,
+            "em_erro": bool(cls._erro_ate) and agora < cls._erro_ate,
+            "ultimo_erro": cls._ultimo_erro,
+            "verificacao_ms": CONFIG_CACHE_VERIFICACAO_MS,
+            "ttl_segundos": CONFIG_CACHE_TTL_SEGUNDOS,
+            "erro_ttl_ms": CONFIG_CACHE_ERRO_TTL_MS,
+        }
+
+    @classmethod
+    def zerar_estatisticas(cls) -> None:
+        """Zera os contadores de `obter_estatisticas`."""
+        cls._contadores = _contadores_zerados()
+
     @classmethod
     def limpar(cls):
         """
-        Limpa todo o cache de configurações.
+        Descarta o snapshot; a próxima leitura recarrega do banco.
 
         Thread-safe: utiliza lock para sincronização.
         """
         with cls._lock:
-            cls._cache = {}
+            cls._snapshot = None
+            cls._erro_ate = 0.0
+            cls._versao += 1
 
     @classmethod
     def limpar_chave(cls, chave: str):
         """
-        Limpa cache de uma chave específica.
+        Invalida o cache após alteração de uma chave específica.
+
+        O snapshot é recarregado por inteiro (uma única consulta), então
+        equivale a `limpar`.
 
         Thread-safe: utiliza lock para sincronização.
         """
-        with cls._lock:
-            if chave in cls._cache:
-                del cls._cache[chave]
+        cls.limpar()
 
 
 # Instância global para uso em toda a aplicação
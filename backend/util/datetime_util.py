@@ -4,7 +4,7 @@ Módulo de utilitários para manipulação de datetime com timezone.
 Centraliza toda criação de datetime no sistema para garantir
 consistência de timezone em toda a aplicação.
 """
-from datetime import datetime, date
+from datetime import datetime, date, time
 from zoneinfo import ZoneInfo
 from typing import Optional
 from util.config import APP_TIMEZONE
@@ -33,6 +33,22 @@ def hoje() -> date:
     return agora().date()
 
 
+def inicio_do_dia(dia: date) -> datetime:
+    """
+    Retorna a meia-noite de um dia no timezone configurado da aplicação.
+
+    Útil para filtros por data: o intervalo [inicio_do_dia(d), inicio_do_dia(d + 1 dia))
+    cobre o dia d inteiro no horário local, mesmo com os timestamps gravados em UTC.
+
+    Args:
+        dia: Data no calendário local
+
+    Returns:
+        datetime: 00:00 do dia, com timezone configurado
+    """
+    return datetime.combine(dia, time.min, tzinfo=APP_TIMEZONE)
+
+
 def converter_para_timezone(dt: datetime, tz: Optional[ZoneInfo] = None) -> datetime:
     """
     Converte um datetime para o timezone especificado.
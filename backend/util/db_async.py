@@ -0,0 +1,120 @@
+"""
+Acesso assíncrono ao banco de dados.
+
+Os repositórios usam ``sqlite3`` (bloqueante). Chamá-los diretamente de uma
+rota ``async def`` trava o event loop enquanto a query roda — e com ele todos
+os streams SSE e requisições do worker. Este módulo executa as chamadas ao
+banco num ``ThreadPoolExecutor`` dedicado, liberando o event loop:
+
+    usuario = await executar_db(usuario_repo.obter_por_id, usuario_id)
+
+O executor é separado do executor padrão do asyncio (usado pelo Starlette
+para rotas síncronas e arquivos estáticos) para que uma rajada de queries não
+dispute threads com o restante da aplicação. O número de threads acompanha o
+tamanho do pool de conexões: mais threads que conexões só gerariam espera no
+checkout do pool.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from util.db_util import DB_POOL_TAMANHO
+from util.logger_config import logger
+
+T = TypeVar("T")
+
+# Threads dedicadas às chamadas ao banco (padrão: tamanho do pool de conexões)
+DB_EXECUTOR_THREADS = int(os.getenv("DB_EXECUTOR_THREADS", str(DB_POOL_TAMANHO)))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Métricas (protegidas por _metricas_lock)
+_metricas_lock = threading.Lock()
+_em_andamento = 0
+_total_chamadas = 0
+_total_erros = 0
+_espera_maxima = 0.0
+
+
+def obter_executor() -> ThreadPoolExecutor:
+    """Retorna o executor do banco, criando-o na primeira chamada."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_EXECUTOR_THREADS,
+                    thread_name_prefix="db",
+                )
+                logger.info(f"Executor do banco iniciado ({DB_EXECUTOR_THREADS} threads)")
+    return _executor
+
+
+def encerrar_executor() -> None:
+    """Encerra o executor aguardando as chamadas em andamento."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _executar_medindo(enfileirada_em: float, funcao: Callable[..., T], *args, **kwargs) -> T:
+    """Executa a função na thread do executor registrando as métricas."""
+    global _em_andamento, _total_chamadas, _total_erros, _espera_maxima
+    espera = time.perf_counter() - enfileirada_em
+    with _metricas_lock:
+        _em_andamento += 1
+        _total_chamadas += 1
+        _espera_maxima = max(_espera_maxima, espera)
+    try:
+        return funcao(*args, **kwargs)
+    except Exception:
+        with _metricas_lock:
+            _total_erros += 1
+        raise
+    finally:
+        with _metricas_lock:
+            _em_andamento -= 1
+
+
+async def executar_db(funcao: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Executa uma função síncrona de acesso ao banco sem bloquear o event loop.
+
+    O contexto (``contextvars``) da corrotina é propagado para a thread, como
+    em ``asyncio.to_thread``. Exceções da função são relançadas no ``await``.
+
+    Args:
+        funcao: Função síncrona (em geral uma função de repositório)
+        *args: Argumentos posicionais repassados à função
+        **kwargs: Argumentos nomeados repassados à função
+
+    Returns:
+        O retorno da função
+    """
+    loop = asyncio.get_running_loop()
+    contexto = contextvars.copy_context()
+    chamada = functools.partial(
+        contexto.run, _executar_medindo, time.perf_counter(), funcao, *args, **kwargs
+    )
+    return await loop.run_in_executor(obter_executor(), chamada)
+
+
+def obter_estatisticas_executor() -> dict:
+    """Retorna métricas do executor do banco (para health check)."""
+    with _metricas_lock:
+        return {
+            "threads": DB_EXECUTOR_THREADS,
+            "em_andamento": _em_andamento,
+            "total_chamadas": _total_chamadas,
+            "total_erros": _total_erros,
+            "espera_maxima_ms": round(_espera_maxima * 1000, 2),
+        }
@@ -1,10 +1,18 @@
 import sqlite3
 import os
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
+from typing import Optional
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 
+from util import config as app_config
+from util.logger_config import logger
+
 
 load_dotenv()
 
@@ -12,25 +20,502 @@ DATABASE_PATH = os.getenv('DATABASE_PATH', 'dados.db')
 TIMEZONE = os.getenv('TIMEZONE', 'America/Sao_Paulo')
 APP_TIMEZONE = ZoneInfo(TIMEZONE)
 
+# === Pool de conexões ===
+# Quantidade máxima de conexões abertas simultaneamente com o banco
+DB_POOL_TAMANHO = int(os.getenv('DB_POOL_TAMANHO', '10'))
+# Tempo máximo (segundos) aguardando uma conexão livre antes de falhar
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+# Conexões ociosas há mais tempo que isso (segundos) são fechadas
+DB_POOL_MAX_OCIOSO = float(os.getenv('DB_POOL_MAX_OCIOSO', '300'))
+# Conexões ociosas há mais tempo que isso (segundos) são validadas antes do uso
+DB_POOL_VERIFICAR_APOS = float(os.getenv('DB_POOL_VERIFICAR_APOS', '30'))
+
+
+# =============================================================================
+# Perfil de armazenamento (PRAGMAs)
+# =============================================================================
+
+# Valores aceitos (PRAGMA não aceita parâmetros, então os valores textuais
+# são validados contra estas listas antes de serem interpolados no SQL)
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+TEMP_STORE_MODES = ("DEFAULT", "FILE", "MEMORY")
+
+
+@dataclass(frozen=True)
+class PerfilArmazenamento:
+    """
+    Conjunto de PRAGMAs aplicados a cada conexão do pool.
+
+    Attributes:
+        nome: Nome do perfil base (desempenho, seguro, legado)
+        journal_mode: Modo de journal (WAL permite leituras concorrentes às escritas)
+        synchronous: Nível de fsync (NORMAL é seguro em WAL e bem mais rápido que FULL)
+        busy_timeout_ms: Tempo que uma escrita espera por lock antes de "database is locked"
+        cache_size: Cache de páginas (negativo = KiB, positivo = páginas)
+        mmap_size: Bytes do arquivo mapeados em memória (0 desativa)
+        temp_store: Onde ficam tabelas/índices temporários
+    """
+    nome: str
+    journal_mode: str
+    synchronous: str
+    busy_timeout_ms: int
+    cache_size: int
+    mmap_size: int
+    temp_store: str
+
+    def pragmas(self) -> list[str]:
+        """Retorna os comandos PRAGMA que aplicam o perfil em uma conexão."""
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA busy_timeout = {self.busy_timeout_ms}",
+            f"PRAGMA cache_size = {self.cache_size}",
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
+
+
+PERFIS_ARMAZENAMENTO = {
+    "desempenho": PerfilArmazenamento(
+        nome="desempenho",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        busy_timeout_ms=5000,
+        cache_size=-20000,
+        mmap_size=128 * 1024 * 1024,
+        temp_store="MEMORY",
+    ),
+    "seguro": PerfilArmazenamento(
+        nome="seguro",
+        journal_mode="WAL",
+        synchronous="FULL",
+        busy_timeout_ms=5000,
+        cache_size=-20000,
+        mmap_size=128 * 1024 * 1024,
+        temp_store="MEMORY",
+    ),
+    "legado": PerfilArmazenamento(
+        nome="legado",
+        journal_mode="DELETE",
+        synchronous="FULL",
+        busy_timeout_ms=5000,
+        cache_size=-2000,
+        mmap_size=0,
+        temp_store="DEFAULT",
+    ),
+}
+
+
+def _validar_opcao(nome: str, valor: str, opcoes: tuple[str, ...]) -> str:
+    """Normaliza e valida um valor textual de PRAGMA."""
+    valor = valor.strip().upper()
+    if valor not in opcoes:
+        raise ValueError(f"{nome} inválido: '{valor}'. Valores aceitos: {', '.join(opcoes)}")
+    return valor
+
+
+def carregar_perfil_armazenamento() -> PerfilArmazenamento:
+    """
+    Monta o perfil de armazenamento a partir da configuração.
+
+    Parte do perfil base DB_PERFIL_ARMAZENAMENTO e aplica as sobrescritas
+    individuais (DB_JOURNAL_MODE, DB_SYNCHRONOUS, ...) que estiverem definidas.
+
+    Raises:
+        ValueError: Se algum valor configurado for inválido
+    """
+    nome = app_config.DB_PERFIL_ARMAZENAMENTO.strip().lower()
+    if nome not in PERFIS_ARMAZENAMENTO:
+        raise ValueError(
+            f"DB_PERFIL_ARMAZENAMENTO inválido: '{nome}'. "
+            f"Valores aceitos: {', '.join(PERFIS_ARMAZENAMENTO)}"
+        )
+
+    perfil = PERFIS_ARMAZENAMENTO[nome]
+    sobrescritas = {}
+    if app_config.DB_JOURNAL_MODE:
+        sobrescritas["journal_mode"] = _validar_opcao(
+            "DB_JOURNAL_MODE", app_config.DB_JOURNAL_MODE, JOURNAL_MODES
+        )
+    if app_config.DB_SYNCHRONOUS:
+        sobrescritas["synchronous"] = _validar_opcao(
+            "DB_SYNCHRONOUS", app_config.DB_SYNCHRONOUS, SYNCHRONOUS_MODES
+        )
+    if app_config.DB_TEMP_STORE:
+        sobrescritas["temp_store"] = _validar_opcao(
+            "DB_TEMP_STORE", app_config.DB_TEMP_STORE, TEMP_STORE_MODES
+        )
+    if app_config.DB_BUSY_TIMEOUT_MS:
+        sobrescritas["busy_timeout_ms"] = int(app_config.DB_BUSY_TIMEOUT_MS)
+    if app_config.DB_CACHE_SIZE:
+        sobrescritas["cache_size"] = int(app_config.DB_CACHE_SIZE)
+    if app_config.DB_MMAP_SIZE:
+        sobrescritas["mmap_size"] = int(app_config.DB_MMAP_SIZE)
+
+    return replace(perfil, **sobrescritas)
+
+
+PERFIL_ARMAZENAMENTO = carregar_perfil_armazenamento()
+
+
+class PoolConexoes:
+    """
+    Pool limitado e thread-safe de conexões SQLite reutilizáveis.
+
+    A configuração de cada conexão (adaptadores, foreign keys, row_factory)
+    é feita uma única vez, na criação. Conexões devolvidas ficam ociosas
+    para reuso; as ociosas há mais de ``max_ocioso`` segundos são fechadas
+    e as ociosas há mais de ``verificar_apos`` segundos passam por um
+    health check (``SELECT 1``) antes de serem entregues.
+
+    Attributes:
+        caminho: Caminho do arquivo do banco de dados
+        tamanho_maximo: Número máximo de conexões abertas
+        timeout: Segundos aguardando conexão livre antes de lançar erro
+        max_ocioso: Segundos de ociosidade antes de fechar a conexão
+        verificar_apos: Segundos de ociosidade antes de validar a conexão
+        perfil: PRAGMAs aplicados a cada conexão criada
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        tamanho_maximo: int = DB_POOL_TAMANHO,
+        timeout: float = DB_POOL_TIMEOUT,
+        max_ocioso: float = DB_POOL_MAX_OCIOSO,
+        verificar_apos: float = DB_POOL_VERIFICAR_APOS,
+        perfil: Optional[PerfilArmazenamento] = None,
+    ):
+        if tamanho_maximo <= 0:
+            raise ValueError("tamanho_maximo deve ser positivo")
+
+        self.caminho = caminho
+        self.tamanho_maximo = tamanho_maximo
+        self.timeout = timeout
+        self.max_ocioso = max_ocioso
+        self.verificar_apos = verificar_apos
+        self.perfil = perfil or PERFIL_ARMAZENAMENTO
+
+        # Pilha (LIFO) de (conexão, instante em que ficou ociosa)
+        self._ociosas: deque[tuple[sqlite3.Connection, float]] = deque()
+        self._abertas = 0
+        self._em_uso = 0
+        self._fechado = False
+        self._condicao = threading.Condition()
+
+        # Métricas
+        self._total_checkouts = 0
+        self._total_criadas = 0
+        self._total_descartadas = 0
+        self._total_timeouts = 0
+        self._espera_total = 0.0
+        self._espera_maxima = 0.0
+
+    @property
+    def fechado(self) -> bool:
+        """Indica se o pool já foi encerrado."""
+        return self._fechado
+
+    def _criar_conexao(self) -> sqlite3.Connection:
+        """Abre e configura uma nova conexão (executado uma vez por conexão)."""
+        conn = sqlite3.connect(
+            self.caminho,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA foreign_keys = ON")
+        for pragma in self.perfil.pragmas():
+            conn.execute(pragma)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _conexao_saudavel(conn: sqlite3.Connection) -> bool:
+        """Health check: a conexão ainda responde a uma query trivial?"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _fechar_silenciosamente(conn: sqlite3.Connection) -> None:
+        """Fecha a conexão ignorando erros (ela já pode estar inválida)."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _remover_ociosas_expiradas(self, momento: float) -> None:
+        """Fecha conexões ociosas há mais de max_ocioso. Chamar com o lock."""
+        # As mais antigas ficam no início da pilha
+        while self._ociosas and momento - self._ociosas[0][1] > self.max_ocioso:
+            conn, _ = self._ociosas.popleft()
+            self._fechar_silenciosamente(conn)
+            self._abertas -= 1
+            self._total_descartadas += 1
+
+    def obter(self) -> sqlite3.Connection:
+        """
+        Retira uma conexão do pool, aguardando se todas estiverem em uso.
+
+        Returns:
+            Conexão pronta para uso (deve ser devolvida com devolver())
+
+        Raises:
+            sqlite3.OperationalError: Se nenhuma conexão ficar livre dentro do timeout
+            sqlite3.ProgrammingError: Se o pool já foi encerrado
+        """
+        inicio = time.monotonic()
+        limite = inicio + self.timeout
+        conn: Optional[sqlite3.Connection] = None
+        ociosa_desde = inicio
+
+        with self._condicao:
+            while True:
+                if self._fechado:
+                    raise sqlite3.ProgrammingError("Pool de conexões encerrado")
+
+                agora_mono = time.monotonic()
+                self._remover_ociosas_expiradas(agora_mono)
+
+                if self._ociosas:
+                    conn, ociosa_desde = self._ociosas.pop()
+                    break
+                if self._abertas < self.tamanho_maximo:
+                    # Reserva a vaga; a conexão é criada fora do lock
+                    self._abertas += 1
+                    break
+
+                restante = limite - agora_mono
+                if restante <= 0:
+                    self._total_timeouts += 1
+                    raise sqlite3.OperationalError(
+                        f"Timeout ({self.timeout}s) aguardando conexão livre do pool "
+                        f"({self._em_uso}/{self.tamanho_maximo} em uso)"
+                    )
+                self._condicao.wait(restante)
+
+            self._em_uso += 1
+            self._total_checkouts += 1
+            espera = time.monotonic() - inicio
+            self._espera_total += espera
+            self._espera_maxima = max(self._espera_maxima, espera)
+
+        # Health check apenas de conexões que ficaram ociosas por muito tempo
+        if conn is not None and time.monotonic() - ociosa_desde > self.verificar_apos:
+            if not self._conexao_saudavel(conn):
+                logger.warning("[PoolConexoes] Conexão inválida descartada no health check")
+                self._fechar_silenciosamente(conn)
+                with self._condicao:
+                    self._total_descartadas += 1
+                conn = None
+
+        if conn is None:
+            try:
+                conn = self._criar_conexao()
+            except Exception:
+                with self._condicao:
+                    self._abertas -= 1
+                    self._em_uso -= 1
+                    self._condicao.notify()
+                raise
+            with self._condicao:
+                self._total_criadas += 1
+
+        return conn
+
+    def devolver(self, conn: sqlite3.Connection, descartar: bool = False) -> None:
+        """
+        Devolve uma conexão ao pool.
+
+        Args:
+            conn: Conexão obtida com obter()
+            descartar: Se True, fecha a conexão em vez de reutilizá-la
+        """
+        if not descartar:
+            try:
+                # Nunca devolver conexão com transação pendente
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.row_factory = sqlite3.Row
+            except sqlite3.Error:
+                descartar = True
+
+        with self._condicao:
+            self._em_uso -= 1
+            if descartar or self._fechado:
+                self._fechar_silenciosamente(conn)
+                self._abertas -= 1
+                self._total_descartadas += 1
+            else:
+                self._ociosas.append((conn, time.monotonic()))
+            self._condicao.notify()
+
+    def fechar(self) -> None:
+        """
+        Encerra o pool: fecha as conexões ociosas imediatamente e as que
+        estão em uso no momento em que forem devolvidas.
+        """
+        with self._condicao:
+            self._fechado = True
+            while self._ociosas:
+                conn, _ = self._ociosas.pop()
+                self._fechar_silenciosamente(conn)
+                self._abertas -= 1
+            self._condicao.notify_all()
+
+    def obter_estatisticas(self) -> dict:
+        """
+        Retorna métricas do pool.
+
+        Returns:
+            Dicionário com ocupação, contadores e tempos de espera (ms)
+        """
+        with self._condicao:
+            media = self._espera_total / self._total_checkouts if self._total_checkouts else 0.0
+            return {
+                "tamanho_maximo": self.tamanho_maximo,
+                "abertas": self._abertas,
+                "em_uso": self._em_uso,
+                "ociosas": len(self._ociosas),
+                "total_checkouts": self._total_checkouts,
+                "total_criadas": self._total_criadas,
+                "total_descartadas": self._total_descartadas,
+                "total_timeouts": self._total_timeouts,
+                "espera_media_ms": round(media * 1000, 3),
+                "espera_maxima_ms": round(self._espera_maxima * 1000, 3),
+            }
+
+
+_pool: Optional[PoolConexoes] = None
+_pool_lock = threading.Lock()
+
+
+def obter_pool() -> PoolConexoes:
+    """
+    Retorna o pool de conexões do banco atual (DATABASE_PATH).
+
+    O pool é criado sob demanda e recriado se DATABASE_PATH mudar
+    (ex: testes que apontam para um banco temporário) ou se tiver sido encerrado.
+    """
+    global _pool
+    pool = _pool
+    if pool is not None and pool.caminho == DATABASE_PATH and not pool.fechado:
+        return pool
+
+    with _pool_lock:
+        if _pool is None or _pool.caminho != DATABASE_PATH or _pool.fechado:
+            if _pool is not None:
+                _pool.fechar()
+            registrar_adaptadores()
+            _pool = PoolConexoes(DATABASE_PATH)
+        return _pool
+
+
+def fechar_pool() -> None:
+    """Encerra o pool global (ex: no shutdown ou antes de restaurar backup)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.fechar()
+            _pool = None
+
+
+def obter_estatisticas_pool() -> dict:
+    """Retorna as métricas do pool global de conexões."""
+    return obter_pool().obter_estatisticas()
+
+
+# Resultado da última verificação (exposto em /health)
+_perfil_verificado: Optional[dict] = None
+
+# Leitura numérica devolvida pelo SQLite -> nome usado na configuração
+_SYNCHRONOUS_POR_CODIGO = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+_TEMP_STORE_POR_CODIGO = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+def verificar_perfil_armazenamento() -> dict:
+    """
+    Lê de volta os PRAGMAs de uma conexão do pool e compara com o perfil.
+
+    Deve ser chamado no startup. Divergências (ex: WAL indisponível em
+    sistemas de arquivos de rede, mmap limitado na compilação do SQLite)
+    são registradas como warning, sem impedir a inicialização.
+
+    Returns:
+        Dicionário com nome do perfil, valores ativos e divergências
+    """
+    global _perfil_verificado
+    perfil = obter_pool().perfil
+
+    with obter_conexao() as conn:
+        ativos = {
+            "journal_mode": str(conn.execute("PRAGMA journal_mode").fetchone()[0]).upper(),
+            "synchronous": _SYNCHRONOUS_POR_CODIGO.get(
+                conn.execute("PRAGMA synchronous").fetchone()[0], "?"
+            ),
+            "busy_timeout_ms": conn.execute("PRAGMA busy_timeout").fetchone()[0],
+            "cache_size": conn.execute("PRAGMA cache_size").fetchone()[0],
+            "mmap_size": conn.execute("PRAGMA mmap_size").fetchone()[0],
+            "temp_store": _TEMP_STORE_POR_CODIGO.get(
+                conn.execute("PRAGMA temp_store").fetchone()[0], "?"
+            ),
+        }
+
+    esperados = asdict(perfil)
+    divergencias = [
+        f"{pragma}: esperado {esperados[pragma]}, ativo {valor}"
+        for pragma, valor in ativos.items()
+        if esperados[pragma] != valor
+    ]
+    for divergencia in divergencias:
+        logger.warning(f"[PerfilArmazenamento] PRAGMA divergente - {divergencia}")
+
+    if not divergencias:
+        logger.info(
+            f"Perfil de armazenamento '{perfil.nome}' ativo "
+            f"(journal_mode={ativos['journal_mode']}, synchronous={ativos['synchronous']})"
+        )
+
+    _perfil_verificado = {
+        "perfil": perfil.nome,
+        "pragmas": ativos,
+        "divergencias": divergencias,
+    }
+    return _perfil_verificado
+
+
+def obter_perfil_ativo() -> dict:
+    """Retorna o perfil verificado no startup (verifica agora se ainda não foi)."""
+    if _perfil_verificado is None:
+        return verificar_perfil_armazenamento()
+    return _perfil_verificado
+
 
 @contextmanager
 def obter_conexao():
-    """Context manager para conexão com banco de dados"""
-    registrar_adaptadores()
-    conn = sqlite3.connect(
-        DATABASE_PATH,
-        detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-    )
-    conn.execute("PRAGMA foreign_keys = ON")
-    conn.row_factory = sqlite3.Row
+    """
+    Context manager para conexão com banco de dados.
+
+    A conexão vem do pool global: commit ao sair sem erro, rollback em caso
+    de exceção e devolução ao pool ao final (em vez de fechar).
+    """
+    pool = obter_pool()
+    conn = pool.obter()
+    descartar = False
     try:
         yield conn
         conn.commit()
     except Exception as e:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            descartar = True
         raise e
     finally:
-        conn.close()
+        pool.devolver(conn, descartar)
 
 
 def adaptar_datetime(dt: datetime) -> str:
@@ -219,6 +219,16 @@ CONFIGS_PARA_MIGRAR = {
         "Período em minutos para gestão de usuários",
         "Admin"
     ),
+    "rate_limit_admin_notificacoes_max": (
+        "RATE_LIMIT_ADMIN_NOTIFICACOES_MAX",
+        "Máximo de envios de notificações em lote",
+        "Admin"
+    ),
+    "rate_limit_admin_notificacoes_minutos": (
+        "RATE_LIMIT_ADMIN_NOTIFICACOES_MINUTOS",
+        "Período em minutos para envios de notificações em lote",
+        "Admin"
+    ),
     "rate_limit_admin_config_max": (
         "RATE_LIMIT_ADMIN_CONFIG_MAX",
         "Máximo de requisições à tela de configurações",
@@ -380,6 +390,40 @@ CONFIGS_PAGAMENTO_GARANTIDAS = {
 }
 
 
+CONFIGS_NOTIFICACOES_GARANTIDAS = {
+    "notificacao_retencao_dias_info": (
+        "NOTIFICACAO_RETENCAO_DIAS_INFO",
+        "30",
+        "Dias de retenção das notificações do tipo info (0 = manter sempre)",
+        "Notificações",
+    ),
+    "notificacao_retencao_dias_sucesso": (
+        "NOTIFICACAO_RETENCAO_DIAS_SUCESSO",
+        "30",
+        "Dias de retenção das notificações do tipo sucesso (0 = manter sempre)",
+        "Notificações",
+    ),
+    "notificacao_retencao_dias_aviso": (
+        "NOTIFICACAO_RETENCAO_DIAS_AVISO",
+        "90",
+        "Dias de retenção das notificações do tipo aviso (0 = manter sempre)",
+        "Notificações",
+    ),
+    "notificacao_retencao_dias_erro": (
+        "NOTIFICACAO_RETENCAO_DIAS_ERRO",
+        "180",
+        "Dias de retenção das notificações do tipo erro (0 = manter sempre)",
+        "Notificações",
+    ),
+    "notificacao_retencao_arquivar": (
+        "NOTIFICACAO_RETENCAO_ARQUIVAR",
+        "false",
+        "Arquivar (comprimidas) as notificações removidas pela retenção",
+        "Notificações",
+    ),
+}
+
+
 CONFIGS_TOAST_GARANTIDAS = {
     "toast_posicao": (
         "inferior_direito",
@@ -432,16 +476,20 @@ def garantir_configs_toast():
     logger.info(f"Configs de toast verificadas: {inseridas} novas inseridas")
 
 
-def garantir_configs_pagamento():
+def _garantir_configs_com_env(configs: dict, grupo: str) -> int:
     """
-    Garante que todas as chaves de pagamento existam no banco.
+    Insere as chaves de `configs` que ainda não existem no banco.
 
-    Diferente de migrar_configs_para_banco(), esta função insere a chave mesmo
-    quando o valor do .env está vazio, usando o valor padrão definido em
-    CONFIGS_PAGAMENTO_GARANTIDAS. Isso assegura que o formulário de configurações
-    de pagamento sempre seja renderizado na interface administrativa.
+    Cada item é chave -> (variável de ambiente, valor padrão, descrição,
+    categoria). Usa o valor do .env quando definido e não vazio, senão o
+    padrão; não sobrescreve valores já existentes.
 
-    Não sobrescreve valores já existentes no banco.
+    Args:
+        configs: Chaves garantidas (ex: CONFIGS_PAGAMENTO_GARANTIDAS)
+        grupo: Nome do grupo nos logs (ex: "pagamento")
+
+    Returns:
+        Quantidade de chaves inseridas
     """
     import os
     from dotenv import load_dotenv
@@ -449,7 +497,7 @@ def garantir_configs_pagamento():
     load_dotenv()
     inseridas = 0
 
-    for chave, (var_env, valor_padrao, descricao, categoria) in CONFIGS_PAGAMENTO_GARANTIDAS.items():
+    for chave, (var_env, valor_padrao, descricao, categoria) in configs.items():
         if configuracao_repo.obter_por_chave(chave):
             continue  # já existe, não sobrescrever
 
@@ -463,13 +511,39 @@ def garantir_configs_pagamento():
                 descricao=descricao_completa
             )
             inseridas += 1
-            logger.info(f"✓ Config de pagamento garantida: '{chave}' ({categoria})")
+            logger.info(f"✓ Config de {grupo} garantida: '{chave}' ({categoria})")
         except sqlite3.Error as e:
             logger.error(f"✗ Erro ao garantir config '{chave}': {e}")
 
     if inseridas:
         from util.config_cache import config
         config.limpar()
-        logger.debug("Cache limpo após garantia de configs de pagamento")
+        logger.debug(f"Cache limpo após garantia de configs de {grupo}")
+
+    logger.info(f"Configs de {grupo} verificadas: {inseridas} novas inseridas")
+    return inseridas
 
-    logger.info(f"Configs de pagamento verificadas: {inseridas} novas inseridas")
+
+def garantir_configs_pagamento():
+    """
+    Garante que todas as chaves de pagamento existam no banco.
+
+    Diferente de migrar_configs_para_banco(), esta função insere a chave mesmo
+    quando o valor do .env está vazio, usando o valor padrão definido em
+    CONFIGS_PAGAMENTO_GARANTIDAS. Isso assegura que o formulário de configurações
+    de pagamento sempre seja renderizado na interface administrativa.
+
+    Não sobrescreve valores já existentes no banco.
+    """
+    _garantir_configs_com_env(CONFIGS_PAGAMENTO_GARANTIDAS, "pagamento")
+
+
+def garantir_configs_notificacoes():
+    """
+    Garante que as chaves da política de retenção de notificações existam no banco.
+
+    Usa o valor do .env quando definido, senão o padrão de
+    CONFIGS_NOTIFICACOES_GARANTIDAS. Não sobrescreve valores já existentes,
+    para que o admin possa ajustar a retenção pela interface.
+    """
+    _garantir_configs_com_env(CONFIGS_NOTIFICACOES_GARANTIDAS, "notificações")
@@ -0,0 +1,237 @@
+"""
+Retenção de notificações in-app.
+
+A tabela `notificacao` só cresce: cada evento relevante gera uma linha por
+destinatário. Este módulo remove periodicamente as notificações mais
+antigas que a política de retenção do tipo delas:
+
+    notificacao_retencao_dias_info     (padrão 30)
+    notificacao_retencao_dias_sucesso  (padrão 30)
+    notificacao_retencao_dias_aviso    (padrão 90)
+    notificacao_retencao_dias_erro     (padrão 180)
+    notificacao_retencao_arquivar      (padrão false)
+
+As chaves ficam na tabela `configuracao` (editáveis pelo admin, garantidas
+por util.migrar_config.garantir_configs_notificacoes); 0 dias mantém o tipo
+para sempre. Com `notificacao_retencao_arquivar` ligado, cada lote removido
+é gravado comprimido em `notificacao_arquivo` na mesma transação.
+
+A exclusão é feita em lotes de NOTIFICACOES_RETENCAO_LOTE linhas, cada um
+numa transação curta no executor do banco, com uma pausa de
+NOTIFICACOES_RETENCAO_PAUSA_MS entre lotes: os demais escritores (que
+disputam o único lock de escrita do SQLite) nunca esperam mais que um lote.
+
+Uso:
+    # Agendada: main.py inicia o agendador no startup do app
+    await agendador_retencao.iniciar()
+
+    # Sob demanda (ex.: POST /api/admin/notificacoes/retencao/executar)
+    resultado = await executar_retencao()
+
+Cada worker roda o próprio agendador; execuções simultâneas em workers
+diferentes são seguras (a exclusão é idempotente), só redundantes.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from model.notificacao_model import TipoNotificacao
+from repo import notificacao_repo
+from util.config_cache import config
+from util.datetime_util import agora
+from util.db_async import executar_db
+from util.logger_config import logger
+
+# Intervalo entre execuções agendadas (0 desliga o agendador)
+NOTIFICACOES_RETENCAO_INTERVALO_HORAS = float(os.getenv("NOTIFICACOES_RETENCAO_INTERVALO_HORAS", "24"))
+# Notificações excluídas por transação
+NOTIFICACOES_RETENCAO_LOTE = int(os.getenv("NOTIFICACOES_RETENCAO_LOTE", "500"))
+# Pausa entre lotes, liberando o lock de escrita para as requisições
+NOTIFICACOES_RETENCAO_PAUSA_MS = int(os.getenv("NOTIFICACOES_RETENCAO_PAUSA_MS", "50"))
+# Atraso da primeira execução após o startup (não disputa o banco na subida)
+ATRASO_INICIAL_SEGUNDOS = 60
+
+# Dias de retenção por tipo quando a chave não existe no banco
+RETENCAO_PADRAO_DIAS: Dict[TipoNotificacao, int] = {
+    TipoNotificacao.INFO: 30,
+    TipoNotificacao.SUCESSO: 30,
+    TipoNotificacao.AVISO: 90,
+    TipoNotificacao.ERRO: 180,
+}
+
+CHAVE_ARQUIVAR = "notificacao_retencao_arquivar"
+
+
+def chave_retencao(tipo: TipoNotificacao) -> str:
+    """Chave da tabela configuracao com os dias de retenção do tipo."""
+    return f"notificacao_retencao_dias_{tipo.value}"
+
+
+def obter_politica() -> Dict[TipoNotificacao, int]:
+    """Retorna os dias de retenção de cada tipo (0 = manter para sempre)."""
+    return {
+        tipo: max(config.obter_int(chave_retencao(tipo), padrao), 0)
+        for tipo, padrao in RETENCAO_PADRAO_DIAS.items()
+    }
+
+
+def arquivamento_ativo() -> bool:
+    """Indica se as notificações removidas devem ser arquivadas."""
+    return config.obter_bool(CHAVE_ARQUIVAR, False)
+
+
+# Métricas acumuladas desde o início do worker (protegidas por _metricas_lock)
+_metricas_lock = threading.Lock()
+_execucoes = 0
+_removidas_total = 0
+_arquivadas_total = 0
+_removidas_por_tipo: Dict[str, int] = {tipo.value: 0 for tipo in TipoNotificacao}
+_ultima_execucao: Optional[dict] = None
+_em_execucao = False
+
+
+async def executar_retencao(
+    politica: Optional[Dict[TipoNotificacao, int]] = None,
+    arquivar: Optional[bool] = None,
+    lote: Optional[int] = None,
+    pausa_ms: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    Remove as notificações que excederam a retenção do seu tipo.
+
+    Args:
+        politica: Dias de retenção por tipo (padrão: obter_politica())
+        arquivar: Arquiva as removidas (padrão: arquivamento_ativo())
+        lote: Notificações por transação (padrão: NOTIFICACOES_RETENCAO_LOTE)
+        pausa_ms: Pausa entre lotes (padrão: NOTIFICACOES_RETENCAO_PAUSA_MS)
+
+    Returns:
+        Resumo da execução (removidas, arquivadas, lotes, removidas_por_tipo,
+        duracao_segundos, executada_em) ou None se já havia uma execução em
+        andamento neste worker
+    """
+    global _em_execucao, _execucoes, _removidas_total, _arquivadas_total, _ultima_execucao
+
+    if _em_execucao:
+        return None
+    _em_execucao = True
+    try:
+        politica = obter_politica() if politica is None else politica
+        arquivar = arquivamento_ativo() if arquivar is None else arquivar
+        lote = lote or NOTIFICACOES_RETENCAO_LOTE
+        pausa = (NOTIFICACOES_RETENCAO_PAUSA_MS if pausa_ms is None else pausa_ms) / 1000
+
+        inicio = time.perf_counter()
+        removidas_por_tipo: Dict[str, int] = {}
+        lotes = 0
+        for tipo, dias in politica.items():
+            if dias <= 0:
+                continue
+            removidas = 0
+            while True:
+                quantidade = await executar_db(
+                    notificacao_repo.excluir_antigas, tipo, dias, lote, arquivar
+                )
+                lotes += 1
+                removidas += quantidade
+                if quantidade < lote:
+                    break
+                await asyncio.sleep(pausa)
+            removidas_por_tipo[tipo.value] = removidas
+
+        total = sum(removidas_por_tipo.values())
+        resultado = {
+            "removidas": total,
+            "arquivadas": total if arquivar else 0,
+            "lotes": lotes,
+            "removidas_por_tipo": removidas_por_tipo,
+            "duracao_segundos": round(time.perf_counter() - inicio, 3),
+            "executada_em": agora(),
+        }
+
+        with _metricas_lock:
+            _execucoes += 1
+            _removidas_total += total
+            _arquivadas_total += resultado["arquivadas"]
+            for tipo_valor, quantidade in removidas_por_tipo.items():
+                _removidas_por_tipo[tipo_valor] += quantidade
+            _ultima_execucao = resultado
+
+        if total:
+            logger.info(
+                f"Retenção de notificações: {total} removida(s) em {lotes} lote(s) "
+                f"({resultado['duracao_segundos']}s){' e arquivada(s)' if arquivar else ''}"
+            )
+        return resultado
+    finally:
+        _em_execucao = False
+
+
+def obter_estatisticas() -> dict:
+    """Retorna a política vigente e as métricas acumuladas da retenção."""
+    with _metricas_lock:
+        return {
+            "politica": {tipo.value: dias for tipo, dias in obter_politica().items()},
+            "arquivar": arquivamento_ativo(),
+            "intervalo_horas": NOTIFICACOES_RETENCAO_INTERVALO_HORAS,
+            "agendada": agendador_retencao.ativo,
+            "em_execucao": _em_execucao,
+            "execucoes": _execucoes,
+            "removidas_total": _removidas_total,
+            "arquivadas_total": _arquivadas_total,
+            "removidas_por_tipo": dict(_removidas_por_tipo),
+            "ultima_execucao": _ultima_execucao,
+        }
+
+
+class AgendadorRetencao:
+    """Tarefa de fundo que executa a retenção a cada `intervalo_horas`."""
+
+    def __init__(
+        self,
+        intervalo_horas: float = NOTIFICACOES_RETENCAO_INTERVALO_HORAS,
+        atraso_inicial: float = ATRASO_INICIAL_SEGUNDOS,
+    ):
+        self.intervalo_segundos = intervalo_horas * 3600
+        self.atraso_inicial = atraso_inicial
+        self._tarefa: Optional[asyncio.Task] = None
+
+    @property
+    def ativo(self) -> bool:
+        return self._tarefa is not None
+
+    async def iniciar(self):
+        if self._tarefa is not None or self.intervalo_segundos <= 0:
+            return
+        self._tarefa = asyncio.create_task(self._executar_periodicamente())
+        logger.info(
+            f"Retenção de notificações agendada a cada "
+            f"{self.intervalo_segundos / 3600:g} h"
+        )
+
+    async def encerrar(self):
+        if self._tarefa is None:
+            return
+        self._tarefa.cancel()
+        try:
+            await self._tarefa
+        except asyncio.CancelledError:
+            pass
+        self._tarefa = None
+
+    async def _executar_periodicamente(self):
+        await asyncio.sleep(self.atraso_inicial)
+        while True:
+            try:
+                await executar_retencao()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro na retenção de notificações: {e}", exc_info=True)
+            await asyncio.sleep(self.intervalo_segundos)
+
+
+agendador_retencao = AgendadorRetencao()
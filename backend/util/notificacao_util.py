@@ -32,14 +32,44 @@ Uso básico:
         tipo=TipoNotificacao.AVISO,
         url_acao="/usuario/perfil/editar",
     )
+
+Para notificar muitos usuários de uma vez (lista de IDs ou um perfil
+inteiro), use criar_notificacoes_em_lote: um INSERT ... SELECT por lote de
+NOTIFICACOES_TAMANHO_LOTE usuários, em vez de uma conexão e um commit por
+notificação. Envios grandes disparados pelo admin rodam em segundo plano
+com progresso consultável (iniciar_envio_lote / obter_envio_lote).
+
+Cada notificação criada é enviada na hora ao usuário pelo stream SSE
+(GET /api/chat/stream, evento "notificacao") junto com o total de não lidas;
+o badge do navbar não depende mais do polling de /api/notificacoes/nao-lidas.
 """
 
-from typing import Optional
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
 
+from dtos.responses.notificacao_response import (
+    EventoNotificacaoLoteSSE,
+    EventoNotificacaoSSE,
+    NotificacaoResumoResponse,
+)
 from model.notificacao_model import TipoNotificacao
-from repo import notificacao_repo
+from repo import notificacao_repo, usuario_repo
+from util.chat_manager import gerenciador_chat
+from util.datetime_util import agora
+from util.db_async import executar_db
 from util.logger_config import logger
 
+# Usuários notificados por transação em criar_notificacoes_em_lote
+NOTIFICACOES_TAMANHO_LOTE = int(os.getenv("NOTIFICACOES_TAMANHO_LOTE", "1000"))
+# Envios em lote mantidos em memória para consulta de progresso
+NOTIFICACOES_ENVIOS_MANTIDOS = 50
+
 
 def criar_notificacao(
     usuario_id: int,
@@ -94,12 +124,273 @@ def criar_notificacao(
 
     if notificacao_id:
         logger.debug(f"Notificação criada (ID={notificacao_id}) para usuário {usuario_id}: {titulo}")
+        publicar_nao_lidas(
+            usuario_id,
+            NotificacaoResumoResponse(
+                id=notificacao_id,
+                titulo=titulo,
+                mensagem=mensagem,
+                tipo=tipo.value,
+                url_acao=url_acao,
+                # Com fuso (APP_TIMEZONE), como o conversor de TIMESTAMP entrega
+                # a data_criacao nas rotas REST
+                data_criacao=agora().replace(microsecond=0),
+            ),
+        )
     else:
         logger.warning(f"Falha ao criar notificação para usuário {usuario_id}: {titulo}")
 
     return notificacao_id
 
 
+def publicar_nao_lidas(usuario_id: int, notificacao: Optional[NotificacaoResumoResponse] = None) -> bool:
+    """
+    Envia ao usuário, pelo stream SSE, o total atualizado de não lidas.
+
+    Chamada por criar_notificacao e pelas rotas que marcam ou excluem
+    notificações. Se o usuário não tem como receber o evento (sem conexão
+    neste worker e sem backend de broadcast compartilhado), nem a contagem é
+    consultada.
+
+    Args:
+        usuario_id: ID do usuário destinatário
+        notificacao: Resumo da notificação recém-criada, se houver
+
+    Returns:
+        True se o evento foi agendado para envio
+    """
+    if not gerenciador_chat.alcanca_usuario(usuario_id):
+        return False
+
+    evento = EventoNotificacaoSSE(
+        nao_lidas=notificacao_repo.contar_nao_lidas(usuario_id),
+        notificacao=notificacao,
+    )
+    return gerenciador_chat.enviar_threadsafe([usuario_id], evento.model_dump(mode="json"))
+
+
+def criar_notificacoes_em_lote(
+    titulo: str,
+    mensagem: str,
+    tipo: TipoNotificacao = TipoNotificacao.INFO,
+    url_acao: Optional[str] = None,
+    usuario_ids: Optional[List[int]] = None,
+    perfil: Optional[str] = None,
+    tamanho_lote: int = NOTIFICACOES_TAMANHO_LOTE,
+    ao_progredir: Optional[Callable[[int], None]] = None,
+    interromper: Optional[threading.Event] = None,
+) -> int:
+    """
+    Cria a mesma notificação para muitos usuários, em lotes.
+
+    Cada lote é uma única transação (INSERT ... SELECT a partir de usuario);
+    IDs de usuários inexistentes são ignorados. Os destinatários conectados
+    recebem um evento "notificacao_lote" por lote no stream SSE.
+
+    Args:
+        titulo, mensagem, tipo, url_acao: Conteúdo da notificação
+        usuario_ids: IDs dos destinatários (informe este OU perfil)
+        perfil: Perfil cujos usuários serão todos notificados
+        tamanho_lote: Usuários notificados por transação
+        ao_progredir: Chamada após cada lote com o total criado até então
+        interromper: Se sinalizado, o envio para antes do próximo lote (os
+            lotes já gravados ficam)
+
+    Returns:
+        Quantidade de notificações criadas
+
+    Raises:
+        ValueError: Se nenhum ou ambos entre usuario_ids e perfil forem informados
+
+    Exemplo:
+        criar_notificacoes_em_lote(
+            titulo="Manutenção programada",
+            mensagem="O sistema ficará indisponível no domingo às 2h.",
+            tipo=TipoNotificacao.AVISO,
+            perfil=Perfil.CLIENTE.value,
+        )
+    """
+    if (usuario_ids is None) == (perfil is None):
+        raise ValueError("Informe usuario_ids ou perfil (apenas um dos dois)")
+
+    criadas = 0
+
+    def concluir_lote(notificados: List[int]):
+        nonlocal criadas
+        criadas += len(notificados)
+        _publicar_lote(notificados)
+        if ao_progredir:
+            ao_progredir(criadas)
+
+    def interrompido() -> bool:
+        return interromper is not None and interromper.is_set()
+
+    if perfil is not None:
+        ultimo_id = 0
+        while not interrompido():
+            notificados = notificacao_repo.inserir_para_perfil(
+                perfil, titulo, mensagem, tipo, url_acao, ultimo_id, tamanho_lote
+            )
+            concluir_lote(notificados)
+            if len(notificados) < tamanho_lote:
+                break
+            ultimo_id = max(notificados)
+    else:
+        unicos = list(dict.fromkeys(usuario_ids))
+        for inicio in range(0, len(unicos), tamanho_lote):
+            if interrompido():
+                break
+            concluir_lote(notificacao_repo.inserir_para_usuarios(
+                unicos[inicio:inicio + tamanho_lote], titulo, mensagem, tipo, url_acao
+            ))
+
+    destino = f"perfil {perfil}" if perfil is not None else f"{len(usuario_ids)} usuário(s)"
+    logger.info(f"Notificação em lote criada para {criadas} usuário(s) ({destino}): {titulo}")
+    return criadas
+
+
+def _publicar_lote(usuario_ids: List[int]) -> bool:
+    """Envia um único evento "notificacao_lote" aos destinatários alcançáveis."""
+    alvos = [u for u in usuario_ids if gerenciador_chat.alcanca_usuario(u)]
+    if not alvos:
+        return False
+    return gerenciador_chat.enviar_threadsafe(alvos, EventoNotificacaoLoteSSE().model_dump(mode="json"))
+
+
+@dataclass
+class EnvioLote:
+    """
+    Estado de um envio de notificações em lote disparado em segundo plano.
+
+    Mantido em memória no worker que recebeu a requisição (os últimos
+    NOTIFICACOES_ENVIOS_MANTIDOS envios).
+
+    Attributes:
+        id: Identificador do envio
+        total: Destinatários previstos (IDs informados ou usuários do perfil)
+        criadas: Notificações criadas até o momento
+        status: "em_andamento", "concluido", "interrompido" (encerramento
+            da aplicação) ou "erro"
+        erro: Mensagem de erro, se houver
+    """
+
+    id: str
+    total: int
+    criadas: int = 0
+    status: str = "em_andamento"
+    erro: Optional[str] = None
+    iniciado_em: datetime = field(default_factory=agora)
+    concluido_em: Optional[datetime] = None
+
+    @property
+    def em_andamento(self) -> bool:
+        return self.status == "em_andamento"
+
+    @property
+    def percentual(self) -> float:
+        if self.status == "concluido" or self.total <= 0:
+            return 100.0
+        return round(min(self.criadas / self.total, 1.0) * 100, 1)
+
+
+_envios_lote: "OrderedDict[str, EnvioLote]" = OrderedDict()
+# Referências às tarefas em andamento (o event loop guarda só referências fracas)
+_tarefas_envio: Dict[str, asyncio.Task] = {}
+# Sinalizado no encerramento: os envios param entre lotes
+_encerrando = threading.Event()
+
+
+def _descartar_envios_antigos() -> None:
+    """Mantém os últimos NOTIFICACOES_ENVIOS_MANTIDOS envios, sem descartar os em andamento."""
+    excedentes = len(_envios_lote) - NOTIFICACOES_ENVIOS_MANTIDOS
+    if excedentes <= 0:
+        return
+    concluidos = [envio_id for envio_id, envio in _envios_lote.items() if not envio.em_andamento]
+    for envio_id in concluidos[:excedentes]:
+        del _envios_lote[envio_id]
+
+
+async def iniciar_envio_lote(
+    titulo: str,
+    mensagem: str,
+    tipo: TipoNotificacao = TipoNotificacao.INFO,
+    url_acao: Optional[str] = None,
+    usuario_ids: Optional[List[int]] = None,
+    perfil: Optional[str] = None,
+) -> EnvioLote:
+    """
+    Dispara criar_notificacoes_em_lote em segundo plano.
+
+    Returns:
+        EnvioLote cujo progresso pode ser consultado com obter_envio_lote
+
+    Raises:
+        ValueError: Se nenhum ou ambos entre usuario_ids e perfil forem informados
+    """
+    if (usuario_ids is None) == (perfil is None):
+        raise ValueError("Informe usuario_ids ou perfil (apenas um dos dois)")
+
+    if perfil is not None:
+        total = await executar_db(usuario_repo.obter_quantidade_por_perfil, perfil)
+    else:
+        total = len(set(usuario_ids))
+
+    envio = EnvioLote(id=uuid.uuid4().hex, total=total)
+    _envios_lote[envio.id] = envio
+    _descartar_envios_antigos()
+
+    def progredir(criadas: int):
+        envio.criadas = criadas
+
+    async def executar():
+        try:
+            envio.criadas = await executar_db(
+                criar_notificacoes_em_lote,
+                titulo, mensagem, tipo, url_acao, usuario_ids, perfil,
+                ao_progredir=progredir,
+                interromper=_encerrando,
+            )
+            if _encerrando.is_set():
+                logger.warning(
+                    f"Envio de notificações em lote {envio.id} interrompido pelo "
+                    f"encerramento ({envio.criadas}/{envio.total})"
+                )
+                envio.status = "interrompido"
+            else:
+                envio.status = "concluido"
+        except Exception as e:
+            logger.error(f"Erro no envio de notificações em lote {envio.id}: {e}", exc_info=True)
+            envio.status = "erro"
+            envio.erro = str(e)
+        finally:
+            envio.concluido_em = agora()
+            _tarefas_envio.pop(envio.id, None)
+
+    _tarefas_envio[envio.id] = asyncio.create_task(executar())
+    return envio
+
+
+def obter_envio_lote(envio_id: str) -> Optional[EnvioLote]:
+    """Retorna o estado de um envio em lote, ou None se desconhecido/expirado."""
+    return _envios_lote.get(envio_id)
+
+
+async def encerrar_envios_lote() -> None:
+    """
+    Interrompe os envios em lote em andamento e aguarda suas tarefas.
+
+    Cada envio termina o lote (transação) atual e para antes do próximo;
+    chamado no shutdown antes de encerrar o executor e fechar o pool.
+    """
+    if not _tarefas_envio:
+        return
+    _encerrando.set()
+    try:
+        await asyncio.gather(*list(_tarefas_envio.values()), return_exceptions=True)
+    finally:
+        _encerrando.clear()
+
+
 def criar_notificacao_sucesso(usuario_id: int, titulo: str, mensagem: str, url_acao: Optional[str] = None) -> Optional[int]:
     """Atalho para criar notificação de sucesso."""
     return criar_notificacao(usuario_id, titulo, mensagem, TipoNotificacao.SUCESSO, url_acao)
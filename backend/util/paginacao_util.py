@@ -27,6 +27,8 @@ Uso com SQL (eficiente para grandes volumes):
     )
 """
 
+import base64
+import re
 from dataclasses import dataclass, field
 from typing import Any, Callable, Optional
 from util.db_util import obter_conexao
@@ -238,6 +240,37 @@ def obter_paginado(
         return Paginacao(items=[], total=0, pagina_atual=1, por_pagina=por_pagina)
 
 
+def expressao_busca_prefixo(termo: str, so_ultima: bool = False) -> Optional[str]:
+    """
+    Converte o termo digitado numa consulta FTS5 de prefixos.
+
+    Cada palavra vira um prefixo entre aspas ("jo"* "sil"*), exigido em
+    conjunto (AND), em qualquer coluna do índice. As aspas impedem que
+    caracteres do termo sejam lidos como sintaxe do FTS5; pontuação separa
+    palavras, como no tokenizador unicode61.
+
+    Args:
+        termo: Texto digitado
+        so_ultima: Só a última palavra como prefixo; as anteriores, já
+            completas, buscam a palavra exata. Em índices grandes, o prefixo
+            de uma palavra comum junta as listas de todas as palavras que
+            começam por ele, o que a palavra exata evita.
+
+    Returns:
+        Expressão para ``MATCH ?``, ou None se o termo não tiver palavras
+
+    Exemplo:
+        expressao_busca_prefixo("João Sil")  # -> '"João"* "Sil"*'
+        expressao_busca_prefixo("João Sil", so_ultima=True)  # -> '"João" "Sil"*'
+    """
+    palavras = re.findall(r"[^\W_]+", termo)
+    if not palavras:
+        return None
+    if so_ultima:
+        return " ".join([*(f'"{palavra}"' for palavra in palavras[:-1]), f'"{palavras[-1]}"*'])
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+
 def obter_pagina_request(pagina_param: Any, por_pagina: int = ITENS_POR_PAGINA_PADRAO) -> tuple[int, int]:
     """
     Extrai e valida os parâmetros de paginação de uma requisição HTTP.
@@ -262,3 +295,60 @@ def obter_pagina_request(pagina_param: Any, por_pagina: int = ITENS_POR_PAGINA_P
         pagina = 1
 
     return pagina, max(1, por_pagina)
+
+
+# =============================================================================
+# Paginação por cursor (keyset)
+# =============================================================================
+
+# Direções aceitas no cursor: "antes" (mais antigos) e "depois" (mais novos)
+DIRECOES_CURSOR = ("antes", "depois")
+
+# Maior INTEGER do SQLite: acima dele o sqlite3 lança OverflowError ao
+# passar o parâmetro
+ID_MAXIMO = 2**63 - 1
+
+
+def codificar_cursor(direcao: str, referencia_id: int) -> str:
+    """
+    Gera um cursor opaco para paginação keyset.
+
+    O cliente não deve interpretar o valor: apenas devolvê-lo no parâmetro
+    ``cursor`` para obter a próxima janela na mesma direção.
+
+    Args:
+        direcao: "antes" (itens com ID menor) ou "depois" (itens com ID maior)
+        referencia_id: ID de referência (exclusivo) da próxima janela
+
+    Returns:
+        Cursor codificado em base64 (URL-safe, sem padding)
+    """
+    if direcao not in DIRECOES_CURSOR:
+        raise ValueError(f"Direção de cursor inválida: {direcao}")
+    bruto = f"{direcao}:{referencia_id}".encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> tuple[str, int]:
+    """
+    Decodifica um cursor gerado por codificar_cursor.
+
+    Args:
+        cursor: Cursor opaco recebido do cliente
+
+    Returns:
+        Tupla (direcao, referencia_id)
+
+    Raises:
+        ValueError: Se o cursor for malformado
+    """
+    try:
+        preenchido = cursor + "=" * (-len(cursor) % 4)
+        direcao, referencia = base64.urlsafe_b64decode(preenchido).decode().split(":")
+        referencia_id = int(referencia)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido.") from e
+
+    if direcao not in DIRECOES_CURSOR or not 0 <= referencia_id <= ID_MAXIMO:
+        raise ValueError("Cursor inválido.")
+    return direcao, referencia_id
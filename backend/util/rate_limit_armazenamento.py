@@ -0,0 +1,274 @@
+"""
+Armazenamentos do estado dos rate limiters.
+
+Por padrão cada RateLimiter guarda o estado na memória do processo. Com mais
+de um worker do uvicorn, cada processo tem o próprio dicionário e um
+atacante ganha N vezes o limite configurado (login, cadastro,
+esqueci_senha...). Um armazenamento compartilhado resolve isso: o limiter
+passa a consultar e atualizar o estado nele.
+
+Armazenamentos disponíveis (variável RATE_LIMIT_BACKEND):
+
+  - memoria: estado no próprio processo (padrão; um único worker)
+  - sqlite:  tabela rate_limit num arquivo SQLite próprio
+             (RATE_LIMIT_SQLITE_PATH, padrão rate_limit.db ao lado do banco),
+             compartilhado pelos workers do mesmo host
+
+O armazenamento sqlite guarda o estado do GCRA (um float por identificador)
+e decide cada tentativa com um único UPSERT atômico, sem transação
+explícita nem leitura prévia. Os instantes vêm de time.monotonic(), que é
+comum a todos os processos do host. O arquivo é separado do banco da
+aplicação para que as escritas dos limiters não disputem o lock de escrita
+com as requisições. Como o estado é descartável, ele usa synchronous=OFF.
+
+Se o armazenamento falhar (arquivo travado além do busy_timeout, disco
+cheio...), o erro é registrado e a tentativa é permitida ou negada conforme
+o limiter (RateLimiter.bloquear_em_falha): por padrão permitida, para que o
+rate limiting não derrube a aplicação (RATE_LIMIT_BLOQUEAR_EM_FALHA), e
+negada nos limiters de autenticação (RATE_LIMIT_AUTH_BLOQUEAR_EM_FALHA),
+que não podem ficar desligados justamente sob contenção. Limpezas e contagens que falham também só
+registram o erro (nada removido, total 0).
+
+Cada verificação é uma escrita síncrona que pode esperar até
+RATE_LIMIT_SQLITE_TIMEOUT_MS pelo lock; por isso util/api_helpers.py
+(checar_rate_limit) a executa no executor do banco, fora do event loop.
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional
+
+from sql.rate_limit_sql import (
+    CRIAR_TABELA,
+    CONSUMIR,
+    OBTER_TAT,
+    EXCLUIR,
+    EXCLUIR_POR_LIMITER,
+    EXCLUIR_EXPIRADOS,
+    CONTAR_POR_LIMITER,
+)
+from util import db_util
+from util.logger_config import logger
+
+# Armazenamento usado pelos limiters: "memoria" ou "sqlite"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memoria")
+# Arquivo do armazenamento sqlite (vazio: rate_limit.db na pasta do banco)
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "")
+# Espera máxima pelo lock de escrita do arquivo antes de tratar a falha
+RATE_LIMIT_SQLITE_TIMEOUT_MS = int(os.getenv("RATE_LIMIT_SQLITE_TIMEOUT_MS", "200"))
+# Política quando o armazenamento falha: negar a tentativa (fail-closed) ou
+# permiti-la (fail-open). Os limiters de autenticação (login, cadastro,
+# esqueci_senha) usam a sua própria, por padrão negar.
+RATE_LIMIT_BLOQUEAR_EM_FALHA = os.getenv("RATE_LIMIT_BLOQUEAR_EM_FALHA", "false").lower() == "true"
+RATE_LIMIT_AUTH_BLOQUEAR_EM_FALHA = os.getenv("RATE_LIMIT_AUTH_BLOQUEAR_EM_FALHA", "true").lower() == "true"
+
+# Mesma tolerância do GCRA em memória (util/rate_limiter.py)
+_EPSILON = 1e-9
+
+
+class ArmazenamentoRateLimit:
+    """
+    Interface dos armazenamentos compartilhados de rate limit.
+
+    Guardam o estado do GCRA: o TAT (instante monotônico em que o
+    identificador volta a ter a rajada cheia) por (limiter, identificador).
+    """
+
+    nome = "base"
+
+    def consumir(
+        self,
+        limiter: str,
+        identificador: str,
+        intervalo: float,
+        janela: float,
+        agora: float,
+        permitir_em_falha: bool = True,
+    ) -> bool:
+        """
+        Registra uma tentativa se couber na janela; retorna se foi permitida.
+
+        Se o armazenamento falhar, retorna `permitir_em_falha`.
+        """
+        raise NotImplementedError
+
+    def obter_tat(self, limiter: str, identificador: str) -> Optional[float]:
+        """Retorna o TAT gravado, ou None se o identificador não tem estado."""
+        raise NotImplementedError
+
+    def remover(self, limiter: str, identificador: Optional[str] = None) -> None:
+        """Remove o estado de um identificador (ou de todo o limiter)."""
+        raise NotImplementedError
+
+    def remover_expirados(self, limiter: str, janela: float, agora: float) -> int:
+        """Remove os identificadores expirados do limiter; retorna quantos."""
+        raise NotImplementedError
+
+    def contar(self, limiter: str) -> int:
+        """Retorna quantos identificadores o limiter tem no armazenamento."""
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        """Libera os recursos do armazenamento."""
+
+    def obter_estatisticas(self) -> dict:
+        return {"armazenamento": self.nome}
+
+
+class ArmazenamentoSQLite(ArmazenamentoRateLimit):
+    """Estado dos limiters numa tabela SQLite compartilhada pelos workers do host."""
+
+    nome = "sqlite"
+
+    def __init__(self, caminho: Optional[str] = None):
+        self.caminho = (
+            caminho
+            or RATE_LIMIT_SQLITE_PATH
+            or str(Path(db_util.DATABASE_PATH).with_name("rate_limit.db"))
+        )
+        perfil = replace(
+            db_util.PERFIL_ARMAZENAMENTO,
+            nome="rate_limit",
+            journal_mode="WAL",
+            synchronous="OFF",
+            busy_timeout_ms=RATE_LIMIT_SQLITE_TIMEOUT_MS,
+        )
+        self._pool = db_util.PoolConexoes(self.caminho, perfil=perfil)
+        self._total_erros = 0
+        with self._conexao() as conn:
+            conn.execute(CRIAR_TABELA)
+        logger.info(f"[RateLimit] Armazenamento sqlite em {self.caminho}")
+
+    @contextmanager
+    def _conexao(self):
+        """Conexão do pool próprio: commit ao sair, rollback em erro."""
+        conn = self._pool.obter()
+        descartar = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                descartar = True
+            raise
+        finally:
+            self._pool.devolver(conn, descartar)
+
+    def _registrar_erro(self, operacao: str, erro: Exception) -> None:
+        self._total_erros += 1
+        logger.error(f"[RateLimit] Erro no armazenamento sqlite ({operacao}): {erro}")
+
+    def consumir(
+        self,
+        limiter: str,
+        identificador: str,
+        intervalo: float,
+        janela: float,
+        agora: float,
+        permitir_em_falha: bool = True,
+    ) -> bool:
+        try:
+            with self._conexao() as conn:
+                linha = conn.execute(CONSUMIR, {
+                    "limiter": limiter,
+                    "identificador": identificador,
+                    "intervalo": intervalo,
+                    "janela": janela,
+                    "agora": agora,
+                    "tolerancia": _EPSILON,
+                }).fetchone()
+                return linha is not None
+        except sqlite3.Error as e:
+            self._registrar_erro("consumir", e)
+            return permitir_em_falha
+
+    def obter_tat(self, limiter: str, identificador: str) -> Optional[float]:
+        try:
+            with self._conexao() as conn:
+                linha = conn.execute(OBTER_TAT, (limiter, identificador)).fetchone()
+                return linha["tat"] if linha else None
+        except sqlite3.Error as e:
+            self._registrar_erro("obter_tat", e)
+            return None
+
+    def remover(self, limiter: str, identificador: Optional[str] = None) -> None:
+        try:
+            with self._conexao() as conn:
+                if identificador is None:
+                    conn.execute(EXCLUIR_POR_LIMITER, (limiter,))
+                else:
+                    conn.execute(EXCLUIR, (limiter, identificador))
+        except sqlite3.Error as e:
+            self._registrar_erro("remover", e)
+
+    def remover_expirados(self, limiter: str, janela: float, agora: float) -> int:
+        try:
+            with self._conexao() as conn:
+                return conn.execute(EXCLUIR_EXPIRADOS, (limiter, agora, agora + janela)).rowcount
+        except sqlite3.Error as e:
+            self._registrar_erro("remover_expirados", e)
+            return 0
+
+    def contar(self, limiter: str) -> int:
+        try:
+            with self._conexao() as conn:
+                return conn.execute(CONTAR_POR_LIMITER, (limiter,)).fetchone()[0]
+        except sqlite3.Error as e:
+            self._registrar_erro("contar", e)
+            return 0
+
+    def fechar(self) -> None:
+        self._pool.fechar()
+
+    def obter_estatisticas(self) -> dict:
+        return {
+            "armazenamento": self.nome,
+            "caminho": self.caminho,
+            "total_erros": self._total_erros,
+            "pool": self._pool.obter_estatisticas(),
+        }
+
+
+# None = estado na memória de cada limiter (sem armazenamento compartilhado)
+BACKENDS = {
+    "memoria": None,
+    ArmazenamentoSQLite.nome: ArmazenamentoSQLite,
+}
+
+
+def criar_armazenamento(nome: str = RATE_LIMIT_BACKEND) -> Optional[ArmazenamentoRateLimit]:
+    """
+    Cria o armazenamento de rate limit pelo nome.
+
+    Returns:
+        Instância do armazenamento, ou None para "memoria"
+
+    Raises:
+        ValueError: Se o nome não corresponder a um armazenamento conhecido
+    """
+    chave = nome.strip().lower()
+    if chave not in BACKENDS:
+        raise ValueError(
+            f"RATE_LIMIT_BACKEND inválido: {nome!r} "
+            f"(opções: {', '.join(BACKENDS)})"
+        )
+    classe = BACKENDS[chave]
+    return classe() if classe else None
+
+
+_armazenamento_padrao: Optional[ArmazenamentoRateLimit] = None
+_armazenamento_padrao_criado = False
+
+
+def obter_armazenamento_padrao() -> Optional[ArmazenamentoRateLimit]:
+    """Armazenamento de RATE_LIMIT_BACKEND, criado uma vez por processo."""
+    global _armazenamento_padrao, _armazenamento_padrao_criado
+    if not _armazenamento_padrao_criado:
+        _armazenamento_padrao = criar_armazenamento()
+        _armazenamento_padrao_criado = True
+    return _armazenamento_padrao
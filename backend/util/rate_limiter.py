@@ -7,27 +7,78 @@ rotas contra abuso, brute force e DDoS.
 Oferece duas classes:
     - RateLimiter: Rate limiter estático (valores fixos na inicialização)
     - DynamicRateLimiter: Rate limiter dinâmico (lê valores do config_cache)
+
+E dois algoritmos (parâmetro `algoritmo`, padrão RATE_LIMIT_ALGORITMO):
+    - "gcra" (Generic Cell Rate Algorithm): guarda um único float por
+      identificador (o "theoretical arrival time"), O(1) em tempo e memória.
+      Permite rajadas de até max_tentativas e depois libera uma tentativa a
+      cada janela / max_tentativas.
+    - "janela_deslizante": guarda o instante de cada tentativa e garante no
+      máximo max_tentativas em qualquer janela. O(max_tentativas) de memória
+      por identificador.
+
+Os dois usam time.monotonic(): ajustes no relógio do sistema não liberam
+nem bloqueiam identificadores.
+
+O estado é limitado: cada limiter guarda no máximo max_identificadores
+(RATE_LIMIT_MAX_IDENTIFICADORES) em ordem LRU, descartando o menos recente
+quando enche, e a varredura periódica do registry
+(registro_limiters.iniciar_varredura) remove os identificadores cujo estado
+já expirou. Sob uma varredura de IPs ou DDoS a memória não cresce sem limite.
+
+Com mais de um worker, o estado do GCRA pode ficar num armazenamento
+compartilhado entre os processos (RATE_LIMIT_BACKEND=sqlite, ver
+util/rate_limit_armazenamento.py); assim o limite vale para o host inteiro,
+não para cada worker.
 """
 
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Union
 from util.logger_config import logger
+from util.config import (
+    RATE_LIMIT_ALGORITMO,
+    RATE_LIMIT_MAX_IDENTIFICADORES,
+    RATE_LIMIT_VARREDURA_SEGUNDOS,
+)
 from util.config_cache import config
-from util.datetime_util import agora as obter_agora
+from util.db_async import executar_db
+from util.rate_limit_armazenamento import (
+    RATE_LIMIT_BLOQUEAR_EM_FALHA,
+    ArmazenamentoRateLimit,
+    obter_armazenamento_padrao,
+)
+
+ALGORITMO_GCRA = "gcra"
+ALGORITMO_JANELA_DESLIZANTE = "janela_deslizante"
+ALGORITMOS = (ALGORITMO_GCRA, ALGORITMO_JANELA_DESLIZANTE)
+
+# Tolerância nas comparações do GCRA (janela / max_tentativas nem sempre é
+# exato em ponto flutuante; sem ela a última tentativa da rajada seria negada)
+_EPSILON = 1e-9
 
 
 class RateLimiter:
     """
-    Rate limiter baseado em janela deslizante (sliding window).
+    Rate limiter por identificador (geralmente IP).
 
-    Mantém registro de tentativas por identificador (geralmente IP)
-    e bloqueia se exceder limite em janela de tempo.
+    Bloqueia o identificador que exceder max_tentativas em janela de tempo,
+    usando GCRA ou janela deslizante (ver docstring do módulo).
 
     Attributes:
         max_tentativas: Número máximo de tentativas permitidas
         janela: Timedelta representando janela de tempo
-        tentativas: Dict de identificador -> lista de timestamps
+        algoritmo: "gcra" ou "janela_deslizante"
+        tentativas: Dict (ordem LRU) de identificador -> estado do algoritmo
+            (float monotônico no GCRA, lista de instantes na janela deslizante)
+        max_identificadores: Tamanho máximo de `tentativas`
+        armazenamento: Armazenamento compartilhado do estado (None = `tentativas`)
+        bloquear_em_falha: Nega a tentativa se o armazenamento falhar
+        total_removidos_lru: Identificadores descartados por falta de espaço
+        total_expirados: Identificadores removidos pela varredura
     """
 
     def __init__(
@@ -35,32 +86,60 @@ class RateLimiter:
         max_tentativas: int = 5,
         janela_minutos: int = 5,
         nome: str = "default",
+        algoritmo: Optional[str] = None,
+        max_identificadores: Optional[int] = None,
+        armazenamento: Optional[ArmazenamentoRateLimit] = None,
+        bloquear_em_falha: Optional[bool] = None,
     ):
         """
-        Inicializa rate limiter.
+        Inicializa rate limiter e o registra em registro_limiters.
 
         Args:
             max_tentativas: Número máximo de tentativas na janela
             janela_minutos: Tamanho da janela em minutos
             nome: Nome descritivo do limiter (para logs)
+            algoritmo: "gcra" ou "janela_deslizante" (padrão: RATE_LIMIT_ALGORITMO)
+            max_identificadores: Identificadores mantidos (padrão:
+                RATE_LIMIT_MAX_IDENTIFICADORES)
+            armazenamento: Armazenamento compartilhado (padrão: o de
+                RATE_LIMIT_BACKEND; None se for "memoria"). Exige GCRA.
+            bloquear_em_falha: Se o armazenamento falhar, nega (True) ou
+                permite (False) a tentativa (padrão: RATE_LIMIT_BLOQUEAR_EM_FALHA)
         """
         if max_tentativas <= 0:
             raise ValueError("max_tentativas deve ser positivo")
         if janela_minutos <= 0:
             raise ValueError("janela_minutos deve ser positivo")
+        algoritmo = algoritmo or RATE_LIMIT_ALGORITMO
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"algoritmo deve ser um de {ALGORITMOS}")
+        max_identificadores = max_identificadores or RATE_LIMIT_MAX_IDENTIFICADORES
+        if max_identificadores <= 0:
+            raise ValueError("max_identificadores deve ser positivo")
+        armazenamento = armazenamento or obter_armazenamento_padrao()
+        if armazenamento is not None and algoritmo != ALGORITMO_GCRA:
+            raise ValueError("armazenamento compartilhado exige o algoritmo gcra")
 
         self.max_tentativas = max_tentativas
         self.janela = timedelta(minutes=janela_minutos)
         self.janela_minutos = janela_minutos
         self.nome = nome
-        self.tentativas: defaultdict[str, list[datetime]] = defaultdict(list)
+        self.algoritmo = algoritmo
+        self.max_identificadores = max_identificadores
+        self.tentativas: OrderedDict[str, Union[float, list[float]]] = OrderedDict()
+        self.total_removidos_lru = 0
+        self.total_expirados = 0
+        self.armazenamento = armazenamento
+        self.bloquear_em_falha = (
+            RATE_LIMIT_BLOQUEAR_EM_FALHA if bloquear_em_falha is None else bloquear_em_falha
+        )
+        registro_limiters.registrar(self)
 
     def verificar(self, identificador: str) -> bool:
         """
         Verifica se identificador está dentro do limite.
 
-        Remove tentativas antigas da janela e verifica se está
-        abaixo do máximo. Se estiver, registra nova tentativa.
+        Se estiver, registra nova tentativa.
 
         Args:
             identificador: Identificador único (geralmente IP)
@@ -69,25 +148,105 @@ class RateLimiter:
             True se dentro do limite (permitido)
             False se excedeu limite (bloqueado)
         """
-        momento_atual = obter_agora()
+        momento_atual = time.monotonic()
+        janela = self.janela_minutos * 60
+
+        if self.algoritmo == ALGORITMO_GCRA:
+            # TAT: instante em que o identificador volta a ter a rajada cheia
+            intervalo = janela / self.max_tentativas
+            if self.armazenamento is not None:
+                if self.armazenamento.consumir(
+                    self.nome, identificador, intervalo, janela, momento_atual,
+                    permitir_em_falha=not self.bloquear_em_falha,
+                ):
+                    return True
+            else:
+                tat = max(self.tentativas.get(identificador, momento_atual), momento_atual)
+                if tat + intervalo - momento_atual <= janela + _EPSILON:
+                    self._gravar(identificador, tat + intervalo)
+                    return True
+                self.tentativas.move_to_end(identificador)
+            tentativas_atuais = self.max_tentativas
+        else:
+            registro = self._registro_na_janela(identificador, momento_atual)
+            if registro is None:
+                registro = []
+                self._gravar(identificador, registro)
+            else:
+                self.tentativas.move_to_end(identificador)
+            if len(registro) < self.max_tentativas:
+                registro.append(momento_atual)
+                return True
+            tentativas_atuais = len(registro)
+
+        logger.warning(
+            f"Rate limit excedido [{self.nome}] - "
+            f"Identificador: {identificador}, "
+            f"Tentativas: {tentativas_atuais}/{self.max_tentativas}"
+        )
+        return False
 
-        # Limpar tentativas antigas (fora da janela)
-        self.tentativas[identificador] = [
-            t for t in self.tentativas[identificador] if momento_atual - t < self.janela
-        ]
+    def _gravar(self, identificador: str, estado: Union[float, list[float]]) -> None:
+        """Grava o estado como o mais recente, descartando o LRU se exceder o limite."""
+        self.tentativas[identificador] = estado
+        self.tentativas.move_to_end(identificador)
+        if len(self.tentativas) > self.max_identificadores:
+            self.tentativas.popitem(last=False)
+            self.total_removidos_lru += 1
 
-        # Verificar se excedeu limite
-        if len(self.tentativas[identificador]) >= self.max_tentativas:
-            logger.warning(
-                f"Rate limit excedido [{self.nome}] - "
-                f"Identificador: {identificador}, "
-                f"Tentativas: {len(self.tentativas[identificador])}/{self.max_tentativas}"
-            )
-            return False
+    def remover_expirados(self) -> int:
+        """
+        Remove os identificadores cujo estado expirou (equivalente a ausente).
+
+        GCRA: TAT no passado (rajada cheia de novo). Janela deslizante:
+        nenhuma tentativa dentro da janela.
 
-        # Registrar nova tentativa
-        self.tentativas[identificador].append(momento_atual)
-        return True
+        Returns:
+            Número de identificadores removidos
+        """
+        momento_atual = time.monotonic()
+        corte = momento_atual - self.janela_minutos * 60
+
+        if self.armazenamento is not None:
+            removidos = self.armazenamento.remover_expirados(self.nome, self.janela_minutos * 60, momento_atual)
+            self.total_expirados += removidos
+            return removidos
+
+        if self.algoritmo == ALGORITMO_GCRA:
+            expirados = [i for i, tat in list(self.tentativas.items()) if tat <= momento_atual]
+        else:
+            expirados = [i for i, registro in list(self.tentativas.items()) if not registro or registro[-1] <= corte]
+
+        for identificador in expirados:
+            self.tentativas.pop(identificador, None)
+        self.total_expirados += len(expirados)
+        return len(expirados)
+
+    def contar_identificadores(self) -> int:
+        """Identificadores com estado (no armazenamento compartilhado, se houver)."""
+        if self.armazenamento is not None:
+            return self.armazenamento.contar(self.nome)
+        return len(self.tentativas)
+
+    def _obter_tat(self, identificador: str, momento_atual: float) -> Optional[float]:
+        """GCRA: TAT do identificador, ou None se não houver estado válido."""
+        if self.armazenamento is not None:
+            tat = self.armazenamento.obter_tat(self.nome, identificador)
+        else:
+            tat = self.tentativas.get(identificador)
+        # TAT além de agora + janela só existe se o relógio monotônico
+        # recomeçou (reboot com estado compartilhado em disco): é descartado
+        if tat is None or tat > momento_atual + self.janela_minutos * 60 + _EPSILON:
+            return None
+        return tat
+
+    def _registro_na_janela(self, identificador: str, momento_atual: float) -> Optional[list[float]]:
+        """Janela deslizante: descarta (do início) as tentativas fora da janela."""
+        registro = self.tentativas.get(identificador)
+        if registro:
+            # Instantes em ordem crescente: busca binária pelo corte
+            del registro[:bisect_right(registro, momento_atual - self.janela_minutos * 60)]
+        return registro
 
     def limpar(self, identificador: Optional[str] = None) -> None:
         """
@@ -97,6 +256,9 @@ class RateLimiter:
             identificador: Se fornecido, limpa apenas este identificador.
                           Se None, limpa todos (útil para testes).
         """
+        if self.armazenamento is not None:
+            self.armazenamento.remover(self.nome, identificador or None)
+            return
         if identificador:
             if identificador in self.tentativas:
                 del self.tentativas[identificador]
@@ -115,19 +277,21 @@ class RateLimiter:
         Returns:
             Número de tentativas restantes (0 se bloqueado)
         """
-        momento_atual = obter_agora()
+        momento_atual = time.monotonic()
 
-        # Limpar tentativas antigas
-        self.tentativas[identificador] = [
-            t for t in self.tentativas[identificador] if momento_atual - t < self.janela
-        ]
+        if self.algoritmo == ALGORITMO_GCRA:
+            janela = self.janela_minutos * 60
+            intervalo = janela / self.max_tentativas
+            tat = max(self._obter_tat(identificador, momento_atual) or momento_atual, momento_atual)
+            restantes = int((janela - (tat - momento_atual)) / intervalo + _EPSILON)
+            return min(max(0, restantes), self.max_tentativas)
 
-        tentativas_atuais = len(self.tentativas[identificador])
-        return max(0, self.max_tentativas - tentativas_atuais)
+        registro = self._registro_na_janela(identificador, momento_atual)
+        return max(0, self.max_tentativas - len(registro or ()))
 
     def obter_tempo_reset(self, identificador: str) -> Optional[timedelta]:
         """
-        Retorna tempo até o reset do limite.
+        Retorna tempo até o identificador poder tentar de novo.
 
         Args:
             identificador: Identificador único
@@ -135,41 +299,44 @@ class RateLimiter:
         Returns:
             Timedelta até reset, ou None se não bloqueado
         """
-        if identificador not in self.tentativas or not self.tentativas[identificador]:
-            return None
-
-        momento_atual = obter_agora()
-
-        # Limpar tentativas antigas
-        self.tentativas[identificador] = [
-            t for t in self.tentativas[identificador] if momento_atual - t < self.janela
-        ]
-
-        # Se ainda está bloqueado, calcular tempo até reset
-        if len(self.tentativas[identificador]) >= self.max_tentativas:
+        momento_atual = time.monotonic()
+        janela = self.janela_minutos * 60
+
+        if self.algoritmo == ALGORITMO_GCRA:
+            tat = self._obter_tat(identificador, momento_atual)
+            if tat is None:
+                return None
+            # Próxima tentativa liberada quando TAT + intervalo couber na janela
+            intervalo = janela / self.max_tentativas
+            espera = tat + intervalo - janela - momento_atual
+        else:
+            registro = self._registro_na_janela(identificador, momento_atual)
+            if not registro or len(registro) < self.max_tentativas:
+                return None
             # Reset quando a tentativa mais antiga sair da janela
-            tentativa_mais_antiga = self.tentativas[identificador][0]
-            tempo_reset = (tentativa_mais_antiga + self.janela) - momento_atual
-            return tempo_reset if tempo_reset.total_seconds() > 0 else None
+            espera = registro[0] + janela - momento_atual
 
-        return None
+        return timedelta(seconds=espera) if espera > _EPSILON else None
 
     def __repr__(self) -> str:
         """Representação string do limiter."""
         return (
             f"RateLimiter(nome='{self.nome}', "
             f"max_tentativas={self.max_tentativas}, "
-            f"janela_minutos={self.janela_minutos})"
+            f"janela_minutos={self.janela_minutos}, "
+            f"algoritmo='{self.algoritmo}')"
         )
 
 
 class DynamicRateLimiter(RateLimiter):
     """
-    Rate limiter dinâmico que busca valores do config_cache a cada verificação.
+    Rate limiter dinâmico que acompanha os valores do config_cache.
 
     Permite alteração de rate limits sem reiniciar o servidor. Os valores
     max_tentativas e janela_minutos são lidos do cache de configuração
-    usando as chaves fornecidas.
+    usando as chaves fornecidas, e relidos apenas quando a versão do cache
+    muda (config.limpar/limpar_chave). Assim a verificação não toma o lock
+    do ConfigCache a cada requisição.
 
     Attributes:
         chave_max: Chave de configuração para max_tentativas
@@ -185,6 +352,10 @@ class DynamicRateLimiter(RateLimiter):
         padrao_max: int = 5,
         padrao_minutos: int = 5,
         nome: str = "dynamic",
+        algoritmo: Optional[str] = None,
+        max_identificadores: Optional[int] = None,
+        armazenamento: Optional[ArmazenamentoRateLimit] = None,
+        bloquear_em_falha: Optional[bool] = None,
     ):
         """
         Inicializa rate limiter dinâmico.
@@ -195,6 +366,12 @@ class DynamicRateLimiter(RateLimiter):
             padrao_max: Valor padrão para max_tentativas
             padrao_minutos: Valor padrão para janela_minutos
             nome: Nome descritivo do limiter (para logs)
+            algoritmo: "gcra" ou "janela_deslizante" (padrão: RATE_LIMIT_ALGORITMO)
+            max_identificadores: Identificadores mantidos (padrão:
+                RATE_LIMIT_MAX_IDENTIFICADORES)
+            armazenamento: Armazenamento compartilhado (padrão: RATE_LIMIT_BACKEND)
+            bloquear_em_falha: Nega a tentativa se o armazenamento falhar
+                (padrão: RATE_LIMIT_BLOQUEAR_EM_FALHA)
         """
         # Validar valores padrão
         if padrao_max <= 0:
@@ -207,14 +384,20 @@ class DynamicRateLimiter(RateLimiter):
         self.padrao_max = padrao_max
         self.padrao_minutos = padrao_minutos
 
-        # Inicializar com valores atuais do config
+        # Inicializar com valores atuais do config. A versão é lida antes
+        # dos valores: uma limpeza concorrente força nova leitura depois.
+        self._versao_config = config.obter_versao()
         max_tentativas = config.obter_int(chave_max, padrao_max)
         janela_minutos = config.obter_int(chave_minutos, padrao_minutos)
 
         super().__init__(
             max_tentativas=max_tentativas,
             janela_minutos=janela_minutos,
-            nome=nome
+            nome=nome,
+            algoritmo=algoritmo,
+            max_identificadores=max_identificadores,
+            armazenamento=armazenamento,
+            bloquear_em_falha=bloquear_em_falha,
         )
 
     def _atualizar_valores(self) -> None:
@@ -222,8 +405,14 @@ class DynamicRateLimiter(RateLimiter):
         Atualiza valores de max_tentativas e janela_minutos do config_cache.
 
         Chamado internamente antes de cada verificação para garantir
-        que está usando os valores mais recentes.
+        que está usando os valores mais recentes. Só consulta o cache
+        quando a versão dele mudou desde a última leitura.
         """
+        versao = config.obter_versao()
+        if versao == self._versao_config:
+            return
+        self._versao_config = versao
+
         max_tentativas = config.obter_int(self.chave_max, self.padrao_max)
         janela_minutos = config.obter_int(self.chave_minutos, self.padrao_minutos)
 
@@ -296,7 +485,8 @@ class DynamicRateLimiter(RateLimiter):
             f"chave_max='{self.chave_max}', "
             f"chave_minutos='{self.chave_minutos}', "
             f"max_tentativas={self.max_tentativas}, "
-            f"janela_minutos={self.janela_minutos})"
+            f"janela_minutos={self.janela_minutos}, "
+            f"algoritmo='{self.algoritmo}')"
         )
 
 
@@ -323,15 +513,20 @@ class RegistroLimiters:
     """
     Registry global para gerenciar e monitorar todos os rate limiters.
 
+    Todo RateLimiter se registra em `registro_limiters` ao ser criado.
+
     Permite:
     - Listar todos os limiters registrados
-    - Obter estatísticas globais
+    - Obter estatísticas globais (identificadores e remoções)
     - Limpar todos os limiters de uma vez (útil para testes)
+    - Varrer periodicamente os identificadores expirados (tarefa de fundo)
     """
 
     def __init__(self):
         """Inicializa o registry vazio."""
         self._limiters: dict[str, RateLimiter] = {}
+        self._tarefa_varredura: Optional[asyncio.Task] = None
+        self._varreduras = 0
 
     def registrar(self, limiter: RateLimiter) -> None:
         """
@@ -373,16 +568,31 @@ class RegistroLimiters:
         """
         stats = {
             "total_limiters": len(self._limiters),
+            "total_identificadores": 0,
+            "total_removidos_lru": 0,
+            "total_expirados": 0,
+            "varredura_ativa": self._tarefa_varredura is not None,
+            "varreduras": self._varreduras,
             "limiters": {}
         }
 
         for nome, limiter in self._limiters.items():
+            identificadores = limiter.contar_identificadores()
             stats["limiters"][nome] = {
                 "max_tentativas": limiter.max_tentativas,
                 "janela_minutos": limiter.janela_minutos,
-                "identificadores_ativos": len(limiter.tentativas),
+                "identificadores_ativos": identificadores,
+                "max_identificadores": limiter.max_identificadores,
+                "removidos_lru": limiter.total_removidos_lru,
+                "expirados": limiter.total_expirados,
+                "algoritmo": limiter.algoritmo,
+                "armazenamento": limiter.armazenamento.nome if limiter.armazenamento else "memoria",
+                "bloquear_em_falha": limiter.bloquear_em_falha,
                 "tipo": "dinamico" if isinstance(limiter, DynamicRateLimiter) else "estatico"
             }
+            stats["total_identificadores"] += identificadores
+            stats["total_removidos_lru"] += limiter.total_removidos_lru
+            stats["total_expirados"] += limiter.total_expirados
 
         return stats
 
@@ -396,6 +606,71 @@ class RegistroLimiters:
             limiter.limpar()
         logger.info("Todos os rate limiters foram limpos")
 
+    def varrer(self) -> int:
+        """
+        Remove os identificadores expirados de todos os limiters.
+
+        Returns:
+            Total de identificadores removidos
+        """
+        removidos = _remover_expirados(list(self._limiters.values()))
+        return self._registrar_varredura(removidos)
+
+    async def varrer_sem_bloquear(self) -> int:
+        """
+        Como varrer(), mas sem bloquear o event loop.
+
+        Os limiters em memória são varridos no próprio loop (sem lock, não
+        podem ser tocados por outra thread); os de armazenamento compartilhado
+        fazem um DELETE cada, que pode esperar o lock do arquivo, e rodam no
+        executor do banco.
+
+        Returns:
+            Total de identificadores removidos
+        """
+        limiters = list(self._limiters.values())
+        compartilhados = [limiter for limiter in limiters if limiter.armazenamento is not None]
+        removidos = _remover_expirados([limiter for limiter in limiters if limiter.armazenamento is None])
+        if compartilhados:
+            removidos += await executar_db(_remover_expirados, compartilhados)
+        return self._registrar_varredura(removidos)
+
+    def _registrar_varredura(self, removidos: int) -> int:
+        self._varreduras += 1
+        if removidos:
+            logger.debug(f"Varredura de rate limiters: {removidos} identificador(es) expirado(s)")
+        return removidos
+
+    async def iniciar_varredura(self, intervalo_segundos: float = RATE_LIMIT_VARREDURA_SEGUNDOS) -> None:
+        """Inicia a varredura periódica (varrer_sem_bloquear, a partir do event loop)."""
+        if self._tarefa_varredura is not None or intervalo_segundos <= 0:
+            return
+        self._tarefa_varredura = asyncio.create_task(self._varrer_periodicamente(intervalo_segundos))
+
+    async def encerrar_varredura(self) -> None:
+        """Cancela a varredura periódica."""
+        if self._tarefa_varredura is None:
+            return
+        self._tarefa_varredura.cancel()
+        try:
+            await self._tarefa_varredura
+        except asyncio.CancelledError:
+            pass
+        self._tarefa_varredura = None
+
+    async def _varrer_periodicamente(self, intervalo_segundos: float) -> None:
+        while True:
+            await asyncio.sleep(intervalo_segundos)
+            try:
+                await self.varrer_sem_bloquear()
+            except Exception as e:
+                logger.error(f"Erro na varredura de rate limiters: {e}", exc_info=True)
+
+
+def _remover_expirados(limiters: list[RateLimiter]) -> int:
+    """Remove os identificadores expirados dos limiters informados."""
+    return sum(limiter.remover_expirados() for limiter in limiters)
+
 
 # Instância global do registry
 registro_limiters = RegistroLimiters()
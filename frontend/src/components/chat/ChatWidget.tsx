@@ -3,16 +3,18 @@
 import { useCallback, useEffect, useRef, useState } from 'react'
 import { api, ApiError } from '../../lib/api'
 import type { ChatMensagem, ChatSala, Conversa, UsuarioBusca } from '../../lib/types'
+import { assinarEventos } from '../../lib/eventos'
 import { formatarHora } from '../../lib/format'
 import { useAuthStore } from '../../store/authStore'
 import { toast } from '../../store/uiStore'
 
-// Evento recebido pelo EventSource (ver chat_routes.enviar_mensagem / marcar_como_lidas).
+// Evento recebido pelo stream SSE (lib/eventos.ts; ver chat_routes.enviar_mensagem / marcar_como_lidas).
 // O backend emite `sala_id` como string (formato "menor_id_maior_id") e o payload
-// da mensagem traz `data_envio` e `lida_em` possivelmente nulos.
+// da mensagem traz `data_envio` e `lida_em` possivelmente nulos. `ressincronizar`
+// chega na reconexão quando o servidor não tem mais os eventos perdidos.
 interface EventoSSE {
-  tipo: 'nova_mensagem' | 'atualizar_contador'
-  sala_id: string
+  tipo: 'nova_mensagem' | 'atualizar_contador' | 'ressincronizar'
+  sala_id?: string
   mensagem?: ChatMensagem
 }
 
@@ -34,7 +36,7 @@ export default function ChatWidget() {
   const [texto, setTexto] = useState('')
   const [enviando, setEnviando] = useState(false)
 
-  // Refs para acesso atualizado dentro do handler do EventSource.
+  // Refs para acesso atualizado dentro do handler do stream SSE.
   const salaAtualRef = useRef<string | null>(null)
   const abertoRef = useRef(false)
   const messagesEndRef = useRef<HTMLDivElement | null>(null)
@@ -110,21 +112,14 @@ export default function ChatWidget() {
     [marcarLidas],
   )
 
-  // ===== EventSource (SSE) =====
+  // ===== Stream SSE (compartilhado com o NotificationBell) =====
 
   useEffect(() => {
     if (!usuario) return
-    const es = new EventSource('/api/chat/stream')
+    const cancelar = assinarEventos((e) => {
+      const evento = e as unknown as EventoSSE
 
-    es.onmessage = (e: MessageEvent<string>) => {
-      let evento: EventoSSE
-      try {
-        evento = JSON.parse(e.data) as EventoSSE
-      } catch {
-        return
-      }
-
-      if (evento.tipo === 'nova_mensagem' && evento.mensagem) {
+      if (evento.tipo === 'nova_mensagem' && evento.mensagem && evento.sala_id) {
         const msg = evento.mensagem
         const salaId = evento.sala_id
         const ehDaSalaAberta = abertoRef.current && salaAtualRef.current === salaId
@@ -143,16 +138,27 @@ export default function ChatWidget() {
       } else if (evento.tipo === 'atualizar_contador') {
         void carregarConversas()
         void carregarTotalNaoLidas()
+      } else if (evento.tipo === 'ressincronizar') {
+        // Eventos perdidos na reconexão: recarrega o que está na tela.
+        void carregarConversas()
+        void carregarTotalNaoLidas()
+        const salaAberta = abertoRef.current ? salaAtualRef.current : null
+        if (salaAberta) {
+          void api
+            .get<ChatMensagem[]>(`/chat/mensagens/${salaAberta}`, {
+              params: { limit: 50, offset: 0 },
+            })
+            .then((msgs) => {
+              if (salaAtualRef.current === salaAberta) setMensagens(msgs)
+            })
+            .catch(() => {
+              // Silencioso: o próximo evento/abertura recarrega.
+            })
+        }
       }
-    }
-
-    es.onerror = () => {
-      // O browser reconecta automaticamente.
-    }
+    })
 
-    return () => {
-      es.close()
-    }
+    return cancelar
   }, [usuario, carregarConversas, carregarTotalNaoLidas, marcarLidas])
 
   // Carga inicial do contador (mesmo com o painel fechado).
@@ -1,14 +1,30 @@
 import { useEffect, useState } from 'react'
 import { Link } from 'react-router-dom'
 import { api } from '../../lib/api'
+import { assinarEventos } from '../../lib/eventos'
 import type { NaoLidasResumo } from '../../lib/types'
 
-// Sino de notificações com polling a cada 30s (espelha navbar_user_dropdown.html).
+// O total chega por push (eventos `notificacao` e `notificacao_lote` do stream
+// SSE); o polling fica só como rede de segurança, para o caso de eventos
+// perdidos.
+const INTERVALO_SEGURANCA_MS = 5 * 60 * 1000
+
+// Sino de notificações (espelha navbar_user_dropdown.html).
 export default function NotificationBell() {
   const [total, setTotal] = useState(0)
 
   useEffect(() => {
     let ativo = true
+    const cancelar = assinarEventos((evento) => {
+      if (evento.tipo === 'notificacao' && typeof evento.nao_lidas === 'number') {
+        setTotal(evento.nao_lidas)
+      } else if (evento.tipo === 'notificacao_lote' && typeof evento.incremento === 'number') {
+        const incremento = evento.incremento
+        setTotal((t) => t + incremento)
+      } else if (evento.tipo === 'ressincronizar') {
+        void verificar()
+      }
+    })
     async function verificar() {
       try {
         const data = await api.get<NaoLidasResumo>('/notificacoes/nao-lidas')
@@ -18,9 +34,10 @@ export default function NotificationBell() {
       }
     }
     verificar()
-    const id = setInterval(verificar, 30000)
+    const id = setInterval(verificar, INTERVALO_SEGURANCA_MS)
     return () => {
       ativo = false
+      cancelar()
       clearInterval(id)
     }
   }, [])
@@ -0,0 +1,45 @@
+// Canal de push do servidor (SSE) compartilhado pelos componentes.
+//
+// Uma única conexão com /api/chat/stream por aba: o chat (ChatWidget) e o sino
+// de notificações (NotificationBell) assinam os eventos daqui em vez de abrir
+// cada um o seu EventSource. A conexão abre na primeira assinatura e fecha
+// quando a última é cancelada; a reconexão (com Last-Event-ID) fica por conta
+// do browser.
+
+export interface EventoServidor {
+  tipo: string
+  [campo: string]: unknown
+}
+
+type Ouvinte = (evento: EventoServidor) => void
+
+const URL_STREAM = '/api/chat/stream'
+
+const ouvintes = new Set<Ouvinte>()
+let fonte: EventSource | null = null
+
+function abrir() {
+  fonte = new EventSource(URL_STREAM)
+  fonte.onmessage = (e: MessageEvent<string>) => {
+    let evento: EventoServidor
+    try {
+      evento = JSON.parse(e.data) as EventoServidor
+    } catch {
+      return
+    }
+    for (const ouvinte of Array.from(ouvintes)) ouvinte(evento)
+  }
+}
+
+/** Assina os eventos do servidor; retorna a função que cancela a assinatura. */
+export function assinarEventos(ouvinte: Ouvinte): () => void {
+  ouvintes.add(ouvinte)
+  if (!fonte) abrir()
+  return () => {
+    ouvintes.delete(ouvinte)
+    if (ouvintes.size === 0 && fonte) {
+      fonte.close()
+      fonte = null
+    }
+  }
+}
@@ -93,6 +93,8 @@ export interface Chamado {
   usuario_email?: string | null
   mensagens_nao_lidas?: number
   tem_resposta_admin?: boolean
+  /** Trecho que casou com a busca (q), com os termos entre <mark> e </mark>. */
+  trecho_busca?: string | null
   interacoes?: ChamadoInteracao[] | null
 }
 
@@ -16,6 +16,21 @@ import { formatarDataHora } from '../../../lib/format'
 
 const POR_PAGINA = 10
 
+/**
+ * Exibe o trecho da busca com os termos destacados. O backend marca os
+ * termos com <mark>…</mark> sem escapar o restante, então o texto é
+ * renderizado como texto (nunca como HTML).
+ */
+function TrechoBusca({ trecho }: { trecho: string }) {
+  return (
+    <>
+      {trecho.split(/<mark>(.*?)<\/mark>/).map((parte, i) =>
+        i % 2 === 1 ? <mark key={i}>{parte}</mark> : parte
+      )}
+    </>
+  )
+}
+
 export default function AdminChamadosListarPage() {
   // Campos do formulário (controlados) e filtros efetivamente aplicados.
   const [busca, setBusca] = useState('')
@@ -84,7 +99,7 @@ export default function AdminChamadosListarPage() {
                     id="busca"
                     type="text"
                     className="form-control"
-                    placeholder="Título, usuário ou e-mail..."
+                    placeholder="Título, mensagem, usuário ou e-mail..."
                     value={busca}
                     onChange={(e) => setBusca(e.target.value)}
                   />
@@ -169,6 +184,10 @@ export default function AdminChamadosListarPage() {
                     <tbody>
                       {chamados.map((chamado) => {
                         const nome = chamado.usuario_nome ?? '—'
+                        const trecho = chamado.trecho_busca
+                        // Trecho do próprio título: destaca no título em vez de repetir
+                        const trechoNoTitulo =
+                          !!trecho && trecho.replace(/<\/?mark>/g, '') === chamado.titulo
                         return (
                           <tr key={chamado.id}>
                             <td>
@@ -180,8 +199,21 @@ export default function AdminChamadosListarPage() {
                                 style={{ maxWidth: 300 }}
                                 title={chamado.titulo}
                               >
-                                {chamado.titulo}
+                                {trechoNoTitulo && trecho ? (
+                                  <TrechoBusca trecho={trecho} />
+                                ) : (
+                                  chamado.titulo
+                                )}
                               </div>
+                              {trecho && !trechoNoTitulo && (
+                                <small
+                                  className="d-block text-muted text-truncate"
+                                  style={{ maxWidth: 300 }}
+                                  title={trecho.replace(/<\/?mark>/g, '')}
+                                >
+                                  <TrechoBusca trecho={trecho} />
+                                </small>
+                              )}
                               {chamado.mensagens_nao_lidas ? (
                                 <div className="mt-1">
                                   <MensagensNaoLidasBadge count={chamado.mensagens_nao_lidas} />
@@ -5,19 +5,30 @@ import { StatusPagamento } from '../../../lib/types'
 import { useFetch } from '../../../hooks/useFetch'
 import { formatarDataHora, formatarMoeda } from '../../../lib/format'
 import { StatusPagamentoBadge } from '../../../components/ui/Badges'
-import { SelectField } from '../../../components/form/Field'
+import { SelectField, TextField } from '../../../components/form/Field'
 import Pagination from '../../../components/ui/Pagination'
 import EmptyState from '../../../components/ui/EmptyState'
 import Spinner from '../../../components/ui/Spinner'
 
 const POR_PAGINA = 10
 
+// Chaves gravadas em pagamento.provider (util/payment_service.py)
+const PROVEDORES = [
+  { valor: 'mercadopago', rotulo: 'Mercado Pago' },
+  { valor: 'stripe', rotulo: 'Stripe' },
+  { valor: 'paypal', rotulo: 'PayPal' },
+]
+
 export default function AdminPagamentosListarPage() {
   const navigate = useNavigate()
   const [searchParams, setSearchParams] = useSearchParams()
 
   const pagina = Number(searchParams.get('pagina')) || 1
   const statusFiltro = searchParams.get('status_filtro') ?? ''
+  const provider = searchParams.get('provider') ?? ''
+  const dataInicio = searchParams.get('data_inicio') ?? ''
+  const dataFim = searchParams.get('data_fim') ?? ''
+  const temFiltro = Boolean(statusFiltro || provider || dataInicio || dataFim)
 
   const { data, carregando, erro } = useFetch<PaginaResponse<Pagamento>>(
     (signal) =>
@@ -26,15 +37,21 @@ export default function AdminPagamentosListarPage() {
           pagina,
           por_pagina: POR_PAGINA,
           status_filtro: statusFiltro || undefined,
+          provider: provider || undefined,
+          data_inicio: dataInicio || undefined,
+          data_fim: dataFim || undefined,
         },
         signal,
       }),
-    [pagina, statusFiltro],
+    [pagina, statusFiltro, provider, dataInicio, dataFim],
   )
 
   function atualizarParams(next: Record<string, string | number | undefined>) {
     const params: Record<string, string> = {}
     if (statusFiltro) params.status_filtro = statusFiltro
+    if (provider) params.provider = provider
+    if (dataInicio) params.data_inicio = dataInicio
+    if (dataFim) params.data_fim = dataFim
     if (pagina > 1) params.pagina = String(pagina)
     for (const [k, v] of Object.entries(next)) {
       if (v === undefined || v === '' || v === 0) delete params[k]
@@ -55,7 +72,7 @@ export default function AdminPagamentosListarPage() {
         <div className="card shadow-sm mb-4">
           <div className="card-body">
             <div className="row g-2 align-items-end">
-              <div className="col-md-4">
+              <div className="col-md-3">
                 <SelectField
                   label="Filtrar por status"
                   name="status_filtro"
@@ -65,6 +82,34 @@ export default function AdminPagamentosListarPage() {
                   placeholder="Todos os status"
                 />
               </div>
+              <div className="col-md-3">
+                <SelectField
+                  label="Provedor"
+                  name="provider"
+                  value={provider}
+                  onChange={(v) => atualizarParams({ provider: v || undefined, pagina: undefined })}
+                  opcoes={PROVEDORES}
+                  placeholder="Todos os provedores"
+                />
+              </div>
+              <div className="col-md-3">
+                <TextField
+                  label="Criados de"
+                  name="data_inicio"
+                  type="date"
+                  value={dataInicio}
+                  onChange={(v) => atualizarParams({ data_inicio: v || undefined, pagina: undefined })}
+                />
+              </div>
+              <div className="col-md-3">
+                <TextField
+                  label="Até"
+                  name="data_fim"
+                  type="date"
+                  value={dataFim}
+                  onChange={(v) => atualizarParams({ data_fim: v || undefined, pagina: undefined })}
+                />
+              </div>
             </div>
           </div>
         </div>
@@ -80,9 +125,7 @@ export default function AdminPagamentosListarPage() {
                 icon="credit-card"
                 titulo="Nenhum pagamento encontrado"
                 mensagem={
-                  statusFiltro
-                    ? `Não há pagamentos com status "${statusFiltro}".`
-                    : 'Não há pagamentos.'
+                  temFiltro ? 'Não há pagamentos com os filtros selecionados.' : 'Não há pagamentos.'
                 }
               />
             ) : (